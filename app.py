@@ -1,5 +1,4 @@
 import streamlit as st
-import re
 
 
 # ✅ 무조건 첫 Streamlit 명령어
@@ -13,27 +12,27 @@ st.set_page_config(
 
 from datetime import datetime, timedelta, timezone
 import os
-from PIL import Image
-import docx
-from docx.shared import Pt, RGBColor, Inches
 import io
+from importlib.util import find_spec
 from urllib.parse import urlparse
-from googlenews import GoogleNews
-import pandas as pd
-try:
-    import openpyxl
-except ImportError:
+# 보고서 라이브러리(openpyxl, python-docx)는 파일을 만들 때 임포트 (첫 화면 로딩 단축)
+if find_spec("openpyxl") is None:
     st.error("openpyxl 라이브러리가 설치되지 않았습니다. 'pip install openpyxl' 명령어로 설치해주세요.")
     st.stop()
-from news_ai import (
-    collect_news,
-    filter_valid_press,
-    filter_excluded_news,
-    group_and_select_news,
-    evaluate_importance,
-    summarize_selected_articles,
-    _generate_article_summary,
+from prompt_layout import PromptCacheStats
+from region_health import RegionRunStats
+from model_cascade import ModelUsageStats
+from news_pipeline import (
+    STAGE_NAMES,
+    build_initial_state,
+    get_scope_based_criteria,
+    get_scope_based_system_prompts,
 )
+from job_runner import JobRunner, FINISHED_STATUSES, STATUS_QUEUED, STATUS_RUNNING, STATUS_DONE, STATUS_FAILED
+from excel_report import StreamingExcelReport, column_widths, write_summary_sheet
+from news_report import NewsReport, build_news_status, format_news_date, get_article_summary
+from email_report import prepare_email_articles, render_email_html
+from press_index import parse_press_config
 
 # Import centralized configuration
 from config import (
@@ -41,8 +40,6 @@ from config import (
     COMPANY_KEYWORD_MAP,
     COMPANY_STRUCTURE_NEW,  # 새로운 구조 추가
     COMPANY_STRUCTURE_ENGLISH,  # 영어 키워드 구조 추가
-    ANALYSIS_SCOPE_CRITERIA,  # 분석 범위별 특화 기준 추가
-    ANALYSIS_SCOPE_SYSTEM_PROMPTS,  # 분석 범위별 시스템 프롬프트 추가
     TRUSTED_PRESS_ALIASES,
     ADDITIONAL_PRESS_ALIASES,
     SYSTEM_PROMPT_1,
@@ -53,6 +50,8 @@ from config import (
     SELECTION_CRITERIA, 
     GPT_MODELS,
     DEFAULT_GPT_MODEL,
+    JOB_DB_PATH,
+    JOB_MAX_WORKERS,
     # 새로 추가되는 회사별 기준들
     COMPANY_ADDITIONAL_EXCLUSION_CRITERIA,
     COMPANY_ADDITIONAL_DUPLICATE_HANDLING,
@@ -63,67 +62,80 @@ from config import (
 KST = timezone(timedelta(hours=9))
 
 
-def _clean_html_for_display(text: str) -> str:
-    """HTML 태그를 완전히 제거하고 Streamlit 표시용으로 정리"""
-    import re
-    
-    if not text:
-        return ""
-    
-    # 모든 HTML 태그 완전 제거 (더 강력한 정규식)
-    text = re.sub(r'<[^<>]*>', '', text)
-    text = re.sub(r'<[^<>]*', '', text)  # 닫히지 않은 태그도 제거
-    text = re.sub(r'[^<>]*>', '', text)  # 여는 태그가 없는 닫는 태그도 제거
-    
-    # HTML 엔티티 변환
-    html_entities = {
-        '&amp;': '&',
-        '&lt;': '<',
-        '&gt;': '>',
-        '&quot;': '"',
-        '&#39;': "'",
-        '&nbsp;': ' ',
-        '&apos;': "'"
-    }
-    
-    for entity, char in html_entities.items():
-        text = text.replace(entity, char)
-    
-    # 특정 HTML 관련 문자열 제거
-    text = text.replace('</div>', '')
-    text = text.replace('<div>', '')
-    text = text.replace('<br>', '\n')
-    text = text.replace('<br/>', '\n')
-    text = text.replace('<br />', '\n')
-    
-    # 연속된 공백과 줄바꿈 정리
-    text = re.sub(r'[ \t]+', ' ', text)
-    text = re.sub(r'\n\s*\n\s*\n+', '\n\n', text)
-    
-    return text.strip()
+# 재실행 간 캐시 - 사이드바를 조작할 때마다 기준/프롬프트 조립과 언론사 설정 파싱을 다시 하지 않음
+@st.cache_data(show_spinner=False)
+def get_scope_preview(scope):
+    """미리보기 범위별 (시스템 프롬프트 1~3, 제외 기준, 선택 기준)"""
+    if scope == "기본":
+        return (SYSTEM_PROMPT_1, SYSTEM_PROMPT_2, SYSTEM_PROMPT_3), EXCLUSION_CRITERIA, SELECTION_CRITERIA
+
+    dummy_keywords = ["키워드1", "키워드2"]
+    exclusion = EXCLUSION_CRITERIA + "\n\n" + get_scope_based_criteria([scope], "exclusion_criteria", dummy_keywords)
+    selection = get_scope_based_criteria([scope], "selection_criteria", dummy_keywords) or SELECTION_CRITERIA
+    return get_scope_based_system_prompts([scope]), exclusion, selection
+
+
+@st.cache_data(show_spinner=False)
+def get_scope_company_criteria(analysis_scope, company_keywords):
+    """
+    분석 범위 + 검색 키워드별 특화 기준
+
+    Args:
+        analysis_scope (tuple): 선택된 분석 범위
+        company_keywords (tuple): 실제 검색 키워드
+
+    Returns:
+        tuple: (범위별 선택 기준, 범위별 제외 기준, 시스템 프롬프트 1~3) - 범위별 기준이 없으면 빈 문자열
+    """
+    scope, keywords = list(analysis_scope), list(company_keywords)
+    return (
+        get_scope_based_criteria(scope, "selection_criteria", keywords),
+        get_scope_based_criteria(scope, "exclusion_criteria", keywords),
+        get_scope_based_system_prompts(scope),
+    )
 
-def _format_ai_summary_for_box(clean_summary, extraction_success):
-    """AI 요약을 파란색 박스 안에 포함되도록 HTML 포맷팅 (JSON 형식 지원)"""
-    if not clean_summary:
+
+# 원문 링크 디코딩용 웹 스크래퍼 (HTTP 세션 재사용, 서버 프로세스당 1개)
+@st.cache_resource
+def get_web_scraper():
+    from web_scraper import HybridNewsWebScraper
+    return HybridNewsWebScraper(
+        openai_api_key=os.getenv('OPENAI_API_KEY'),
+        enable_ai_fallback=True
+    )
+
+
+def _format_ai_summary_for_box(summary, extraction_success):
+    """AI 요약(ArticleSummary)을 파란색 박스 안에 포함되도록 필드에서 직접 HTML 구성 (이메일 템플릿과 같은 구성)"""
+    if summary is None:
         return ""
     
     if not extraction_success:
         return f"""
             <div class="selection-reason">
-                • ⚠️ 원문 추출 실패: {clean_summary}
+                • ⚠️ 원문 추출 실패: {summary.summary}
             </div>
         """
     
-    # JSON 형식의 요약이면 그대로 사용 (이미 _format_json_summary에서 HTML로 변환됨)
-    # 기존 텍스트 형식이면 기존 방식 사용
-    if clean_summary.strip().startswith('<div'):
-        # 이미 HTML로 포맷된 JSON 요약
+    # JSON 요약을 얻지 못한 경우 (오류/원문 텍스트)
+    if not summary.parsed:
         return f"""
-            {clean_summary}
+            <div class="selection-reason">
+                • ⚠️ {summary.summary}
+            </div>
         """
     
+    details = "".join(
+        f"<div style='margin-bottom: 6px; line-height: 1.4;'>- {detail}</div>" for detail in summary.details
+    )
     return f"""
-            {clean_summary}
+            <div style="margin-bottom: 15px;">
+                <h4 style="color: #333; margin-bottom: 10px; font-size: 1.2em; font-weight: bold;">{summary.title or '번역 제목 없음'}</h4>
+                <div style="background-color: #f0f8ff; padding: 12px; border-radius: 6px; margin-bottom: 12px; border-left: 3px solid #0077b6;">
+                    <strong>핵심 요약:</strong> {summary.summary or '요약 없음'}
+                </div>
+                <div style='margin-top: 8px;'>{details}</div>
+            </div>
     """
 
 def format_date(date_str):
@@ -150,110 +162,11 @@ def format_date(date_str):
                 # Return original if parsing fails
                 return date_str if date_str else '날짜 정보 없음'
 
-# 회사별 추가 기준을 적용하는 함수들
-def get_enhanced_exclusion_criteria(companies):
-    """회사별 제외 기준을 추가한 프롬프트 반환 (여러 회사 지원)"""
-    base_criteria = EXCLUSION_CRITERIA
-    
-    # companies가 문자열이면 리스트로 변환
-    if isinstance(companies, str):
-        companies = [companies]
-    
-    # 선택된 모든 회사의 추가 기준을 합침
-    all_additional_criteria = ""
-    for company in companies:
-        additional_criteria = COMPANY_ADDITIONAL_EXCLUSION_CRITERIA.get(company, "")
-        if additional_criteria:
-            all_additional_criteria += additional_criteria
-    
-    return base_criteria + all_additional_criteria
-
-def get_enhanced_duplicate_handling(companies):
-    """회사별 중복 처리 기준을 추가한 프롬프트 반환 (여러 회사 지원)"""
-    base_criteria = DUPLICATE_HANDLING
-    
-    # companies가 문자열이면 리스트로 변환
-    if isinstance(companies, str):
-        companies = [companies]
-    
-    # 선택된 모든 회사의 추가 기준을 합침
-    all_additional_criteria = ""
-    for company in companies:
-        additional_criteria = COMPANY_ADDITIONAL_DUPLICATE_HANDLING.get(company, "")
-        if additional_criteria:
-            all_additional_criteria += additional_criteria
-    
-    return base_criteria + all_additional_criteria
-
-def get_enhanced_selection_criteria(companies):
-    """회사별 선택 기준을 추가한 프롬프트 반환 (여러 회사 지원)"""
-    base_criteria = SELECTION_CRITERIA
-    
-    # companies가 문자열이면 리스트로 변환
-    if isinstance(companies, str):
-        companies = [companies]
-    
-    # 선택된 모든 회사의 추가 기준을 합침
-    all_additional_criteria = ""
-    for company in companies:
-        additional_criteria = COMPANY_ADDITIONAL_SELECTION_CRITERIA.get(company, "")
-        if additional_criteria:
-            all_additional_criteria += additional_criteria
-    
-    return base_criteria + all_additional_criteria
-
-def get_scope_based_criteria(analysis_scope, criteria_type="selection_criteria", keywords=None):
-    """분석 범위에 따른 특화 기준을 반환 (키워드 포함)"""
-    if not analysis_scope:
-        return ""
-    
-    # 첫 번째 범위를 주요 기준으로 사용 (본인회사 > 경쟁사 > 산업분야 순서로 우선순위)
-    priority_order = ["본인회사", "경쟁사", "산업분야"]
-    selected_scope = None
-    
-    for scope in priority_order:
-        if scope in analysis_scope:
-            selected_scope = scope
-            break
-    
-    if selected_scope and selected_scope in ANALYSIS_SCOPE_CRITERIA:
-        criteria_template = ANALYSIS_SCOPE_CRITERIA[selected_scope].get(criteria_type, "")
-        
-        # 키워드가 제공된 경우 템플릿에 삽입
-        if keywords and "{keywords}" in criteria_template:
-            keywords_str = ", ".join(keywords) if isinstance(keywords, list) else str(keywords)
-            return criteria_template.format(keywords=keywords_str)
-        
-        return criteria_template
-    
-    return ""
-
-def get_scope_based_system_prompts(analysis_scope):
-    """분석 범위에 따른 시스템 프롬프트를 반환"""
-    if not analysis_scope:
-        return SYSTEM_PROMPT_1, SYSTEM_PROMPT_2, SYSTEM_PROMPT_3
-    
-    # 첫 번째 범위를 주요 기준으로 사용 (본인회사 > 경쟁사 > 산업분야 순서로 우선순위)
-    priority_order = ["본인회사", "경쟁사", "산업분야"]
-    selected_scope = None
-    
-    for scope in priority_order:
-        if scope in analysis_scope:
-            selected_scope = scope
-            break
-    
-    if selected_scope and selected_scope in ANALYSIS_SCOPE_SYSTEM_PROMPTS:
-        scope_prompts = ANALYSIS_SCOPE_SYSTEM_PROMPTS[selected_scope]
-        return (
-            scope_prompts.get("system_prompt_1", SYSTEM_PROMPT_1),
-            scope_prompts.get("system_prompt_2", SYSTEM_PROMPT_2),
-            scope_prompts.get("system_prompt_3", SYSTEM_PROMPT_3)
-        )
-    
-    return SYSTEM_PROMPT_1, SYSTEM_PROMPT_2, SYSTEM_PROMPT_3
-            
 # 워드 파일 생성 함수
 def create_word_document(keyword, final_selection, analysis=""):
+    import docx
+    from docx.shared import RGBColor
+
     # 새 워드 문서 생성
     doc = docx.Document()
     
@@ -325,9 +238,6 @@ def get_binary_file_downloader_html(doc, file_name):
 def create_excel_analysis_report(keyword, final_state, start_date, end_date):
     """전체 뉴스 분석 과정을 Excel로 정리"""
     
-    # 데이터 수집
-    all_data = []
-    
     # 1. 전체 뉴스 데이터 (날짜 필터링 후)
     news_data = final_state.get("news_data", [])
     excluded_news = final_state.get("excluded_news", [])
@@ -335,75 +245,12 @@ def create_excel_analysis_report(keyword, final_state, start_date, end_date):
     retained_news = final_state.get("retained_news", [])
     grouped_news = final_state.get("grouped_news", [])
     final_selection = final_state.get("final_selection", [])
-    not_selected_news = final_state.get("not_selected_news", [])
     
-    # 각 뉴스의 상태를 추적하기 위한 딕셔너리
-    news_status = {}
+    # 각 뉴스의 상태 (제외/보류/유지/그룹/최종 선택)
+    news_status = build_news_status(final_state)
     
-    # 제외된 뉴스 처리
-    for news in excluded_news:
-        news_status[news.get('index', -1)] = {
-            'status': '제외',
-            'reason': news.get('reason', ''),
-            'group': '',
-            'final_reason': ''
-        }
-    
-    # 보류 뉴스 처리
-    for news in borderline_news:
-        news_status[news.get('index', -1)] = {
-            'status': '보류',
-            'reason': news.get('reason', ''),
-            'group': '',
-            'final_reason': ''
-        }
-    
-    # 유지 뉴스 처리
-    for news in retained_news:
-        news_status[news.get('index', -1)] = {
-            'status': '유지',
-            'reason': news.get('reason', ''),
-            'group': '',
-            'final_reason': ''
-        }
-    
-    # 그룹핑 정보 처리
-    for group in grouped_news:
-        group_indices = group.get('indices', [])
-        selected_index = group.get('selected_index', -1)
-        group_reason = group.get('reason', '')
-        
-        # 그룹 정보를 문자열로 변환
-        group_info = f"그룹 {group_indices} (선택: {selected_index})"
-        
-        for idx in group_indices:
-            if idx in news_status:
-                news_status[idx]['group'] = group_info
-                if idx == selected_index:
-                    news_status[idx]['status'] = '그룹 대표 선택'
-                else:
-                    news_status[idx]['status'] = '그룹 내 미선택'
-    
-    # 최종 선택된 뉴스 처리
-    for news in final_selection:
-        # 원본 뉴스에서 인덱스 찾기
-        original_index = -1
-        for i, original_news in enumerate(news_data, 1):
-            if original_news.get('url') == news.get('url') or original_news.get('content') == news.get('title'):
-                original_index = i
-                break
-        
-        if original_index in news_status:
-            news_status[original_index]['status'] = '최종 선택'
-            news_status[original_index]['final_reason'] = news.get('reason', '')
-    
-    # 최종 선택되지 않은 뉴스 처리
-    for news in not_selected_news:
-        news_index = news.get('index', -1)
-        if news_index in news_status:
-            news_status[news_index]['final_reason'] = f"미선택 사유: {news.get('reason', '')}"
-    
-    # Excel 데이터 생성
+    # 행 값 구성 (열 너비를 먼저 계산해야 openpyxl write-only 시트에도 행을 바로 기록 가능)
+    rows = []
     for i, news in enumerate(news_data, 1):
         status_info = news_status.get(i, {
             'status': '상태 불명',
@@ -412,120 +259,38 @@ def create_excel_analysis_report(keyword, final_state, start_date, end_date):
             'final_reason': ''
         })
         
-        # 날짜 형식 변환
-        date_str = news.get('date', '')
-        try:
-            if 'GMT' in date_str:
-                date_obj = datetime.strptime(date_str, '%a, %d %b %Y %H:%M:%S %Z')
-                formatted_date = date_obj.strftime('%Y-%m-%d %H:%M')
-            else:
-                date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-                formatted_date = date_str
-        except:
-            formatted_date = date_str if date_str else '날짜 정보 없음'
-        
-        all_data.append({
-            '순번': i,
-            '제목': news.get('content', '제목 없음'),
-            '언론사': news.get('press', '알 수 없음'),
-            '날짜': formatted_date,
-            'URL': news.get('url', ''),
-            '분석 상태': status_info['status'],
-            '1차 분류 사유': status_info['reason'],
-            '그룹핑 정보': status_info['group'],
-            '최종 선택 사유': status_info['final_reason']
-        })
-    
-    # DataFrame 생성
-    df = pd.DataFrame(all_data)
-    
-    # Excel 파일 생성
-    bio = io.BytesIO()
-    with pd.ExcelWriter(bio, engine='openpyxl') as writer:
-        # 메인 시트
-        df.to_excel(writer, sheet_name='전체 뉴스 분석', index=False)
-        
-        # 워크북과 워크시트 가져오기
-        workbook = writer.book
-        worksheet = writer.sheets['전체 뉴스 분석']
-        
-        # 헤더 스타일 설정
-        from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-        
-        header_font = Font(bold=True, color='FFFFFF')
-        header_fill = PatternFill(start_color='D04A02', end_color='D04A02', fill_type='solid')
-        header_alignment = Alignment(horizontal='center', vertical='center')
-        
-        # 헤더에 스타일 적용
-        for cell in worksheet[1]:
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = header_alignment
-        
-        # 열 너비 자동 조정
-        for column in worksheet.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            
-            # 최대/최소 너비 설정
-            adjusted_width = min(max(max_length + 2, 10), 50)
-            worksheet.column_dimensions[column_letter].width = adjusted_width
-        
-        # 상태별 색상 구분
-        status_colors = {
-            '최종 선택': 'C6EFCE',      # 연한 초록
-            '그룹 대표 선택': 'C6EFCE',   # 연한 초록
-            '제외': 'FFC7CE',           # 연한 빨강
-            '보류': 'FFEB9C',           # 연한 노랑
-            '유지': 'BDD7EE',           # 연한 파랑
-            '그룹 내 미선택': 'F2F2F2'    # 연한 회색
-        }
-        
-        # 데이터 행에 색상 적용
-        for row in range(2, len(df) + 2):
-            status = worksheet[f'F{row}'].value  # 분석 상태 열
-            if status in status_colors:
-                fill = PatternFill(start_color=status_colors[status], 
-                                 end_color=status_colors[status], 
-                                 fill_type='solid')
-                for col in range(1, len(df.columns) + 1):
-                    worksheet.cell(row=row, column=col).fill = fill
-        
-        # 요약 시트 추가
-        summary_data = [
-            ['분석 기간', f"{start_date} ~ {end_date}"],
-            ['키워드', keyword],
-            ['전체 뉴스 수', len(news_data)],
-            ['제외된 뉴스', len(excluded_news)],
-            ['보류된 뉴스', len(borderline_news)],
-            ['유지된 뉴스', len(retained_news)],
-            ['그룹 수', len(grouped_news)],
-            ['최종 선택된 뉴스', len(final_selection)]
-        ]
-        
-        summary_df = pd.DataFrame(summary_data, columns=['항목', '값'])
-        summary_df.to_excel(writer, sheet_name='분석 요약', index=False)
-        
-        # 요약 시트 스타일 적용
-        summary_ws = writer.sheets['분석 요약']
-        for cell in summary_ws[1]:
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = header_alignment
-        
-        # 요약 시트 열 너비 조정
-        summary_ws.column_dimensions['A'].width = 20
-        summary_ws.column_dimensions['B'].width = 30
-    
-    bio.seek(0)
-    return bio
+        rows.append(([
+            i,
+            news.get('content', '제목 없음'),
+            news.get('press', '알 수 없음'),
+            format_news_date(news.get('date', '')),
+            news.get('url', ''),
+            status_info['status'],
+            status_info['reason'],
+            status_info['group'],
+            status_info['final_reason']
+        ], status_info['status']))
+    
+    # 스트리밍 Excel 작성 (상태별 색상은 포맷으로 한 번만 정의)
+    headers = ['순번', '제목', '언론사', '날짜', 'URL', '분석 상태', '1차 분류 사유', '그룹핑 정보', '최종 선택 사유']
+    report = StreamingExcelReport()
+    sheet = report.add_sheet('전체 뉴스 분석', headers, fixed_widths=column_widths(headers, (values for values, _ in rows)))
+    for values, status in rows:
+        report.write_row(sheet, values, status=status)
+    
+    # 요약 시트 추가
+    write_summary_sheet(report, [
+        ['분석 기간', f"{start_date} ~ {end_date}"],
+        ['키워드', keyword],
+        ['전체 뉴스 수', len(news_data)],
+        ['제외된 뉴스', len(excluded_news)],
+        ['보류된 뉴스', len(borderline_news)],
+        ['유지된 뉴스', len(retained_news)],
+        ['그룹 수', len(grouped_news)],
+        ['최종 선택된 뉴스', len(final_selection)]
+    ], widths=(20, 30))
+    
+    return report.close()
 
 # 커스텀 CSS
 st.markdown("""
@@ -1051,26 +816,9 @@ prompt_preview_scope = st.sidebar.selectbox(
     help="어떤 분석 범위의 AI 프롬프트와 기준을 미리보기할지 선택하세요"
 )
 
-# 선택된 범위에 따른 프롬프트와 기준 가져오기
-if prompt_preview_scope == "기본":
-    preview_system_prompt_1 = SYSTEM_PROMPT_1
-    preview_system_prompt_2 = SYSTEM_PROMPT_2
-    preview_system_prompt_3 = SYSTEM_PROMPT_3
-    preview_exclusion_criteria = EXCLUSION_CRITERIA
-    preview_selection_criteria = SELECTION_CRITERIA
-else:
-    # 시스템 프롬프트
-    preview_prompts = get_scope_based_system_prompts([prompt_preview_scope])
-    preview_system_prompt_1 = preview_prompts[0]
-    preview_system_prompt_2 = preview_prompts[1] 
-    preview_system_prompt_3 = preview_prompts[2]
-    
-    # 분석 기준
-    dummy_keywords = ["키워드1", "키워드2"]
-    preview_exclusion_criteria = EXCLUSION_CRITERIA + "\n\n" + get_scope_based_criteria([prompt_preview_scope], "exclusion_criteria", dummy_keywords)
-    preview_selection_criteria = get_scope_based_criteria([prompt_preview_scope], "selection_criteria", dummy_keywords)
-    if not preview_selection_criteria:
-        preview_selection_criteria = SELECTION_CRITERIA
+# 선택된 범위에 따른 프롬프트와 기준 가져오기 (범위별 캐시)
+(preview_system_prompt_1, preview_system_prompt_2, preview_system_prompt_3), \
+    preview_exclusion_criteria, preview_selection_criteria = get_scope_preview(prompt_preview_scope)
 
 # 단계별 설정
 st.sidebar.markdown(f"#### 📋 1단계: 제외 판단 ({prompt_preview_scope})")
@@ -1203,695 +951,279 @@ analysis_prompt = f"""
 {duplicate_handling}
 """
 
-# 메인 컨텐츠
-if st.button("뉴스 분석 시작", type="primary"):
-    # 이메일 미리보기를 위한 전체 내용 저장
-    email_content = "[Client Intelligence]\n\n"
-    
-    # 모든 키워드 분석 결과를 저장할 딕셔너리
-    all_results = {}
-    
-    # 모든 키워드의 전체 분석 상태를 저장할 딕셔너리 (Excel 통합용)
-    all_analysis_states = {}
-    
-    for i, company in enumerate(final_selected_companies, 1):
-        with st.spinner(f"'{company}' 관련 뉴스를 수집하고 분석 중입니다..."):
-            # 해당 회사의 연관 키워드 확장 (세션 상태에서 가져옴)
-            company_keywords = st.session_state.company_keyword_map.get(company, [company])
-            
-            # 연관 키워드 표시
-            st.write(f"'{company}' 연관 키워드로 검색 중: {', '.join(company_keywords)}")
-            
-            # 범위별 특화 기준 적용
-            if 'analysis_scope' in locals():
-                # 범위별 특화 기준 적용 (실제 검색 키워드 포함)
-                scope_selection_criteria = get_scope_based_criteria(analysis_scope, "selection_criteria", company_keywords)
-                scope_exclusion_criteria = get_scope_based_criteria(analysis_scope, "exclusion_criteria", company_keywords)
-                
-                # 범위별 시스템 프롬프트 적용
-                scope_system_prompt_1, scope_system_prompt_2, scope_system_prompt_3 = get_scope_based_system_prompts(analysis_scope)
-                
-                # 범위별 기준이 있으면 사용, 없으면 기본 기준 사용
-                if scope_selection_criteria:
-                    enhanced_selection_criteria = scope_selection_criteria
-                else:
-                    enhanced_selection_criteria = selection_criteria
-                    
-                if scope_exclusion_criteria:
-                    enhanced_exclusion_criteria = exclusion_criteria + "\n\n" + scope_exclusion_criteria
-                else:
-                    enhanced_exclusion_criteria = exclusion_criteria
-                    
-                # 중복 처리는 기본 기준 사용
-                enhanced_duplicate_handling = duplicate_handling
-                
-                # 현재 선택된 분석 범위 확인
-                priority_order = ["본인회사", "경쟁사", "산업분야"]
-                selected_scope = None
-                for scope in priority_order:
-                    if scope in analysis_scope:
-                        selected_scope = scope
-                        break
-                
-                st.info(f"🎯 분석 범위별 특화 기준 적용: {', '.join(analysis_scope)}")
-                st.info(f"🔍 실제 검색 키워드: {', '.join(company_keywords)}")
-                if selected_scope:
-                    st.info(f"🤖 시스템 프롬프트 변경: {selected_scope} 분석 모드")
-                
-            else:
-                # analysis_scope가 없는 경우
-                scope_system_prompt_1, scope_system_prompt_2, scope_system_prompt_3 = SYSTEM_PROMPT_1, SYSTEM_PROMPT_2, SYSTEM_PROMPT_3
-                
-                base_exclusion = exclusion_criteria
-                base_duplicate = duplicate_handling
-                base_selection = selection_criteria
-                
-                # 해당 회사의 추가 특화 기준만 가져오기 (세션 상태에서)
-                # 세션 상태가 초기화되지 않은 경우를 위한 안전장치
-                if 'company_additional_exclusion_criteria' not in st.session_state:
-                    st.session_state.company_additional_exclusion_criteria = COMPANY_ADDITIONAL_EXCLUSION_CRITERIA.copy()
-                if 'company_additional_duplicate_handling' not in st.session_state:
-                    st.session_state.company_additional_duplicate_handling = COMPANY_ADDITIONAL_DUPLICATE_HANDLING.copy()
-                if 'company_additional_selection_criteria' not in st.session_state:
-                    st.session_state.company_additional_selection_criteria = COMPANY_ADDITIONAL_SELECTION_CRITERIA.copy()
-                    
-                company_additional_exclusion = st.session_state.company_additional_exclusion_criteria.get(company, "")
-                company_additional_duplicate = st.session_state.company_additional_duplicate_handling.get(company, "")
-                company_additional_selection = st.session_state.company_additional_selection_criteria.get(company, "")
-                
-                # 사용자 수정 기준 + 해당 회사 특화 기준 결합
-                enhanced_exclusion_criteria = base_exclusion + company_additional_exclusion
-                enhanced_duplicate_handling = base_duplicate + company_additional_duplicate  
-                enhanced_selection_criteria = base_selection + company_additional_selection
-            
-            # initial_state 설정 부분 직전에 valid_press_dict를 딕셔너리로 변환하는 코드 추가
-            # 텍스트 에어리어의 내용을 딕셔너리로 변환
-            valid_press_config = {}
-            try:
-                # 문자열에서 딕셔너리 파싱
-                lines = valid_press_dict.strip().split('\n')
-                for line in lines:
-                    line = line.strip()
-                    if line and ': ' in line:
-                        press_name, aliases_str = line.split(':', 1)
-                        try:
-                            # 문자열 형태의 리스트를 실제 리스트로 변환
-                            aliases = eval(aliases_str.strip())
-                            valid_press_config[press_name.strip()] = aliases
-                            print(f"[DEBUG] Valid press 파싱 성공: {press_name.strip()} -> {aliases}")
-                        except Exception as e:
-                            print(f"[DEBUG] Valid press 파싱 실패: {line}, 오류: {str(e)}")
-            except Exception as e:
-                print(f"[DEBUG] Valid press 전체 파싱 실패: {str(e)}")
-                # 오류 발생 시 빈 딕셔너리 사용
-                valid_press_config = {}
-            
-            print(f"[DEBUG] 파싱된 valid_press_dict: {valid_press_config}")
-            
+# 백그라운드 분석 실행기 (서버 프로세스당 1개, 재실행 간 공유)
+@st.cache_resource
+def get_job_runner():
+    return JobRunner(JOB_DB_PATH, max_workers=JOB_MAX_WORKERS)
 
-            
-            # 각 키워드별 상태 초기화
-            initial_state = {
-                "news_data": [], 
-                "filtered_news": [], 
-                "analysis": "", 
-                "keyword": company_keywords,  # 회사별 확장 키워드 리스트 전달
-                "model": selected_model,
-                "excluded_news": [],
-                "borderline_news": [],
-                "retained_news": [],
-                "grouped_news": [],
-                "final_selection": [],
-                # 회사별 enhanced 기준들 적용
-                "exclusion_criteria": enhanced_exclusion_criteria,
-                "duplicate_handling": enhanced_duplicate_handling,
-                "selection_criteria": enhanced_selection_criteria,
-                "system_prompt_1": scope_system_prompt_1,
-                "user_prompt_1": "",
-                "llm_response_1": "",
-                "system_prompt_2": scope_system_prompt_2,
-                "user_prompt_2": "",
-                "llm_response_2": "",
-                "system_prompt_3": scope_system_prompt_3,
-                "user_prompt_3": "",
-                "llm_response_3": "",
-                "not_selected_news": [],
-                "original_news_data": [],
-                # 언론사 설정 추가 (파싱된 딕셔너리 사용)
-                "valid_press_dict": valid_press_config,
-                # 날짜 필터 정보 추가
-                "start_datetime": datetime.combine(start_date, start_time, KST),
-                "end_datetime": datetime.combine(end_date, end_time, KST)
-                #"start_datetime": start_datetime,
-                #"end_datetime": end_datetime
-            }
-            
-            
-            print(f"[DEBUG] start_datetime: {datetime.combine(start_date, start_time)}")
-            print(f"[DEBUG] end_datetime: {datetime.combine(end_date, end_time)}")
-            
-            # 1단계: 뉴스 수집
-            st.write("1단계: 뉴스 수집 중...")
-            state_after_collection = collect_news(initial_state)
-            
-            # 2단계: 유효 언론사 필터링 (글로벌 뉴스를 위해 건너뜀)
-            st.write("2단계: 날짜 필터링 중...")
-            state_after_press_filter = state_after_collection  # 필터링 없이 그대로 전달
-            
-            # 3단계: 제외 판단
-            st.write("3단계: 제외 판단 중...")
-            state_after_exclusion = filter_excluded_news(state_after_press_filter)
-            
-            # 4단계: 그룹핑
-            st.write("4단계: 그룹핑 중...")
-            state_after_grouping = group_and_select_news(state_after_exclusion)
-            
-            # 5단계: 중요도 평가
-            st.write("5단계: 중요도 평가 중...")
-            final_state = evaluate_importance(state_after_grouping)
-            
-            # 6단계: 기사 원문 요약 (옵션)
-            if enable_article_summary and final_state.get("final_selection"):
-                st.write("6단계: 선정된 기사 원문 요약 중...")
-                final_state = summarize_selected_articles(final_state)
 
-            # 선정된 뉴스가 없는 경우 메시지 표시
-            if len(final_state["final_selection"]) == 0:
-                st.info("선정 기준에 부합하는 뉴스가 없습니다.")
+@st.cache_data(show_spinner=False)
+def parse_valid_press_config(valid_press_text):
+    """유효 언론사 설정 텍스트를 {언론사: [별칭, ...]} 딕셔너리로 변환 (eval 없이 리터럴만 파싱)"""
+    valid_press_config = parse_press_config(valid_press_text)
+    print(f"[DEBUG] 파싱된 valid_press_dict: {valid_press_config}")
+    return valid_press_config
 
-            # 키워드별 분석 결과 저장
-            all_results[company] = final_state["final_selection"]
-            
-            # 전체 분석 상태 저장 (Excel 통합용)
-            all_analysis_states[company] = final_state
-            
-            # 키워드 구분선 추가
-            st.markdown("---")
-            
-            # 키워드별 섹션 구분
-            st.markdown(f"## 📊 {company} 분석 결과")
-            
 
-            
-            # 전체 뉴스 표시 (필터링 전)
-            with st.expander(f"📰 '{company}' 관련 전체 뉴스 (필터링 전)"):
-                for i, news in enumerate(final_state.get("original_news_data", []), 1):
-                    date_str = news.get('date', '날짜 정보 없음')
-                    url = news.get('url', 'URL 정보 없음')
-                    press = news.get('press', '알 수 없음')
-                    st.markdown(f"""
-                    <div class="news-card">
-                        <div class="news-title">{i}. {news['content']}</div>
-                        <div class="news-meta">📰 {press}</div>
-                        <div class="news-date">📅 {date_str}</div>
-                        <div class="news-url">🔗 <a href="{url}" target="_blank">{url}</a></div>
-                    </div>
-                    """, unsafe_allow_html=True)
-            
-            # 유효 언론사 필터링된 뉴스 표시
-            with st.expander(f"📰 '{company}' 관련 유효 언론사 뉴스"):
-                for i, news in enumerate(final_state["news_data"]):
-                    date_str = news.get('date', '날짜 정보 없음')
-                    url = news.get('url', 'URL 정보 없음')
-                    press = news.get('press', '알 수 없음')
-                    st.markdown(f"""
-                    <div class="news-card">
-                        <div class="news-title">{i+1}. {news['content']}</div>
-                        <div class="news-meta">📰 {press}</div>
-                        <div class="news-date">📅 {date_str}</div>
-                        <div class="news-url">🔗 <a href="{url}" target="_blank">{url}</a></div>
-                    </div>
-                    """, unsafe_allow_html=True)
-            
-            # 2단계: 유효 언론사 필터링 결과 표시
-            st.markdown("<div class='subtitle'>🔍 2단계: 유효 언론사 필터링 결과</div>", unsafe_allow_html=True)
-            st.markdown(f"유효 언론사 뉴스: {len(final_state['news_data'])}개")
-            
-            # 3단계: 제외/보류/유지 뉴스 표시
-            st.markdown("<div class='subtitle'>🔍 3단계: 뉴스 분류 결과</div>", unsafe_allow_html=True)
-            
-            # 제외된 뉴스
-            with st.expander("❌ 제외된 뉴스"):
-                for news in final_state["excluded_news"]:
-                    st.markdown(f"<div class='excluded-news'>[{news['index']}] {news['title']}<br/>└ {news['reason']}</div>", unsafe_allow_html=True)
-            
-            # 보류 뉴스
-            with st.expander("⚠️ 보류 뉴스"):
-                for news in final_state["borderline_news"]:
-                    st.markdown(f"<div class='excluded-news'>[{news['index']}] {news['title']}<br/>└ {news['reason']}</div>", unsafe_allow_html=True)
-            
-            # 유지 뉴스
-            with st.expander("✅ 유지 뉴스"):
-                for news in final_state["retained_news"]:
-                    st.markdown(f"<div class='excluded-news'>[{news['index']}] {news['title']}<br/>└ {news['reason']}</div>", unsafe_allow_html=True)
-            
-            # 4단계: 그룹핑 결과 표시
-            st.markdown("<div class='subtitle'>🔍 4단계: 뉴스 그룹핑 결과</div>", unsafe_allow_html=True)
-            
-            with st.expander("📋 그룹핑 결과 보기"):
-                for group in final_state["grouped_news"]:
-                    st.markdown(f"""
-                    <div class="analysis-section">
-                        <h4>그룹 {group['indices']}</h4>
-                        <p>선택된 기사: {group['selected_index']}</p>
-                        <p>선정 이유: {group['reason']}</p>
-                    </div>
-                    """, unsafe_allow_html=True)
-            
-            # 5단계: 최종 선택 결과 표시
-            st.markdown("<div class='subtitle'>🔍 5단계: 최종 선택 결과</div>", unsafe_allow_html=True)
-            
-            # 최종 선정된 뉴스가 있는 경우에만 표시
-            if final_state["final_selection"]:
-                st.markdown("### 📰 최종 선정된 뉴스")  
-                news_style = ""
-                reason_prefix = "선별 이유: "
-            
-            # 최종 선정된 뉴스 표시
-            for news in final_state["final_selection"]:
-                # 날짜 형식 변환
-                
-                date_str = format_date(news.get('date', ''))
-                
-                try:
-                    # YYYY-MM-DD 형식으로 가정
-                    date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-                    formatted_date = date_obj.strftime('%m/%d')
-                except Exception as e:
-                    try:
-                        # GMT 형식 시도
-                        date_obj = datetime.strptime(date_str, '%a, %d %b %Y %H:%M:%S %Z')
-                        formatted_date = date_obj.strftime('%m/%d')
-                    except Exception as e:
-                        formatted_date = date_str if date_str else '날짜 정보 없음'
-
-                url = news.get('url', 'URL 정보 없음')
-                press = news.get('press', '언론사 정보 없음')
-                
-                # AI 요약 텍스트 준비 (HTML 태그 완전 제거)
-                clean_summary = None
-                if news.get('ai_summary'):
-                    clean_summary = _clean_html_for_display(news['ai_summary'])
-                
-                # 뉴스 정보 표시
-                st.markdown(f"""
-                    <div class="selected-news" style="{news_style}">
-                        <div class="news-title-large">{news['title']} ({formatted_date})</div>
-                        <div class="news-url">🔗 <a href="{url}" target="_blank">{url}</a></div>
-                        <div class="selection-reason">
-                            • {reason_prefix}{news['reason']}
-                        </div>
-                        <div class="news-summary">
-                            • 키워드: {', '.join(news['keywords'])} | 관련 계열사: {', '.join(news['affiliates'])} | 언론사: {press}
-                        </div>
-                        {_format_ai_summary_for_box(clean_summary, news.get('extraction_success', False))}
-                """, unsafe_allow_html=True)
-                
-                # 구분선 추가
-                st.markdown("---")
-            
-            # 선정되지 않은 뉴스 표시
-            if final_state.get("not_selected_news"):
-                with st.expander("❌ 선정되지 않은 뉴스"):
-                    for news in final_state["not_selected_news"]:
-                        st.markdown(f"""
-                        <div class="not-selected-news">
-                            <div class="news-title">{news['index']}. {news['title']}</div>
-                            <div class="importance-low">💡 중요도: {news['importance']}</div>
-                            <div class="not-selected-reason">❌ 미선정 사유: {news['reason']}</div>
-                        </div>
-                        """, unsafe_allow_html=True)
-            
-            # 디버그 정보
-            with st.expander("디버그 정보"):
-                st.markdown("### 1단계: 제외 판단")
-                st.markdown("#### 시스템 프롬프트")
-                st.text(final_state.get("system_prompt_1", "없음"))
-                st.markdown("#### 사용자 프롬프트")
-                st.text(final_state.get("user_prompt_1", "없음"))
-                st.markdown("#### LLM 응답")
-                st.text(final_state.get("llm_response_1", "없음"))
-                
-                st.markdown("### 2단계: 그룹핑")
-                st.markdown("#### 시스템 프롬프트")
-                st.text(final_state.get("system_prompt_2", "없음"))
-                st.markdown("#### 사용자 프롬프트")
-                st.text(final_state.get("user_prompt_2", "없음"))
-                st.markdown("#### LLM 응답")
-                st.text(final_state.get("llm_response_2", "없음"))
-                
-                st.markdown("### 3단계: 중요도 평가")
-                st.markdown("#### 시스템 프롬프트")
-                st.text(final_state.get("system_prompt_3", "없음"))
-                st.markdown("#### 사용자 프롬프트")
-                st.text(final_state.get("user_prompt_3", "없음"))
-                st.markdown("#### LLM 응답")
-                st.text(final_state.get("llm_response_3", "없음"))
-                
+def build_company_state(company, valid_press_config):
+    """키워드 1개의 분석 초기 상태 생성 (사이드바 설정 + 범위별 특화 기준)"""
+    # 해당 회사의 연관 키워드 확장 (세션 상태에서 가져옴)
+    company_keywords = st.session_state.company_keyword_map.get(company, [company])
+    
+    # 범위별 특화 기준 적용
+    if 'analysis_scope' in globals():
+        # 범위별 특화 기준/시스템 프롬프트 적용 (실제 검색 키워드 포함, 범위+키워드별 캐시)
+        scope_selection_criteria, scope_exclusion_criteria, (scope_system_prompt_1, scope_system_prompt_2, scope_system_prompt_3) = \
+            get_scope_company_criteria(tuple(analysis_scope), tuple(company_keywords))
+        
+        # 범위별 기준이 있으면 사용, 없으면 기본 기준 사용
+        if scope_selection_criteria:
+            enhanced_selection_criteria = scope_selection_criteria
+        else:
+            enhanced_selection_criteria = selection_criteria
+            
+        if scope_exclusion_criteria:
+            enhanced_exclusion_criteria = exclusion_criteria + "\n\n" + scope_exclusion_criteria
+        else:
+            enhanced_exclusion_criteria = exclusion_criteria
+            
+        # 중복 처리는 기본 기준 사용
+        enhanced_duplicate_handling = duplicate_handling
+        
+    else:
+        # analysis_scope가 없는 경우
+        scope_system_prompt_1, scope_system_prompt_2, scope_system_prompt_3 = SYSTEM_PROMPT_1, SYSTEM_PROMPT_2, SYSTEM_PROMPT_3
+        
+        base_exclusion = exclusion_criteria
+        base_duplicate = duplicate_handling
+        base_selection = selection_criteria
+        
+        # 해당 회사의 추가 특화 기준만 가져오기 (설정 값은 수정되지 않으므로 세션 상태에 복사하지 않고 직접 참조)
+        company_additional_exclusion = COMPANY_ADDITIONAL_EXCLUSION_CRITERIA.get(company, "")
+        company_additional_duplicate = COMPANY_ADDITIONAL_DUPLICATE_HANDLING.get(company, "")
+        company_additional_selection = COMPANY_ADDITIONAL_SELECTION_CRITERIA.get(company, "")
+        
+        # 사용자 수정 기준 + 해당 회사 특화 기준 결합
+        enhanced_exclusion_criteria = base_exclusion + company_additional_exclusion
+        enhanced_duplicate_handling = base_duplicate + company_additional_duplicate  
+        enhanced_selection_criteria = base_selection + company_additional_selection
+    
+    # 각 키워드별 상태 초기화
+    return build_initial_state(
+        company_keywords,
+        model=selected_model,
+        # 회사별 enhanced 기준들 적용
+        exclusion_criteria=enhanced_exclusion_criteria,
+        duplicate_handling=enhanced_duplicate_handling,
+        selection_criteria=enhanced_selection_criteria,
+        system_prompts=(scope_system_prompt_1, scope_system_prompt_2, scope_system_prompt_3),
+        # 언론사 설정 추가 (파싱된 딕셔너리 사용)
+        valid_press_dict=valid_press_config,
+        # 날짜 필터 정보 추가
+        start_datetime=datetime.combine(start_date, start_time, KST),
+        end_datetime=datetime.combine(end_date, end_time, KST)
+    )
 
-            
-            # 이메일 내용 추가
-            email_content += f"{i}. {company}\n"
-            for news in final_state["final_selection"]:
-                # 날짜 형식 변환
-                date_str = news.get('date', '')
-                try:
-                    date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-                    formatted_date = date_obj.strftime('%m/%d')
-                except Exception as e:
-                    try:
-                        date_obj = datetime.strptime(date_str, '%a, %d %b %Y %H:%M:%S %Z')
-                        formatted_date = date_obj.strftime('%m/%d')
-                    except Exception as e:
-                        formatted_date = date_str if date_str else '날짜 정보 없음'
-                
-                url = news.get('url', '')
-                email_content += f"  - {news['title']} ({formatted_date}) {url}\n"
-            email_content += "\n"
-            
-            # 키워드 구분선 추가
-            st.markdown("---")
 
-    # 모든 키워드 분석이 끝난 후 통합 Excel 다운로드
-    st.markdown("---")
-    st.markdown("### 📊 전체 분석 결과 Excel 다운로드")
+def render_company_result(company, final_state):
+    """키워드 1개의 분석 결과(단계별 중간 결과, 최종 선정 뉴스, 디버그 정보) 표시"""
+    # 키워드별 섹션 구분
+    st.markdown(f"## 📊 {company} 분석 결과")
+    st.info(f"🔍 실제 검색 키워드: {', '.join(final_state.get('keyword', [company]))}")
+
+    # 선정된 뉴스가 없는 경우 메시지 표시
+    if len(final_state["final_selection"]) == 0:
+        st.info("선정 기준에 부합하는 뉴스가 없습니다.")
+
+    # 전체 뉴스 표시 (필터링 전)
+    with st.expander(f"📰 '{company}' 관련 전체 뉴스 (필터링 전)"):
+        for i, news in enumerate(final_state.get("original_news_data", []), 1):
+            date_str = news.get('date', '날짜 정보 없음')
+            url = news.get('url', 'URL 정보 없음')
+            press = news.get('press', '알 수 없음')
+            st.markdown(f"""
+            <div class="news-card">
+                <div class="news-title">{i}. {news['content']}</div>
+                <div class="news-meta">📰 {press}</div>
+                <div class="news-date">📅 {date_str}</div>
+                <div class="news-url">🔗 <a href="{url}" target="_blank">{url}</a></div>
+            </div>
+            """, unsafe_allow_html=True)
+    
+    # 유효 언론사 필터링된 뉴스 표시
+    with st.expander(f"📰 '{company}' 관련 유효 언론사 뉴스"):
+        for i, news in enumerate(final_state["news_data"]):
+            date_str = news.get('date', '날짜 정보 없음')
+            url = news.get('url', 'URL 정보 없음')
+            press = news.get('press', '알 수 없음')
+            st.markdown(f"""
+            <div class="news-card">
+                <div class="news-title">{i+1}. {news['content']}</div>
+                <div class="news-meta">📰 {press}</div>
+                <div class="news-date">📅 {date_str}</div>
+                <div class="news-url">🔗 <a href="{url}" target="_blank">{url}</a></div>
+            </div>
+            """, unsafe_allow_html=True)
+    
+    # 2단계: 유효 언론사 필터링 결과 표시
+    st.markdown("<div class='subtitle'>🔍 2단계: 유효 언론사 필터링 결과</div>", unsafe_allow_html=True)
+    st.markdown(f"유효 언론사 뉴스: {len(final_state['news_data'])}개")
+    
+    # 3단계: 제외/보류/유지 뉴스 표시
+    st.markdown("<div class='subtitle'>🔍 3단계: 뉴스 분류 결과</div>", unsafe_allow_html=True)
+    
+    # 제외된 뉴스
+    with st.expander("❌ 제외된 뉴스"):
+        for news in final_state["excluded_news"]:
+            st.markdown(f"<div class='excluded-news'>[{news['index']}] {news['title']}<br/>└ {news['reason']}</div>", unsafe_allow_html=True)
+    
+    # 보류 뉴스
+    with st.expander("⚠️ 보류 뉴스"):
+        for news in final_state["borderline_news"]:
+            st.markdown(f"<div class='excluded-news'>[{news['index']}] {news['title']}<br/>└ {news['reason']}</div>", unsafe_allow_html=True)
+    
+    # 유지 뉴스
+    with st.expander("✅ 유지 뉴스"):
+        for news in final_state["retained_news"]:
+            st.markdown(f"<div class='excluded-news'>[{news['index']}] {news['title']}<br/>└ {news['reason']}</div>", unsafe_allow_html=True)
+    
+    # 4단계: 그룹핑 결과 표시
+    st.markdown("<div class='subtitle'>🔍 4단계: 뉴스 그룹핑 결과</div>", unsafe_allow_html=True)
+    
+    with st.expander("📋 그룹핑 결과 보기"):
+        for group in final_state["grouped_news"]:
+            st.markdown(f"""
+            <div class="analysis-section">
+                <h4>그룹 {group['indices']}</h4>
+                <p>선택된 기사: {group['selected_index']}</p>
+                <p>선정 이유: {group['reason']}</p>
+            </div>
+            """, unsafe_allow_html=True)
+    
+    # 5단계: 최종 선택 결과 표시
+    st.markdown("<div class='subtitle'>🔍 5단계: 최종 선택 결과</div>", unsafe_allow_html=True)
     
-    # 통합 Excel 생성 함수
-    def create_integrated_excel_report(all_results_data, start_date, end_date):
-        """모든 키워드의 분석 결과를 하나의 시트에 통합한 Excel 파일 생성"""
-        bio = io.BytesIO()
+    # 최종 선정된 뉴스가 있는 경우에만 표시
+    if final_state["final_selection"]:
+        st.markdown("### 📰 최종 선정된 뉴스")  
+        news_style = ""
+        reason_prefix = "선별 이유: "
+    
+    # 최종 선정된 뉴스 표시
+    for news in final_state["final_selection"]:
+        # 날짜 형식 변환
         
-        # 모든 키워드의 데이터를 통합할 리스트
-        integrated_data = []
+        date_str = format_date(news.get('date', ''))
         
-        # 각 키워드별 데이터 처리
-        for company, final_state in all_results_data.items():
-            if not final_state:  # final_state가 비어있으면 건너뛰기
-                continue
-                
-            # 해당 키워드의 데이터 처리
-            news_data = final_state.get("news_data", [])
-            excluded_news = final_state.get("excluded_news", [])
-            borderline_news = final_state.get("borderline_news", [])
-            retained_news = final_state.get("retained_news", [])
-            grouped_news = final_state.get("grouped_news", [])
-            final_selection = final_state.get("final_selection", [])
-            not_selected_news = final_state.get("not_selected_news", [])
-            
-            # 뉴스 상태 추적
-            news_status = {}
-            
-            # 제외된 뉴스 처리
-            for news in excluded_news:
-                news_status[news.get('index', -1)] = {
-                    'status': '제외',
-                    'reason': news.get('reason', ''),
-                    'group': '',
-                    'final_reason': ''
-                }
-            
-            # 보류 뉴스 처리
-            for news in borderline_news:
-                news_status[news.get('index', -1)] = {
-                    'status': '보류',
-                    'reason': news.get('reason', ''),
-                    'group': '',
-                    'final_reason': ''
-                }
-            
-            # 유지 뉴스 처리
-            for news in retained_news:
-                news_status[news.get('index', -1)] = {
-                    'status': '유지',
-                    'reason': news.get('reason', ''),
-                    'group': '',
-                    'final_reason': ''
-                }
-            
-            # 그룹핑 정보 처리
-            for group in grouped_news:
-                group_indices = group.get('indices', [])
-                selected_index = group.get('selected_index', -1)
-                group_info = f"그룹 {group_indices} (선택: {selected_index})"
-                
-                for idx in group_indices:
-                    if idx in news_status:
-                        news_status[idx]['group'] = group_info
-                        if idx == selected_index:
-                            news_status[idx]['status'] = '그룹 대표 선택'
-                        else:
-                            news_status[idx]['status'] = '그룹 내 미선택'
-            
-            # 최종 선택된 뉴스 처리
-            for news in final_selection:
-                original_index = -1
-                for i, original_news in enumerate(news_data, 1):
-                    if original_news.get('url') == news.get('url') or original_news.get('content') == news.get('title'):
-                        original_index = i
-                        break
-                
-                if original_index in news_status:
-                    news_status[original_index]['status'] = '최종 선택'
-                    news_status[original_index]['final_reason'] = news.get('reason', '')
-            
-            # 최종 선택되지 않은 뉴스 처리
-            for news in not_selected_news:
-                news_index = news.get('index', -1)
-                if news_index in news_status:
-                    news_status[news_index]['final_reason'] = f"미선택 사유: {news.get('reason', '')}"
-            
-            # 해당 키워드의 모든 뉴스 데이터를 통합 리스트에 추가
-            for i, news in enumerate(news_data, 1):
-                status_info = news_status.get(i, {
-                    'status': '상태 불명',
-                    'reason': '',
-                    'group': '',
-                    'final_reason': ''
-                })
-                
-                # 날짜 형식 변환
-                date_str = news.get('date', '')
-                try:
-                    if 'GMT' in date_str:
-                        date_obj = datetime.strptime(date_str, '%a, %d %b %Y %H:%M:%S %Z')
-                        formatted_date = date_obj.strftime('%Y-%m-%d %H:%M')
-                    else:
-                        date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-                        formatted_date = date_str
-                except:
-                    formatted_date = date_str if date_str else '날짜 정보 없음'
-                
-                # AI 요약 정보 파싱 (최종 선택된 뉴스인 경우에만)
-                ai_title_korean = ""
-                ai_summary_oneline = ""
-                ai_details = ""
-                extraction_success = False
-                
-                if status_info['status'] == '최종 선택':
-                    # final_selection에서 해당 뉴스 찾기
-                    for selected_news in final_selection:
-                        if (selected_news.get('url') == news.get('url') or 
-                            selected_news.get('title') == news.get('content')):
-                            
-                            ai_summary = selected_news.get('ai_summary', '')
-                            extraction_success = selected_news.get('extraction_success', False)
-                            
-                            if ai_summary and extraction_success:
-                                try:
-                                    import json
-                                    import re
-                                    
-                                    # HTML 태그가 포함된 경우 텍스트만 추출
-                                    if ai_summary.strip().startswith('<div'):
-                                        # HTML에서 텍스트만 추출
-                                        import re
-                                        # HTML 태그 제거
-                                        clean_text = re.sub(r'<[^>]+>', '', ai_summary)
-                                        # HTML 엔티티 변환
-                                        clean_text = clean_text.replace('&amp;', '&').replace('&lt;', '<').replace('&gt;', '>')
-                                        clean_text = clean_text.replace('&quot;', '"').replace('&#39;', "'").replace('&nbsp;', ' ')
-                                        # 연속된 공백과 줄바꿈 정리
-                                        clean_text = re.sub(r'\s+', ' ', clean_text).strip()
-                                        
-                                        # 간단한 파싱으로 제목, 요약, 세부사항 추출
-                                        lines = [line.strip() for line in clean_text.split('\n') if line.strip()]
-                                        if len(lines) >= 2:
-                                            ai_title_korean = lines[0]
-                                            ai_summary_oneline = lines[1]
-                                            ai_details = " | ".join(lines[2:]) if len(lines) > 2 else ""
-                                        else:
-                                            ai_summary_oneline = clean_text[:200] + "..." if len(clean_text) > 200 else clean_text
-                                    else:
-                                        # JSON 형식 파싱
-                                        json_text = ai_summary.strip()
-                                        if json_text.startswith("```json"):
-                                            json_text = json_text[7:]
-                                        if json_text.startswith("```"):
-                                            json_text = "\n".join(json_text.split("\n")[1:])
-                                        if json_text.endswith("```"):
-                                            json_text = "\n".join(json_text.split("\n")[:-1])
-                                        
-                                        json_text = json_text.strip()
-                                        
-                                        # JSON 정리 - 불필요한 공백과 줄바꿈 제거
-                                        json_text = re.sub(r'\s+', ' ', json_text)  # 연속된 공백을 하나로
-                                        json_text = re.sub(r'"\s*,\s*"', '", "', json_text)  # 쉼표 주변 정리
-                                        json_text = re.sub(r'{\s+', '{', json_text)  # 중괄호 뒤 공백 제거
-                                        json_text = re.sub(r'\s+}', '}', json_text)  # 중괄호 앞 공백 제거
-                                        json_text = re.sub(r'\[\s+', '[', json_text)  # 대괄호 뒤 공백 제거
-                                        json_text = re.sub(r'\s+\]', ']', json_text)  # 대괄호 앞 공백 제거
-                                        
-                                        # JSON 파싱 시도
-                                        try:
-                                            summary_data = json.loads(json_text)
-                                        except json.JSONDecodeError as e:
-                                            print(f"Excel JSON 파싱 시도 실패: {e}")
-                                            # JSON 복구 시도
-                                            json_text = json_text.replace('\\"', '"')  # 이중 이스케이프 수정
-                                            json_text = re.sub(r'(?<!\\)"(?![,\]\}:\s])', '\\"', json_text)  # 문자열 내부 따옴표 이스케이프
-                                            summary_data = json.loads(json_text)
-                                        
-                                        ai_title_korean = summary_data.get('title', '')
-                                        ai_summary_oneline = summary_data.get('summary', '')
-                                        details = summary_data.get('details', [])
-                                        
-                                        # 세부 내용을 문자열로 결합
-                                        if details:
-                                            ai_details = " | ".join(details)
-                                    
-                                except Exception as e:
-                                    print(f"AI 요약 파싱 실패: {e}")
-                                    # JSON 파싱 실패 시 원본 텍스트 사용 (HTML 태그 제거)
-                                    import re
-                                    clean_text = re.sub(r'<[^>]+>', '', ai_summary)
-                                    ai_summary_oneline = clean_text[:200] + "..." if len(clean_text) > 200 else clean_text
-                            elif ai_summary:
-                                # 추출 실패했지만 오류 메시지가 있는 경우
-                                import re
-                                clean_text = re.sub(r'<[^>]+>', '', ai_summary)
-                                ai_summary_oneline = clean_text
-                            break
-                
-                integrated_data.append({
-                    '키워드': company,  # 맨 앞 컬럼에 키워드 추가
-                    '순번': i,
-                    '제목': news.get('content', '제목 없음'),
-                    '언론사': news.get('press', '알 수 없음'),
-                    '날짜': formatted_date,
-                    'URL': news.get('url', ''),
-                    '분석 상태': status_info['status'],
-                    '1차 분류 사유': status_info['reason'],
-                    '그룹핑 정보': status_info['group'],
-                    '최종 선택 사유': status_info['final_reason'],
-                    'AI 번역 제목': ai_title_korean,
-                    'AI 핵심 요약': ai_summary_oneline,
-                    'AI 세부 내용': ai_details,
-                    '원문 추출 성공': '성공' if extraction_success else '실패' if status_info['status'] == '최종 선택' else ''
-                })
+        try:
+            # YYYY-MM-DD 형식으로 가정
+            date_obj = datetime.strptime(date_str, '%Y-%m-%d')
+            formatted_date = date_obj.strftime('%m/%d')
+        except Exception as e:
+            try:
+                # GMT 형식 시도
+                date_obj = datetime.strptime(date_str, '%a, %d %b %Y %H:%M:%S %Z')
+                formatted_date = date_obj.strftime('%m/%d')
+            except Exception as e:
+                formatted_date = date_str if date_str else '날짜 정보 없음'
+
+        url = news.get('url', 'URL 정보 없음')
+        press = news.get('press', '언론사 정보 없음')
         
-        # DataFrame 생성
-        df = pd.DataFrame(integrated_data)
+        # AI 요약 (구조화된 필드를 직접 사용)
+        summary = get_article_summary(news) if news.get('ai_summary') else None
         
-        with pd.ExcelWriter(bio, engine='openpyxl') as writer:
-            # 통합 데이터를 하나의 시트에 저장
-            df.to_excel(writer, sheet_name='전체 뉴스 분석', index=False)
-            
-            # 스타일 적용
-            worksheet = writer.sheets['전체 뉴스 분석']
-            from openpyxl.styles import Font, PatternFill, Alignment
-            
-            header_font = Font(bold=True, color='FFFFFF')
-            header_fill = PatternFill(start_color='D04A02', end_color='D04A02', fill_type='solid')
-            header_alignment = Alignment(horizontal='center', vertical='center')
-            
-            # 헤더에 스타일 적용
-            for cell in worksheet[1]:
-                cell.font = header_font
-                cell.fill = header_fill
-                cell.alignment = header_alignment
-            
-            # 열 너비 자동 조정
-            for column in worksheet.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                
-                adjusted_width = min(max(max_length + 2, 10), 50)
-                worksheet.column_dimensions[column_letter].width = adjusted_width
-            
-            # 상태별 색상 구분
-            status_colors = {
-                '최종 선택': 'C6EFCE',
-                '그룹 대표 선택': 'C6EFCE',
-                '제외': 'FFC7CE',
-                '보류': 'FFEB9C',
-                '유지': 'BDD7EE',
-                '그룹 내 미선택': 'F2F2F2'
-            }
-            
-            # 데이터 행에 색상 적용 (분석 상태 컬럼 찾기)
-            status_col_index = None
-            for col_idx, col_name in enumerate(df.columns, 1):
-                if col_name == '분석 상태':
-                    status_col_index = col_idx
-                    break
-            
-            if status_col_index:
-                status_col_letter = chr(64 + status_col_index)  # A=65, B=66, ...
-                for row in range(2, len(df) + 2):
-                    status = worksheet[f'{status_col_letter}{row}'].value
-                    if status in status_colors:
-                        fill = PatternFill(start_color=status_colors[status], 
-                                         end_color=status_colors[status], 
-                                         fill_type='solid')
-                        for col in range(1, len(df.columns) + 1):
-                            worksheet.cell(row=row, column=col).fill = fill
-            
-            # 요약 시트 추가
-            summary_data = []
-            summary_data.append(['분석 기간', f"{start_date} ~ {end_date}"])
-            summary_data.append(['분석 키워드 수', len(all_results_data)])
-            summary_data.append(['전체 뉴스 수', len(integrated_data)])
-            summary_data.append(['', ''])  # 빈 행
-            
-            # 키워드별 통계
-            for company, final_state in all_results_data.items():
-                if final_state:
-                    news_count = len(final_state.get("news_data", []))
-                    selected_count = len(final_state.get("final_selection", []))
-                    summary_data.append([f"{company} - 전체 뉴스", news_count])
-                    summary_data.append([f"{company} - 최종 선택", selected_count])
-            
-            summary_df = pd.DataFrame(summary_data, columns=['항목', '값'])
-            summary_df.to_excel(writer, sheet_name='분석 요약', index=False)
-            
-            # 요약 시트 스타일 적용
-            summary_ws = writer.sheets['분석 요약']
-            for cell in summary_ws[1]:
-                cell.font = Font(bold=True, color='FFFFFF')
-                cell.fill = PatternFill(start_color='D04A02', end_color='D04A02', fill_type='solid')
-                cell.alignment = Alignment(horizontal='center', vertical='center')
-            
-            summary_ws.column_dimensions['A'].width = 25
-            summary_ws.column_dimensions['B'].width = 15
+        # 뉴스 정보 표시
+        st.markdown(f"""
+            <div class="selected-news" style="{news_style}">
+                <div class="news-title-large">{news['title']} ({formatted_date})</div>
+                <div class="news-url">🔗 <a href="{url}" target="_blank">{url}</a></div>
+                <div class="selection-reason">
+                    • {reason_prefix}{news['reason']}
+                </div>
+                <div class="news-summary">
+                    • 키워드: {', '.join(news['keywords'])} | 관련 계열사: {', '.join(news['affiliates'])} | 언론사: {press}
+                </div>
+                {_format_ai_summary_for_box(summary, news.get('extraction_success', False))}
+        """, unsafe_allow_html=True)
+        
+        # 구분선 추가
+        st.markdown("---")
+    
+    # 선정되지 않은 뉴스 표시
+    if final_state.get("not_selected_news"):
+        with st.expander("❌ 선정되지 않은 뉴스"):
+            for news in final_state["not_selected_news"]:
+                st.markdown(f"""
+                <div class="not-selected-news">
+                    <div class="news-title">{news['index']}. {news['title']}</div>
+                    <div class="importance-low">💡 중요도: {news['importance']}</div>
+                    <div class="not-selected-reason">❌ 미선정 사유: {news['reason']}</div>
+                </div>
+                """, unsafe_allow_html=True)
+    
+    # 디버그 정보
+    with st.expander("디버그 정보"):
+        st.markdown("### 1단계: 제외 판단")
+        st.markdown("#### 시스템 프롬프트")
+        st.text(final_state.get("system_prompt_1", "없음"))
+        st.markdown("#### 사용자 프롬프트")
+        st.text(final_state.get("user_prompt_1", "없음"))
+        st.markdown("#### LLM 응답")
+        st.text(final_state.get("llm_response_1", "없음"))
         
-        bio.seek(0)
-        return bio
+        st.markdown("### 2단계: 그룹핑")
+        st.markdown("#### 시스템 프롬프트")
+        st.text(final_state.get("system_prompt_2", "없음"))
+        st.markdown("#### 사용자 프롬프트")
+        st.text(final_state.get("user_prompt_2", "없음"))
+        st.markdown("#### LLM 응답")
+        st.text(final_state.get("llm_response_2", "없음"))
+        
+        st.markdown("### 3단계: 중요도 평가")
+        st.markdown("#### 시스템 프롬프트")
+        st.text(final_state.get("system_prompt_3", "없음"))
+        st.markdown("#### 사용자 프롬프트")
+        st.text(final_state.get("user_prompt_3", "없음"))
+        st.markdown("#### LLM 응답")
+        st.text(final_state.get("llm_response_3", "없음"))
+
+
+def render_analysis_reports(job_id, news_report, job_cache_stats, job_region_stats, job_model_stats,
+                            start_date_str, end_date_str, enable_article_summary):
+    """전체 키워드 분석이 끝난 뒤 캐시 사용량, 지역별 RSS 상태, 모델별 비용/지연, 통합 Excel/Word, HTML 이메일 표시"""
+    # 단계별 프롬프트 캐시 적중 현황 (전체 키워드 누적)
+    cache_report = job_cache_stats.report_lines()
+    if cache_report:
+        with st.expander("⚡ 단계별 프롬프트 캐시 사용량"):
+            for line in cache_report:
+                st.write(f"- {line}")
+    
+    # 지역별 RSS 상태 (느리거나 막혀 차단된 지역 확인용, 첫 줄은 제목이므로 제외)
+    region_report = job_region_stats.report_lines()[1:]
+    if region_report:
+        with st.expander("🌐 지역별 뉴스 검색 상태"):
+            for line in region_report:
+                st.write(f"- {line}")
+
+    # 단계×모델별 호출 수, 추정 비용, LLM 대기 시간 (캐스케이드 재판단 비율 포함)
+    model_report = job_model_stats.report_lines()
+    if model_report:
+        with st.expander("💰 단계별 모델 비용/지연"):
+            for line in model_report:
+                st.write(f"- {line}")
+
+    # 모든 키워드 분석이 끝난 후 통합 Excel 다운로드
+    st.markdown("---")
+    st.markdown("### 📊 전체 분석 결과 Excel 다운로드")
     
     # 통합 Excel 다운로드 버튼
-    if any(all_results.values()):  # 분석 결과가 있는 경우에만 표시
+    if news_report.final_news:  # 분석 결과가 있는 경우에만 표시
         try:
-            # 통합 Excel 파일 생성
-            integrated_excel = create_integrated_excel_report(
-                all_results_data=all_analysis_states,
-                start_date=start_date.strftime('%Y-%m-%d'),
-                end_date=end_date.strftime('%Y-%m-%d')
+            # 통합 Excel 파일 생성 (누적된 보고서 모델 사용)
+            integrated_excel = news_report.to_excel(
+                start_date=start_date_str,
+                end_date=end_date_str
             )
             
             current_time = datetime.now().strftime("%Y%m%d_%H%M")
@@ -1906,217 +1238,195 @@ if st.button("뉴스 분석 시작", type="primary"):
                 type="primary"
             )
             
-            st.success(f"✅ {len(all_analysis_states)}개 키워드의 통합 분석 결과를 Excel로 다운로드할 수 있습니다!")
+            st.success(f"✅ {len(news_report.company_stats)}개 키워드의 통합 분석 결과를 Excel로 다운로드할 수 있습니다!")
             
         except Exception as e:
             st.error(f"통합 Excel 파일 생성 중 오류가 발생했습니다: {str(e)}")
+        
+        try:
+            # 최종 선정 기사 Word 보고서 (같은 보고서 모델 사용)
+            st.download_button(
+                label="📝 최종 선정 뉴스 Word 다운로드",
+                data=news_report.to_word(),
+                file_name=f"뉴스분석_최종선정_{datetime.now().strftime('%Y%m%d_%H%M')}.docx",
+                mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+                help="모든 키워드의 최종 선정 뉴스와 AI 요약을 Word 파일로 다운로드합니다."
+            )
+        except Exception as e:
+            st.error(f"Word 파일 생성 중 오류가 발생했습니다: {str(e)}")
     
     st.markdown("---")
     st.markdown("### 📧 이메일용 HTML 요약")
     st.markdown("아래 HTML을 복사하여 이메일로 전송하실 수 있습니다.")
     
-    # 모든 키워드의 최종 선정 기사들을 하나의 리스트로 통합
-    all_final_news = []
-    for company, results in all_results.items():
-        for news in results:
-            news['source_keyword'] = company
-            all_final_news.append(news)
+    # 모든 키워드의 최종 선정 기사 (보고서 모델에 요약이 파싱된 상태로 누적됨)
+    all_final_news = news_report.final_news
     
     if all_final_news:
-        with st.spinner("선정된 기사들의 상세 요약을 생성하는 중..."):
-            # 웹 스크래퍼 초기화
-            from web_scraper import HybridNewsWebScraper
-            scraper = HybridNewsWebScraper(
-                openai_api_key=os.getenv('OPENAI_API_KEY'),
-                enable_ai_fallback=True
-            )
-            
-            # HTML 이메일 내용 생성
-            html_content = """
-<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <style>
-        body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
-        .header { background-color: #d04a02; color: white; padding: 20px; text-align: center; }
-        .article { border: 1px solid #ddd; margin: 20px 0; padding: 20px; border-radius: 8px; }
-        .article-title { font-size: 1.3em; font-weight: bold; color: #d04a02; margin-bottom: 10px; }
-        .article-meta { color: #666; font-size: 0.9em; margin-bottom: 15px; }
-        .korean-title { font-size: 1.2em; font-weight: bold; color: #333; margin: 15px 0 10px 0; }
-        .oneline-summary { background-color: #f0f8ff; padding: 12px; border-radius: 6px; margin: 15px 0; border-left: 4px solid #0077b6; }
-        .details { margin: 15px 0; }
-        .details li { margin-bottom: 8px; line-height: 1.4; }
-        .original-url { margin-top: 15px; }
-        .original-url a { color: #0077b6; text-decoration: none; }
-        .original-url a:hover { text-decoration: underline; }
-        .footer { background-color: #f8f9fa; padding: 15px; text-align: center; color: #666; margin-top: 30px; }
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>PwC 뉴스 분석 보고서</h1>
-        <p>생성일: """ + datetime.now().strftime("%Y년 %m월 %d일 %H:%M") + """</p>
-    </div>
-"""
-            
-            # 각 기사별로 상세 정보 추가
-            for i, news in enumerate(all_final_news, 1):
-                url = news.get('url', '')
-                title = news.get('title', '제목 없음')
-                press = news.get('press', '알 수 없음')
-                date_str = news.get('date', '')
-                source_keyword = news.get('source_keyword', '')
-                reason = news.get('reason', '')
+        # 재실행마다 URL을 다시 디코딩하지 않도록 작업별로 생성된 HTML 보관
+        email_cache_key = f"email_html_{job_id}"
+        if email_cache_key not in st.session_state:
+            with st.spinner("선정된 기사들의 원문 링크를 확인하고 HTML 이메일을 생성하는 중..."):
+                # 웹 스크래퍼 (재실행 간 공유)
+                scraper = get_web_scraper()
                 
-                # 날짜 형식 변환
-                try:
-                    if 'GMT' in date_str:
-                        date_obj = datetime.strptime(date_str, '%a, %d %b %Y %H:%M:%S %Z')
-                        formatted_date = date_obj.strftime('%Y-%m-%d')
-                    else:
-                        date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-                        formatted_date = date_str
-                except:
-                    formatted_date = date_str if date_str else '날짜 정보 없음'
-                
-                # Google News URL 디코딩
-                original_url = url
-                if 'news.google.com' in url:
-                    decoded_url = scraper._resolve_google_news_url_simple(url, timeout=10)
-                    if decoded_url:
-                        original_url = decoded_url
-                
-                # 기사 원문 요약 처리 (옵션이 활성화된 경우에만)
-                summary_html = ""
-                
-                if enable_article_summary and news.get('ai_summary'):
-                    # 이미 생성된 AI 요약 사용
-                    summary = news.get('ai_summary', '')
-                    
-                    # JSON 파싱하여 각 요소 추출
-                    try:
-                        import json
-                        import re
-                        
-                        # JSON 응답에서 코드 블록 제거
-                        json_text = summary.strip()
-                        if "<div" in json_text:  # 이미 HTML로 포맷된 경우
-                            summary_html = json_text
-                        else:
-                            # JSON 파싱 시도
-                            if json_text.startswith("```json"):
-                                json_text = json_text[7:]
-                            if json_text.startswith("```"):
-                                json_text = "\n".join(json_text.split("\n")[1:])
-                            if json_text.endswith("```"):
-                                json_text = "\n".join(json_text.split("\n")[:-1])
-                            
-                            json_text = json_text.strip()
-                            
-                            # JSON 정리 - 불필요한 공백과 줄바꿈 제거
-                            json_text = re.sub(r'\s+', ' ', json_text)  # 연속된 공백을 하나로
-                            json_text = re.sub(r'"\s*,\s*"', '", "', json_text)  # 쉼표 주변 정리
-                            json_text = re.sub(r'{\s+', '{', json_text)  # 중괄호 뒤 공백 제거
-                            json_text = re.sub(r'\s+}', '}', json_text)  # 중괄호 앞 공백 제거
-                            json_text = re.sub(r'\[\s+', '[', json_text)  # 대괄호 뒤 공백 제거
-                            json_text = re.sub(r'\s+\]', ']', json_text)  # 대괄호 앞 공백 제거
-                            
-                            # JSON 파싱 시도
-                            try:
-                                summary_data = json.loads(json_text)
-                            except json.JSONDecodeError as e:
-                                print(f"HTML 이메일 JSON 파싱 시도 실패: {e}")
-                                # JSON 복구 시도
-                                json_text = json_text.replace('\\"', '"')  # 이중 이스케이프 수정
-                                json_text = re.sub(r'(?<!\\)"(?![,\]\}:\s])', '\\"', json_text)  # 문자열 내부 따옴표 이스케이프
-                                summary_data = json.loads(json_text)
-                            
-                            korean_title = summary_data.get('title', '번역 제목 없음')
-                            oneline_summary = summary_data.get('summary', '요약 없음')
-                            details = summary_data.get('details', [])
-                            
-                            # 세부 내용 HTML 생성
-                            details_html = ""
-                            if details:
-                                details_html = "<ul class='details'>"
-                                for detail in details:
-                                    details_html += f"<li>{detail}</li>"
-                                details_html += "</ul>"
-                            
-                            summary_html = f"""
-                            <div class="korean-title">{korean_title}</div>
-                            <div class="oneline-summary"><strong>핵심 요약:</strong> {oneline_summary}</div>
-                            {details_html}
-                            """
-                    except:
-                        # JSON 파싱 실패 시 원본 HTML 사용
-                        if summary:
-                            summary_html = summary
-                        else:
-                            summary_html = "<div>요약 파싱 실패</div>"
-                
-                elif enable_article_summary:
-                    # 원문 요약 옵션이 켜져있지만 요약이 없는 경우
-                    summary_html = "<div style='color: #666; font-style: italic;'>원문 요약을 생성하지 못했습니다.</div>"
-                else:
-                    # 원문 요약 옵션이 꺼져있는 경우
-                    summary_html = "<div style='color: #666; font-style: italic;'>원문 요약이 비활성화되었습니다.</div>"
-                
-                # HTML에 기사 정보 추가
-                html_content += f"""
-    <div class="article">
-        <div class="article-title">{i}. {title}</div>
-        <div class="article-meta">
-            <strong>날짜:</strong> {formatted_date} | 
-            <strong>언론사:</strong> {press} | 
-            <strong>키워드:</strong> {source_keyword}
-        </div>
-        <div class="article-meta">
-            <strong>선정 이유:</strong> {reason}
-        </div>
+                # 기사별 데이터 준비 (Google News URL 병렬 디코딩) 후 템플릿 한 번에 렌더링
+                email_articles = prepare_email_articles(
+                    all_final_news,
+                    resolver=lambda url: scraper._resolve_google_news_url_simple(url, timeout=10)
+                )
+                st.session_state[email_cache_key] = render_email_html(email_articles, enable_article_summary=enable_article_summary)
+        html_content = st.session_state[email_cache_key]
         
-        {summary_html}
+        # HTML 내용 표시
+        st.markdown("#### 📋 생성된 HTML 이메일")
+        st.text_area(
+            "HTML 코드 (복사하여 사용하세요)",
+            value=html_content,
+            height=400,
+            help="이 HTML 코드를 복사하여 이메일 본문에 붙여넣으세요."
+        )
         
-        <div class="original-url">
-            <strong>원문 링크:</strong> <a href="{original_url}" target="_blank">{original_url}</a>
-        </div>
-    </div>
-"""
-                
-                # 진행상황 표시
-                st.write(f"기사 {i}/{len(all_final_news)} 처리 완료: {title[:50]}...")
-            
-            # HTML 마무리
-            html_content += """
-    <div class="footer">
-        <p>© 2024 PwC 뉴스 분석기 | 회계법인 관점의 뉴스 분석 도구</p>
-    </div>
-</body>
-</html>
-"""
-            
-            # HTML 내용 표시
-            st.markdown("#### 📋 생성된 HTML 이메일")
-            st.text_area(
-                "HTML 코드 (복사하여 사용하세요)",
-                value=html_content,
-                height=400,
-                help="이 HTML 코드를 복사하여 이메일 본문에 붙여넣으세요."
-            )
-            
-            # HTML 미리보기
-            st.markdown("#### 👀 이메일 미리보기")
-            st.components.v1.html(html_content, height=600, scrolling=True)
-            
-            st.success(f"🎉 총 {len(all_final_news)}개 기사의 HTML 이메일이 생성되었습니다!")
+        # HTML 미리보기
+        st.markdown("#### 👀 이메일 미리보기")
+        st.components.v1.html(html_content, height=600, scrolling=True)
+        
+        st.success(f"🎉 총 {len(all_final_news)}개 기사의 HTML 이메일이 생성되었습니다!")
     
     else:
         st.info("선정된 기사가 없어 HTML 이메일을 생성할 수 없습니다.")
+
+
+@st.fragment(run_every=2)
+def show_job_progress(job_id, rendered_count):
+    """실행 중인 작업의 키워드별 진행 단계 표시 (이 영역만 주기적으로 갱신)"""
+    job = job_runner.store.job(job_id)
+    companies = job['companies']
+    finished_count = sum(1 for entry in companies if entry['status'] in FINISHED_STATUSES)
+    
+    # 새로 끝난 키워드가 있으면 전체 화면을 다시 그려 결과 표시
+    if finished_count != rendered_count:
+        st.rerun()
+    
+    st.progress(finished_count / len(companies), text=f"뉴스 분석 진행 중... ({finished_count}/{len(companies)} 키워드 완료)")
+    for entry in companies:
+        if entry['status'] == STATUS_QUEUED:
+            st.write(f"⏳ {entry['company']}: 대기 중")
+        elif entry['status'] == STATUS_RUNNING:
+            st.write(f"🔄 {entry['company']}: {STAGE_NAMES.get(entry['stage'], entry['stage'])} 중...")
+        elif entry['status'] == STATUS_DONE:
+            st.write(f"✅ {entry['company']}: 완료")
+        else:
+            st.write(f"❌ {entry['company']}: 실패")
+
+
+def _job_accumulator(job_id):
+    """작업별 누적 보고서/집계 (재실행·진행 폴링마다 완료된 결과를 다시 읽지 않도록 세션에 보관)"""
+    cache_key = f"job_report_{job_id}"
+    if cache_key not in st.session_state:
+        st.session_state[cache_key] = {
+            'states': {},           # 위치 → 최종 상태 (작업 테이블에서 한 번만 읽음)
+            'next_position': 0,     # 보고서에 아직 누적하지 않은 첫 위치 (작업 순서대로 누적)
+            'news_report': NewsReport(),
+            'cache_stats': PromptCacheStats(),
+            'region_stats': RegionRunStats(),
+            'model_stats': ModelUsageStats(),
+        }
+    return st.session_state[cache_key]
+
+
+def render_analysis_job(job):
+    """작업 테이블에 저장된 결과로 완료된 키워드를 표시 (실행 중이면 진행 상황 폴링)"""
+    job_id = job['job_id']
+    params = job['params']
+    
+    # 회사별 분석이 끝날 때마다 보고서 행/최종 기사를 누적 (Excel/Word/HTML 이메일 공용, 새로 끝난 위치만 읽음)
+    accumulated = _job_accumulator(job_id)
+    states = accumulated['states']
     
+    finished_count = sum(1 for entry in job['companies'] if entry['status'] in FINISHED_STATUSES)
+    if not job['finished']:
+        show_job_progress(job_id, finished_count)
+    
+    for entry in job['companies']:
+        if entry['status'] == STATUS_DONE and entry['position'] not in states:
+            states[entry['position']] = job_runner.store.result(job_id, entry['position'])
+    
+    # 보고서에는 작업 순서대로 누적 (앞 키워드가 끝날 때까지 뒤 키워드는 대기)
+    companies = job['companies']
+    while accumulated['next_position'] < len(companies):
+        entry = companies[accumulated['next_position']]
+        if entry['status'] not in FINISHED_STATUSES:
+            break
+        if entry['status'] == STATUS_DONE:
+            final_state, company_cache_summary = states[entry['position']]
+            accumulated['cache_stats'].merge(company_cache_summary)
+            accumulated['region_stats'].merge(final_state.get("region_health"))
+            accumulated['model_stats'].merge(final_state.get("model_usage") or {})
+            accumulated['news_report'].add_company(entry['company'], final_state)
+        accumulated['next_position'] += 1
+    
+    for entry in companies:
+        company = entry['company']
+        if entry['status'] == STATUS_FAILED:
+            st.error(f"'{company}' 분석 중 오류가 발생했습니다: {entry['error']}")
+            continue
+        if entry['status'] != STATUS_DONE:
+            continue
+        
+        # 키워드 구분선 추가
+        st.markdown("---")
+        render_company_result(company, states[entry['position']][0])
+        
+        # 키워드 구분선 추가
+        st.markdown("---")
+    
+    if job['finished']:
+        render_analysis_reports(
+            job_id,
+            accumulated['news_report'],
+            accumulated['cache_stats'],
+            accumulated['region_stats'],
+            accumulated['model_stats'],
+            params.get('start_date', ''),
+            params.get('end_date', ''),
+            params.get('enable_article_summary', False)
+        )
+
+
+job_runner = get_job_runner()
 
+# 메인 컨텐츠
+if st.button("뉴스 분석 시작", type="primary"):
+    # 키워드별 초기 상태를 만들어 백그라운드 작업으로 제출 (재실행되어도 분석은 계속 진행)
+    valid_press_config = parse_valid_press_config(valid_press_dict)
+    company_states = [(company, build_company_state(company, valid_press_config)) for company in final_selected_companies]
+    
+    print(f"[DEBUG] start_datetime: {datetime.combine(start_date, start_time)}")
+    print(f"[DEBUG] end_datetime: {datetime.combine(end_date, end_time)}")
+    
+    analysis_job_id = job_runner.submit(
+        company_states,
+        enable_article_summary=enable_article_summary,
+        params={
+            'start_date': start_date.strftime('%Y-%m-%d'),
+            'end_date': end_date.strftime('%Y-%m-%d'),
+            'enable_article_summary': enable_article_summary,
+            'model': selected_model,
+            'analysis_scope': analysis_scope,
+        }
+    )
+    st.session_state.analysis_job_id = analysis_job_id
+    # 새로고침해도 같은 작업을 이어서 볼 수 있도록 URL에 작업 ID 기록
+    st.query_params["job"] = analysis_job_id
+    if analysis_scope:
+        st.info(f"🎯 분석 범위별 특화 기준 적용: {', '.join(analysis_scope)}")
 
+analysis_job_id = st.session_state.get('analysis_job_id') or st.query_params.get("job")
+analysis_job = job_runner.store.job(analysis_job_id) if analysis_job_id else None
 
+if analysis_job:
+    render_analysis_job(analysis_job)
 
 else:
     # 초기 화면 설명 (주석 처리됨)
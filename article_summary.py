@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Article Summary
+---------------
+LLM 기사 요약(JSON)을 생성 시점에 한 번만 파싱해 보관하는 구조화 객체입니다.
+HTML(Streamlit 표시), Excel, Word, 이메일 렌더러는 문자열을 다시 파싱하지 않고 필드를 직접 읽습니다.
+"""
+
+import json
+import re
+from typing import Iterable, Optional
+
+from text_cleaner import clean_html
+
+# 코드 블록/공백 정리용 정규식 (모듈 로드 시 1회 컴파일)
+_WHITESPACE_RE = re.compile(r'\s+')
+_COMMA_RE = re.compile(r'"\s*,\s*"')
+_OPEN_BRACE_RE = re.compile(r'{\s+')
+_CLOSE_BRACE_RE = re.compile(r'\s+}')
+_OPEN_BRACKET_RE = re.compile(r'\[\s+')
+_CLOSE_BRACKET_RE = re.compile(r'\s+\]')
+_INNER_QUOTE_RE = re.compile(r'(?<!\\)"(?![,\]\}:\s])')
+
+
+def _strip_code_fence(text: str) -> str:
+    """```json ... ``` 코드 블록 제거"""
+    text = text.strip()
+    if text.startswith("```json"):
+        text = text[7:]
+    if text.startswith("```"):
+        text = "\n".join(text.split("\n")[1:])
+    if text.endswith("```"):
+        text = "\n".join(text.split("\n")[:-1])
+    return text.strip()
+
+
+def parse_summary_json(response: str) -> dict:
+    """
+    요약 JSON 응답을 파싱합니다 (코드 블록/공백 정리 후 실패 시 따옴표 복구 재시도).
+
+    Raises:
+        json.JSONDecodeError: 복구 후에도 파싱할 수 없는 경우
+    """
+    json_text = _strip_code_fence(response)
+
+    # JSON 정리 - 불필요한 공백과 줄바꿈 제거
+    json_text = _WHITESPACE_RE.sub(' ', json_text)
+    json_text = _COMMA_RE.sub('", "', json_text)
+    json_text = _OPEN_BRACE_RE.sub('{', json_text)
+    json_text = _CLOSE_BRACE_RE.sub('}', json_text)
+    json_text = _OPEN_BRACKET_RE.sub('[', json_text)
+    json_text = _CLOSE_BRACKET_RE.sub(']', json_text)
+
+    try:
+        return json.loads(json_text)
+    except json.JSONDecodeError as e:
+        print(f"첫 번째 JSON 파싱 시도 실패: {e}")
+        # 잘못된 따옴표나 이스케이프 문제 수정 후 재시도
+        json_text = json_text.replace('\\"', '"')
+        json_text = _INNER_QUOTE_RE.sub('\\"', json_text)
+        try:
+            return json.loads(json_text)
+        except json.JSONDecodeError:
+            print(f"정리된 JSON 텍스트: {json_text}")
+            raise
+
+
+class ArticleSummary:
+    """
+    기사 요약 (번역 제목, 핵심 요약 1문장, 세부 내용).
+
+    parsed가 False이면 JSON 요약을 얻지 못한 경우로, summary에 오류/원문 텍스트가 들어 있고
+    raw에는 표시용 원본(HTML 또는 LLM 응답)이 보관됩니다.
+    """
+
+    __slots__ = ('title', 'summary', 'details', 'parsed', 'raw')
+
+    def __init__(self, title: str = "", summary: str = "", details: Iterable[str] = (),
+                 parsed: bool = True, raw: str = ""):
+        self.title = title
+        self.summary = summary
+        self.details = tuple(details)
+        self.parsed = parsed
+        self.raw = raw
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ArticleSummary":
+        """{"title", "summary", "details"} 딕셔너리에서 생성"""
+        details = data.get('details', []) or []
+        if isinstance(details, str):
+            details = [details]
+        return cls(
+            title=str(data.get('title', '') or ''),
+            summary=str(data.get('summary', '') or ''),
+            details=[str(detail) for detail in details]
+        )
+
+    @classmethod
+    def parse(cls, response: str) -> "ArticleSummary":
+        """
+        LLM 응답을 파싱해 생성합니다. 파싱에 실패하면 parsed=False인 객체를 반환합니다.
+        """
+        try:
+            data = parse_summary_json(response)
+        except json.JSONDecodeError as e:
+            print(f"JSON 파싱 오류: {e}")
+            print(f"원본 응답: {response}")
+            return cls.failed(f"요약 파싱 오류: {response}", raw=f"<div style='color: #666;'>요약 파싱 오류:<br>{response}</div>")
+        if not isinstance(data, dict):
+            return cls.failed(f"요약 포맷팅 오류: {response}", raw=f"<div style='color: #666;'>요약 포맷팅 오류:<br>{response}</div>")
+        return cls.from_dict(data)
+
+    @classmethod
+    def failed(cls, message: str, raw: Optional[str] = None) -> "ArticleSummary":
+        """요약 생성/추출 실패 (message는 태그 없는 텍스트로 보관)"""
+        return cls(summary=clean_html(message), parsed=False, raw=message if raw is None else raw)
+
+    def details_text(self, separator: str = " | ") -> str:
+        """세부 내용을 한 줄로 결합 (Excel용)"""
+        return separator.join(self.details)
+
+    def to_dict(self) -> dict:
+        return {'title': self.title, 'summary': self.summary, 'details': list(self.details)}
+
+    def to_html(self) -> str:
+        """Streamlit 표시용 HTML (파싱 실패 시 원본 표시)"""
+        if not self.parsed:
+            return self.raw
+
+        title_korean = self.title or '제목 없음'
+        summary_oneline = self.summary or '요약 없음'
+
+        # HTML 포맷팅
+        html_content = f"""
+<div style="margin-bottom: 15px;">
+    <h4 style="color: #333; margin-bottom: 10px; font-size: 1.2em; font-weight: bold;">{title_korean}</h4>
+    <div style="background-color: #f0f8ff; padding: 12px; border-radius: 6px; margin-bottom: 12px; border-left: 3px solid #0077b6;">
+        <strong>*</strong> {summary_oneline}
+    </div>
+</div>
+"""
+
+        if self.details:
+            html_content += "<div style='margin-top: 8px;'>\n"
+            for detail in self.details:
+                html_content += f"<div style='margin-bottom: 6px; line-height: 1.4;'>- {detail}</div>\n"
+            html_content += "</div>"
+
+        return html_content
+
+    def __repr__(self) -> str:
+        return f"ArticleSummary(title={self.title!r}, parsed={self.parsed})"
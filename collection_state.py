@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Collection State
+----------------
+일일 배치가 전날 이미 분석한 기사를 다시 LLM에 보내지 않도록 수집 상태를 저장하는 모듈입니다 (증분 수집).
+
+테이블:
+    watermarks    키워드 × 지역별 마지막으로 분석한 기사 발행 시각 (다음 검색 기간의 시작점)
+    seen_articles 분석 대상(키워드 묶음)별로 최근 본 기사 지문(URL/제목+언론사)과 당시 판단
+
+워터마크와 판단은 파이프라인이 끝난 뒤에만 기록하므로, 중간에 실패한 실행의 기사는 다음 실행에서 다시 분석됩니다.
+"""
+
+import hashlib
+import re
+import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from config import COLLECTION_STATE_DB_PATH, SEEN_RETENTION_DAYS
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS watermarks (
+    keyword TEXT NOT NULL,
+    region TEXT NOT NULL,
+    last_published REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (keyword, region)
+);
+CREATE TABLE IF NOT EXISTS seen_articles (
+    scope TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    verdict TEXT NOT NULL,
+    reason TEXT,
+    seen_at REAL NOT NULL,
+    PRIMARY KEY (scope, fingerprint)
+);
+"""
+
+_NON_WORD = re.compile(r'\W+')
+
+
+def published_timestamp(date_str: str) -> Optional[float]:
+    """RSS 발행일(RFC 822) → UNIX 시각 (파싱 실패 시 None)"""
+    try:
+        published = parsedate_to_datetime(date_str)
+    except (TypeError, ValueError):
+        return None
+    if published is None:
+        return None
+    if published.tzinfo is None:
+        published = published.replace(tzinfo=timezone.utc)
+    return published.timestamp()
+
+
+def article_fingerprints(news: dict) -> Tuple[str, ...]:
+    """기사 지문 (쿼리 문자열을 뺀 URL, 정규화한 제목+언론사) - 지역이 달라도 같은 기사면 일치"""
+    fingerprints = []
+    url = news.get('url', '')
+    if url:
+        parts = urlsplit(url)
+        fingerprints.append("u:" + hashlib.sha1(f"{parts.netloc.lower()}{parts.path}".encode('utf-8')).hexdigest())
+    title = _NON_WORD.sub(" ", news.get('content', '').casefold()).strip()
+    if title:
+        press = news.get('press', '').casefold().strip()
+        fingerprints.append("t:" + hashlib.sha1(f"{title}|{press}".encode('utf-8')).hexdigest())
+    return tuple(fingerprints)
+
+
+def collection_scope(keywords) -> str:
+    """판단을 공유하는 분석 대상 키 (같은 키워드 묶음 = 같은 기준으로 판단)"""
+    if isinstance(keywords, str):
+        return keywords
+    return " | ".join(keywords)
+
+
+class CollectionStateStore:
+    """
+    증분 수집 상태 (SQLite, 프로세스마다 연결을 새로 열어 사용).
+
+    사용 예:
+        store = CollectionStateStore()
+        since = store.query_start(["Hyundai e-axle"], "미국", start_datetime)
+        carried = store.previous_verdicts(scope, news_items)     # 이미 본 기사 → (판단, 사유)
+        store.remember(scope, news_items, verdicts, watermarks) # 파이프라인 종료 후
+    """
+
+    def __init__(self, db_path: str = COLLECTION_STATE_DB_PATH, retention_days: int = SEEN_RETENTION_DAYS):
+        self.db_path = db_path
+        self.retention_days = retention_days
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def watermarks(self, keywords: Iterable[str]) -> Dict[Tuple[str, str], float]:
+        """(키워드, 지역) → 마지막 분석 기사 발행 시각"""
+        keywords = list(keywords)
+        if not keywords:
+            return {}
+        placeholders = ",".join("?" * len(keywords))
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT keyword, region, last_published FROM watermarks WHERE keyword IN ({placeholders})", keywords
+            ).fetchall()
+        return {(keyword, region): last_published for keyword, region, last_published in rows}
+
+    def query_start(self, keywords: Sequence[str], region: str, start_datetime: Optional[datetime],
+                    watermarks: Dict[Tuple[str, str], float], overlap: timedelta) -> Optional[datetime]:
+        """
+        요청 1건의 검색 시작 시각 - 모든 키워드에 워터마크가 있으면 가장 이른 워터마크(겹침 여유 포함)부터,
+        아니면 원래 시작 시각부터 검색합니다. 원래 시작 시각보다 앞당기지는 않습니다.
+        """
+        marks = [watermarks.get((keyword, region)) for keyword in keywords]
+        if start_datetime is None or not marks or any(mark is None for mark in marks):
+            return start_datetime
+        since = datetime.fromtimestamp(min(marks), tz=start_datetime.tzinfo or timezone.utc) - overlap
+        return max(start_datetime, since)
+
+    def previous_verdicts(self, scope: str, news_items: List[dict]) -> List[Optional[Tuple[str, str]]]:
+        """기사별 이전 판단 (판단, 사유) - 처음 보는 기사는 None"""
+        fingerprints = [article_fingerprints(news) for news in news_items]
+        wanted = sorted({fingerprint for group in fingerprints for fingerprint in group})
+        known = {}
+        with self._connect() as conn:
+            # SQLite 변수 개수 제한을 피하도록 나눠서 조회
+            for start in range(0, len(wanted), 500):
+                chunk = wanted[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                for fingerprint, verdict, reason in conn.execute(
+                    f"SELECT fingerprint, verdict, reason FROM seen_articles WHERE scope = ? AND fingerprint IN ({placeholders})",
+                    [scope, *chunk]
+                ):
+                    known[fingerprint] = (verdict, reason or "")
+        return [next((known[fingerprint] for fingerprint in group if fingerprint in known), None)
+                for group in fingerprints]
+
+    def remember(self, scope: str, news_items: List[dict], verdicts: Dict[int, Tuple[str, str]],
+                 watermarks: Dict[Tuple[str, str], float]):
+        """
+        실행 결과 기록 (기사 지문별 판단, 워터마크 전진, 보존 기간이 지난 지문 정리)
+
+        Args:
+            scope (str): 분석 대상 키
+            news_items (List[dict]): 이번 실행에서 분석한 기사
+            verdicts (Dict[int, Tuple[str, str]]): 기사 순번(1부터) → (판단, 사유)
+            watermarks (Dict[Tuple[str, str], float]): (키워드, 지역) → 이번 실행의 최신 발행 시각
+        """
+        now = time.time()
+        rows = []
+        for position, news in enumerate(news_items, 1):
+            verdict, reason = verdicts.get(position, ("상태 불명", ""))
+            rows.extend((scope, fingerprint, verdict, reason, now) for fingerprint in article_fingerprints(news))
+
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO seen_articles (scope, fingerprint, verdict, reason, seen_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(scope, fingerprint) DO UPDATE SET verdict = excluded.verdict, "
+                "reason = excluded.reason, seen_at = excluded.seen_at",
+                rows
+            )
+            conn.executemany(
+                "INSERT INTO watermarks (keyword, region, last_published, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(keyword, region) DO UPDATE SET "
+                "last_published = MAX(last_published, excluded.last_published), updated_at = excluded.updated_at",
+                [(keyword, region, published, now) for (keyword, region), published in watermarks.items()]
+            )
+            conn.execute("DELETE FROM seen_articles WHERE seen_at < ?", (now - self.retention_days * 86400,))
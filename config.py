@@ -467,6 +467,135 @@ GPT_MODELS = {
 #DEFAULT_GPT_MODEL = "gpt-4.1"
 DEFAULT_GPT_MODEL = "gpt-4.1" 
 
+# 기사 원문 요약 시 본문 토큰 예산 (제목 포함, 리드/수치 문단 우선 보존)
+ARTICLE_TOKEN_BUDGET = 1500
+
+# 원문 추출 시 본문 최대 글자 수 (상태/작업 결과/보고서에 저장되는 원문 크기 제한 -
+# 프롬프트에 넣을 분량은 ARTICLE_TOKEN_BUDGET으로 따로 줄이므로 넉넉하게 설정)
+ARTICLE_MAX_CHARS = 20000
+
+# 기사 원문 배치 요약 설정 (여러 기사를 한 번의 LLM 호출로 요약, 실패한 기사만 단건 재요약)
+SUMMARY_BATCH_MODE = True
+SUMMARY_BATCH_TOKEN_BUDGET = 6000
+SUMMARY_BATCH_MAX_ARTICLES = 5
+
+# 단계별 모델 캐스케이드 (model_cascade - 1단계는 작은 모델이 확신도와 함께 먼저 분류하고,
+# 보류이거나 확신도가 낮은 기사만 선택한 모델로 다시 판단)
+MODEL_CASCADE_ENABLED = False   # 기본값 (배치 CLI는 --cascade로 사용)
+# 단계별 모델 (None이면 선택한 모델 - 3단계 중요도 평가와 1단계 재판단은 선택한 큰 모델 사용)
+STAGE_MODELS = {
+    1: "gpt-4.1-nano",
+    2: None,
+    3: None,
+}
+CASCADE_ESCALATE_CONFIDENCE = 0.8   # 1단계 작은 모델 확신도가 이보다 낮으면 큰 모델로 재판단
+CASCADE_ESCALATE_BORDERLINE = True  # 작은 모델이 보류로 분류한 기사도 재판단
+
+# 모델별 가격 (USD / 1M 토큰: 입력, 캐시된 입력, 출력 - 실행 요약의 비용 추정용, 모델명 접두어로 찾음)
+MODEL_PRICES = {
+    "gpt-4.1-nano": (0.10, 0.025, 0.40),
+    "gpt-4.1-mini": (0.40, 0.10, 1.60),
+    "gpt-4.1": (2.00, 0.50, 8.00),
+    "gpt-4o-mini": (0.15, 0.075, 0.60),
+    "gpt-4o": (2.50, 1.25, 10.00),
+    "gpt-4-turbo": (10.00, 10.00, 30.00),
+    "gpt-3.5-turbo": (0.50, 0.50, 1.50),
+    "gpt-5": (1.25, 0.125, 10.00),
+}
+
+# LLM 호출 한도 (모델명 접두어별 분당 요청 수/토큰 수, llm_governor에서 사용)
+LLM_RATE_LIMITS = {
+    "default": {"rpm": 500, "tpm": 200000},
+    "gpt-4.1": {"rpm": 500, "tpm": 300000},
+    "gpt-4o-mini": {"rpm": 500, "tpm": 200000},
+    "gpt-5": {"rpm": 500, "tpm": 500000},
+}
+
+# 429/5xx/타임아웃 발생 시 최대 재시도 횟수
+LLM_MAX_RETRIES = 5
+
+# 백그라운드 분석 작업 (SQLite 작업 테이블 경로, 동시에 분석할 키워드 수)
+JOB_DB_PATH = "news_jobs.db"
+JOB_MAX_WORKERS = 2
+
+# 뉴스 검색 계획 (query_planner - 키워드 문자 체계와 과거 수집량으로 RSS 요청 수 최소화)
+# 문자 체계별 검색 지역 (첫 지역은 항상 검색, 나머지는 과거 수집량이 적으면 생략)
+QUERY_REGIONS_BY_SCRIPT = {
+    "hangul": ["한국"],
+    "kana": ["일본"],
+    "han": ["중국"],
+    "latin": ["미국", "일본"],
+}
+QUERY_STATS_DB_PATH = "news_query_stats.db"
+QUERY_MIN_AVG_YIELD = 1.0     # 보조 지역의 최근 평균 수집 건수가 이보다 적으면 생략
+QUERY_MIN_OBSERVATIONS = 3    # 생략 판단 전 필요한 최소 검색 횟수
+QUERY_MAX_OR_TERMS = 4        # OR 쿼리 하나에 묶는 최대 키워드 수
+QUERY_MAX_LENGTH = 200        # OR 쿼리 최대 길이 (문자 수)
+
+# 증분 수집 (collection_state - 이전 실행에서 분석한 기사는 LLM에 다시 보내지 않고 이전 판단을 이어받음)
+INCREMENTAL_COLLECTION = False   # 기본값 (배치 CLI는 --incremental로 사용)
+COLLECTION_STATE_DB_PATH = "news_collection_state.db"
+SEEN_RETENTION_DAYS = 14         # 본 기사 지문 보존 기간
+WATERMARK_OVERLAP_HOURS = 2      # 워터마크 이전부터 겹쳐 검색할 시간 (늦게 색인된 기사 대비)
+
+# 지역별 RSS 상태 추적 / 차단기 (region_health - 느리거나 막힌 지역이 키워드마다 타임아웃을 더하지 않도록)
+REGION_BREAKER_FAILURE_THRESHOLD = 2    # 연속 실패(오류 또는 느린 응답) 횟수가 이 이상이면 차단
+REGION_BREAKER_COOLDOWN_SECONDS = 600   # 차단 후 다시 시험 요청을 보낼 때까지 대기 시간
+REGION_SLOW_SECONDS = 6.0               # 성공했더라도 이보다 느린 응답은 실패로 집계
+REGION_PROBE_TIMEOUT_SECONDS = 4        # 차단 해제 시험 요청의 타임아웃
+REGION_HEALTH_WINDOW = 20               # 지역별 최근 지연 시간/오류율 집계 요청 수
+
+# 지연 요청 헤징 (hedging - RSS/기사 요청이 호스트별 p90 지연을 넘기면 같은 요청을 한 번 더 보내 먼저 온 응답 사용)
+# 기본은 꺼짐 (환경 변수 NEWS_HEDGED_REQUESTS=1 또는 news_cli --hedge로 사용)
+HEDGING_ENABLED = False
+HEDGE_LATENCY_PERCENTILE = 0.9   # 이 분위수 지연을 넘기면 중복 요청
+HEDGE_MIN_SAMPLES = 5            # 호스트별 최소 관측 수 (그 전에는 헤징하지 않음)
+HEDGE_LATENCY_WINDOW = 50        # 호스트별 최근 지연 시간 보관 수
+HEDGE_MIN_DELAY_SECONDS = 0.2    # 중복 요청 전 최소 대기 시간
+HEDGE_BUDGET_RATIO = 0.1         # 중복 요청 한도 (원 요청 수 대비 비율)
+HEDGE_BUDGET_BURST = 2           # 한도와 별도로 허용하는 초기 중복 요청 수
+
+# 1단계 전 로컬 관련성 사전 필터 (relevance_filter - 명백히 무관한 제목은 LLM에 보내지 않고 사유와 함께 자동 제외)
+# 점수: 검색 키워드/회사 별칭 +1, 산업 용어 +1, 핵심 이슈 용어 +2, 잡음 분류 -2, 제외 기준 키워드 -3, 약어 충돌 -1
+RELEVANCE_PREFILTER = False      # 기본값 (배치 CLI는 --prefilter로 사용, python relevance_filter.py로 과거 판단과 일치율 확인)
+RELEVANCE_MIN_SCORE = 0          # 점수가 이보다 낮은 제목은 자동 제외
+
+# 잡음 분류별 용어 (제목에 있으면 감점 - 주가 시세, 스포츠단, 연예 기사)
+RELEVANCE_NOISE_TERMS = {
+    "주가/시세": ["특징주", "목표가", "목표주가", "상한가", "하한가", "52주 신고가", "52주 신저가", "급등주", "테마주",
+              "주가 급등", "주가 급락", "시간외", "stock price", "price target", "shares jump", "shares fall",
+              "stock forecast"],
+    "스포츠": ["야구단", "축구단", "농구단", "배구단", "프로야구", "프로농구", "프로배구", "KBO", "K리그", "트윈스", "랜더스",
+            "자이언츠", "이글스", "와이번스", "타이거즈", "라이온즈", "홈런", "결승골", "LPGA"],
+    "연예": ["드라마", "예능", "아이돌", "컴백", "뮤직비디오", "열애", "팬미팅", "시청률", "K-pop"],
+}
+
+# 핵심 이슈 용어 (제목에 있으면 가점 - 재무/실적, 사업구조, 법적 이슈)
+RELEVANCE_KEEP_TERMS = [
+    "실적", "영업이익", "순이익", "매출", "수주", "계약", "인수", "합병", "M&A", "지분", "투자", "공시", "감리", "회계",
+    "소송", "과징금", "제재", "분할", "상장", "증자", "배당", "earnings", "acquisition", "merger", "investment",
+    "contract", "lawsuit",
+]
+
+# 1단계 판단 기록 / 로컬 분류기 (verdict_model - 쌓인 LLM 판단으로 학습한 모델이 확신하는 기사는 LLM에 보내지 않음)
+STAGE1_VERDICT_LOG = True                       # LLM 1단계 판단을 (제목, 언론사, 키워드, 판단)으로 기록
+STAGE1_VERDICT_DB_PATH = "news_stage1_verdicts.db"
+STAGE1_LOCAL_MODEL = False                      # 기본값 (배치 CLI는 --local-model로 사용)
+STAGE1_MODEL_PATH = "stage1_verdict_model.npz"  # python verdict_model.py train 으로 생성
+STAGE1_MODEL_CONFIDENCE = 0.9                   # 보정된 확률이 이 이상인 기사만 로컬 모델이 판단
+STAGE1_MODEL_MIN_SAMPLES = 300                  # 학습에 필요한 최소 기록 수
+STAGE1_MODEL_HASH_BITS = 18                     # 해시 특징 공간 크기 (2^18)
+
+# 모듈 임포트 시간 예산 (ms, python -X importtime 누적 기준, import_budget.py에서 확인)
+# 무거운 라이브러리(langchain, selenium, newspaper3k, openai, tiktoken, 보고서 라이브러리)는 사용 시점에 임포트
+IMPORT_TIME_BUDGETS_MS = {
+    "news_cli": 150,
+    "news_pipeline": 150,
+    "job_runner": 100,
+    "news_ai": 600,
+    "web_scraper": 600,
+}
+
 # Email settings
 EMAIL_SETTINGS = {
     "from": "kr_client_and_market@pwc.com", #from #kr_client_and_market@pwc.com"
@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Content Budget
+--------------
+LLM 프롬프트에 넣을 기사 본문을 토큰 예산 안으로 줄이는 모듈입니다.
+대상 모델의 토크나이저(tiktoken)로 토큰을 세고, 리드 문단과 수치(kW, Nm, km, 가격 등)가
+포함된 문단을 우선 보존하며 보일러플레이트 문단은 버립니다.
+"""
+
+import re
+from functools import lru_cache
+from importlib.util import find_spec
+from typing import Dict, List
+
+from text_cleaner import is_junk_line
+
+# tiktoken 설치 여부 (선택적, 임포트는 첫 토큰 계산 시)
+TIKTOKEN_AVAILABLE = find_spec("tiktoken") is not None
+if not TIKTOKEN_AVAILABLE:
+    print("tiktoken이 설치되지 않았습니다. 토큰 수는 근사치로 계산됩니다. pip install tiktoken로 설치하세요.")
+
+# 기본 토큰 예산
+DEFAULT_TOKEN_BUDGET = 1500
+DEFAULT_MODEL = "gpt-4.1"
+
+# 리드 문단 수 (항상 우선 보존)
+LEAD_PARAGRAPHS = 2
+
+# 수치 정보가 포함된 문단 (출력, 토크, 주행거리, 가격 등)
+_NUMERIC_FACT_RE = re.compile(
+    r'\d[\d,.]*\s*(?:kWh|kW|MW|GWh|Nm|kgf?m|km|mi|miles|mph|mpg|HP|hp|PS|ps|마력|V|A|L|%|퍼센트)(?![A-Za-z])'
+    r'|[$€£¥₩]\s?\d'
+    r'|\d[\d,.]*\s*(?:달러|원|유로|엔|위안|억|만|조|million|billion|USD|EUR|KRW|CNY|JPY)',
+    re.IGNORECASE
+)
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?。])\s+')
+_PARAGRAPH_SPLIT_RE = re.compile(r'\n+')
+
+# 문장 단위로 다시 나눌 단일 문단 길이 기준
+_SINGLE_PARAGRAPH_SPLIT_CHARS = 600
+
+
+@lru_cache(maxsize=16)
+def _get_encoding(model: str):
+    """모델명에 맞는 tiktoken 인코딩 반환 (없으면 None)"""
+    if not TIKTOKEN_AVAILABLE:
+        return None
+    import tiktoken
+
+    # "openai.gpt-4.1-2025-04-14" 같은 프록시 접두어 제거
+    model_name = model.split('.', 1)[1] if model.startswith('openai.') else model
+    try:
+        return tiktoken.encoding_for_model(model_name)
+    except KeyError:
+        # tiktoken이 모르는 최신 모델(gpt-4.1, gpt-5 등)은 o200k_base 사용
+        try:
+            return tiktoken.get_encoding("o200k_base")
+        except Exception:
+            return None
+    except Exception:
+        return None
+
+
+def count_tokens(text: str, model: str = DEFAULT_MODEL) -> int:
+    """
+    대상 모델의 토크나이저로 토큰 수를 계산합니다.
+    tiktoken을 사용할 수 없으면 ASCII 4자당 1토큰, 그 외 문자 1자당 1토큰으로 근사합니다.
+    """
+    if not text:
+        return 0
+    encoding = _get_encoding(model)
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+def _truncate_to_tokens(text: str, max_tokens: int, model: str) -> str:
+    """텍스트를 토큰 수 기준으로 자름"""
+    if max_tokens <= 0:
+        return ""
+    encoding = _get_encoding(model)
+    if encoding is not None:
+        tokens = encoding.encode(text, disallowed_special=())
+        if len(tokens) <= max_tokens:
+            return text
+        return encoding.decode(tokens[:max_tokens]) + "..."
+    total = count_tokens(text, model)
+    if total <= max_tokens:
+        return text
+    return text[:max(1, len(text) * max_tokens // total)] + "..."
+
+
+def split_paragraphs(content: str) -> List[str]:
+    """본문을 문단 리스트로 분리 (문단 구분이 없는 긴 본문은 문장 단위로 분리)"""
+    paragraphs = [p.strip() for p in _PARAGRAPH_SPLIT_RE.split(content or "") if p.strip()]
+    if len(paragraphs) == 1 and len(paragraphs[0]) > _SINGLE_PARAGRAPH_SPLIT_CHARS:
+        paragraphs = [s.strip() for s in _SENTENCE_SPLIT_RE.split(paragraphs[0]) if s.strip()]
+    return paragraphs
+
+
+def is_boilerplate(paragraph: str, min_chars: int = 10) -> bool:
+    """메뉴/광고/구독 안내 등 본문이 아닌 문단 판별"""
+    if len(paragraph) < min_chars:
+        return True
+    # 긴 문단은 '광고', '구독' 같은 단어가 있어도 본문일 가능성이 높음
+    return len(paragraph) < 80 and is_junk_line(paragraph)
+
+
+def has_numeric_facts(paragraph: str) -> bool:
+    """출력/토크/주행거리/가격 등 수치 정보 포함 여부"""
+    return _NUMERIC_FACT_RE.search(paragraph) is not None
+
+
+def budget_article(content: str, title: str = "", max_tokens: int = DEFAULT_TOKEN_BUDGET,
+                   model: str = DEFAULT_MODEL, lead_paragraphs: int = LEAD_PARAGRAPHS) -> str:
+    """
+    기사 본문을 토큰 예산 안으로 줄입니다.
+    우선순위: 리드 문단 → 수치 정보 문단 → 나머지 문단 (원래 순서 유지), 보일러플레이트는 제외합니다.
+
+    Args:
+        content (str): 기사 본문
+        title (str): 기사 제목 (프롬프트에 별도로 들어가므로 예산에서 차감하고 본문 중복은 제거)
+        max_tokens (int): 제목 포함 토큰 예산 (기본값: 1500)
+        model (str): 토큰을 계산할 대상 모델 (기본값: gpt-4.1)
+        lead_paragraphs (int): 항상 우선 보존할 리드 문단 수 (기본값: 2)
+
+    Returns:
+        str: 예산 안으로 줄인 본문 (문단은 빈 줄로 구분)
+    """
+    title = (title or "").strip()
+    paragraphs = [
+        p for p in split_paragraphs(content)
+        if not is_boilerplate(p) and p != title
+    ]
+    if not paragraphs:
+        return ""
+
+    budget = max_tokens - count_tokens(title, model)
+    costs = [count_tokens(p, model) for p in paragraphs]
+    if sum(costs) <= budget:
+        return '\n\n'.join(paragraphs)
+
+    leads = list(range(min(lead_paragraphs, len(paragraphs))))
+    numeric = [i for i in range(len(leads), len(paragraphs)) if has_numeric_facts(paragraphs[i])]
+    numeric_set = set(numeric)
+    rest = [i for i in range(len(leads), len(paragraphs)) if i not in numeric_set]
+
+    selected = set()
+    used = 0
+    for i in leads + numeric + rest:
+        if used + costs[i] <= budget:
+            selected.add(i)
+            used += costs[i]
+
+    if not selected:
+        # 첫 문단만으로 예산을 넘는 경우 토큰 단위로 자름
+        return _truncate_to_tokens(paragraphs[0], budget, model)
+
+    return '\n\n'.join(paragraphs[i] for i in sorted(selected))
+
+
+def budget_stats(content: str, budgeted: str, model: str = DEFAULT_MODEL) -> Dict[str, float]:
+    """예산 적용 전후 토큰 수 비교 (디버그 출력용)"""
+    before = count_tokens(content, model)
+    after = count_tokens(budgeted, model)
+    return {
+        'before_tokens': before,
+        'after_tokens': after,
+        'saved_ratio': (1 - after / before) if before else 0.0
+    }
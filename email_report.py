@@ -0,0 +1,167 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Email Report
+------------
+최종 선정 기사로 이메일용 HTML 보고서를 생성하는 모듈입니다.
+HTML 템플릿(Jinja2)은 모듈 로드 시 한 번만 컴파일하고,
+기사별 준비 작업(Google News URL 디코딩, 요약 선택)은 렌더링 전에 병렬로 끝내
+기사 수와 관계없이 렌더링은 한 번에 이루어집니다.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from jinja2 import Environment
+
+from news_report import format_news_date, get_article_summary
+
+# 이메일 HTML 템플릿
+EMAIL_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <style>
+        body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+        .header { background-color: #d04a02; color: white; padding: 20px; text-align: center; }
+        .article { border: 1px solid #ddd; margin: 20px 0; padding: 20px; border-radius: 8px; }
+        .article-title { font-size: 1.3em; font-weight: bold; color: #d04a02; margin-bottom: 10px; }
+        .article-meta { color: #666; font-size: 0.9em; margin-bottom: 15px; }
+        .korean-title { font-size: 1.2em; font-weight: bold; color: #333; margin: 15px 0 10px 0; }
+        .oneline-summary { background-color: #f0f8ff; padding: 12px; border-radius: 6px; margin: 15px 0; border-left: 4px solid #0077b6; }
+        .details { margin: 15px 0; }
+        .details li { margin-bottom: 8px; line-height: 1.4; }
+        .original-url { margin-top: 15px; }
+        .original-url a { color: #0077b6; text-decoration: none; }
+        .original-url a:hover { text-decoration: underline; }
+        .footer { background-color: #f8f9fa; padding: 15px; text-align: center; color: #666; margin-top: 30px; }
+    </style>
+</head>
+<body>
+    <div class="header">
+        <h1>{{ report_title }}</h1>
+        <p>생성일: {{ generated_at }}</p>
+    </div>
+{% for article in articles %}
+    <div class="article">
+        <div class="article-title">{{ loop.index }}. {{ article.title }}</div>
+        <div class="article-meta">
+            <strong>날짜:</strong> {{ article.date }} |
+            <strong>언론사:</strong> {{ article.press }} |
+            <strong>키워드:</strong> {{ article.keyword }}
+        </div>
+        <div class="article-meta">
+            <strong>선정 이유:</strong> {{ article.reason }}
+        </div>
+{% set summary = article.summary %}
+{% if not enable_article_summary %}
+        <div style='color: #666; font-style: italic;'>원문 요약이 비활성화되었습니다.</div>
+{% elif summary is none %}
+        <div style='color: #666; font-style: italic;'>원문 요약을 생성하지 못했습니다.</div>
+{% elif summary.parsed %}
+        <div class="korean-title">{{ summary.title or '번역 제목 없음' }}</div>
+        <div class="oneline-summary"><strong>핵심 요약:</strong> {{ summary.summary or '요약 없음' }}</div>
+{% if summary.details %}
+        <ul class='details'>{% for detail in summary.details %}<li>{{ detail }}</li>{% endfor %}</ul>
+{% endif %}
+{% else %}
+        {{ article.summary_html }}
+{% endif %}
+        <div class="original-url">
+            <strong>원문 링크:</strong> <a href="{{ article.url }}" target="_blank">{{ article.url }}</a>
+        </div>
+    </div>
+{% endfor %}
+    <div class="footer">
+        <p>© 2024 PwC 뉴스 분석기 | 회계법인 관점의 뉴스 분석 도구</p>
+    </div>
+</body>
+</html>
+"""
+
+# 템플릿 환경/컴파일은 모듈 로드 시 1회만 수행
+# (기사 제목 등은 원문 그대로 삽입하던 기존 이메일과 동일하게 자동 이스케이프하지 않음)
+_environment = Environment(autoescape=False, trim_blocks=True, lstrip_blocks=True)
+_template = _environment.from_string(EMAIL_TEMPLATE)
+
+# Google News URL 병렬 디코딩 기본 동시 실행 수
+DEFAULT_RESOLVE_WORKERS = 8
+
+
+def resolve_article_urls(urls: List[str], resolver: Optional[Callable[[str], Optional[str]]],
+                         max_workers: int = DEFAULT_RESOLVE_WORKERS) -> Dict[str, str]:
+    """
+    Google News URL을 원문 URL로 병렬 디코딩합니다 (중복 URL은 한 번만 요청).
+
+    Args:
+        urls (List[str]): 기사 URL 목록
+        resolver (Callable): Google News URL → 원문 URL (실패 시 None) 함수
+        max_workers (int): 동시 디코딩 수
+
+    Returns:
+        Dict[str, str]: 입력 URL → 표시할 URL (디코딩 실패 또는 일반 URL은 그대로)
+    """
+    resolved = {url: url for url in urls}
+    targets = [url for url in resolved if url and 'news.google.com' in url]
+    if not targets or resolver is None:
+        return resolved
+
+    def resolve(url):
+        try:
+            return resolver(url)
+        except Exception as e:
+            print(f"URL 디코딩 실패: {url} ({str(e)})")
+            return None
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(targets)))) as executor:
+        for url, decoded_url in zip(targets, executor.map(resolve, targets)):
+            if decoded_url:
+                resolved[url] = decoded_url
+    return resolved
+
+
+def prepare_email_articles(final_news: List[dict], resolver: Optional[Callable[[str], Optional[str]]] = None,
+                           max_workers: int = DEFAULT_RESOLVE_WORKERS) -> List[dict]:
+    """
+    최종 선정 기사(NewsReport.final_news)를 템플릿 렌더링용 데이터로 변환합니다.
+
+    Args:
+        final_news (List[dict]): 최종 선정 기사 목록
+        resolver (Callable): Google News URL 디코딩 함수 (None이면 디코딩 생략)
+        max_workers (int): URL 디코딩 동시 실행 수
+
+    Returns:
+        List[dict]: 기사별 제목/날짜/언론사/키워드/선정 이유/원문 URL/요약
+    """
+    resolved = resolve_article_urls([news.get('url', '') for news in final_news], resolver, max_workers)
+
+    articles = []
+    for news in final_news:
+        url = news.get('url', '')
+        has_summary = bool(news.get('ai_summary'))
+        articles.append({
+            'title': news.get('title', '제목 없음'),
+            'press': news.get('press', '알 수 없음'),
+            'date': format_news_date(news.get('date', ''), '%Y-%m-%d'),
+            'keyword': news.get('source_keyword', ''),
+            'reason': news.get('reason', ''),
+            'url': resolved.get(url, url),
+            'summary': get_article_summary(news) if has_summary else None,
+            'summary_html': news.get('ai_summary', ''),
+        })
+    return articles
+
+
+def render_email_html(articles: List[dict], enable_article_summary: bool = True,
+                      report_title: str = 'PwC 뉴스 분석 보고서',
+                      generated_at: Optional[datetime] = None) -> str:
+    """준비된 기사 데이터로 이메일 HTML을 한 번에 렌더링"""
+    generated_at = generated_at or datetime.now()
+    return _template.render(
+        articles=articles,
+        enable_article_summary=enable_article_summary,
+        report_title=report_title,
+        generated_at=generated_at.strftime("%Y년 %m월 %d일 %H:%M"),
+    )
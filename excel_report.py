@@ -0,0 +1,270 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Excel Report
+------------
+뉴스 분석 결과를 Excel로 스트리밍 출력하는 모듈입니다.
+DataFrame을 만들고 셀을 다시 순회하며 스타일/열 너비를 적용하던 방식 대신,
+행을 쓰는 즉시 열 너비를 갱신하고 스타일(헤더, 상태별 배경색)은 포맷으로 한 번만 정의합니다.
+
+xlsxwriter가 설치되어 있으면 constant_memory 모드로 행을 바로 기록하고,
+없으면 openpyxl write-only 모드로 바로 기록합니다. write-only 시트는 열 너비를 첫 행보다 먼저 써야 하므로
+호출 측이 column_widths()로 미리 계산한 너비(fixed_widths)를 쓰고, 없으면 헤더 길이로 정합니다.
+"""
+
+import io
+import time
+from importlib.util import find_spec
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+# xlsxwriter 설치 여부 (선택적, 임포트는 보고서 생성 시)
+XLSXWRITER_AVAILABLE = find_spec("xlsxwriter") is not None
+
+# 헤더 색상 (PwC 오렌지)
+HEADER_COLOR = 'D04A02'
+
+# 분석 상태별 행 배경색
+STATUS_COLORS = {
+    '최종 선택': 'C6EFCE',      # 연한 초록
+    '그룹 대표 선택': 'C6EFCE',   # 연한 초록
+    '제외': 'FFC7CE',           # 연한 빨강
+    '보류': 'FFEB9C',           # 연한 노랑
+    '유지': 'BDD7EE',           # 연한 파랑
+    '그룹 내 미선택': 'F2F2F2'    # 연한 회색
+}
+
+# 자동 열 너비 범위
+MIN_COLUMN_WIDTH = 10
+MAX_COLUMN_WIDTH = 50
+
+
+def _clamp_width(length: int) -> float:
+    return min(max(length + 2, MIN_COLUMN_WIDTH), MAX_COLUMN_WIDTH)
+
+
+def column_widths(headers: Sequence[str], rows: Iterable[Sequence[Any]]) -> List[float]:
+    """
+    헤더와 행 값으로 자동 열 너비 계산 (openpyxl write-only 시트는 행보다 너비를 먼저 써야 하므로 미리 계산)
+
+    Args:
+        headers (Sequence[str]): 헤더
+        rows (Iterable[Sequence[Any]]): 기록할 행 값 (한 번만 순회)
+
+    Returns:
+        List[float]: 열별 너비 (MIN_COLUMN_WIDTH ~ MAX_COLUMN_WIDTH)
+    """
+    max_lengths = [len(str(header)) for header in headers]
+    for values in rows:
+        for i, value in enumerate(values):
+            length = len(str(value)) if value is not None else 0
+            if length > max_lengths[i]:
+                max_lengths[i] = length
+    return [_clamp_width(length) for length in max_lengths]
+
+
+class _Sheet:
+    """시트별 헤더, 열 너비, 기록 위치"""
+
+    def __init__(self, name: str, headers: Sequence[str], fixed_widths: Optional[Sequence[float]] = None):
+        self.name = name
+        self.headers = list(headers)
+        self.fixed_widths = list(fixed_widths) if fixed_widths else None
+        self.max_lengths = [len(str(header)) for header in headers]
+        self.row_count = 0
+        self.worksheet = None
+
+    def track(self, values: Sequence[Any]):
+        """행 값으로 열별 최대 길이 갱신"""
+        max_lengths = self.max_lengths
+        for i, value in enumerate(values):
+            length = len(str(value)) if value is not None else 0
+            if length > max_lengths[i]:
+                max_lengths[i] = length
+
+    def widths(self) -> List[float]:
+        if self.fixed_widths:
+            return self.fixed_widths
+        return [_clamp_width(length) for length in self.max_lengths]
+
+
+class StreamingExcelReport:
+    """
+    헤더/상태 색상 스타일을 공유하는 스트리밍 Excel 작성기.
+
+    사용 예:
+        report = StreamingExcelReport()
+        sheet = report.add_sheet('전체 뉴스 분석', ['순번', '제목', '분석 상태'])
+        report.write_row(sheet, [1, '기사 제목', '최종 선택'], status='최종 선택')
+        bio = report.close()
+    """
+
+    def __init__(self, use_xlsxwriter: Optional[bool] = None):
+        self.use_xlsxwriter = XLSXWRITER_AVAILABLE if use_xlsxwriter is None else use_xlsxwriter
+        self.bio = io.BytesIO()
+        self.sheets: List[_Sheet] = []
+
+        if self.use_xlsxwriter:
+            import xlsxwriter
+
+            # BytesIO에 쓰더라도 시트 데이터는 임시 파일로 흘려보냄 (constant_memory)
+            self.workbook = xlsxwriter.Workbook(self.bio, {'constant_memory': True, 'strings_to_urls': False})
+            self.header_format = self.workbook.add_format({
+                'bold': True, 'font_color': '#FFFFFF', 'bg_color': f'#{HEADER_COLOR}',
+                'align': 'center', 'valign': 'vcenter'
+            })
+            self.status_formats = {
+                status: self.workbook.add_format({'bg_color': f'#{color}'})
+                for status, color in STATUS_COLORS.items()
+            }
+        else:
+            from openpyxl import Workbook
+            from openpyxl.styles import Alignment, Font, PatternFill
+
+            # 스타일 객체는 한 번만 만들어 모든 셀이 공유 (write-only 모드, 행은 기록 즉시 직렬화)
+            self.workbook = Workbook(write_only=True)
+            self.header_font = Font(bold=True, color='FFFFFF')
+            self.header_fill = PatternFill(start_color=HEADER_COLOR, end_color=HEADER_COLOR, fill_type='solid')
+            self.header_alignment = Alignment(horizontal='center', vertical='center')
+            self.status_fills = {
+                status: PatternFill(start_color=color, end_color=color, fill_type='solid')
+                for status, color in STATUS_COLORS.items()
+            }
+
+    def add_sheet(self, name: str, headers: Sequence[str], fixed_widths: Optional[Sequence[float]] = None) -> _Sheet:
+        """
+        시트 추가 후 헤더 행 기록
+
+        fixed_widths를 주면 자동 열 너비 대신 사용합니다. openpyxl 모드에서는 행보다 너비를 먼저 써야 하므로
+        fixed_widths가 없으면 헤더 길이로 너비를 정합니다 (긴 값이 있으면 column_widths()로 미리 계산해 전달).
+        """
+        sheet = _Sheet(name, headers, fixed_widths)
+        if self.use_xlsxwriter:
+            sheet.worksheet = self.workbook.add_worksheet(name)
+            sheet.worksheet.write_row(0, 0, sheet.headers, self.header_format)
+        else:
+            from openpyxl.cell import WriteOnlyCell
+            from openpyxl.utils import get_column_letter
+
+            sheet.worksheet = self.workbook.create_sheet(name)
+            for col, width in enumerate(sheet.widths(), 1):
+                sheet.worksheet.column_dimensions[get_column_letter(col)].width = width
+            header_cells = []
+            for header in sheet.headers:
+                cell = WriteOnlyCell(sheet.worksheet, value=header)
+                cell.font = self.header_font
+                cell.fill = self.header_fill
+                cell.alignment = self.header_alignment
+                header_cells.append(cell)
+            sheet.worksheet.append(header_cells)
+        self.sheets.append(sheet)
+        return sheet
+
+    def write_row(self, sheet: _Sheet, values: Sequence[Any], status: Optional[str] = None):
+        """데이터 행 기록 (status가 STATUS_COLORS에 있으면 행 전체에 배경색 적용)"""
+        sheet.row_count += 1
+        if self.use_xlsxwriter:
+            sheet.track(values)
+            sheet.worksheet.write_row(sheet.row_count, 0, values, self.status_formats.get(status))
+            return
+
+        fill = self.status_fills.get(status)
+        if fill is None:
+            sheet.worksheet.append(list(values))
+            return
+        from openpyxl.cell import WriteOnlyCell
+
+        row_cells = []
+        for value in values:
+            cell = WriteOnlyCell(sheet.worksheet, value=value)
+            cell.fill = fill
+            row_cells.append(cell)
+        sheet.worksheet.append(row_cells)
+
+    def close(self) -> io.BytesIO:
+        """(xlsxwriter는 누적한 열 너비를 반영해) 파일을 완성하고 BytesIO 반환"""
+        if self.use_xlsxwriter:
+            for sheet in self.sheets:
+                for col, width in enumerate(sheet.widths()):
+                    sheet.worksheet.set_column(col, col, width)
+            self.workbook.close()
+        else:
+            self.workbook.save(self.bio)
+        self.bio.seek(0)
+        return self.bio
+
+
+def write_summary_sheet(report: StreamingExcelReport, rows: Sequence[Sequence[Any]],
+                        widths: Sequence[float] = (20, 30), name: str = '분석 요약'):
+    """항목/값 2열 요약 시트 기록"""
+    sheet = report.add_sheet(name, ['항목', '값'], fixed_widths=widths)
+    for row in rows:
+        report.write_row(sheet, row)
+
+
+def benchmark_export(rows: int = 20000, repeat: int = 1) -> Dict[str, float]:
+    """
+    통합 보고서 크기의 데이터로 기존 방식(DataFrame + 셀 순회)과 스트리밍 방식의 출력 시간을 비교합니다.
+
+    Args:
+        rows (int): 데이터 행 수 (기본값: 20000)
+        repeat (int): 반복 횟수, 최고 기록 사용 (기본값: 1)
+
+    Returns:
+        Dict[str, float]: 방식별 소요 시간(초)
+    """
+    headers = ['키워드', '순번', '제목', '언론사', '날짜', 'URL', '분석 상태',
+               '1차 분류 사유', '그룹핑 정보', '최종 선택 사유']
+    statuses = list(STATUS_COLORS) + ['상태 불명']
+    data = [
+        [f"키워드{i % 20}", i, f"Hyundai Motor unveils new e-axle with 160kW output {i}", "Reuters",
+         "2025-06-01 09:00", f"https://example.com/news/{i}", statuses[i % len(statuses)],
+         "PT/전동화 관련 기술 발표", f"그룹 [{i}, {i + 1}] (선택: {i})", "선정 사유 예시"]
+        for i in range(rows)
+    ]
+
+    def legacy():
+        import pandas as pd
+        from openpyxl.styles import PatternFill
+        bio = io.BytesIO()
+        df = pd.DataFrame(data, columns=headers)
+        with pd.ExcelWriter(bio, engine='openpyxl') as writer:
+            df.to_excel(writer, sheet_name='전체 뉴스 분석', index=False)
+            worksheet = writer.sheets['전체 뉴스 분석']
+            for column in worksheet.columns:
+                max_length = max(len(str(cell.value)) for cell in column)
+                worksheet.column_dimensions[column[0].column_letter].width = min(max(max_length + 2, 10), 50)
+            for row in range(2, len(df) + 2):
+                status = worksheet[f'G{row}'].value
+                if status in STATUS_COLORS:
+                    fill = PatternFill(start_color=STATUS_COLORS[status], end_color=STATUS_COLORS[status], fill_type='solid')
+                    for col in range(1, len(headers) + 1):
+                        worksheet.cell(row=row, column=col).fill = fill
+
+    def streaming(use_xlsxwriter):
+        report = StreamingExcelReport(use_xlsxwriter=use_xlsxwriter)
+        sheet = report.add_sheet('전체 뉴스 분석', headers, fixed_widths=column_widths(headers, data))
+        for row in data:
+            report.write_row(sheet, row, status=row[6])
+        report.close()
+
+    cases = {'DataFrame + 셀 순회 (기존)': legacy, 'openpyxl write-only': lambda: streaming(False)}
+    if XLSXWRITER_AVAILABLE:
+        cases['xlsxwriter constant_memory'] = lambda: streaming(True)
+
+    results = {}
+    for name, fn in cases.items():
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+        results[name] = best
+    return results
+
+
+# 출력 시간 벤치마크
+if __name__ == "__main__":
+    print("=== 통합 Excel 보고서 출력 벤치마크 (20,000행) ===")
+    for name, seconds in benchmark_export().items():
+        print(f"{name:<28} {seconds:8.2f}초")
@@ -1,8 +1,42 @@
-import feedparser
+import math
+import os
 from urllib.parse import quote
 from typing import List, Dict, Optional
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
 import time
+from rss_parser import fetch_feed
+from news_item import NewsItem
+from region_health import RegionRunStats, region_health
+from hedging import hedging
+
+
+def date_window_operators(start_datetime: Optional[datetime] = None, end_datetime: Optional[datetime] = None,
+                          now: Optional[datetime] = None) -> str:
+    """
+    검색 기간을 Google News 검색 연산자로 변환합니다 (서버에서 기간 밖 기사를 먼저 제외).
+
+    종료 시각이 현재에 가까우면 시간 단위 when:Nh(48시간 초과 시 when:Nd)를 사용하고,
+    과거 기간은 일 단위 after:/before:를 쓰되 시간대 차이를 고려해 앞뒤로 하루씩 여유를 둡니다.
+    정확한 시각 필터링은 수집 후 로컬에서 다시 수행합니다.
+
+    Returns:
+        str: 검색어 뒤에 붙일 연산자 문자열 (기간이 없으면 빈 문자열)
+    """
+    if start_datetime is None:
+        return ""
+    utc = timezone.utc
+    now = now or datetime.now(utc)
+    start = start_datetime if start_datetime.tzinfo else start_datetime.replace(tzinfo=utc)
+    end = end_datetime if end_datetime is None or end_datetime.tzinfo else end_datetime.replace(tzinfo=utc)
+
+    if end is None or end >= now - timedelta(hours=1):
+        hours = max(1, math.ceil((now - start).total_seconds() / 3600) + 1)
+        return f"when:{hours}h" if hours <= 48 else f"when:{math.ceil(hours / 24)}d"
+
+    after = (start.astimezone(utc) - timedelta(days=1)).strftime('%Y-%m-%d')
+    before = (end.astimezone(utc) + timedelta(days=1)).strftime('%Y-%m-%d')
+    return f"after:{after} before:{before}"
 
 
 class GoogleNews:
@@ -12,7 +46,11 @@ class GoogleNews:
 
     def __init__(self):
         """GoogleNews 클래스를 초기화합니다."""
-        self.base_url = "https://news.google.com/rss"
+        # GOOGLE_NEWS_BASE_URL로 로컬 기록 피드 서버 지정 가능 (pipeline_benchmark)
+        self.base_url = os.getenv("GOOGLE_NEWS_BASE_URL", "https://news.google.com/rss")
+        
+        # 이 인스턴스(수집 1회)의 지역별 요청/실패/건너뜀 집계 (차단기 상태는 region_health에서 프로세스 전역 관리)
+        self.run_stats = RegionRunStats()
         
         # 지역별 설정 (현대자동차 남양연구소 우선순위 기준: 북미→서유럽→중국→아태→브라질→한국)
         self.regions = {
@@ -31,7 +69,8 @@ class GoogleNews:
             "글로벌": {"hl": "en", "gl": "US", "ceid": "US:en"}  # 기본 글로벌 설정
         }
 
-    def search_by_keyword(self, keyword: Optional[str] = None, k: int = 20, region: str = "한국", timeout: int = 10) -> List[Dict[str, str]]:
+    def search_by_keyword(self, keyword: Optional[str] = None, k: int = 20, region: str = "한국", timeout: int = 10,
+                          start_datetime: Optional[datetime] = None, end_datetime: Optional[datetime] = None) -> List[NewsItem]:
         """
         키워드로 뉴스를 검색합니다.
 
@@ -40,9 +79,11 @@ class GoogleNews:
             k (int): 검색할 뉴스의 최대 개수 (기본값: 20)
             region (str): 검색할 지역 (기본값: "한국")
             timeout (int): HTTP 요청 타임아웃 (기본값: 10초)
+            start_datetime (Optional[datetime]): 검색 시작 시각 - 지정하면 when:/after:/before: 연산자로 서버에서 기간 제한
+            end_datetime (Optional[datetime]): 검색 종료 시각
 
         Returns:
-            List[Dict[str, str]]: URL, 제목, 언론사, 발행일, 지역을 포함한 딕셔너리 리스트
+            List[NewsItem]: URL, 제목, 언론사, 발행일, 지역을 포함한 기사 리스트 (딕셔너리처럼 .get/[] 접근 가능)
         """
         # 지역 설정 확인
         if region not in self.regions:
@@ -51,48 +92,56 @@ class GoogleNews:
         
         region_config = self.regions[region]
         
-        # URL 생성
+        # URL 생성 (기간 연산자는 OR 쿼리 전체에 적용되도록 괄호로 묶은 뒤 추가)
         if keyword:
+            date_operators = date_window_operators(start_datetime, end_datetime)
+            if date_operators:
+                keyword = f"({keyword}) {date_operators}" if " OR " in keyword else f"{keyword} {date_operators}"
             encoded_keyword = quote(keyword)
             url = f"{self.base_url}/search?q={encoded_keyword}&hl={region_config['hl']}&gl={region_config['gl']}&ceid={region_config['ceid']}"
         else:
             url = f"{self.base_url}?hl={region_config['hl']}&gl={region_config['gl']}&ceid={region_config['ceid']}"
         
-        # 뉴스 데이터 파싱 (타임아웃 적용)
+        # 최근 계속 실패한 지역은 차단 대기 시간 동안 요청하지 않음 (시험 요청은 짧은 타임아웃)
+        request_timeout = region_health.acquire(region, timeout)
+        if request_timeout is None:
+            print(f"'{keyword}' 검색 건너뜀: {region} 지역 RSS가 최근 계속 실패해 차단 중입니다.")
+            self.run_stats.add(region, skipped=1)
+            return []
+        
+        # 뉴스 데이터 파싱 (스트리밍 파서 - k개를 채우면 나머지 응답은 읽지 않음, 소켓 타임아웃 적용)
+        # 헤징을 켜면 지역별 p90 지연을 넘긴 요청은 한 번 더 보내고 먼저 온 응답 사용
+        started = time.monotonic()
         try:
-            # feedparser에는 직접적인 timeout 옵션이 없으므로 전체 작업에 대한 timeout 처리
-            start_time = time.time()
-            news_data = feedparser.parse(url)
-            
-            # 타임아웃 체크
-            if time.time() - start_time > timeout:
-                print(f"'{keyword}' 검색이 {region}에서 타임아웃되었습니다.")
-                return []
-                
+            entries = hedging.call(f"rss:{region}",
+                                   lambda cancel: fetch_feed(url, k=k, timeout=request_timeout, cancel=cancel))
         except Exception as e:
+            elapsed = time.monotonic() - started
+            region_health.record(region, elapsed, ok=False)
+            self.run_stats.add(region, requests=1, failures=1, seconds=elapsed)
             print(f"'{keyword}' 검색 중 {region}에서 오류 발생: {e}")
             return []
+        elapsed = time.monotonic() - started
+        region_health.record(region, elapsed, ok=True)
+        self.run_stats.add(region, requests=1, seconds=elapsed)
         
         # 수집된 뉴스가 없는 경우
-        if not news_data.entries:
+        if not entries:
             print(f"'{keyword}' 관련 뉴스를 {region}에서 찾을 수 없습니다.")
             return []
             
-        # 결과 가공
-        result = []
-        for entry in news_data.entries[:k]:
-            # source 태그에서 직접 언론사 정보 추출
-            press = entry.get('source', {}).get('title', '알 수 없음')
-            
-            result.append({
-                "url": entry.link, 
-                "content": entry.title,  # 제목은 그대로 사용
-                "press": press,
-                "date": entry.get('published', '날짜 정보 없음'),
-                "region": region  # 지역 정보 추가
-            })
-
-        return result
+        # 결과 가공 (source 태그의 언론사명/홈페이지는 파서가 추출)
+        return [
+            NewsItem(
+                url=entry['link'],
+                content=entry['title'],  # 제목은 그대로 사용
+                press=entry['press'],
+                source_url=entry['source_url'],
+                date=entry['published'],
+                region=region  # 지역 정보 추가
+            )
+            for entry in entries
+        ]
     
     def _search_single_region_worker(self, args) -> List[Dict[str, str]]:
         """
@@ -0,0 +1,208 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Hedging
+-------
+RSS/기사 요청의 꼬리 지연(tail latency)을 줄이는 요청 헤징 모듈입니다.
+
+요청이 같은 호스트(키)의 최근 p90 지연 시간을 넘기도록 끝나지 않으면 같은 요청을 한 번 더 보내고,
+먼저 성공한 응답을 사용합니다. 남은 요청에는 취소 신호(threading.Event)를 보내 스트림 읽기를 중단시킵니다.
+중복 요청은 원 요청 수 대비 비율 한도(HEDGE_BUDGET_RATIO)를 넘지 않으므로 전체 요청량은 크게 늘지 않습니다.
+
+기본은 꺼져 있으며 config.HEDGING_ENABLED 또는 환경 변수 NEWS_HEDGED_REQUESTS=1로 켭니다
+(작업 프로세스도 환경 변수를 물려받음). python hedging.py 로 느린 로컬 서버를 대상으로 효과를 확인합니다.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Callable, Dict, Optional, TypeVar
+
+from config import (
+    HEDGE_BUDGET_BURST,
+    HEDGE_BUDGET_RATIO,
+    HEDGE_LATENCY_PERCENTILE,
+    HEDGE_LATENCY_WINDOW,
+    HEDGE_MIN_DELAY_SECONDS,
+    HEDGE_MIN_SAMPLES,
+    HEDGING_ENABLED,
+)
+
+T = TypeVar("T")
+
+
+class FetchCancelled(Exception):
+    """헤징에서 진 요청이 취소 신호를 받아 중단된 경우"""
+
+
+def _run_attempt(fn: Callable[[threading.Event], T], cancel: threading.Event) -> Future:
+    """요청 1건을 별도 데몬 스레드에서 실행 (호출 측 스레드 풀이 가득 차도 대기하지 않도록)"""
+    future: Future = Future()
+    future.set_running_or_notify_cancel()
+    future.cancel_event = cancel
+
+    def target():
+        started = time.monotonic()
+        try:
+            result = fn(cancel)
+        except BaseException as e:
+            future.set_exception(e)
+        else:
+            future.elapsed = time.monotonic() - started
+            future.set_result(result)
+
+    threading.Thread(target=target, daemon=True).start()
+    return future
+
+
+class HedgingPolicy:
+    """
+    키(호스트)별 지연 시간 분위수로 중복 요청 시점을 정하는 헤징 정책.
+
+    사용 예:
+        body = hedging.call("rss:미국", lambda cancel: fetch_feed(url, k, timeout, cancel=cancel))
+    """
+
+    def __init__(self, enabled: Optional[bool] = None, percentile: float = HEDGE_LATENCY_PERCENTILE,
+                 min_samples: int = HEDGE_MIN_SAMPLES, window: int = HEDGE_LATENCY_WINDOW,
+                 min_delay: float = HEDGE_MIN_DELAY_SECONDS, budget_ratio: float = HEDGE_BUDGET_RATIO,
+                 budget_burst: int = HEDGE_BUDGET_BURST):
+        if enabled is None:
+            enabled = HEDGING_ENABLED or os.getenv("NEWS_HEDGED_REQUESTS") == "1"
+        self.enabled = enabled
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.window = window
+        self.min_delay = min_delay
+        self.budget_ratio = budget_ratio
+        self.budget_burst = budget_burst
+        self._latencies: Dict[str, deque] = {}
+        self._counts = {'requests': 0, 'hedges': 0, 'hedge_wins': 0, 'over_budget': 0}
+        self._lock = threading.Lock()
+
+    def _record(self, key: str, latency: float):
+        with self._lock:
+            latencies = self._latencies.get(key)
+            if latencies is None:
+                latencies = self._latencies[key] = deque(maxlen=self.window)
+            latencies.append(latency)
+
+    def hedge_delay(self, key: str) -> Optional[float]:
+        """중복 요청 전 대기 시간 (관측이 부족하면 None - 헤징하지 않음)"""
+        with self._lock:
+            latencies = sorted(self._latencies.get(key, ()))
+        if len(latencies) < self.min_samples:
+            return None
+        position = min(len(latencies) - 1, int(self.percentile * len(latencies)))
+        return max(self.min_delay, latencies[position])
+
+    def _try_hedge(self) -> bool:
+        """한도 안에서 중복 요청 1건 허용 여부"""
+        with self._lock:
+            if self._counts['hedges'] < self._counts['requests'] * self.budget_ratio + self.budget_burst:
+                self._counts['hedges'] += 1
+                return True
+            self._counts['over_budget'] += 1
+            return False
+
+    def call(self, key: str, fn: Callable[[threading.Event], T]) -> T:
+        """
+        요청 실행 (지연되면 중복 요청 후 먼저 성공한 결과 반환)
+
+        Args:
+            key (str): 지연 시간을 집계할 키 (호스트, RSS 지역 등)
+            fn (Callable[[threading.Event], T]): 요청 함수 - 취소 신호가 설정되면 가능한 빨리 중단
+
+        Returns:
+            T: 먼저 성공한 요청의 결과 (모두 실패하면 마지막 예외 발생)
+        """
+        if not self.enabled:
+            started = time.monotonic()
+            result = fn(threading.Event())
+            self._record(key, time.monotonic() - started)
+            return result
+
+        with self._lock:
+            self._counts['requests'] += 1
+        delay = self.hedge_delay(key)
+        primary = _run_attempt(fn, threading.Event())
+        pending = {primary}
+
+        # p90 지연까지 끝나지 않으면 한도 안에서 중복 요청
+        if delay is not None:
+            done, _ = wait(pending, timeout=delay)
+            if not done and self._try_hedge():
+                pending.add(_run_attempt(fn, threading.Event()))
+
+        # 먼저 성공한 요청 사용 (실패한 요청은 남은 요청 결과를 기다림), 남은 요청은 취소 신호
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    error = future.exception()
+                    continue
+                self._record(key, future.elapsed)
+                if future is not primary:
+                    with self._lock:
+                        self._counts['hedge_wins'] += 1
+                for other in pending:
+                    other.cancel_event.set()
+                return future.result()
+        raise error
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
+
+    def reset(self):
+        with self._lock:
+            self._latencies.clear()
+            self._counts = {key: 0 for key in self._counts}
+
+
+# 프로세스 전역 헤징 정책 (RSS/기사 요청 공용)
+hedging = HedgingPolicy()
+
+
+# 느린 응답이 섞인 로컬 서버로 헤징 전후 꼬리 지연 비교
+if __name__ == "__main__":
+    import random
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    from rss_parser import _sample_feed, fetch_feed
+
+    body = _sample_feed(20)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            # 요청 5%는 1.5초 지연 (느린 피드/언론사)
+            time.sleep(1.5 if random.random() < 0.05 else 0.05)
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/rss"
+
+    for enabled in (False, True):
+        random.seed(7)
+        policy = HedgingPolicy(enabled=enabled)
+        latencies = []
+        for _ in range(100):
+            started = time.monotonic()
+            policy.call("rss:local", lambda cancel: fetch_feed(url, 20, timeout=5, cancel=cancel))
+            latencies.append(time.monotonic() - started)
+        latencies.sort()
+        print(f"헤징 {'켬' if enabled else '끔'}: 평균 {sum(latencies) / len(latencies):.3f}s, "
+              f"p90 {latencies[89]:.3f}s, p99 {latencies[98]:.3f}s, 통계 {policy.stats()}")
+    server.shutdown()
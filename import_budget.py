@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Import Budget
+-------------
+python -X importtime으로 모듈별 임포트 시간을 측정해 config.IMPORT_TIME_BUDGETS_MS 예산과 비교하는 점검 도구입니다.
+배치 CLI와 백그라운드 작업 프로세스는 시작할 때마다 모듈을 새로 임포트하므로,
+무거운 라이브러리가 다시 최상위 임포트로 들어오면 예산 초과로 바로 드러납니다.
+
+사용 예:
+    python import_budget.py                 # 예산에 등록된 모든 모듈 측정
+    python import_budget.py news_cli --top 5
+예산을 초과한 모듈이 있으면 종료 코드 1을 반환합니다.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Optional, Tuple
+
+from config import IMPORT_TIME_BUDGETS_MS
+
+# 측정 반복 횟수 (디스크 캐시 영향을 줄이기 위해 최솟값 사용)
+DEFAULT_REPEAT = 3
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """
+    -X importtime 출력 파싱
+
+    Returns:
+        List[Tuple[str, int, int]]: (모듈명, 자체 시간 us, 누적 시간 us) 목록
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # 헤더 행
+        entries.append((fields[2].strip(), int(fields[0]), int(fields[1])))
+    return entries
+
+
+def measure_import(module: str) -> Tuple[float, List[Tuple[str, int, int]]]:
+    """
+    새 인터프리터에서 모듈 1개를 임포트해 누적 임포트 시간(ms)과 세부 항목을 반환합니다.
+    임포트에 실패하면 RuntimeError를 발생시킵니다.
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        last_line = completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else "알 수 없는 오류"
+        raise RuntimeError(last_line)
+
+    entries = parse_importtime(completed.stderr)
+    total_us = next((cumulative for name, _, cumulative in entries if name == module), 0)
+    return total_us / 1000, entries
+
+
+def check_budgets(modules: Optional[List[str]] = None, repeat: int = DEFAULT_REPEAT,
+                  top: int = 3) -> Dict[str, dict]:
+    """
+    모듈별 임포트 시간을 예산과 비교합니다.
+
+    Returns:
+        Dict[str, dict]: 모듈명 → {'ms', 'budget_ms', 'ok', 'offenders', 'error'}
+    """
+    results = {}
+    for module in modules or list(IMPORT_TIME_BUDGETS_MS):
+        budget_ms = IMPORT_TIME_BUDGETS_MS.get(module)
+        try:
+            runs = [measure_import(module) for _ in range(max(1, repeat))]
+        except RuntimeError as e:
+            results[module] = {'ms': None, 'budget_ms': budget_ms, 'ok': False, 'offenders': [], 'error': str(e)}
+            continue
+
+        elapsed_ms, entries = min(runs, key=lambda run: run[0])
+        # 최상위 패키지 단위로 누적 시간이 큰 항목 (자기 자신 제외)
+        packages = {}
+        for name, _, cumulative in entries:
+            if name != module and "." not in name.strip():
+                packages[name.strip()] = max(packages.get(name.strip(), 0), cumulative)
+        offenders = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+
+        results[module] = {
+            'ms': elapsed_ms,
+            'budget_ms': budget_ms,
+            'ok': budget_ms is None or elapsed_ms <= budget_ms,
+            'offenders': [(name, us / 1000) for name, us in offenders],
+            'error': None,
+        }
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="모듈별 임포트 시간 예산 점검 (python -X importtime)")
+    parser.add_argument("modules", nargs="*", help="측정할 모듈 (기본값: IMPORT_TIME_BUDGETS_MS 전체)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help=f"측정 반복 횟수 (기본값: {DEFAULT_REPEAT})")
+    parser.add_argument("--top", type=int, default=3, help="모듈별로 표시할 상위 임포트 항목 수")
+    args = parser.parse_args(argv)
+
+    results = check_budgets(args.modules, repeat=args.repeat, top=args.top)
+    for module, result in results.items():
+        budget = f"{result['budget_ms']}ms" if result['budget_ms'] is not None else "예산 없음"
+        if result['error']:
+            print(f"❌ {module}: 임포트 실패 - {result['error']}")
+            continue
+        mark = "✅" if result['ok'] else "❌"
+        print(f"{mark} {module}: {result['ms']:.1f}ms / {budget}")
+        for name, ms in result['offenders']:
+            print(f"    {name}: {ms:.1f}ms")
+
+    return 0 if all(result['ok'] for result in results.values()) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,5 @@
 import requests
 import time
-import re
 from urllib.parse import urlparse
 from bs4 import BeautifulSoup
 from selenium import webdriver
@@ -10,6 +9,7 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.chrome.service import Service
+from text_cleaner import is_junk_line, filter_meaningful_lines
 
 class ImprovedNewsExtractor:
     """조선일보 및 기타 언론사 최적화 추출기"""
@@ -130,8 +130,7 @@ class ImprovedNewsExtractor:
                     text = element.get_text(separator='\n', strip=True)
                     
                     # 의미있는 문장만 필터링
-                    lines = [line.strip() for line in text.split('\n') if line.strip()]
-                    meaningful_lines = [line for line in lines if len(line) > 20 and not self._is_junk_line(line)]
+                    meaningful_lines = filter_meaningful_lines(text)
                     
                     if len(meaningful_lines) >= 3:
                         return '\n\n'.join(meaningful_lines)
@@ -144,24 +143,7 @@ class ImprovedNewsExtractor:
     
     def _is_junk_line(self, line):
         """쓸모없는 라인 판별"""
-        junk_patterns = [
-            r'^\s*\d+\s*$',  # 숫자만
-            r'^\s*[^\w\s]*\s*$',  # 특수문자만
-            r'관련\s*기사',
-            r'더\s*보기',
-            r'이전\s*기사',
-            r'다음\s*기사',
-            r'^\s*AD\s*$',
-            r'광고',
-            r'구독',
-            r'로그인',
-            r'회원가입'
-        ]
-        
-        for pattern in junk_patterns:
-            if re.search(pattern, line, re.IGNORECASE):
-                return True
-        return False
+        return is_junk_line(line)
     
     def _fallback_content_extraction(self, soup):
         """폴백 본문 추출"""
@@ -0,0 +1,229 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Job Runner
+----------
+뉴스 분석 파이프라인을 Streamlit 스크립트 밖(로컬 프로세스 풀)에서 실행하는 백그라운드 작업 모듈입니다.
+작업/키워드별 진행 단계와 결과는 SQLite 작업 테이블에 기록되므로,
+위젯 조작으로 Streamlit이 재실행되어도 분석이 중단되지 않고 화면은 저장된 결과를 다시 그립니다.
+
+테이블:
+    jobs          작업 1건 (생성 시각, 파라미터)
+    job_companies 작업 내 키워드별 상태(queued/running/done/failed), 현재 단계, 결과(pickle)
+"""
+
+import json
+import multiprocessing
+import pickle
+import sqlite3
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Iterator, List, Optional, Tuple
+
+from llm_governor import init_worker
+
+# 키워드별 작업 상태
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+FINISHED_STATUSES = (STATUS_DONE, STATUS_FAILED)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    params TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS job_companies (
+    job_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    company TEXT NOT NULL,
+    status TEXT NOT NULL,
+    stage TEXT,
+    error TEXT,
+    result BLOB,
+    started_at REAL,
+    finished_at REAL,
+    PRIMARY KEY (job_id, position)
+);
+"""
+
+
+class JobStore:
+    """SQLite 작업 테이블 (프로세스마다 연결을 새로 열어 사용)"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def create_job(self, companies: List[str], params: Optional[dict] = None) -> str:
+        """작업과 키워드별 대기 행 생성 후 작업 ID 반환"""
+        job_id = uuid.uuid4().hex[:12]
+        with self._connect() as conn:
+            conn.execute("INSERT INTO jobs (job_id, created_at, params) VALUES (?, ?, ?)",
+                         (job_id, time.time(), json.dumps(params or {}, ensure_ascii=False, default=str)))
+            conn.executemany(
+                "INSERT INTO job_companies (job_id, position, company, status) VALUES (?, ?, ?, ?)",
+                [(job_id, position, company, STATUS_QUEUED) for position, company in enumerate(companies)]
+            )
+        return job_id
+
+    def set_stage(self, job_id: str, position: int, stage: str):
+        """키워드 실행 단계 갱신 (첫 단계 진입 시 running으로 전환)"""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE job_companies SET status = ?, stage = ?, started_at = COALESCE(started_at, ?) "
+                "WHERE job_id = ? AND position = ?",
+                (STATUS_RUNNING, stage, time.time(), job_id, position)
+            )
+
+    def finish(self, job_id: str, position: int, result: Any = None, error: Optional[str] = None):
+        """키워드 완료/실패 기록 (결과는 pickle로 저장)"""
+        status = STATUS_FAILED if error else STATUS_DONE
+        blob = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL) if result is not None else None
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE job_companies SET status = ?, error = ?, result = ?, finished_at = ? "
+                "WHERE job_id = ? AND position = ?",
+                (status, error, blob, time.time(), job_id, position)
+            )
+
+    def fail_unfinished(self, message: str, job_id: Optional[str] = None):
+        """끝나지 않은 키워드를 실패로 표시 (서버 재시작 또는 작업 프로세스 비정상 종료)"""
+        query = "UPDATE job_companies SET status = ?, error = ?, finished_at = ? WHERE status IN (?, ?)"
+        args = [STATUS_FAILED, message, time.time(), STATUS_QUEUED, STATUS_RUNNING]
+        if job_id:
+            query += " AND job_id = ?"
+            args.append(job_id)
+        with self._connect() as conn:
+            conn.execute(query, args)
+
+    def job(self, job_id: str) -> Optional[dict]:
+        """작업 정보와 키워드별 진행 상태 (결과 제외)"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None
+            companies = conn.execute(
+                "SELECT position, company, status, stage, error, started_at, finished_at "
+                "FROM job_companies WHERE job_id = ? ORDER BY position", (job_id,)
+            ).fetchall()
+        companies = [dict(company) for company in companies]
+        return {
+            'job_id': row['job_id'],
+            'created_at': row['created_at'],
+            'params': json.loads(row['params']),
+            'companies': companies,
+            'finished': all(company['status'] in FINISHED_STATUSES for company in companies),
+        }
+
+    def result(self, job_id: str, position: int) -> Any:
+        """완료된 키워드의 결과 (없으면 None)"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT result FROM job_companies WHERE job_id = ? AND position = ?",
+                               (job_id, position)).fetchone()
+        if row is None or row['result'] is None:
+            return None
+        return pickle.loads(row['result'])
+
+    def results(self) -> Iterator[Any]:
+        """완료된 모든 키워드 결과 (오래된 작업부터, 과거 판단 분석용)"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT result FROM job_companies WHERE status = ? AND result IS NOT NULL ORDER BY finished_at",
+                (STATUS_DONE,)
+            ).fetchall()
+        for row in rows:
+            yield pickle.loads(row['result'])
+
+
+def _run_company(db_path: str, job_id: str, position: int, initial_state: dict,
+                 enable_article_summary: bool):
+    """
+    작업 프로세스에서 키워드 1개를 분석하고 결과를 작업 테이블에 기록합니다.
+    결과는 (최종 상태, 단계별 프롬프트 캐시 집계) 튜플입니다.
+    """
+    from news_pipeline import run_news_pipeline
+    from prompt_layout import cache_stats
+
+    store = JobStore(db_path)
+    try:
+        # 프로세스가 재사용되므로 키워드마다 캐시 집계를 새로 시작
+        cache_stats.reset()
+        final_state = run_news_pipeline(
+            initial_state,
+            enable_article_summary=enable_article_summary,
+            on_stage=lambda stage: store.set_stage(job_id, position, stage)
+        )
+        store.finish(job_id, position, result=(final_state, cache_stats.summary()))
+    except Exception as e:
+        print(f"[작업 {job_id}] 키워드 {position} 분석 실패: {str(e)}")
+        store.finish(job_id, position, error=str(e))
+
+
+class JobRunner:
+    """
+    프로세스 풀 + SQLite 작업 테이블 기반 백그라운드 분석 실행기.
+
+    사용 예:
+        runner = JobRunner("news_jobs.db", max_workers=2)
+        job_id = runner.submit([("현대차", initial_state)], enable_article_summary=True)
+        job = runner.store.job(job_id)          # 키워드별 상태/단계 폴링
+        final_state, usage = runner.store.result(job_id, 0)
+    """
+
+    def __init__(self, db_path: str, max_workers: int = 2):
+        self.store = JobStore(db_path)
+        # 이전 서버 프로세스에서 실행 중이던 작업은 이어서 실행할 수 없으므로 실패 처리
+        self.store.fail_unfinished("서버 재시작으로 분석이 중단되었습니다.")
+        self.max_workers = max_workers
+        self.executor = self._create_executor()
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        # Streamlit 서버(다중 스레드)를 fork하지 않도록 spawn으로 작업 프로세스 생성
+        # LLM 한도는 프로세스마다 전체 한도 / 작업 프로세스 수 (합계가 LLM_RATE_LIMITS를 넘지 않도록)
+        return ProcessPoolExecutor(max_workers=self.max_workers,
+                                   mp_context=multiprocessing.get_context("spawn"),
+                                   initializer=init_worker, initargs=(self.max_workers,))
+
+    def submit(self, companies: List[Tuple[str, dict]], enable_article_summary: bool = False,
+               params: Optional[dict] = None) -> str:
+        """
+        키워드별 초기 상태를 프로세스 풀에 제출합니다.
+
+        Args:
+            companies (List[Tuple[str, dict]]): (키워드, 초기 상태) 목록 - 표시 순서대로
+            enable_article_summary (bool): 원문 요약 여부
+            params (dict): 작업과 함께 저장할 파라미터 (분석 기간 등 화면 표시용)
+
+        Returns:
+            str: 작업 ID
+        """
+        job_id = self.store.create_job([company for company, _ in companies], params)
+        for position, (company, initial_state) in enumerate(companies):
+            args = (_run_company, self.store.db_path, job_id, position, initial_state, enable_article_summary)
+            try:
+                future = self.executor.submit(*args)
+            except BrokenProcessPool:
+                # 이전 작업에서 프로세스 풀이 깨졌으면 새로 만들어 제출
+                self.executor = self._create_executor()
+                future = self.executor.submit(*args)
+            future.add_done_callback(lambda f, job_id=job_id: self._on_done(f, job_id))
+        return job_id
+
+    def _on_done(self, future, job_id: str):
+        # 작업 프로세스가 비정상 종료(BrokenProcessPool 등)하면 남은 키워드를 실패로 표시
+        error = future.exception()
+        if error is not None:
+            self.store.fail_unfinished(f"작업 프로세스 오류: {str(error)}", job_id=job_id)
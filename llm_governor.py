@@ -0,0 +1,378 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+LLM Governor
+------------
+모든 LLM 호출이 거쳐 가는 공용 트래픽 조절 모듈입니다.
+모델별 RPM(분당 요청 수)/TPM(분당 토큰 수) 토큰 버킷으로 호출 속도를 제한하고,
+429/5xx 응답에는 Retry-After 헤더를 우선 적용한 뒤 지터가 있는 지수 백오프로 재시도합니다.
+대기 중인 요청은 우선순위(1단계 분류 → 2/3단계 → 원문 요약 → AI 추출 폴백) 순으로 처리됩니다.
+조정기는 프로세스 전역이므로, 프로세스 풀(job_runner, news_cli --workers)은 init_worker로
+작업 프로세스마다 LLM_RATE_LIMITS / 작업 프로세스 수를 나눠 줘 합계가 전체 한도를 넘지 않게 합니다.
+
+OPENAI_BASE_URL을 로컬 가짜 서버로 지정하면 실제 API 없이 동작을 확인할 수 있습니다
+(python llm_governor.py 실행 시 내장된 가짜 OpenAI 서버로 자체 점검).
+"""
+
+import heapq
+import itertools
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from config import LLM_RATE_LIMITS, LLM_MAX_RETRIES
+
+# 단계별 우선순위 (숫자가 작을수록 먼저 처리)
+STAGE_PRIORITY = {
+    1: 1,
+    2: 2,
+    3: 3,
+    "summary": 6,
+    "extraction": 7,
+}
+DEFAULT_PRIORITY = 5
+
+# 재시도 대상 HTTP 상태 코드
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+# 재시도 대상 예외 클래스명 (openai / httpx / requests 타임아웃·연결 오류)
+RETRYABLE_ERROR_NAMES = {
+    'RateLimitError', 'APITimeoutError', 'APIConnectionError', 'InternalServerError',
+    'Timeout', 'TimeoutException', 'ConnectTimeout', 'ReadTimeout', 'ConnectionError',
+}
+
+# 백오프 설정 (초)
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+
+
+class RateLimitExceeded(Exception):
+    """재시도 횟수를 모두 소진한 경우"""
+
+
+class TokenBucket:
+    """분당 한도를 초당 보충량으로 환산한 토큰 버킷 (호출자가 잠금을 관리)"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self.refill_rate = float(per_minute) / 60.0
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """amount만큼 사용 가능해질 때까지 남은 시간 (0이면 즉시 가능)"""
+        self._refill(now)
+        # 한도보다 큰 요청은 버킷이 가득 찼을 때 통과시킴
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.refill_rate
+
+    def consume(self, amount: float):
+        """토큰 차감 (실사용량 정산 시 음수 잔량 허용)"""
+        self.tokens -= amount
+
+
+class _ModelState:
+    """모델별 버킷, 대기열, Retry-After 차단 시각"""
+
+    def __init__(self, rpm: int, tpm: int):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.waiting = []
+        self.blocked_until = 0.0
+        self.stats = {'calls': 0, 'retries': 0, 'rate_limited': 0, 'wait_seconds': 0.0}
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    """예외에서 HTTP 상태 코드 추출 (openai, httpx, requests, urllib 지원)"""
+    for candidate in (error, getattr(error, 'response', None)):
+        if candidate is None:
+            continue
+        for attr in ('status_code', 'status', 'code'):
+            value = getattr(candidate, attr, None)
+            if isinstance(value, int):
+                return value
+    return None
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """예외의 응답 헤더에서 Retry-After(초) 추출"""
+    headers = getattr(getattr(error, 'response', None), 'headers', None) or getattr(error, 'headers', None)
+    if not headers:
+        return None
+    try:
+        value = headers.get('retry-after-ms') or headers.get('Retry-After-Ms')
+        if value is not None:
+            return float(value) / 1000.0
+        value = headers.get('retry-after') or headers.get('Retry-After')
+        if value is not None:
+            return float(value)
+    except (TypeError, ValueError):
+        # HTTP-date 형식 등은 백오프로 처리
+        return None
+    return None
+
+
+def is_retryable(error: Exception) -> bool:
+    """재시도할 오류인지 판별 (429, 5xx, 타임아웃, 연결 오류)"""
+    status = _status_code(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS_CODES
+    return type(error).__name__ in RETRYABLE_ERROR_NAMES
+
+
+def backoff_delay(attempt: int, base: float = BACKOFF_BASE, cap: float = BACKOFF_MAX) -> float:
+    """지수 백오프 + full jitter (attempt는 0부터)"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class LLMGovernor:
+    """
+    모델별 RPM/TPM 한도와 우선순위 대기열을 관리하는 LLM 호출 조정기.
+
+    Args:
+        rate_limits (Dict[str, Dict[str, int]]): 모델명(접두어) → {"rpm": int, "tpm": int}, "default" 키 필수
+        max_retries (int): 재시도 가능한 오류에 대한 최대 재시도 횟수
+    """
+
+    def __init__(self, rate_limits: Dict[str, Dict[str, int]] = None, max_retries: int = LLM_MAX_RETRIES):
+        self.rate_limits = rate_limits or LLM_RATE_LIMITS
+        self.max_retries = max_retries
+        self._cond = threading.Condition()
+        self._models: Dict[str, _ModelState] = {}
+        self._sequence = itertools.count()
+
+    def _model_key(self, model: str) -> str:
+        """rate_limits에서 가장 길게 일치하는 모델 키 ("openai." 프록시 접두어 무시)"""
+        name = (model or "").split('.', 1)[1] if (model or "").startswith('openai.') else (model or "")
+        matches = [key for key in self.rate_limits if key != 'default' and name.startswith(key)]
+        return max(matches, key=len) if matches else 'default'
+
+    def _state(self, key: str) -> _ModelState:
+        if key not in self._models:
+            limits = self.rate_limits.get(key, self.rate_limits['default'])
+            self._models[key] = _ModelState(limits['rpm'], limits['tpm'])
+        return self._models[key]
+
+    def acquire(self, model: str, tokens: int, priority: int = DEFAULT_PRIORITY) -> float:
+        """
+        한도 안에서 호출 슬롯을 확보할 때까지 대기합니다. 같은 모델의 대기 요청은 우선순위 순으로 통과합니다.
+
+        Returns:
+            float: 대기한 시간(초)
+        """
+        key = self._model_key(model)
+        started = time.monotonic()
+        with self._cond:
+            state = self._state(key)
+            ticket = (priority, next(self._sequence))
+            heapq.heappush(state.waiting, ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    if state.waiting[0] != ticket:
+                        # 앞선 우선순위 요청이 통과하면 notify로 깨어남
+                        self._cond.wait(timeout=1.0)
+                        continue
+                    wait = max(
+                        state.blocked_until - now,
+                        state.requests.wait_time(1, now),
+                        state.tokens.wait_time(tokens, now)
+                    )
+                    if wait <= 0:
+                        state.requests.consume(1)
+                        state.tokens.consume(min(tokens, state.tokens.capacity))
+                        break
+                    self._cond.wait(timeout=wait)
+            finally:
+                state.waiting.remove(ticket)
+                heapq.heapify(state.waiting)
+                self._cond.notify_all()
+            waited = time.monotonic() - started
+            state.stats['wait_seconds'] += waited
+            return waited
+
+    def settle(self, model: str, estimated_tokens: int, actual_tokens: int):
+        """호출 후 실제 사용 토큰으로 TPM 버킷 정산"""
+        if actual_tokens <= 0:
+            return
+        with self._cond:
+            self._state(self._model_key(model)).tokens.consume(actual_tokens - estimated_tokens)
+
+    def penalize(self, model: str, delay: float):
+        """429 응답 시 해당 모델의 모든 요청을 delay초 동안 차단"""
+        with self._cond:
+            state = self._state(self._model_key(model))
+            state.blocked_until = max(state.blocked_until, time.monotonic() + delay)
+            state.stats['rate_limited'] += 1
+
+    def call(self, fn: Callable[[], Any], model: str, tokens: int = 0, priority: int = DEFAULT_PRIORITY,
+             usage_fn: Optional[Callable[[Any], int]] = None) -> Any:
+        """
+        슬롯을 확보한 뒤 fn을 호출하고, 재시도 가능한 오류는 Retry-After/백오프 후 재시도합니다.
+
+        Args:
+            fn (Callable[[], Any]): 실제 LLM 호출 (인자 없음)
+            model (str): 모델명 (한도 조회용)
+            tokens (int): 예상 토큰 수 (입력 + 예상 출력)
+            priority (int): 우선순위 (작을수록 먼저)
+            usage_fn (Callable[[Any], int]): 응답에서 실제 총 토큰 수를 읽는 함수 (선택)
+
+        Returns:
+            Any: fn의 반환값
+        """
+        key = self._model_key(model)
+        for attempt in range(self.max_retries + 1):
+            self.acquire(model, tokens, priority)
+            try:
+                response = fn()
+            except Exception as e:
+                if not is_retryable(e) or attempt == self.max_retries:
+                    if is_retryable(e):
+                        raise RateLimitExceeded(f"{model}: 재시도 {self.max_retries}회 초과 ({e})") from e
+                    raise
+                retry_after = _retry_after(e)
+                delay = retry_after if retry_after is not None else backoff_delay(attempt)
+                if _status_code(e) == 429:
+                    self.penalize(model, delay)
+                with self._cond:
+                    self._state(key).stats['retries'] += 1
+                print(f"LLM 호출 재시도 {attempt + 1}/{self.max_retries} ({model}, {delay:.1f}초 후): {e}")
+                time.sleep(delay)
+                continue
+
+            with self._cond:
+                self._state(key).stats['calls'] += 1
+            if usage_fn is not None:
+                try:
+                    self.settle(model, tokens, usage_fn(response))
+                except Exception:
+                    pass
+            return response
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """모델별 호출/재시도/429/대기시간 통계"""
+        with self._cond:
+            return {key: dict(state.stats) for key, state in self._models.items()}
+
+    def configure(self, rate_limits: Dict[str, Dict[str, int]]):
+        """모델별 한도 교체 (버킷은 새 한도로 다시 생성)"""
+        with self._cond:
+            self.rate_limits = rate_limits
+            self._models.clear()
+            self._cond.notify_all()
+
+
+# 전역 조정기 (news_ai, news_summarizer, web_scraper의 LLM 호출이 공유)
+governor = LLMGovernor()
+
+
+def worker_rate_limits(workers: int, rate_limits: Dict[str, Dict[str, int]] = None) -> Dict[str, Dict[str, int]]:
+    """작업 프로세스 1개의 모델별 한도 (전체 한도를 프로세스 수로 나눔, 최소 1)"""
+    workers = max(1, workers)
+    return {
+        model: {key: max(1, value // workers) for key, value in limits.items()}
+        for model, limits in (rate_limits or LLM_RATE_LIMITS).items()
+    }
+
+
+def init_worker(workers: int):
+    """
+    프로세스 풀 initializer - 이 프로세스의 전역 조정기 한도를 LLM_RATE_LIMITS / 작업 프로세스 수로 설정합니다.
+
+    조정기 상태는 프로세스마다 따로 있으므로(spawn 풀), 한도를 나눠 주지 않으면
+    실제 한도가 LLM_RATE_LIMITS × 작업 프로세스 수가 됩니다. 프로세스 간 버킷을 공유하는 대신
+    한도를 고정 분할하므로 추가 잠금/IPC가 없고, 한 프로세스만 바쁠 때는 전체 한도를 다 쓰지 못합니다.
+    """
+    governor.configure(worker_rate_limits(workers))
+
+
+def governed_call(fn: Callable[[], Any], model: str, tokens: int = 0, stage: Any = None,
+                  usage_fn: Optional[Callable[[Any], int]] = None) -> Any:
+    """전역 조정기를 통한 호출 (stage로 우선순위 결정)"""
+    return governor.call(fn, model, tokens, STAGE_PRIORITY.get(stage, DEFAULT_PRIORITY), usage_fn)
+
+
+def _run_fake_server(fail_first: int = 2, retry_after: float = 0.5):
+    """자체 점검용 가짜 OpenAI 서버 (처음 fail_first번은 429 + Retry-After 응답)"""
+    import json
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    counter = {'requests': 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            counter['requests'] += 1
+            if counter['requests'] <= fail_first:
+                self.send_response(429)
+                self.send_header('Retry-After', str(retry_after))
+                self.end_headers()
+                self.wfile.write(b'{"error": {"message": "Rate limit reached"}}')
+                return
+            body = json.dumps({
+                "id": "chatcmpl-fake", "object": "chat.completion", "model": "fake",
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": "ok"}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": 10, "completion_tokens": 1, "total_tokens": 11,
+                          "prompt_tokens_details": {"cached_tokens": 0}}
+            }).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, counter
+
+
+# 가짜 OpenAI 서버를 이용한 자체 점검
+if __name__ == "__main__":
+    import json
+    import urllib.request
+
+    server, counter = _run_fake_server()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    def post_chat():
+        request = urllib.request.Request(
+            f"{base_url}/chat/completions",
+            data=json.dumps({"model": "gpt-4.1", "messages": [{"role": "user", "content": "ping"}]}).encode('utf-8'),
+            headers={'Content-Type': 'application/json'}
+        )
+        with urllib.request.urlopen(request, timeout=5) as response:
+            return json.loads(response.read())
+
+    test_governor = LLMGovernor({"default": {"rpm": 120, "tpm": 100000}}, max_retries=4)
+    started = time.monotonic()
+    result = test_governor.call(post_chat, "gpt-4.1", tokens=20, usage_fn=lambda r: r['usage']['total_tokens'])
+    print(f"응답: {result['choices'][0]['message']['content']}, 서버 요청 {counter['requests']}회, "
+          f"소요 {time.monotonic() - started:.2f}초")
+    print(f"통계: {test_governor.stats()}")
+
+    # 우선순위 확인: 버킷을 비운 뒤 요약(6) → 분류(1) 순으로 대기시켜도 분류가 먼저 통과
+    order = []
+    limited = LLMGovernor({"default": {"rpm": 60, "tpm": 100000}})
+    limited._state('default').requests.tokens = 0
+    threads = [
+        threading.Thread(target=lambda p=p: (limited.acquire("gpt-4.1", 10, p), order.append(p)))
+        for p in (STAGE_PRIORITY["summary"], STAGE_PRIORITY[1])
+    ]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.05)
+    for thread in threads:
+        thread.join()
+    print(f"통과 순서(우선순위): {order}")
+    server.shutdown()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Model Cascade
+-------------
+단계별 모델 선택과 모델별 비용/지연 집계 모듈입니다.
+
+캐스케이드를 켜면 1단계 제외 판단은 작은 모델(config.STAGE_MODELS[1])이 기사별 확신도와 함께 먼저 분류하고,
+보류이거나 확신도가 CASCADE_ESCALATE_CONFIDENCE보다 낮은 기사만 사이드바에서 선택한 모델로 다시 판단합니다.
+3단계 중요도 평가는 선택한 모델을 그대로 사용합니다.
+모든 LLM 호출은 단계×모델별로 호출 수, 토큰, 추정 비용(config.MODEL_PRICES), 소요 시간을 집계합니다.
+"""
+
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import (
+    CASCADE_ESCALATE_BORDERLINE,
+    CASCADE_ESCALATE_CONFIDENCE,
+    MODEL_PRICES,
+    STAGE_MODELS,
+)
+from prompt_layout import STAGE_LABELS, extract_usage
+
+
+def stage_model(state: Dict[str, Any], stage: Any) -> str:
+    """단계에서 사용할 모델 (캐스케이드가 꺼져 있거나 단계 모델이 없으면 선택한 모델)"""
+    selected = state.get("model", "gpt-5")
+    if not state.get("model_cascade"):
+        return selected
+    return STAGE_MODELS.get(stage) or selected
+
+
+def model_price(model: str) -> Optional[Tuple[float, float, float]]:
+    """MODEL_PRICES에서 가장 길게 일치하는 가격 ("openai." 프록시 접두어 무시, 없으면 None)"""
+    name = (model or "").split('.', 1)[1] if (model or "").startswith('openai.') else (model or "")
+    matches = [key for key in MODEL_PRICES if name.startswith(key)]
+    return MODEL_PRICES[max(matches, key=len)] if matches else None
+
+
+def estimate_cost(model: str, usage: Dict[str, int]) -> float:
+    """usage의 추정 비용 (USD, 가격 정보가 없는 모델은 0)"""
+    price = model_price(model)
+    if price is None:
+        return 0.0
+    input_price, cached_price, output_price = price
+    cached = usage.get('cached_tokens', 0)
+    uncached = max(0, usage.get('prompt_tokens', 0) - cached)
+    return (uncached * input_price + cached * cached_price + usage.get('completion_tokens', 0) * output_price) / 1_000_000
+
+
+def needs_escalation(verdict: str, item: Dict[str, Any],
+                     threshold: float = CASCADE_ESCALATE_CONFIDENCE,
+                     escalate_borderline: bool = CASCADE_ESCALATE_BORDERLINE) -> bool:
+    """
+    작은 모델의 판단을 큰 모델로 다시 확인해야 하는지 여부
+
+    Args:
+        verdict (str): 작은 모델의 분류 ("excluded", "borderline", "retained")
+        item (Dict[str, Any]): 분류 결과 항목 ("confidence" 0~1 포함)
+        threshold (float): 이보다 확신도가 낮으면 재판단
+        escalate_borderline (bool): 보류 항목은 확신도와 관계없이 재판단
+
+    Returns:
+        bool: 재판단 필요 여부 (확신도가 없거나 잘못된 값이면 재판단)
+    """
+    if escalate_borderline and verdict == "borderline":
+        return True
+    try:
+        confidence = float(item.get('confidence'))
+    except (TypeError, ValueError):
+        return True
+    return not 0.0 <= confidence <= 1.0 or confidence < threshold
+
+
+class ModelUsageStats:
+    """단계×모델별 호출 수/토큰/추정 비용/소요 시간과 1단계 재판단 비율 누적 집계"""
+
+    _FIELDS = ('calls', 'prompt_tokens', 'cached_tokens', 'completion_tokens', 'cost', 'seconds')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[Tuple[Any, str], Dict[str, float]] = {}
+        self._cascade = {'triaged': 0, 'escalated': 0}
+
+    def _entry(self, stage: Any, model: str) -> Dict[str, float]:
+        return self._stats.setdefault((stage, model), {key: 0 for key in self._FIELDS})
+
+    def record(self, stage: Any, model: str, response: Any, seconds: float) -> Dict[str, int]:
+        """응답 usage와 소요 시간을 단계×모델별로 누적하고 해당 호출의 usage를 반환"""
+        usage = extract_usage(response)
+        cost = estimate_cost(model, usage)
+        with self._lock:
+            entry = self._entry(stage, model)
+            entry['calls'] += 1
+            for key, value in usage.items():
+                entry[key] += value
+            entry['cost'] += cost
+            entry['seconds'] += seconds
+        return usage
+
+    def record_escalation(self, triaged: int, escalated: int):
+        """1단계 캐스케이드에서 작은 모델이 분류한 기사 수와 큰 모델로 재판단한 기사 수"""
+        with self._lock:
+            self._cascade['triaged'] += triaged
+            self._cascade['escalated'] += escalated
+
+    def merge(self, summary: Dict[str, Any]):
+        """다른 프로세스에서 집계한 summary() 결과를 누적 (백그라운드 작업용)"""
+        with self._lock:
+            for row in summary.get('models', []):
+                entry = self._entry(row['stage'], row['model'])
+                for key in self._FIELDS:
+                    entry[key] += row.get(key, 0)
+            for key in self._cascade:
+                self._cascade[key] += int(summary.get('cascade', {}).get(key, 0))
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self._cascade = {key: 0 for key in self._cascade}
+
+    def summary(self) -> Dict[str, Any]:
+        """단계×모델별 집계 목록과 합계 (pickle 가능한 dict)"""
+        with self._lock:
+            models = [{'stage': stage, 'model': model, **entry} for (stage, model), entry in self._stats.items()]
+            cascade = dict(self._cascade)
+        return {
+            'models': models,
+            'total_cost': sum(row['cost'] for row in models),
+            'total_seconds': sum(row['seconds'] for row in models),
+            'cascade': cascade,
+        }
+
+    def report_lines(self) -> List[str]:
+        """출력용 단계×모델별 요약 문자열"""
+        summary = self.summary()
+        if not summary['models']:
+            return []
+        lines = []
+        for row in summary['models']:
+            lines.append(
+                f"{STAGE_LABELS.get(row['stage'], row['stage'])} [{row['model']}]: 호출 {row['calls']}회, "
+                f"입력 {row['prompt_tokens']:,} / 출력 {row['completion_tokens']:,} 토큰, "
+                f"${row['cost']:.4f}, {row['seconds']:.1f}초"
+            )
+        lines.append(f"합계: ${summary['total_cost']:.4f}, LLM 대기 {summary['total_seconds']:.1f}초")
+        cascade = summary['cascade']
+        if cascade['triaged']:
+            lines.append(
+                f"1단계 캐스케이드: 작은 모델 {cascade['triaged']}건 중 {cascade['escalated']}건 재판단 "
+                f"({cascade['escalated'] / cascade['triaged']:.1%})"
+            )
+        return lines
+
+
+# 전역 집계 인스턴스 (news_ai의 LLM 호출이 기록, 파이프라인 종료 시 state["model_usage"]에 저장)
+model_usage = ModelUsageStats()
@@ -1,16 +1,27 @@
-from typing import List, Dict, Any, TypedDict
-from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
-from langchain_openai import ChatOpenAI
-from langgraph.graph import StateGraph, END
+from functools import lru_cache
+from typing import List, Dict, Any, Optional, TypedDict
 from googlenews import GoogleNews
-from web_scraper import NewsWebScraper
+from text_cleaner import clean_html
+from content_budget import budget_article, count_tokens, DEFAULT_TOKEN_BUDGET
+from prompt_layout import build_prompt, cache_stats, format_usage, total_tokens
+from article_summary import ArticleSummary
+from news_item import NewsItem
+from press_index import get_press_index, parse_press_config
+from query_planner import QueryPlanner
+from collection_state import CollectionStateStore, collection_scope, published_timestamp
+from config import STAGE1_MODEL_CONFIDENCE, STAGE1_VERDICT_LOG, WATERMARK_OVERLAP_HOURS
+from region_health import format_region_health, region_health
+from relevance_filter import RelevanceFilter, prefilter_stats
+from verdict_model import VERDICT_LABELS, load_stage1_model, log_stage1_verdicts
+from hedging import hedging
+from model_cascade import model_usage, needs_escalation, stage_model
+from llm_governor import RateLimitExceeded, governed_call, backoff_delay
 import operator
 import dotenv
 import json
-import re
 import os
 from datetime import datetime, timedelta, timezone
-import streamlit as st
+import sys
 import time
 from urllib.parse import urlparse
 
@@ -20,9 +31,18 @@ dotenv.load_dotenv(override=True) #pwc
 # 한국 시간대(KST) 정의
 KST = timezone(timedelta(hours=9))
 
+# langchain/langgraph/streamlit은 임포트 비용이 커서 실제로 사용하는 함수 안에서 임포트합니다
+# (배치 CLI와 작업 프로세스의 시작 시간 단축).
+def _show_error(message: str):
+    """오류 출력 (Streamlit 앱에서 실행 중이면 화면에도 표시)"""
+    print(message)
+    st = sys.modules.get("streamlit")
+    if st is not None:
+        st.error(message)
+
 # 상태 타입 정의
 class AgentState(TypedDict):
-    news_data: List[dict]
+    news_data: List[NewsItem]
     filtered_news: List[dict]
     analysis: str
     keyword: str
@@ -43,7 +63,7 @@ class AgentState(TypedDict):
     user_prompt_3: str
     llm_response_3: str
     not_selected_news: List[dict]
-    original_news_data: List[dict]
+    original_news_data: List[NewsItem]
     start_datetime: datetime
     end_datetime: datetime
 
@@ -68,19 +88,127 @@ TRUSTED_PRESS_ALIASES = {
     "헤럴드경제": ["헤럴드경제", "herald", "heraldcorp", "heraldcorp.com"]
 }
 
+# 단계별 고정 프롬프트 (지시문/응답 형식은 앞, 뉴스 목록 등 가변 데이터는 뒤 - 프롬프트 캐싱용)
+EXCLUSION_INSTRUCTION = """아래 뉴스 목록을 분석하여 제외/보류/유지로 분류해주세요.
+각 뉴스의 번호는 고유 식별자이므로 변경하지 말고 그대로 응답에 사용해주세요."""
+
+EXCLUSION_RESPONSE_FORMAT = """1. 제외/보류/유지 사유는 간단명료하게 작성
+2. 응답은 완전한 JSON 형식이어야 함
+
+다음과 같은 JSON 형식으로 응답해주세요:
+{
+  "excluded": [
+    {
+      "index": 1,
+      "title": "뉴스 제목",
+      "reason": "제외 사유"
+    }
+  ],
+  "borderline": [
+    {
+      "index": 2,
+      "title": "뉴스 제목",
+      "reason": "보류 사유"
+    }
+  ],
+  "retained": [
+    {
+      "index": 3,
+      "title": "뉴스 제목",
+      "reason": "유지 사유"
+    }
+  ]
+}"""
+
+# 캐스케이드 1단계(작은 모델)에서 추가로 요청하는 기사별 확신도
+EXCLUSION_CONFIDENCE_FORMAT = """각 항목에 "confidence" 필드(0~1 사이 숫자)를 추가해 분류에 대한 확신도를 표시해주세요.
+제외 기준에 해당하는지 애매하거나 제목만으로 판단하기 어려우면 낮게 표시합니다.
+예: {"index": 1, "title": "뉴스 제목", "reason": "제외 사유", "confidence": 0.95}"""
+
+GROUPING_INSTRUCTION = """유사한 뉴스끼리 그룹으로 묶고, 각 그룹에서 가장 대표성 있는 뉴스 1건만 선택해 주세요.
+주어진 인덱스 번호를 정확히 사용해주세요. 인덱스 번호를 임의로 변경하지 마세요."""
+
+GROUPING_RESPONSE_FORMAT = """다음과 같은 JSON 형식으로 응답해주세요:
+{
+  "groups": [
+    {
+      "indices": [2, 4],
+      "selected_index": 2,
+      "reason": "동일한 회원권 관련 보도이며, 2번이 더 자세하고 언론사 우선순위가 높음"
+    },
+    {
+      "indices": [5],
+      "selected_index": 5,
+      "reason": "단독 기사"
+    }
+  ]
+}"""
+
+EVALUATION_INSTRUCTION = """아래 기사들에 대해 중요도를 평가하고, 모든 뉴스에 대해 평가 결과를 알려주세요.
+중요도 '상' 또는 '중'인 뉴스는 최종 선정하고, '하'인 뉴스는 선정하지 않습니다."""
+
+EVALUATION_RESPONSE_FORMAT = """1. 중요도는 "상", "중", "하" 중 하나로 평가
+2. 미선정 사유는 간단명료하게 작성
+3. 응답은 완전한 JSON 형식이어야 함
+
+다음과 같은 JSON 형식으로 응답해주세요:
+{
+  "final_selection": [
+        {
+            "index": 2,
+            "title": "뉴스 제목",
+            "importance": "상",
+            "reason": "선정 사유",
+            "keywords": ["키워드1", "키워드2"],
+            "affiliates": ["계열사1", "계열사2"],
+            "press": "언론사명",
+            "date": "발행일"
+        }
+  ],
+  "not_selected": [
+    {
+      "index": 3,
+      "title": "뉴스 제목",
+      "importance": "하",
+      "reason": "미선정 사유"
+    }
+  ]
+}"""
+
+# 헬퍼 함수: LLM 클라이언트 (모델/온도/타임아웃별로 1개만 생성해 HTTP 연결 풀 재사용)
+@lru_cache(maxsize=None)
+def _get_chat_model(model: str, temperature: float, request_timeout: Optional[int] = None):
+    from langchain_openai import ChatOpenAI
+
+    return ChatOpenAI(
+        model=model,
+        temperature=temperature,
+        request_timeout=request_timeout,
+        max_retries=0,  # 재시도는 llm_governor에서 처리
+        openai_api_key=os.getenv("OPENAI_API_KEY"),
+        openai_api_base=os.getenv("OPENAI_BASE_URL")
+    )
+
+# 헬퍼 함수: 원문 추출용 웹 스크래퍼 (작업 프로세스 내 키워드 간 재사용)
+@lru_cache(maxsize=1)
+def _get_web_scraper():
+    from web_scraper import HybridNewsWebScraper
+
+    return HybridNewsWebScraper(
+        openai_api_key=os.getenv('OPENAI_API_KEY'),
+        enable_ai_fallback=True  # AI 폴백 활성화
+    )
+
 # 헬퍼 함수: LLM 호출
-def call_llm(state: AgentState, system_prompt: str, user_prompt: str, stage: int = 1) -> str:
-    """LLM을 호출하고 응답을 반환하는 함수"""
+def call_llm(state: AgentState, system_prompt: str, user_prompt: str, stage: int = 1,
+             model: Optional[str] = None) -> str:
+    """LLM을 호출하고 응답을 반환하는 함수 (model을 주지 않으면 단계별 모델 사용)"""
     try:
-        # LLM 초기화
-        llm = ChatOpenAI(
-           # openai_api_key=os.getenv("OPENAI_API_KEY"), #pwc
-            #openai_api_base=os.getenv("OPENAI_BASE_URL"), #pwc
-            #model_name = "openai.gpt-4.1-2025-04-14",
-            model_name=state.get("model", "gpt-5"),
-            temperature=0.1,
-            #max_tokens=2000
-        )
+        from langchain_core.messages import HumanMessage, SystemMessage
+
+        # LLM 클라이언트 (모델별로 프로세스 내에서 재사용)
+        model = model or stage_model(state, stage)
+        llm = _get_chat_model(model, temperature=0.1)
 
         # 메시지 구성
         messages = [
@@ -106,9 +234,19 @@ def call_llm(state: AgentState, system_prompt: str, user_prompt: str, stage: int
         print("\n[User Prompt]:")
         print(user_prompt)
 
-        # LLM 호출
-        result = llm.invoke(messages).content
-        
+        # LLM 호출 (llm_governor로 속도 제한/재시도, usage에서 캐시 적중 토큰과 모델별 비용/지연 집계)
+        started = time.monotonic()
+        response = governed_call(
+            lambda: llm.invoke(messages),
+            model=model,
+            tokens=count_tokens(system_prompt + user_prompt, model) + 2000,
+            stage=stage,
+            usage_fn=total_tokens
+        )
+        model_usage.record(stage, model, response, time.monotonic() - started)
+        result = response.content
+        print(format_usage(stage, cache_stats.record(stage, response)))
+
         # 응답 저장
         if stage == 1:
             state["llm_response_1"] = result
@@ -123,7 +261,7 @@ def call_llm(state: AgentState, system_prompt: str, user_prompt: str, stage: int
         return result
     
     except Exception as e:
-        st.error(f"LLM 호출 중 오류가 발생했습니다: {str(e)}")
+        _show_error(f"LLM 호출 중 오류가 발생했습니다: {str(e)}")
         return ""
 
 # 헬퍼 함수: JSON 파싱
@@ -165,6 +303,14 @@ def parse_json_response(response: str) -> dict:
         print(f"원본 응답: {response}")
         raise e
 
+# 증분 수집 상태 저장소 (DB를 열 수 없으면 전체 수집으로 진행)
+def _open_collection_store():
+    try:
+        return CollectionStateStore()
+    except Exception as e:
+        print(f"수집 상태 DB를 열 수 없어 전체 수집으로 진행합니다: {e}")
+        return None
+
 # 뉴스 수집기 함수
 def collect_news(state: AgentState) -> AgentState:
     """뉴스를 수집하는 함수"""
@@ -191,43 +337,57 @@ def collect_news(state: AgentState) -> AgentState:
         # 모든 키워드에 대한 뉴스 수집
         all_news_data = []
         
-        # 키워드 언어별 지역 매핑
-        def is_korean_keyword(keyword):
-            """한국어 키워드인지 판단"""
-            # 한글이 포함되어 있으면 한국어 키워드
-            return bool(re.search(r'[가-힣]', keyword))
+        # 검색 계획: 키워드 문자 체계/과거 수집량으로 지역을 고르고 같은 지역 키워드는 OR 쿼리로 병합
+        # (query_regions_by_script가 있으면 설정 대신 사용 - 벤치마크에서 지역 수 조절)
+        planner = QueryPlanner(regions_by_script=state.get("query_regions_by_script"), page_size=max_results)
+        planned_queries = planner.plan(keywords_to_search)
+        print(f"검색 계획: 키워드 {len(keywords_to_search)}개 → RSS 요청 {len(planned_queries)}개")
         
-        def get_target_regions(keyword):
-            """키워드에 따른 대상 지역 반환"""
-            # 모든 키워드에 대해 미국에서만 검색
-            return ["미국","일본"]
+        # 증분 수집: 키워드 × 지역별 워터마크 이후만 검색 (워터마크는 파이프라인 종료 후 news_pipeline에서 기록)
+        collection_store = _open_collection_store() if state.get("incremental_collection") else None
+        watermarks = collection_store.watermarks(keywords_to_search) if collection_store else {}
+        new_watermarks = {}
         
-        # 각 키워드별로 뉴스 검색 및 결과 병합 (언어별 지역 최적화)
-        for kw in keywords_to_search:
-            target_regions = get_target_regions(kw)
-            keyword_type = "한국어" if is_korean_keyword(kw) else "영어"
-            
-            print(f"키워드 '{kw}' ({keyword_type}) 검색 중... 대상 지역: {', '.join(target_regions)}")
-            
-            # 각 대상 지역에서 뉴스 검색
-            keyword_results = []
-            for region in target_regions:
-                region_results = news.search_by_keyword(kw, k=max_results, region=region)  # 각 지역에서 max_results 개씩
-                keyword_results.extend(region_results)
-                print(f"  - {region}에서 {len(region_results)}개 뉴스 수집")
-            
-            all_news_data.extend(keyword_results)
-            print(f"키워드 '{kw}' 총 검색 결과: {len(keyword_results)}개")
-            
-            # 지역별 분포 출력
-            region_count = {}
-            for item in keyword_results:
-                region = item.get("region", "알 수 없음")
-                region_count[region] = region_count.get(region, 0) + 1
-            
-            if region_count:
-                region_summary = ", ".join([f"{region}:{count}" for region, count in region_count.items()])
-                print(f"  지역별 분포: {region_summary}")
+        region_count = {}
+        pending_queries = list(planned_queries)
+        while pending_queries:
+            planned = pending_queries.pop(0)
+            query_start = start_datetime
+            if collection_store:
+                query_start = collection_store.query_start(planned.keywords, planned.region, start_datetime,
+                                                           watermarks, timedelta(hours=WATERMARK_OVERLAP_HOURS))
+            print(f"'{planned.query}' 검색 중... 대상 지역: {planned.region}")
+            # 검색 기간은 쿼리 연산자로 서버에 전달 (아래 로컬 날짜 필터는 안전장치로 유지)
+            region_results = news.search_by_keyword(planned.query, k=max_results, region=planned.region,
+                                                    start_datetime=query_start, end_datetime=end_datetime)
+            # OR 쿼리가 한 페이지를 꽉 채우면 결과가 잘렸을 수 있으므로 키워드별 단독 요청으로 다시 검색
+            retry_queries = planner.split_truncated(planned, region_results)
+            if retry_queries:
+                print(f"  - 결과 {len(region_results)}개로 페이지가 가득 차 키워드별로 다시 검색합니다.")
+                pending_queries[:0] = retry_queries
+                continue
+            planner.record(planned, region_results)
+            if collection_store:
+                published = [ts for ts in (published_timestamp(item.get('date', '')) for item in region_results) if ts]
+                if published:
+                    for kw in planned.keywords:
+                        key = (kw, planned.region)
+                        new_watermarks[key] = max(new_watermarks.get(key, 0), max(published))
+            all_news_data.extend(region_results)
+            region_count[planned.region] = region_count.get(planned.region, 0) + len(region_results)
+            print(f"  - {planned.region}에서 {len(region_results)}개 뉴스 수집")
+        
+        # 지역별 분포 출력
+        if region_count:
+            region_summary = ", ".join([f"{region}:{count}" for region, count in region_count.items()])
+            print(f"지역별 분포: {region_summary}")
+        
+        # 지역별 RSS 상태 (요청/실패/차단으로 건너뜀, 차단기 상태) - 실행 요약용으로 상태에도 저장
+        state["region_health"] = news.run_stats.summary(region_health)
+        for line in format_region_health(state["region_health"]):
+            print(line)
+        if hedging.enabled:
+            print(f"요청 헤징: {hedging.stats()}")
         
         # 중복 URL 제거 (같은 URL이면 중복으로 간주)
         unique_urls = set()
@@ -251,7 +411,7 @@ def collect_news(state: AgentState) -> AgentState:
             print(f"   URL: {news.get('url', 'URL 없음')[:80]}...")
             print("---")
         
-        # 날짜 필터링
+        # 날짜 필터링 (서버 기간 연산자는 일/시간 단위이므로 정확한 시각 범위는 여기서 확인)
         if start_datetime and end_datetime:
             print(f"\n=== 날짜 필터링 시작 ===")
             print(f"필터링 범위: {start_datetime} ~ {end_datetime}")
@@ -351,12 +511,24 @@ def collect_news(state: AgentState) -> AgentState:
             print(f"날짜 범위 외: {date_parsing_stats['out_of_range']}개")
             print(f"최종 필터링된 뉴스: {len(unique_news_data)}개")
         
+        # 증분 수집: 이전 실행에서 판단한 기사는 제외하고 이전 판단을 이어받음 (보고서 표시용)
+        if collection_store:
+            scope = collection_scope(keywords_to_search)
+            previous = collection_store.previous_verdicts(scope, unique_news_data)
+            state["carried_news"] = [
+                {**news_item, "previous_verdict": verdict[0], "previous_reason": verdict[1]}
+                for news_item, verdict in zip(unique_news_data, previous) if verdict
+            ]
+            unique_news_data = [news_item for news_item, verdict in zip(unique_news_data, previous) if not verdict]
+            state["collection_watermarks"] = new_watermarks
+            print(f"증분 수집: 새 기사 {len(unique_news_data)}개, 이전 판단 재사용 {len(state['carried_news'])}개")
+        
         # 원래 인덱스 추가
         for i, news_item in enumerate(unique_news_data, 1):
             news_item['original_index'] = i
         
-        # 원본 뉴스 데이터 저장
-        state["original_news_data"] = unique_news_data.copy()
+        # 원본 뉴스 데이터 저장 (목록만 새로 만들고 기사 객체는 참조를 공유)
+        state["original_news_data"] = list(unique_news_data)
         # 필터링할 뉴스 데이터 저장
         state["news_data"] = unique_news_data
         
@@ -404,44 +576,102 @@ def filter_valid_press_original(state: AgentState) -> AgentState:
     """유효 언론사 필터링 - 원본 함수 (필요시 복구용)"""
     news_data = state.get("news_data", [])
     
-    # UI에서 설정한 유효 언론사 목록 가져오기
+    # UI에서 설정한 유효 언론사 목록 가져오기 (문자열이면 eval 없이 파싱, 딕셔너리면 그대로 사용)
     valid_press_dict_str = state.get("valid_press_dict", "")
-    
-    # UI 설정 값이 문자열이면 딕셔너리로 파싱
-    valid_press_config = {}
-    if isinstance(valid_press_dict_str, str) and valid_press_dict_str.strip():
-        print("\n[DEBUG] UI에서 설정한 언론사 문자열 파싱 시작")
-        try:
-            # 문자열에서 딕셔너리 파싱
-            lines = valid_press_dict_str.strip().split('\n')
-            for line in lines:
-                line = line.strip()
-                if line and ': ' in line:
-                    press_name, aliases_str = line.split(':', 1)
-                    try:
-                        # 문자열 형태의 리스트를 실제 리스트로 변환
-                        aliases = eval(aliases_str.strip())
-                        valid_press_config[press_name.strip()] = aliases
-                        print(f"[DEBUG] 파싱 성공: {press_name.strip()} -> {aliases}")
-                    except Exception as e:
-                        print(f"[DEBUG] 파싱 실패: {line}, 오류: {str(e)}")
-        except Exception as e:
-            print(f"[DEBUG] 전체 파싱 실패: {str(e)}")
-    # UI 설정 값이 이미 딕셔너리면 그대로 사용
-    elif isinstance(valid_press_dict_str, dict):
+    if isinstance(valid_press_dict_str, dict):
         valid_press_config = valid_press_dict_str
         print("\n[DEBUG] UI에서 설정한 언론사 딕셔너리 직접 사용")
+    else:
+        valid_press_config = parse_press_config(valid_press_dict_str)
     
     # 파싱 결과가 비어있으면 기본값 사용
     if not valid_press_config:
         print("\n[DEBUG] 유효한 설정을 찾을 수 없어 기본값 사용")
         valid_press_config = TRUSTED_PRESS_ALIASES
 
+    # 언론사명/도메인 인덱스로 기사마다 O(1) 매칭
+    press_index = get_press_index(valid_press_config)
+    valid_news = []
+    for news in news_data:
+        press = press_index.match_news(news)
+        if press:
+            # 핵심 필드는 불변이므로 언론사명을 바꾼 새 항목 생성 (원본 목록의 기사는 그대로)
+            valid_news.append(NewsItem.from_dict(news).with_press(press))
+
+    print(f"\n유효 언론사 필터링: {len(news_data)}개 중 {len(valid_news)}개 유지")
+    state["news_data"] = valid_news
     return state
 
+# 기사 요약 공통 프롬프트 (단건/배치 요약이 공유)
+SUMMARY_SYSTEM_PROMPT = "당신은 자동차 산업 분석 전문가입니다. 뉴스 기사를 현대자동차 연구개발 관점에서 요약하는 작업을 수행합니다."
+
+SUMMARY_ROLE_PROMPT = """다"당신은 자동차 PT/전동화 전문 기사 요약 전문가입니다. 주어진 형식에 맞춰 정확하고 간결하게 요약해주세요.추론을 하지 말고 기사에 기반하여 요약하세요."""
+
+SUMMARY_INSTRUCTIONS = """[요약 요구사항]
+1. 결과물은 현대차 전동화/파워트레인 R&D 팀에서 매일 뉴스요약을 하는 데 활용됩니다. 
+2. 추론을 하지 말고 기사에 기반하여 요약하세요.
+3. 제목은 핵심적인 내용만 간결하게 한국어로 번역 (예: "Huawei's Aito M8 BEV officially launched at 50,000 USD with CATL battery and 705km range" → \\화웨이, CATL 배터리 탑재 Aito M8 BEV 공식 출시")
+4. 기업명은 한국기업 제외하고 모두 영문명으로 작성
+5. 세부 내용을 3개 항목으로 정리 
+6. 차량 명은 영문으로 <> 안에 넣기
+7. PT/전동화 관점에서 뉴스 기사 요약
+8. 출력은 HP 또는 PS로 전환, 전기차 출력은 kW로, 엔진토크는 kgmf, 전기차 토크는 Nm. 전환 후 수치에 대해서 소수점 둘째 자리에서 반올림
+
+
+[응답 형식]
+JSON 형식으로 응답해주세요:
+{
+  "title": "제목 한국어 번역",
+  "summary": "핵심 내용 1문장 요약",
+  "details": [
+    "세부 내용 1",
+    "세부 내용 2", 
+    "세부 내용 3"
+  ]
+}
+
+[예시1]
+{
+  "title": "VW, BEV (ID. 시리즈) 가격 동결",
+  "summary": "폭스바겐이 '26년식부터 ID. 시리즈, T-Roc 등 BEV는 연례 가격 인상에서 제외, ICE는 평균 1.5% 인상 예정",
+  "details": [
+    "작년 '25년식 출시 모델에 대한 가격 연례 인상 시 ICE가격 2.1%에서 3.2%로 인상 및 BEV 가격은 동결한 것과 유사 행보",
+    "올해 독일 내 VW 판매 차종 5대 중 1대는 BEV 모델인 점 등 시장 침투율 고려하여 BEV 가격 경쟁력 유지 및 소비자 부담 절감 목표",
+    "다만 동결한 BEV 가격의 경우 정가에만 해당하며 외관 컬러, 스포츠·디자인 패키지 등 개별 추가 옵션의 가격은 상향 예정",
+  ]
+}
+
+[예시2]
+{
+  "title": "Renault, Geely GEA 플랫폼 기반 BEV/PHEV SUV 개발 추진",
+  "summary": "GEA는 2024년에 도입된 Geely의 최신 Global Intelligent New Energy Architecture 플랫폼",
+  "details": [
+    "차체(드롭사이드, 패널밴 플러스, L-파티션 패널밴) 및 PT 옵션(디젤, BEV, PHEV) 다양화",
+    "e-Transporter는 Ford Pro와 공동 개발 결과로, 포드 e-Transit Custom과 동일 플랫폼 적용, 터키 코자엘리에서 생산되며, 화물·승객 겸용 및 건설·특수 목적 맞춤 사양 선택 지원",
+    "BEV버전은 64kWh 배터리 탑재 및 3가지 모터 사양(100kW/160kW/210kW), AER 279~353km",
+  ]
+}
+
+[중요] 모든 문장은 한국어로 작성할 것.  
+[중요] 문체는 자연스러운 보고서 요약체(예: ~함, ~임, ~음)로 작성할 것.  
+"""
+
+SUMMARY_BATCH_INSTRUCTIONS = """[배치 응답 형식]
+여러 기사를 한 번에 요약합니다. 각 기사는 [기사 id=번호] 블록으로 주어집니다.
+기사마다 위 요구사항과 응답 형식을 그대로 적용하고, 결과는 JSON 배열로만 응답해주세요.
+각 원소에는 해당 기사의 id를 반드시 포함하세요:
+[
+  {"id": 1, "title": "제목 한국어 번역", "summary": "핵심 내용 1문장 요약", "details": ["세부 내용 1", "세부 내용 2", "세부 내용 3"]}
+]
+"""
+
+# 배치 요약 기본값
+DEFAULT_SUMMARY_BATCH_TOKEN_BUDGET = 6000
+DEFAULT_SUMMARY_BATCH_SIZE = 5
+
 # 추가 단계: 선정된 뉴스 원문 요약
 def summarize_selected_articles(state: AgentState) -> AgentState:
-    """선정된 뉴스 기사의 원문을 스크래핑하고 요약"""
+    """선정된 뉴스 기사의 원문을 스크래핑하고 요약 (배치 모드에서는 여러 기사를 한 번의 LLM 호출로 요약)"""
     try:
         final_selection = state.get("final_selection", [])
         
@@ -451,19 +681,11 @@ def summarize_selected_articles(state: AgentState) -> AgentState:
         
         print(f"\n=== 선정된 {len(final_selection)}개 기사 원문 요약 시작 ===")
         
-        # 하이브리드 웹 스크래퍼 초기화 (AI 폴백 활성화)
-        from web_scraper import HybridNewsWebScraper
-        import os
-        
-        # 환경변수에서 OpenAI API 키 가져오기
-        openai_api_key = os.getenv('OPENAI_API_KEY')
-        scraper = HybridNewsWebScraper(
-            openai_api_key=openai_api_key,
-            enable_ai_fallback=True  # AI 폴백 활성화
-        )
+        # 하이브리드 웹 스크래퍼 (AI 폴백 활성화, 프로세스 내 재사용)
+        scraper = _get_web_scraper()
         
-        # 각 선정된 뉴스의 원문 추출 및 요약
-        summarized_articles = []
+        # 1) 각 선정된 뉴스의 원문 추출
+        extraction_results = []
         
         for i, news in enumerate(final_selection, 1):
             url = news.get('url', '')
@@ -472,43 +694,65 @@ def summarize_selected_articles(state: AgentState) -> AgentState:
             print(f"\n[{i}/{len(final_selection)}] 기사 원문 추출 중: {title}")
             
             # 원문 추출 (새로운 ExtractionResult 객체 반환)
-            extraction_result = scraper.extract_content(url, timeout=15)
+            extraction_results.append(scraper.extract_content(url, timeout=15))
             
-            if extraction_result.success and extraction_result.content:
-                # AI 요약 생성
-                summary = _generate_article_summary(
-                    extraction_result.content, 
-                    title, 
-                    state.get("system_prompt_3", "")
+            # 요청 간 지연 (서버 부하 방지)
+            if i < len(final_selection):
+                time.sleep(1)
+        
+        # 2) 추출 성공 기사 요약 (배치 또는 단건)
+        token_budget = state.get("article_token_budget", DEFAULT_TOKEN_BUDGET)
+        articles_to_summarize = [
+            {'id': i, 'title': news.get('title', ''), 'content': result.content}
+            for i, (news, result) in enumerate(zip(final_selection, extraction_results), 1)
+            if result.success and result.content
+        ]
+        
+        if state.get("summary_batch_mode", True) and len(articles_to_summarize) > 1:
+            summaries = _generate_batch_summaries(
+                articles_to_summarize,
+                token_budget=token_budget,
+                batch_token_budget=state.get("summary_batch_token_budget", DEFAULT_SUMMARY_BATCH_TOKEN_BUDGET),
+                max_batch_size=state.get("summary_batch_size", DEFAULT_SUMMARY_BATCH_SIZE)
+            )
+        else:
+            summaries = {
+                article['id']: _summarize_article(
+                    article['content'],
+                    article['title'],
+                    token_budget=token_budget
                 )
-                
-                # 요약 결과 추가
-                news_with_summary = news.copy()
+                for article in articles_to_summarize
+            }
+        
+        # 3) 요약 결과 조립
+        summarized_articles = []
+        
+        for i, (news, extraction_result) in enumerate(zip(final_selection, extraction_results), 1):
+            title = news.get('title', '')
+            news_with_summary = news.copy()
+            
+            if i in summaries:
                 news_with_summary['full_content'] = extraction_result.content
-                news_with_summary['ai_summary'] = summary
+                # 구조화된 요약(보고서용)과 HTML 요약(화면 표시용)을 함께 보관
+                news_with_summary['article_summary'] = summaries[i]
+                news_with_summary['ai_summary'] = summaries[i].to_html()
                 news_with_summary['extraction_success'] = True
                 news_with_summary['extraction_method'] = extraction_result.method.value
                 news_with_summary['extraction_time'] = extraction_result.extraction_time
-                
-                summarized_articles.append(news_with_summary)
                 print(f"✅ 요약 완료: {title[:50]}... (방법: {extraction_result.method.value})")
-                
             else:
                 # 원문 추출 실패
                 error_msg = extraction_result.error_message if extraction_result else "알 수 없는 오류"
-                news_with_summary = news.copy()
                 news_with_summary['full_content'] = ""
                 news_with_summary['ai_summary'] = f"원문 추출 실패로 요약할 수 없습니다. ({error_msg})"
+                news_with_summary['article_summary'] = ArticleSummary.failed(news_with_summary['ai_summary'])
                 news_with_summary['extraction_success'] = False
                 news_with_summary['extraction_method'] = extraction_result.method.value if extraction_result else "unknown"
                 news_with_summary['extraction_time'] = extraction_result.extraction_time if extraction_result else 0
-                
-                summarized_articles.append(news_with_summary)
                 print(f"❌ 원문 추출 실패: {title[:50]}... ({error_msg})")
             
-            # 요청 간 지연 (서버 부하 방지)
-            if i < len(final_selection):
-                time.sleep(1)
+            summarized_articles.append(news_with_summary)
         
         # 결과 업데이트
         state["final_selection"] = summarized_articles
@@ -523,219 +767,314 @@ def summarize_selected_articles(state: AgentState) -> AgentState:
         print(f"기사 요약 중 오류 발생: {e}")
         return state
 
-def _generate_article_summary(content: str, title: str, system_prompt: str) -> str:
-    """AI를 사용해 기사 요약 생성"""
+def _invoke_summary_llm(user_prompt: str, model: str, max_tokens: int = 1000, request_timeout: int = 30) -> str:
+    """요약용 LLM 호출 (ChatOpenAI 실패 시 OpenAI 클라이언트로 직접 호출)"""
+    # OpenAI 클라이언트 초기화 (수정된 방식)
     try:
-        # 요약 프롬프트 먼저 정의
-        summary_prompt = f"""
-다"당신은 자동차 PT/전동화 전문 기사 요약 전문가입니다. 주어진 형식에 맞춰 정확하고 간결하게 요약해주세요.추론을 하지 말고 기사에 기반하여 요약하세요.
-
-[기사 제목]
-{title}
+        from langchain_core.messages import HumanMessage, SystemMessage
 
-[기사 본문]
-{content}
-
-[요약 요구사항]
-1. 결과물은 현대차 전동화/파워트레인 R&D 팀에서 매일 뉴스요약을 하는 데 활용됩니다. 
-2. 추론을 하지 말고 기사에 기반하여 요약하세요.
-3. 제목은 핵심적인 내용만 간결하게 한국어로 번역 (예: "Huawei's Aito M8 BEV officially launched at 50,000 USD with CATL battery and 705km range" → \화웨이, CATL 배터리 탑재 Aito M8 BEV 공식 출시")
-4. 기업명은 한국기업 제외하고 모두 영문명으로 작성
-5. 세부 내용을 3개 항목으로 정리 
-6. 차량 명은 영문으로 <> 안에 넣기
-7. PT/전동화 관점에서 뉴스 기사 요약
-8. 출력은 HP 또는 PS로 전환, 전기차 출력은 kW로, 엔진토크는 kgmf, 전기차 토크는 Nm. 전환 후 수치에 대해서 소수점 둘째 자리에서 반올림
+        llm = _get_chat_model(model, temperature=0.3, request_timeout=request_timeout)
+        
+        messages = [
+            SystemMessage(content=SUMMARY_SYSTEM_PROMPT),
+            HumanMessage(content=user_prompt)
+        ]
+        
+        estimated_tokens = count_tokens(SUMMARY_SYSTEM_PROMPT + user_prompt, model) + max_tokens
+        started = time.monotonic()
+        response = governed_call(lambda: llm.invoke(messages), model, estimated_tokens, "summary", total_tokens)
+        model_usage.record("summary", model, response, time.monotonic() - started)
+        print(format_usage("summary", cache_stats.record("summary", response)))
+        return response.content
 
+    except RateLimitExceeded:
+        # 조정기가 재시도를 모두 소진한 경우 - 같은 프롬프트를 다른 클라이언트로 다시 보내지 않음
+        raise
+    except Exception as e:
+        print(f"ChatOpenAI 초기화 또는 호출 실패: {e}")
+        # 간단한 OpenAI 클라이언트로 대체
+        from openai import OpenAI
+        client = OpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            base_url=os.getenv("OPENAI_BASE_URL"),
+            max_retries=0
+        )
+        
+        # 직접 API 호출
+        estimated_tokens = count_tokens(SUMMARY_SYSTEM_PROMPT + user_prompt, model) + max_tokens
+        started = time.monotonic()
+        response = governed_call(
+            lambda: client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+                    {"role": "user", "content": user_prompt}
+                ],
+                temperature=0.3,
+                max_tokens=max_tokens
+            ),
+            model, estimated_tokens, "summary", total_tokens
+        )
+        model_usage.record("summary", model, response, time.monotonic() - started)
+        print(format_usage("summary", cache_stats.record("summary", response)))
+        return response.choices[0].message.content
 
-[응답 형식]
-JSON 형식으로 응답해주세요:
-{{
-  "title": "제목 한국어 번역",
-  "summary": "핵심 내용 1문장 요약",
-  "details": [
-    "세부 내용 1",
-    "세부 내용 2", 
-    "세부 내용 3"
-  ]
-}}
+def _generate_article_summary(content: str, title: str, system_prompt: str,
+                              token_budget: int = DEFAULT_TOKEN_BUDGET, model: str = "gpt-4.1") -> str:
+    """AI를 사용해 기사 요약 생성 (본문은 토큰 예산 안에서 리드/수치 문단 우선 보존)"""
+    return _summarize_article(content, title, token_budget, model).to_html()
 
-[예시1]
-{{
-  "title": "VW, BEV (ID. 시리즈) 가격 동결",
-  "summary": "폭스바겐이 '26년식부터 ID. 시리즈, T-Roc 등 BEV는 연례 가격 인상에서 제외, ICE는 평균 1.5% 인상 예정",
-  "details": [
-    "작년 '25년식 출시 모델에 대한 가격 연례 인상 시 ICE가격 2.1%에서 3.2%로 인상 및 BEV 가격은 동결한 것과 유사 행보",
-    "올해 독일 내 VW 판매 차종 5대 중 1대는 BEV 모델인 점 등 시장 침투율 고려하여 BEV 가격 경쟁력 유지 및 소비자 부담 절감 목표",
-    "다만 동결한 BEV 가격의 경우 정가에만 해당하며 외관 컬러, 스포츠·디자인 패키지 등 개별 추가 옵션의 가격은 상향 예정",
-  ]
-}}
+def _summarize_article(content: str, title: str, token_budget: int = DEFAULT_TOKEN_BUDGET,
+                       model: str = "gpt-4.1") -> ArticleSummary:
+    """기사 1건 요약 후 응답을 한 번만 파싱해 ArticleSummary로 반환"""
+    try:
+        # 본문 토큰 예산 적용
+        content = budget_article(content, title, max_tokens=token_budget, model=model) or content[:2000]
 
-[예시2]
-{{
-  "title": "Renault, Geely GEA 플랫폼 기반 BEV/PHEV SUV 개발 추진",
-  "summary": "GEA는 2024년에 도입된 Geely의 최신 Global Intelligent New Energy Architecture 플랫폼",
-  "details": [
-    "차체(드롭사이드, 패널밴 플러스, L-파티션 패널밴) 및 PT 옵션(디젤, BEV, PHEV) 다양화",
-    "e-Transporter는 Ford Pro와 공동 개발 결과로, 포드 e-Transit Custom과 동일 플랫폼 적용, 터키 코자엘리에서 생산되며, 화물·승객 겸용 및 건설·특수 목적 맞춤 사양 선택 지원",
-    "BEV버전은 64kWh 배터리 탑재 및 3가지 모터 사양(100kW/160kW/210kW), AER 279~353km",
-  ]
-}}
-
-[중요] 모든 문장은 한국어로 작성할 것.  
-[중요] 문체는 자연스러운 보고서 요약체(예: ~함, ~임, ~음)로 작성할 것.  
-"""
+        # 요약 프롬프트 (고정 지시문/요구사항/예시 → 기사 제목/본문 순)
+        summary_prompt = build_prompt(
+            SUMMARY_ROLE_PROMPT,
+            static_sections=[("", SUMMARY_INSTRUCTIONS)],
+            data_sections=[("기사 제목", title), ("기사 본문", content)]
+        )
         
-        # OpenAI 클라이언트 초기화 (수정된 방식)
         try:
-            llm = ChatOpenAI(
-                #model="openai.gpt-4.1-2025-04-14",  #pwc
-                model="gpt-4.1",
-                temperature=0.3,
-                request_timeout=30,
-                openai_api_key=os.getenv("OPENAI_API_KEY"),
-                openai_api_base=os.getenv("OPENAI_BASE_URL")
-            )
-            
-            # AI 요약 생성
-            messages = [
-                SystemMessage(content="당신은 자동차 산업 분석 전문가입니다. 뉴스 기사를 현대자동차 연구개발 관점에서 요약하는 작업을 수행합니다."),
-                HumanMessage(content=summary_prompt)
-            ]
-            
-            response = llm.invoke(messages)
             # JSON 응답 파싱 및 포맷팅
-            summary_content = response.content
-            return _format_json_summary(summary_content)
+            summary_content = _invoke_summary_llm(summary_prompt, model)
             
-        except Exception as e:
-            print(f"ChatOpenAI 초기화 또는 호출 실패: {e}")
-            # 간단한 OpenAI 클라이언트로 대체
-            try:
-                from openai import OpenAI
-                client = OpenAI(
-                    api_key=os.getenv("OPENAI_API_KEY"),
-                    base_url=os.getenv("OPENAI_BASE_URL")
-                )
-                
-                # 직접 API 호출
-                response = client.chat.completions.create(
-                    model="gpt-4.1",
-                    messages=[
-                        {"role": "system", "content": "당신은 자동차 산업 분석 전문가입니다. 뉴스 기사를 현대자동차 연구개발 관점에서 요약하는 작업을 수행합니다."},
-                        {"role": "user", "content": summary_prompt}
-                    ],
-                    temperature=0.3,
-                    max_tokens=1000
-                )
-                # JSON 응답 파싱 및 포맷팅
-                summary_content = response.choices[0].message.content
-                return _format_json_summary(summary_content)
-                
-            except Exception as fallback_error:
-                print(f"OpenAI 직접 호출도 실패: {fallback_error}")
-                return f"요약 생성 실패: {str(fallback_error)}"
+        except Exception as fallback_error:
+            print(f"OpenAI 직접 호출도 실패: {fallback_error}")
+            return ArticleSummary.failed(f"요약 생성 실패: {str(fallback_error)}")
+        
+        return ArticleSummary.parse(summary_content)
         
     except Exception as e:
         print(f"AI 요약 생성 실패: {e}")
-        return f"요약 생성 실패: {str(e)}"
+        return ArticleSummary.failed(f"요약 생성 실패: {str(e)}")
 
-def _clean_html_tags(text: str) -> str:
-    """HTML 태그를 제거하고 깔끔한 텍스트로 변환"""
-    import re
-    
-    if not text:
-        return ""
+def _pack_summary_batches(articles: List[dict], batch_token_budget: int, max_batch_size: int, model: str) -> List[List[dict]]:
+    """기사들을 토큰 예산/최대 개수 안에서 배치로 묶음 (공통 헤더 토큰은 배치마다 1회만 계산)"""
+    header_tokens = count_tokens(SUMMARY_ROLE_PROMPT + SUMMARY_INSTRUCTIONS + SUMMARY_BATCH_INSTRUCTIONS, model)
+    batches = []
+    current = []
+    used = header_tokens
     
-    # HTML 태그 제거
-    text = re.sub(r'<[^>]+>', '', text)
+    for article in articles:
+        cost = count_tokens(article['title'], model) + count_tokens(article['content'], model) + 10
+        if current and (used + cost > batch_token_budget or len(current) >= max_batch_size):
+            batches.append(current)
+            current = []
+            used = header_tokens
+        current.append(article)
+        used += cost
     
-    # HTML 엔티티 변환
-    html_entities = {
-        '&amp;': '&',
-        '&lt;': '<',
-        '&gt;': '>',
-        '&quot;': '"',
-        '&#39;': "'",
-        '&nbsp;': ' '
-    }
-    
-    for entity, char in html_entities.items():
-        text = text.replace(entity, char)
+    if current:
+        batches.append(current)
+    return batches
+
+def _parse_batch_summary_response(response: str) -> Dict[int, dict]:
+    """배치 요약 응답(JSON 배열)을 기사 id별 딕셔너리로 변환"""
+    json_text = response.strip()
+    if json_text.startswith("```"):
+        json_text = "\n".join(json_text.split("\n")[1:])
+    if json_text.endswith("```"):
+        json_text = "\n".join(json_text.split("\n")[:-1])
     
-    # 연속된 공백과 줄바꿈 정리
-    text = re.sub(r'\s+', ' ', text)
-    text = re.sub(r'\n\s*\n', '\n\n', text)
+    # 배열 범위만 추출
+    start = json_text.find("[")
+    end = json_text.rfind("]")
+    if start == -1 or end == -1:
+        raise ValueError("배치 응답에서 JSON 배열을 찾을 수 없습니다.")
     
-    return text.strip()
+    items = json.loads(json_text[start:end + 1])
+    results = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        try:
+            article_id = int(item.get("id"))
+        except (TypeError, ValueError):
+            continue
+        results[article_id] = item
+    return results
+
+def _generate_batch_summaries(articles: List[dict], token_budget: int = DEFAULT_TOKEN_BUDGET,
+                              batch_token_budget: int = DEFAULT_SUMMARY_BATCH_TOKEN_BUDGET,
+                              max_batch_size: int = DEFAULT_SUMMARY_BATCH_SIZE,
+                              model: str = "gpt-4.1") -> Dict[int, ArticleSummary]:
+    """
+    여러 기사를 공통 지시문 1회 + 기사 블록 N개로 묶어 배치 요약합니다.
+    응답에서 누락되거나 형식이 잘못된 기사는 단건 요약으로 폴백합니다.
 
-def _format_json_summary(json_response: str) -> str:
-    """요약 JSON 응답을 HTML 형식으로 변환"""
-    import json
-    import re
+    Args:
+        articles (List[dict]): id, title, content를 포함한 기사 리스트
+        token_budget (int): 기사별 본문 토큰 예산
+        batch_token_budget (int): 배치 1회 요청의 입력 토큰 예산
+        max_batch_size (int): 배치당 최대 기사 수
+        model (str): 요약 모델
+
+    Returns:
+        Dict[int, ArticleSummary]: 기사 id별 요약
+    """
+    # 기사별 본문 토큰 예산 적용
+    budgeted = [
+        {**article, 'content': budget_article(article['content'], article['title'], max_tokens=token_budget, model=model) or article['content'][:2000]}
+        for article in articles
+    ]
+    batches = _pack_summary_batches(budgeted, batch_token_budget, max_batch_size, model)
+    print(f"\n=== 배치 요약: {len(articles)}개 기사 → {len(batches)}개 요청 ===")
     
-    try:
-        # JSON 응답에서 코드 블록 제거
-        json_text = json_response.strip()
-        if json_text.startswith("```json"):
-            json_text = json_text[7:]
-        if json_text.startswith("```"):
-            json_text = "\n".join(json_text.split("\n")[1:])
-        if json_text.endswith("```"):
-            json_text = "\n".join(json_text.split("\n")[:-1])
-        
-        json_text = json_text.strip()
-        
-        # JSON 정리 - 불필요한 공백과 줄바꿈 제거
-        json_text = re.sub(r'\s+', ' ', json_text)  # 연속된 공백을 하나로
-        json_text = re.sub(r'"\s*,\s*"', '", "', json_text)  # 쉼표 주변 정리
-        json_text = re.sub(r'{\s+', '{', json_text)  # 중괄호 뒤 공백 제거
-        json_text = re.sub(r'\s+}', '}', json_text)  # 중괄호 앞 공백 제거
-        json_text = re.sub(r'\[\s+', '[', json_text)  # 대괄호 뒤 공백 제거
-        json_text = re.sub(r'\s+\]', ']', json_text)  # 대괄호 앞 공백 제거
-        
-        # JSON 파싱 시도
+    summaries = {}
+    round_trips = 0
+    fallback_count = 0
+    
+    for batch_no, batch in enumerate(batches, 1):
+        article_blocks = "\n\n".join(
+            f"[기사 id={article['id']}]\n[기사 제목]\n{article['title']}\n\n[기사 본문]\n{article['content']}"
+            for article in batch
+        )
+        batch_prompt = build_prompt(
+            SUMMARY_ROLE_PROMPT,
+            static_sections=[("", SUMMARY_INSTRUCTIONS), ("", SUMMARY_BATCH_INSTRUCTIONS)],
+            data_sections=[("", article_blocks)]
+        )
+        parsed = {}
+        rate_limited = None
+        # 실패한 요청도 LLM 호출 횟수에 포함
+        round_trips += 1
         try:
-            summary_data = json.loads(json_text)
-        except json.JSONDecodeError as e:
-            print(f"첫 번째 JSON 파싱 시도 실패: {e}")
-            # JSON 복구 시도
-            # 잘못된 따옴표나 이스케이프 문제 수정
-            json_text = json_text.replace('\\"', '"')  # 이중 이스케이프 수정
-            json_text = re.sub(r'(?<!\\)"(?![,\]\}:\s])', '\\"', json_text)  # 문자열 내부 따옴표 이스케이프
-            summary_data = json.loads(json_text)
-        
-        # HTML 형식으로 변환
-        title_korean = summary_data.get('title', '제목 없음')
-        summary_oneline = summary_data.get('summary', '요약 없음')
-        details = summary_data.get('details', [])
-        
-        # HTML 포맷팅
-        html_content = f"""
-<div style="margin-bottom: 15px;">
-    <h4 style="color: #333; margin-bottom: 10px; font-size: 1.2em; font-weight: bold;">{title_korean}</h4>
-    <div style="background-color: #f0f8ff; padding: 12px; border-radius: 6px; margin-bottom: 12px; border-left: 3px solid #0077b6;">
-        <strong>*</strong> {summary_oneline}
-    </div>
-</div>
-"""
-        
-        if details:
-            html_content += "<div style='margin-top: 8px;'>\n"
-            for detail in details:
-                html_content += f"<div style='margin-bottom: 6px; line-height: 1.4;'>- {detail}</div>\n"
-            html_content += "</div>"
-        
-        return html_content
+            response = _invoke_summary_llm(
+                batch_prompt, model,
+                max_tokens=700 * len(batch),
+                request_timeout=30 + 15 * (len(batch) - 1)
+            )
+            parsed = _parse_batch_summary_response(response)
+        except RateLimitExceeded as e:
+            # 재시도를 모두 소진했으므로 단건 폴백으로 다시 요청하지 않음
+            print(f"배치 {batch_no} 요약 실패 (호출 한도): {e}")
+            rate_limited = e
+        except Exception as e:
+            print(f"배치 {batch_no} 요약 실패: {e} - 단건 요약으로 폴백")
         
-    except json.JSONDecodeError as e:
-        print(f"JSON 파싱 오류: {e}")
-        print(f"정리된 JSON 텍스트: {json_text if 'json_text' in locals() else 'N/A'}")
-        print(f"원본 응답: {json_response}")
-        # JSON 파싱 실패 시 원본 텍스트 반환
-        return f"<div style='color: #666;'>요약 파싱 오류:<br>{json_response}</div>"
-    except Exception as e:
-        print(f"요약 포맷팅 오류: {e}")
-        return f"<div style='color: #666;'>요약 포맷팅 오류:<br>{json_response}</div>"
+        for article in batch:
+            item = parsed.get(article['id'])
+            if item and item.get('summary'):
+                summaries[article['id']] = ArticleSummary.from_dict(item)
+            elif rate_limited is not None:
+                summaries[article['id']] = ArticleSummary.failed(f"요약 생성 실패: {str(rate_limited)}")
+            else:
+                # 누락/실패 기사는 단건 요약으로 폴백
+                fallback_count += 1
+                round_trips += 1
+                summaries[article['id']] = _summarize_article(
+                    article['content'], article['title'], token_budget=token_budget, model=model
+                )
+    
+    print(f"배치 요약 완료: LLM 호출 {round_trips}회 (단건 폴백 {fallback_count}개)")
+    return summaries
+
+def _clean_html_tags(text: str) -> str:
+    """HTML 태그를 제거하고 깔끔한 텍스트로 변환"""
+    return clean_html(text)
+
+def _classify_news(state: AgentState, system_prompt: str, news_data: List[dict], model: str,
+                   with_confidence: bool = False) -> Dict[str, List[dict]]:
+    """
+    1단계 제외 판단 LLM 호출 1회 (JSON 파싱 실패 시 예외)
+
+    Args:
+        state (AgentState): 파이프라인 상태 (제외 기준, 프롬프트 기록)
+        system_prompt (str): 시스템 프롬프트
+        news_data (List[dict]): 분류할 뉴스 (original_index 포함)
+        model (str): 호출할 모델
+        with_confidence (bool): 항목별 확신도("confidence") 요청 여부 - 캐스케이드 작은 모델용
+
+    Returns:
+        Dict[str, List[dict]]: excluded/borderline/retained 분류 결과 (항목에 original_index 추가)
+    """
+    # 뉴스 목록 문자열 생성 - 원래 인덱스 사용
+    news_list = ""
+    for news in news_data:
+        press = news.get('press', '알 수 없음')
+        original_index = news.get('original_index')
+        news_list += f"{original_index}. {news['content']} ({press})\n"
+
+    # 제외 판단 프롬프트 (고정 지시문/기준/응답 형식 → 뉴스 목록 순)
+    static_sections = [
+        ("제외 기준", state.get("exclusion_criteria", "")),
+        ("응답 요구사항", EXCLUSION_RESPONSE_FORMAT),
+    ]
+    if with_confidence:
+        static_sections.append(("확신도", EXCLUSION_CONFIDENCE_FORMAT))
+    exclusion_prompt = build_prompt(EXCLUSION_INSTRUCTION, static_sections=static_sections,
+                                    data_sections=[("뉴스 목록", news_list)])
+
+    # LLM 호출 (헬퍼 함수 사용)
+    result = call_llm(state, system_prompt, exclusion_prompt, stage=1, model=model)
+
+    # JSON 파싱 (헬퍼 함수 사용)
+    classification = parse_json_response(result)
+
+    # 필수 필드 확인
+    if not all(key in classification for key in ["excluded", "borderline", "retained"]):
+        raise ValueError("필수 필드가 누락되었습니다.")
+
+    # 상태 업데이트 시 원래 인덱스 유지
+    for category in ["excluded", "borderline", "retained"]:
+        for item in classification.get(category, []):
+            original_index = item['index']
+            item['original_index'] = original_index
+
+    return classification
+
+
+def _log_verdicts(state: AgentState, news_data: List[dict], classification: Dict[str, List[dict]]):
+    """선택한 모델의 1단계 판단만 기록 (로컬 모델 학습 데이터 - 캐스케이드 작은 모델 판단은 제외)"""
+    if STAGE1_VERDICT_LOG:
+        log_stage1_verdicts(collection_scope(state.get("keyword", [])), news_data, classification,
+                            model=state.get("model", ""))
+
+
+def _classify_news_cascade(state: AgentState, system_prompt: str, news_data: List[dict]) -> Dict[str, List[dict]]:
+    """
+    1단계 제외 판단 (캐스케이드가 켜져 있으면 작은 모델 → 불확실한 기사만 선택한 모델로 재판단)
+
+    작은 모델이 보류로 분류했거나 확신도가 낮은(또는 빠뜨린) 기사만 다시 묻습니다.
+    재판단 응답을 파싱하지 못하면 작은 모델의 분류를 그대로 사용합니다.
+    판단 기록(로컬 모델 학습 데이터)에는 선택한 모델이 판단한 기사만 남깁니다.
+    """
+    selected = state.get("model", "gpt-5")
+    triage_model = stage_model(state, 1)
+    if triage_model == selected:
+        classification = _classify_news(state, system_prompt, news_data, model=selected)
+        _log_verdicts(state, news_data, classification)
+        return classification
+
+    triage = _classify_news(state, system_prompt, news_data, model=triage_model, with_confidence=True)
+    answered = {item.get('index') for items in triage.values() for item in items}
+    escalate = {item.get('index') for category in ["excluded", "borderline", "retained"]
+                for item in triage.get(category, []) if needs_escalation(category, item)}
+    escalate |= {news.get('original_index') for news in news_data if news.get('original_index') not in answered}
+    escalated_news = [news for news in news_data if news.get('original_index') in escalate]
+    model_usage.record_escalation(len(news_data), len(escalated_news))
+    print(f"1단계 캐스케이드: {triage_model} 분류 {len(news_data)}개 중 {len(escalated_news)}개를 {selected}로 재판단")
+    if not escalated_news:
+        return triage
+
+    try:
+        reviewed = _classify_news(state, system_prompt, escalated_news, model=selected)
+    except (json.JSONDecodeError, ValueError) as e:
+        print(f"재판단 결과 파싱 실패, 작은 모델 분류 사용: {str(e)}")
+        return triage
+    _log_verdicts(state, escalated_news, reviewed)
+
+    reviewed_indices = {item.get('index') for items in reviewed.values() for item in items}
+    return {
+        category: [item for item in triage.get(category, []) if item.get('index') not in reviewed_indices]
+                  + reviewed.get(category, [])
+        for category in ["excluded", "borderline", "retained"]
+    }
+
 
 # 1단계: 뉴스 제외 판단
 def filter_excluded_news(state: AgentState) -> AgentState:
@@ -747,78 +1086,50 @@ def filter_excluded_news(state: AgentState) -> AgentState:
         # 뉴스 데이터 준비
         news_data = state.get("news_data", [])
         if not news_data:
-            st.error("분석할 뉴스가 없습니다.")
+            _show_error("분석할 뉴스가 없습니다.")
             return state
             
-        # 뉴스 목록 문자열 생성 - 원래 인덱스 사용
-        news_list = ""
-        for news in news_data:
-            press = news.get('press', '알 수 없음')
-            original_index = news.get('original_index')
-            news_list += f"{original_index}. {news['content']} ({press})\n"
-            
-        # 제외 판단 프롬프트
-        exclusion_prompt = f"""아래 뉴스 목록을 분석하여 제외/보류/유지로 분류해주세요.
-각 뉴스의 번호는 고유 식별자이므로 변경하지 말고 그대로 응답에 사용해주세요.
-
-[뉴스 목록]
-{news_list}
+        # LLM 없이 판단한 기사 (사전 필터, 로컬 모델) - LLM 결과에 합침
+        decided = {"excluded": [], "borderline": [], "retained": []}
 
-[제외 기준]
-{state.get("exclusion_criteria", "")}
+        # 로컬 사전 필터: 명백히 무관한 제목은 LLM에 보내지 않고 사유와 함께 제외
+        if state.get("relevance_prefilter"):
+            news_data, prefiltered = RelevanceFilter.from_state(state).split(news_data)
+            decided["excluded"] += prefiltered
+            state["prefilter_stats"] = prefilter_stats(prefiltered, state.get("news_data", []),
+                                                       state.get("model", "gpt-5"))
+            print(f"사전 필터: {len(prefiltered)}개 자동 제외, LLM 분류 대상 {len(news_data)}개 "
+                  f"(프롬프트 {state['prefilter_stats']['prompt_tokens_saved']}토큰 절감)")
 
-[응답 요구사항]
-1. 제외/보류/유지 사유는 간단명료하게 작성
-2. 응답은 완전한 JSON 형식이어야 함
+        # 로컬 모델: 과거 LLM 판단으로 학습한 분류기가 확신하는 기사만 직접 판단
+        stage1_model = load_stage1_model() if state.get("stage1_local_model") and news_data else None
+        if stage1_model is not None:
+            news_data, by_model = stage1_model.decide(news_data, collection_scope(state.get("keyword", [])),
+                                                      STAGE1_MODEL_CONFIDENCE)
+            for category, items in by_model.items():
+                decided[category] += items
+            model_decided = [item for items in by_model.values() for item in items]
+            state["stage1_model_stats"] = prefilter_stats(model_decided, state.get("news_data", []),
+                                                          state.get("model", "gpt-5"))
+            print(f"로컬 모델: {len(model_decided)}개 판단 "
+                  f"({', '.join(f'{VERDICT_LABELS[category]} {len(items)}' for category, items in by_model.items())}), "
+                  f"LLM 분류 대상 {len(news_data)}개")
 
-다음과 같은 JSON 형식으로 응답해주세요:
-{{
-  "excluded": [
-    {{
-      "index": 1,
-      "title": "뉴스 제목",
-      "reason": "제외 사유"
-    }}
-  ],
-  "borderline": [
-    {{
-      "index": 2,
-      "title": "뉴스 제목",
-      "reason": "보류 사유"
-    }}
-  ],
-  "retained": [
-    {{
-      "index": 3,
-      "title": "뉴스 제목",
-      "reason": "유지 사유"
-    }}
-  ]
-}}"""
+        state["excluded_news"] = list(decided["excluded"])
+        if not news_data:
+            state["borderline_news"] = list(decided["borderline"])
+            state["retained_news"] = list(decided["retained"])
+            return state
 
-        # 최대 3번까지 시도
+        # 최대 3번까지 시도 (캐스케이드면 작은 모델 분류 후 불확실한 기사만 선택한 모델로 재판단)
         max_retries = 3
         for attempt in range(max_retries):
             try:
-                # LLM 호출 (헬퍼 함수 사용)
-                result = call_llm(state, system_prompt, exclusion_prompt, stage=1)
-                
-                # JSON 파싱 (헬퍼 함수 사용)
-                classification = parse_json_response(result)
-                
-                # 필수 필드 확인
-                if not all(key in classification for key in ["excluded", "borderline", "retained"]):
-                    raise ValueError("필수 필드가 누락되었습니다.")
-                
-                # 상태 업데이트 시 원래 인덱스 유지
-                for category in ["excluded", "borderline", "retained"]:
-                    for item in classification.get(category, []):
-                        original_index = item['index']
-                        item['original_index'] = original_index
-                
-                state["excluded_news"] = classification.get("excluded", [])
-                state["borderline_news"] = classification.get("borderline", [])
-                state["retained_news"] = classification.get("retained", [])
+                classification = _classify_news_cascade(state, system_prompt, news_data)
+
+                state["excluded_news"] = classification.get("excluded", []) + decided["excluded"]
+                state["borderline_news"] = classification.get("borderline", []) + decided["borderline"]
+                state["retained_news"] = classification.get("retained", []) + decided["retained"]
                 
                 print("\n[분류 결과]")
                 print(f"제외: {len(state['excluded_news'])}개")
@@ -847,15 +1158,15 @@ def filter_excluded_news(state: AgentState) -> AgentState:
             except (json.JSONDecodeError, ValueError) as e:
                 print(f"\n파싱 시도 {attempt + 1} 실패: {str(e)}")
                 if attempt == max_retries - 1:  # 마지막 시도에서도 실패
-                    st.error(f"분류 결과 파싱 중 오류가 발생했습니다: {str(e)}")
+                    _show_error(f"분류 결과 파싱 중 오류가 발생했습니다: {str(e)}")
                     return state
-                # 다음 시도를 위해 잠시 대기
-                time.sleep(1)
+                # 다음 시도를 위해 잠시 대기 (지터 포함 지수 백오프)
+                time.sleep(backoff_delay(attempt))
 
         return state
 
     except Exception as e:
-        st.error(f"뉴스 분류 중 오류가 발생했습니다: {str(e)}")
+        _show_error(f"뉴스 분류 중 오류가 발생했습니다: {str(e)}")
         return state
 
 # 2단계: 뉴스 그룹핑 + 대표 기사 선택
@@ -897,30 +1208,14 @@ def group_and_select_news(state: AgentState) -> AgentState:
         # 그룹핑 프롬프트
         system_prompt = state.get("system_prompt_2", "당신은 뉴스 분석 전문가입니다. 유사한 뉴스를 그룹화하고 대표성을 갖춘 기사를 선택하는 작업을 수행합니다. 같은 사안에 대해 숫자, 기업 ,계열사, 맥락, 주요 키워드 등이 유사하면 중복으로 판단합니다. 언론사의 신뢰도와 기사의 상세도를 고려하여 대표 기사를 선정합니다.")
         
-        grouping_prompt = f"""유사한 뉴스끼리 그룹으로 묶고, 각 그룹에서 가장 대표성 있는 뉴스 1건만 선택해 주세요.
-주어진 인덱스 번호를 정확히 사용해주세요. 인덱스 번호를 임의로 변경하지 마세요.
-
-[뉴스 목록]
-{news_text}
-
-[중복 처리 기준]
-{state.get("duplicate_handling", "")}
-
-다음과 같은 JSON 형식으로 응답해주세요:
-{{
-  "groups": [
-    {{
-      "indices": [2, 4],
-      "selected_index": 2,
-      "reason": "동일한 회원권 관련 보도이며, 2번이 더 자세하고 언론사 우선순위가 높음"
-    }},
-    {{
-      "indices": [5],
-      "selected_index": 5,
-      "reason": "단독 기사"
-    }}
-  ]
-}}"""
+        grouping_prompt = build_prompt(
+            GROUPING_INSTRUCTION,
+            static_sections=[
+                ("중복 처리 기준", state.get("duplicate_handling", "")),
+                ("응답 형식", GROUPING_RESPONSE_FORMAT),
+            ],
+            data_sections=[("뉴스 목록", news_text)]
+        )
 
         try:
             # LLM 호출 (헬퍼 함수 사용)
@@ -939,6 +1234,19 @@ def group_and_select_news(state: AgentState) -> AgentState:
             current_indices = set(news["current_index"] for news in target_news)
             ungrouped_indices = current_indices - grouped_indices
             
+            # 대표 기사가 그룹에 없으면 언론사 우선순위(설정 순서)로 대표 선정
+            valid_press_config = state.get("valid_press_dict")
+            press_index = get_press_index(valid_press_config if isinstance(valid_press_config, dict) and valid_press_config
+                                          else TRUSTED_PRESS_ALIASES)
+            news_by_index = {news["current_index"]: news for news in target_news}
+            for group in grouped_news:
+                indices = [idx for idx in group.get("indices", []) if idx in news_by_index]
+                if indices and group.get("selected_index") not in indices:
+                    group["selected_index"] = min(
+                        indices, key=lambda idx: (press_index.priority(news_by_index[idx].get("press"),
+                                                                      news_by_index[idx].get("source_url")), idx)
+                    )
+            
             # 미그룹 뉴스들을 각각 단일 그룹으로 추가
             for idx in ungrouped_indices:
                 new_group = {
@@ -959,11 +1267,11 @@ def group_and_select_news(state: AgentState) -> AgentState:
             return state
 
         except json.JSONDecodeError as e:
-            st.error(f"그룹핑 결과 파싱 중 오류가 발생했습니다: {str(e)}")
+            _show_error(f"그룹핑 결과 파싱 중 오류가 발생했습니다: {str(e)}")
             return state
 
     except Exception as e:
-        st.error(f"뉴스 그룹핑 중 오류가 발생했습니다: {str(e)}")
+        _show_error(f"뉴스 그룹핑 중 오류가 발생했습니다: {str(e)}")
         return state
 
 # 3단계: 중요도 평가 + 최종 선정
@@ -977,16 +1285,15 @@ def evaluate_importance(state: AgentState) -> AgentState:
         print("\n=== 중요도 평가 시작 ===")
         print(f"그룹 수: {len(state['grouped_news'])}")
         
+        # 원래 인덱스 → 뉴스 (그룹마다 전체 목록을 다시 훑지 않도록 한 번만 생성)
+        news_by_original_index = {news.get("original_index"): news for news in state["news_data"]}
+        
         # 각 그룹에서 선택된 뉴스 찾기
         for i, group in enumerate(state["grouped_news"], 1):
             selected_index = group["selected_index"]
             
             # 원래 뉴스 데이터에서 selected_index와 일치하는 뉴스 찾기
-            selected_article = next(
-                (news for news in state["news_data"] 
-                 if news.get("original_index") == selected_index),
-                None
-            )
+            selected_article = news_by_original_index.get(selected_index)
             
             if selected_article:
                 print(f"그룹 {i}, 선택된 인덱스 {selected_index}: 제목 = {selected_article['content']}")
@@ -1001,6 +1308,9 @@ def evaluate_importance(state: AgentState) -> AgentState:
         if not selected_news:
             print("선택된 뉴스가 없습니다!")
             return state
+        
+        # 리스트 인덱스 → 선택된 뉴스 (LLM 응답 항목별 원본 조회용)
+        selected_by_list_index = {news["list_index"]: news for news in selected_news}
 
         # 뉴스 데이터를 문자열로 변환 (list_index 사용)
         news_text = "\n\n".join([
@@ -1011,43 +1321,14 @@ def evaluate_importance(state: AgentState) -> AgentState:
         # 중요도 평가 프롬프트
         system_prompt = state.get("system_prompt_3", "당신은 회계법인의 전문 애널리스트입니다. 뉴스의 중요도를 평가하고 최종 선정하는 작업을 수행합니다. 특히 회계 감리, 재무제표, 경영권 변동, 주요 계약, 법적 분쟁 등 회계법인의 관점에서 중요한 이슈를 식별하고, 그 중요도를 '상' 또는 '중'으로 평가합니다. 또한 각 뉴스의 핵심 키워드와 관련 계열사를 식별하여 보고합니다.")
         
-        evaluation_prompt = f"""아래 기사들에 대해 중요도를 평가하고, 모든 뉴스에 대해 평가 결과를 알려주세요.
-중요도 '상' 또는 '중'인 뉴스는 최종 선정하고, '하'인 뉴스는 선정하지 않습니다.
-
-[뉴스 목록]
-{news_text}
-
-[선택 기준]
-{state.get("selection_criteria", "")}
-
-[응답 요구사항]
-1. 중요도는 "상", "중", "하" 중 하나로 평가
-2. 미선정 사유는 간단명료하게 작성
-3. 응답은 완전한 JSON 형식이어야 함
-
-다음과 같은 JSON 형식으로 응답해주세요:
-{{
-  "final_selection": [
-        {{
-            "index": 2,
-            "title": "뉴스 제목",
-            "importance": "상",
-            "reason": "선정 사유",
-            "keywords": ["키워드1", "키워드2"],
-            "affiliates": ["계열사1", "계열사2"],
-            "press": "언론사명",
-            "date": "발행일"
-        }}
-  ],
-  "not_selected": [
-    {{
-      "index": 3,
-      "title": "뉴스 제목",
-      "importance": "하",
-      "reason": "미선정 사유"
-    }}
-  ]
-}}"""
+        evaluation_prompt = build_prompt(
+            EVALUATION_INSTRUCTION,
+            static_sections=[
+                ("선택 기준", state.get("selection_criteria", "")),
+                ("응답 요구사항", EVALUATION_RESPONSE_FORMAT),
+            ],
+            data_sections=[("뉴스 목록", news_text)]
+        )
 
         # 최대 3번까지 시도
         max_retries = 3
@@ -1068,10 +1349,7 @@ def evaluate_importance(state: AgentState) -> AgentState:
                     list_index = news["index"]
                     if list_index in index_map:
                         original_index = index_map[list_index]
-                        original_news = next(
-                            (n for n in selected_news if n["list_index"] == list_index),
-                            None
-                        )
+                        original_news = selected_by_list_index.get(list_index)
                         if original_news:
                             # 원본 데이터의 메타데이터를 그대로 사용
                             news.update({
@@ -1089,10 +1367,7 @@ def evaluate_importance(state: AgentState) -> AgentState:
                     list_index = news["index"]
                     if list_index in index_map:
                         original_index = index_map[list_index]
-                        original_news = next(
-                            (n for n in selected_news if n["list_index"] == list_index),
-                            None
-                        )
+                        original_news = selected_by_list_index.get(list_index)
                         if original_news:
                             news.update({
                                 "url": original_news.get("url", ""),
@@ -1133,15 +1408,15 @@ def evaluate_importance(state: AgentState) -> AgentState:
             except (json.JSONDecodeError, ValueError) as e:
                 print(f"\n파싱 시도 {attempt + 1} 실패: {str(e)}")
                 if attempt == max_retries - 1:  # 마지막 시도에서도 실패
-                    st.error(f"중요도 평가 결과 파싱 중 오류가 발생했습니다: {str(e)}")
+                    _show_error(f"중요도 평가 결과 파싱 중 오류가 발생했습니다: {str(e)}")
                     return state
-                # 다음 시도를 위해 잠시 대기
-                time.sleep(1)
+                # 다음 시도를 위해 잠시 대기 (지터 포함 지수 백오프)
+                time.sleep(backoff_delay(attempt))
 
         return state
 
     except Exception as e:
-        st.error(f"중요도 평가 중 오류가 발생했습니다: {str(e)}")
+        _show_error(f"중요도 평가 중 오류가 발생했습니다: {str(e)}")
         return state
 
 # 노드 정의
@@ -1156,6 +1431,8 @@ def get_nodes():
 
 # 에지 정의
 def get_edges():
+    from langgraph.graph import END
+
     return [
         ("collect_news", "filter_valid_press"),
         ("filter_valid_press", "filter_excluded_news"),
@@ -1173,6 +1450,8 @@ def print_news(news_list, title):
 
 # 메인 실행 함수
 def main():
+    from langgraph.graph import StateGraph
+
     # 노드 및 에지 가져오기
     nodes = get_nodes()
     edges = get_edges()
@@ -0,0 +1,291 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+News CLI
+--------
+브라우저 없이 전체 뉴스 분석 파이프라인을 실행하는 배치 진입점입니다 (cron 일일 클리핑용).
+COMPANY_CATEGORIES의 카테고리(Anchor/Growth/Whitespace) 또는 키워드 설정 JSON을 받아
+모든 대상을 프로세스 풀로 병렬 분석하고 통합 Excel, Word, HTML 이메일을 파일로 저장합니다.
+
+사용 예:
+    python news_cli.py --category Anchor --workers 4 --incremental
+    python news_cli.py --keywords-config pt_electrification_keywords_config_en_with_keywords.json \\
+        --scope 산업분야 --article-summary --output-dir output
+
+무거운 모듈(langchain, 스크래퍼, 보고서 라이브러리)은 인자 파싱 이후에만 임포트하므로 --help는 즉시 응답합니다.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from config import COMPANY_CATEGORIES, COMPANY_KEYWORD_MAP, DEFAULT_GPT_MODEL, TRUSTED_PRESS_ALIASES
+from llm_governor import init_worker
+
+# 한국 시간대(KST) 정의
+KST = timezone(timedelta(hours=9))
+
+# 분석 범위 (app 사이드바와 동일)
+ANALYSIS_SCOPES = ["본인회사", "경쟁사", "산업분야"]
+
+
+def load_keyword_config(path: str) -> "OrderedDict[str, List[str]]":
+    """
+    키워드 설정 JSON을 분석 대상별 검색 키워드로 변환합니다.
+
+    "keywords"의 각 키워드는 categories.oems/suppliers 중 가장 긴 이름으로 시작하면 해당 이름으로 묶고,
+    어디에도 속하지 않으면 키워드 자체를 분석 대상으로 사용합니다.
+
+    Returns:
+        OrderedDict[str, List[str]]: 분석 대상 → 검색 키워드 목록 (설정 파일 순서 유지)
+    """
+    with open(path, encoding='utf-8') as f:
+        config = json.load(f)
+
+    categories = config.get("categories", {})
+    names = sorted(categories.get("oems", []) + categories.get("suppliers", []), key=len, reverse=True)
+
+    targets = OrderedDict()
+    for keyword in config.get("keywords", []):
+        lowered = keyword.lower()
+        target = next((name for name in names if lowered.startswith(name.lower() + " ")), keyword)
+        targets.setdefault(target, []).append(keyword)
+    return targets
+
+
+def resolve_targets(args) -> "OrderedDict[str, List[str]]":
+    """인자에 따라 분석 대상 → 검색 키워드 목록 생성"""
+    if args.keywords_config:
+        return load_keyword_config(args.keywords_config)
+    return OrderedDict((company, COMPANY_KEYWORD_MAP.get(company, [company]))
+                       for company in COMPANY_CATEGORIES[args.category])
+
+
+def parse_datetime(value: str) -> datetime:
+    """YYYY-MM-DD 또는 'YYYY-MM-DD HH:MM' (KST) 문자열 변환"""
+    for fmt in ('%Y-%m-%d %H:%M', '%Y-%m-%d'):
+        try:
+            return datetime.strptime(value, fmt).replace(tzinfo=KST)
+        except ValueError:
+            continue
+    raise argparse.ArgumentTypeError(f"날짜 형식 오류: {value} (YYYY-MM-DD 또는 'YYYY-MM-DD HH:MM')")
+
+
+def default_window(now: Optional[datetime] = None) -> Tuple[datetime, datetime]:
+    """기본 검색 기간: 전일 08:00 ~ 당일 08:00 (KST, app 기본값과 동일)"""
+    now = now or datetime.now(KST)
+    end = now.replace(hour=8, minute=0, second=0, microsecond=0)
+    return end - timedelta(days=1), end
+
+
+def build_states(targets: Dict[str, List[str]], args, start_datetime: datetime,
+                 end_datetime: datetime) -> List[Tuple[str, dict]]:
+    """분석 대상별 초기 상태 생성 (범위 지정 시 범위별 기준, 아니면 회사별 추가 기준 적용)"""
+    from news_pipeline import (
+        build_initial_state,
+        get_enhanced_duplicate_handling,
+        get_enhanced_exclusion_criteria,
+        get_enhanced_selection_criteria,
+        get_scope_based_criteria,
+        get_scope_based_system_prompts,
+    )
+    from config import DUPLICATE_HANDLING, EXCLUSION_CRITERIA, SELECTION_CRITERIA
+
+    scope = [args.scope] if args.scope else []
+    states = []
+    for target, keywords in targets.items():
+        if scope:
+            scope_selection = get_scope_based_criteria(scope, "selection_criteria", keywords)
+            scope_exclusion = get_scope_based_criteria(scope, "exclusion_criteria", keywords)
+            exclusion_criteria = EXCLUSION_CRITERIA + "\n\n" + scope_exclusion if scope_exclusion else EXCLUSION_CRITERIA
+            duplicate_handling = DUPLICATE_HANDLING
+            selection_criteria = scope_selection or SELECTION_CRITERIA
+        else:
+            exclusion_criteria = get_enhanced_exclusion_criteria(target)
+            duplicate_handling = get_enhanced_duplicate_handling(target)
+            selection_criteria = get_enhanced_selection_criteria(target)
+
+        states.append((target, build_initial_state(
+            keywords,
+            model=args.model,
+            exclusion_criteria=exclusion_criteria,
+            duplicate_handling=duplicate_handling,
+            selection_criteria=selection_criteria,
+            system_prompts=get_scope_based_system_prompts(scope),
+            valid_press_dict=TRUSTED_PRESS_ALIASES,
+            start_datetime=start_datetime,
+            end_datetime=end_datetime,
+            incremental_collection=args.incremental,
+            relevance_prefilter=args.prefilter,
+            stage1_local_model=args.local_model,
+            model_cascade=args.cascade,
+        )))
+    return states
+
+
+def _analyze(initial_state: dict, enable_article_summary: bool):
+    """작업 프로세스에서 대상 1개 분석 → (최종 상태, 프롬프트 캐시 집계)"""
+    from news_pipeline import run_news_pipeline
+    from prompt_layout import cache_stats
+
+    cache_stats.reset()
+    final_state = run_news_pipeline(initial_state, enable_article_summary=enable_article_summary)
+    return final_state, cache_stats.summary()
+
+
+def run_batch(states: List[Tuple[str, dict]], workers: int, enable_article_summary: bool):
+    """
+    대상별 파이프라인을 병렬 실행합니다.
+
+    Returns:
+        Tuple[List, List[str]]: 입력 순서의 (대상, 최종 상태, 캐시 집계) 목록, 실패한 대상 목록
+    """
+    results: List[Optional[tuple]] = [None] * len(states)
+    failed = []
+
+    if workers <= 1:
+        for position, (target, initial_state) in enumerate(states):
+            print(f"[{position + 1}/{len(states)}] '{target}' 분석 중...")
+            try:
+                results[position] = (target, *_analyze(initial_state, enable_article_summary))
+            except Exception as e:
+                print(f"'{target}' 분석 실패: {str(e)}")
+                failed.append(target)
+    else:
+        # LLM 한도는 프로세스마다 전체 한도 / 작업 프로세스 수 (합계가 LLM_RATE_LIMITS를 넘지 않도록)
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(workers,)) as executor:
+            futures = {
+                executor.submit(_analyze, initial_state, enable_article_summary): (position, target)
+                for position, (target, initial_state) in enumerate(states)
+            }
+            for done_count, future in enumerate(as_completed(futures), 1):
+                position, target = futures[future]
+                try:
+                    results[position] = (target, *future.result())
+                    print(f"[{done_count}/{len(states)}] '{target}' 분석 완료")
+                except Exception as e:
+                    print(f"[{done_count}/{len(states)}] '{target}' 분석 실패: {str(e)}")
+                    failed.append(target)
+
+    return [result for result in results if result is not None], failed
+
+
+def write_outputs(results, args, start_datetime: datetime, end_datetime: datetime) -> List[str]:
+    """통합 Excel, Word, HTML 이메일 파일 저장 후 경로 목록 반환"""
+    from news_report import NewsReport
+    from email_report import prepare_email_articles, render_email_html
+    from prompt_layout import PromptCacheStats
+    from region_health import RegionRunStats
+    from model_cascade import ModelUsageStats
+
+    report = NewsReport()
+    usage = PromptCacheStats()
+    region_stats = RegionRunStats()
+    model_stats = ModelUsageStats()
+    for target, final_state, cache_summary in results:
+        report.add_company(target, final_state)
+        usage.merge(cache_summary)
+        region_stats.merge(final_state.get("region_health"))
+        model_stats.merge(final_state.get("model_usage") or {})
+
+    for line in usage.report_lines() + region_stats.report_lines() + model_stats.report_lines():
+        print(line)
+
+    # LLM 없이 1단계를 판단한 기사 수와 절감 토큰 (사전 필터, 로컬 모델)
+    for key, label in (("prefilter_stats", "사전 필터"), ("stage1_model_stats", "로컬 모델")):
+        stats = [final_state.get(key) for _, final_state, _ in results if final_state.get(key)]
+        if stats:
+            print(f"{label}: {sum(item['scored'] for item in stats)}개 중 "
+                  f"{sum(item['auto_excluded'] for item in stats)}개 판단, "
+                  f"프롬프트 {sum(item['prompt_tokens_saved'] for item in stats)}토큰 / "
+                  f"응답 약 {sum(item['response_tokens_saved'] for item in stats)}토큰 절감")
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    current_time = datetime.now().strftime("%Y%m%d_%H%M")
+    paths = []
+
+    excel_path = os.path.join(args.output_dir, f"뉴스분석_통합결과_{current_time}.xlsx")
+    with open(excel_path, 'wb') as f:
+        f.write(report.to_excel(start_datetime.strftime('%Y-%m-%d'), end_datetime.strftime('%Y-%m-%d')).getvalue())
+    paths.append(excel_path)
+
+    if report.final_news:
+        word_path = os.path.join(args.output_dir, f"뉴스분석_최종선정_{current_time}.docx")
+        with open(word_path, 'wb') as f:
+            f.write(report.to_word().getvalue())
+        paths.append(word_path)
+
+        resolver = None
+        if not args.no_resolve_urls:
+            from web_scraper import HybridNewsWebScraper
+            scraper = HybridNewsWebScraper(openai_api_key=os.getenv('OPENAI_API_KEY'), enable_ai_fallback=False)
+            resolver = lambda url: scraper._resolve_google_news_url_simple(url, timeout=10)
+
+        html_path = os.path.join(args.output_dir, f"뉴스분석_이메일_{current_time}.html")
+        articles = prepare_email_articles(report.final_news, resolver=resolver)
+        with open(html_path, 'w', encoding='utf-8') as f:
+            f.write(render_email_html(articles, enable_article_summary=args.article_summary))
+        paths.append(html_path)
+
+    return paths
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="PwC 뉴스 분석기 배치 실행 (Streamlit 없이 전체 파이프라인 실행)")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--category", choices=list(COMPANY_CATEGORIES), help="COMPANY_CATEGORIES 카테고리")
+    source.add_argument("--keywords-config", help="키워드 설정 JSON 경로 (keywords/categories 형식)")
+    parser.add_argument("--scope", choices=ANALYSIS_SCOPES, help="분석 범위별 특화 기준/시스템 프롬프트 적용")
+    parser.add_argument("--model", default=DEFAULT_GPT_MODEL, help=f"GPT 모델 (기본값: {DEFAULT_GPT_MODEL})")
+    parser.add_argument("--start", type=parse_datetime, help="검색 시작 (KST, 기본값: 전일 08:00)")
+    parser.add_argument("--end", type=parse_datetime, help="검색 종료 (KST, 기본값: 당일 08:00)")
+    parser.add_argument("--workers", type=int, default=2, help="동시에 분석할 대상 수 (기본값: 2)")
+    parser.add_argument("--article-summary", action="store_true", help="선정된 기사 원문 요약")
+    parser.add_argument("--incremental", action="store_true",
+                        help="이전 실행에서 분석한 기사는 건너뛰고 이전 판단을 보고서에 표시 (일일 배치용)")
+    parser.add_argument("--prefilter", action="store_true",
+                        help="1단계 LLM 분류 전 제목 점수로 명백히 무관한 기사(주가 시세, 스포츠, 약어 충돌 등) 자동 제외")
+    parser.add_argument("--local-model", action="store_true",
+                        help="과거 1단계 판단으로 학습한 로컬 모델(verdict_model.py train)이 확신하는 기사는 LLM 없이 판단")
+    parser.add_argument("--cascade", action="store_true",
+                        help="1단계는 작은 모델(config.STAGE_MODELS)로 먼저 분류하고 보류/저확신 기사만 --model로 재판단")
+    parser.add_argument("--hedge", action="store_true",
+                        help="느린 RSS/기사 요청(호스트별 p90 초과)은 한 번 더 보내 먼저 온 응답 사용 (요청 헤징)")
+    parser.add_argument("--no-resolve-urls", action="store_true", help="이메일의 Google News URL 원문 디코딩 생략")
+    parser.add_argument("--output-dir", default="output", help="결과 파일 저장 폴더 (기본값: output)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    start_datetime, end_datetime = default_window()
+    start_datetime = args.start or start_datetime
+    end_datetime = args.end or end_datetime
+
+    # 요청 헤징은 환경 변수로 켜서 작업 프로세스에도 전달
+    if args.hedge:
+        os.environ["NEWS_HEDGED_REQUESTS"] = "1"
+
+    targets = resolve_targets(args)
+    print(f"분석 대상 {len(targets)}개, 기간 {start_datetime:%Y-%m-%d %H:%M} ~ {end_datetime:%Y-%m-%d %H:%M} (KST)")
+
+    started = time.perf_counter()
+    states = build_states(targets, args, start_datetime, end_datetime)
+    results, failed = run_batch(states, args.workers, args.article_summary)
+
+    for path in write_outputs(results, args, start_datetime, end_datetime):
+        print(f"저장: {path}")
+    print(f"완료: {len(results)}개 성공, {len(failed)}개 실패, {time.perf_counter() - started:.1f}초")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
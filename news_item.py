@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+News Item
+---------
+수집된 기사 1건을 나타내는 슬롯 기반 모델입니다.
+RSS에서 읽은 핵심 필드(url, content, press, source_url, date, region)는 생성 후 바꿀 수 없고,
+파이프라인 단계가 붙이는 인덱스/그룹 정보는 별도 주석(annotation) 슬롯에 기록합니다.
+
+기존 딕셔너리 기반 코드(news.get('press'), news['content'], news['current_index'] = ...)가
+그대로 동작하도록 읽기/주석 쓰기용 매핑 인터페이스를 함께 제공하므로,
+상태(AgentState)에는 복사본 대신 같은 객체의 참조가 전달됩니다.
+"""
+
+from typing import Any, Dict, Iterator, Optional
+
+# RSS에서 읽은 핵심 필드 (생성 후 변경 불가)
+CORE_FIELDS = ('url', 'content', 'press', 'source_url', 'date', 'region')
+
+# 파이프라인 단계가 기록하는 주석 필드
+ANNOTATION_FIELDS = ('original_index', 'current_index', 'list_index', 'group_info')
+
+_FIELD_SET = frozenset(CORE_FIELDS + ANNOTATION_FIELDS)
+
+
+class NewsItem:
+    """
+    기사 1건 (핵심 필드 불변 + 단계별 주석).
+
+    사용 예:
+        item = NewsItem(url, "Hyundai unveils e-axle", "Reuters", date="Mon, 19 Oct 2026 01:00:00 GMT", region="미국")
+        item.press                      # 속성 접근 (핫 루프용)
+        item.get('press')               # 기존 딕셔너리 코드 호환
+        item['original_index'] = 3      # 주석 기록
+        item['press'] = 'AP'            # TypeError (핵심 필드는 with_press로 새 객체 생성)
+    """
+
+    __slots__ = CORE_FIELDS + ANNOTATION_FIELDS
+
+    def __init__(self, url: str = '', content: str = '', press: str = '알 수 없음', source_url: str = '',
+                 date: str = '날짜 정보 없음', region: str = ''):
+        for name, value in zip(CORE_FIELDS, (url, content, press, source_url, date, region)):
+            object.__setattr__(self, name, value)
+        for name in ANNOTATION_FIELDS:
+            object.__setattr__(self, name, None)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "NewsItem":
+        """딕셔너리(이전 형식 결과, 테스트 데이터)에서 생성"""
+        if isinstance(data, cls):
+            return data
+        item = cls(**{name: data[name] for name in CORE_FIELDS if name in data})
+        for name in ANNOTATION_FIELDS:
+            if data.get(name) is not None:
+                object.__setattr__(item, name, data[name])
+        return item
+
+    def __setattr__(self, name: str, value: Any):
+        if name in CORE_FIELDS:
+            raise AttributeError(f"NewsItem의 '{name}' 필드는 변경할 수 없습니다.")
+        object.__setattr__(self, name, value)
+
+    def with_press(self, press: str) -> "NewsItem":
+        """언론사명만 바꾼 새 객체 (주석 유지)"""
+        item = NewsItem(self.url, self.content, press, self.source_url, self.date, self.region)
+        for name in ANNOTATION_FIELDS:
+            object.__setattr__(item, name, getattr(self, name))
+        return item
+
+    # 딕셔너리 호환 인터페이스 (값이 None인 주석은 없는 키로 취급)
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in _FIELD_SET:
+            value = getattr(self, key)
+            if value is not None:
+                return value
+        return default
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _FIELD_SET:
+            value = getattr(self, key)
+            if value is not None:
+                return value
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any):
+        if key not in ANNOTATION_FIELDS:
+            raise TypeError(f"NewsItem에 '{key}' 필드를 기록할 수 없습니다.")
+        object.__setattr__(self, key, value)
+
+    def __contains__(self, key: str) -> bool:
+        return key in _FIELD_SET and getattr(self, key) is not None
+
+    def keys(self) -> Iterator[str]:
+        return (name for name in self.__slots__ if getattr(self, name) is not None)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.keys()}
+
+    # pickle (백그라운드 작업 결과 저장) - 불변 필드도 복원되도록 직접 설정
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, NewsItem) and self.__getstate__() == other.__getstate__()
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"NewsItem({self.content!r}, press={self.press!r}, region={self.region!r})"
+
+
+def as_news_item(news: Optional[Dict[str, Any]]) -> Optional[NewsItem]:
+    """딕셔너리 또는 NewsItem을 NewsItem으로 변환 (None은 그대로)"""
+    return None if news is None else NewsItem.from_dict(news)
+
+
+if __name__ == "__main__":
+    import pickle
+    import timeit
+    import tracemalloc
+
+    def _measure(factory, count: int = 500):
+        tracemalloc.start()
+        items = [factory(i) for i in range(count)]
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        for i, item in enumerate(items, 1):
+            item['original_index'] = i
+        seconds = timeit.timeit(lambda: [item['content'] for item in items if item['press']], number=200)
+        return size / count, seconds * 1000 / 200, len(pickle.dumps(items)) / count, items
+
+    def _fields(i: int) -> dict:
+        return dict(url=f"https://news.google.com/rss/articles/CBMi{i:06d}", content=f"Hyundai Motor e-axle {i}",
+                    press="Reuters", source_url="https://www.reuters.com",
+                    date="Mon, 19 Oct 2026 01:00:00 GMT", region="미국")
+
+    cases = {'dict': _fields, 'NewsItem': lambda i: NewsItem(**_fields(i))}
+    for name, factory in cases.items():
+        per_item, access_ms, pickled, items = _measure(factory)
+        print(f"{name}: 기사당 {per_item:.0f}B (문자열 포함), 500건 [] 순회 {access_ms:.3f}ms, pickle 기사당 {pickled:.0f}B")
+    attribute_ms = timeit.timeit(lambda: [item.content for item in items if item.press], number=200) * 1000 / 200
+    print(f"NewsItem 속성 접근 500건 순회 {attribute_ms:.3f}ms")
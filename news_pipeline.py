@@ -0,0 +1,306 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+News Pipeline
+-------------
+키워드(회사) 1개의 뉴스 분석 파이프라인(수집 → 제외 판단 → 그룹핑 → 중요도 평가 → 원문 요약)을
+Streamlit 화면과 분리해 실행하는 모듈입니다.
+백그라운드 작업(job_runner)과 배치 실행에서 같은 단계 순서를 사용합니다.
+"""
+
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from config import (
+    ANALYSIS_SCOPE_CRITERIA,
+    ANALYSIS_SCOPE_SYSTEM_PROMPTS,
+    ARTICLE_TOKEN_BUDGET,
+    COMPANY_ADDITIONAL_DUPLICATE_HANDLING,
+    COMPANY_ADDITIONAL_EXCLUSION_CRITERIA,
+    COMPANY_ADDITIONAL_SELECTION_CRITERIA,
+    DUPLICATE_HANDLING,
+    EXCLUSION_CRITERIA,
+    INCREMENTAL_COLLECTION,
+    MODEL_CASCADE_ENABLED,
+    RELEVANCE_PREFILTER,
+    STAGE1_LOCAL_MODEL,
+    SELECTION_CRITERIA,
+    SUMMARY_BATCH_MAX_ARTICLES,
+    SUMMARY_BATCH_MODE,
+    SUMMARY_BATCH_TOKEN_BUDGET,
+    SYSTEM_PROMPT_1,
+    SYSTEM_PROMPT_2,
+    SYSTEM_PROMPT_3,
+)
+
+# 파이프라인 단계 (단계 키, 표시명)
+PIPELINE_STAGES: List[Tuple[str, str]] = [
+    ("collect", "1단계: 뉴스 수집"),
+    ("exclusion", "2단계: 제외 판단"),
+    ("grouping", "3단계: 그룹핑"),
+    ("evaluation", "4단계: 중요도 평가"),
+    ("summary", "5단계: 선정된 기사 원문 요약"),
+]
+
+STAGE_NAMES = dict(PIPELINE_STAGES)
+
+
+# 회사별 추가 기준을 적용하는 함수들
+def get_enhanced_exclusion_criteria(companies):
+    """회사별 제외 기준을 추가한 프롬프트 반환 (여러 회사 지원)"""
+    base_criteria = EXCLUSION_CRITERIA
+    
+    # companies가 문자열이면 리스트로 변환
+    if isinstance(companies, str):
+        companies = [companies]
+    
+    # 선택된 모든 회사의 추가 기준을 합침
+    all_additional_criteria = ""
+    for company in companies:
+        additional_criteria = COMPANY_ADDITIONAL_EXCLUSION_CRITERIA.get(company, "")
+        if additional_criteria:
+            all_additional_criteria += additional_criteria
+    
+    return base_criteria + all_additional_criteria
+
+def get_enhanced_duplicate_handling(companies):
+    """회사별 중복 처리 기준을 추가한 프롬프트 반환 (여러 회사 지원)"""
+    base_criteria = DUPLICATE_HANDLING
+    
+    # companies가 문자열이면 리스트로 변환
+    if isinstance(companies, str):
+        companies = [companies]
+    
+    # 선택된 모든 회사의 추가 기준을 합침
+    all_additional_criteria = ""
+    for company in companies:
+        additional_criteria = COMPANY_ADDITIONAL_DUPLICATE_HANDLING.get(company, "")
+        if additional_criteria:
+            all_additional_criteria += additional_criteria
+    
+    return base_criteria + all_additional_criteria
+
+def get_enhanced_selection_criteria(companies):
+    """회사별 선택 기준을 추가한 프롬프트 반환 (여러 회사 지원)"""
+    base_criteria = SELECTION_CRITERIA
+    
+    # companies가 문자열이면 리스트로 변환
+    if isinstance(companies, str):
+        companies = [companies]
+    
+    # 선택된 모든 회사의 추가 기준을 합침
+    all_additional_criteria = ""
+    for company in companies:
+        additional_criteria = COMPANY_ADDITIONAL_SELECTION_CRITERIA.get(company, "")
+        if additional_criteria:
+            all_additional_criteria += additional_criteria
+    
+    return base_criteria + all_additional_criteria
+
+def get_scope_based_criteria(analysis_scope, criteria_type="selection_criteria", keywords=None):
+    """분석 범위에 따른 특화 기준을 반환 (키워드 포함)"""
+    if not analysis_scope:
+        return ""
+    
+    # 첫 번째 범위를 주요 기준으로 사용 (본인회사 > 경쟁사 > 산업분야 순서로 우선순위)
+    priority_order = ["본인회사", "경쟁사", "산업분야"]
+    selected_scope = None
+    
+    for scope in priority_order:
+        if scope in analysis_scope:
+            selected_scope = scope
+            break
+    
+    if selected_scope and selected_scope in ANALYSIS_SCOPE_CRITERIA:
+        criteria_template = ANALYSIS_SCOPE_CRITERIA[selected_scope].get(criteria_type, "")
+        
+        # 키워드가 제공된 경우 템플릿에 삽입
+        if keywords and "{keywords}" in criteria_template:
+            keywords_str = ", ".join(keywords) if isinstance(keywords, list) else str(keywords)
+            return criteria_template.format(keywords=keywords_str)
+        
+        return criteria_template
+    
+    return ""
+
+def get_scope_based_system_prompts(analysis_scope):
+    """분석 범위에 따른 시스템 프롬프트를 반환"""
+    if not analysis_scope:
+        return SYSTEM_PROMPT_1, SYSTEM_PROMPT_2, SYSTEM_PROMPT_3
+    
+    # 첫 번째 범위를 주요 기준으로 사용 (본인회사 > 경쟁사 > 산업분야 순서로 우선순위)
+    priority_order = ["본인회사", "경쟁사", "산업분야"]
+    selected_scope = None
+    
+    for scope in priority_order:
+        if scope in analysis_scope:
+            selected_scope = scope
+            break
+    
+    if selected_scope and selected_scope in ANALYSIS_SCOPE_SYSTEM_PROMPTS:
+        scope_prompts = ANALYSIS_SCOPE_SYSTEM_PROMPTS[selected_scope]
+        return (
+            scope_prompts.get("system_prompt_1", SYSTEM_PROMPT_1),
+            scope_prompts.get("system_prompt_2", SYSTEM_PROMPT_2),
+            scope_prompts.get("system_prompt_3", SYSTEM_PROMPT_3)
+        )
+    
+    return SYSTEM_PROMPT_1, SYSTEM_PROMPT_2, SYSTEM_PROMPT_3
+
+
+def build_initial_state(keywords: List[str], model: str, exclusion_criteria: str, duplicate_handling: str,
+                        selection_criteria: str, system_prompts: Sequence[str], valid_press_dict: Dict[str, List[str]],
+                        start_datetime: datetime, end_datetime: datetime,
+                        incremental_collection: bool = INCREMENTAL_COLLECTION,
+                        relevance_prefilter: bool = RELEVANCE_PREFILTER,
+                        stage1_local_model: bool = STAGE1_LOCAL_MODEL,
+                        model_cascade: bool = MODEL_CASCADE_ENABLED) -> dict:
+    """
+    키워드 1개(회사/분야) 분석의 초기 상태를 생성합니다.
+
+    Args:
+        keywords (List[str]): 실제 검색에 사용할 확장 키워드 목록
+        model (str): 사용할 GPT 모델
+        exclusion_criteria (str): 1단계 제외 기준
+        duplicate_handling (str): 2단계 중복 처리 기준
+        selection_criteria (str): 3단계 선택 기준
+        system_prompts (Sequence[str]): 1~3단계 시스템 프롬프트
+        valid_press_dict (Dict[str, List[str]]): 유효 언론사 별칭
+        start_datetime (datetime): 검색 시작 시각
+        end_datetime (datetime): 검색 종료 시각
+        incremental_collection (bool): 이전 실행에서 분석한 기사를 건너뛰고 이전 판단을 이어받을지 여부
+        relevance_prefilter (bool): 1단계 전 로컬 사전 필터로 명백히 무관한 제목을 자동 제외할지 여부
+        stage1_local_model (bool): 과거 1단계 판단으로 학습한 로컬 모델이 확신하는 기사를 직접 판단할지 여부
+        model_cascade (bool): 1단계를 작은 모델로 먼저 분류하고 불확실한 기사만 선택한 모델로 재판단할지 여부
+
+    Returns:
+        dict: run_news_pipeline에 전달할 초기 상태
+    """
+    system_prompt_1, system_prompt_2, system_prompt_3 = system_prompts
+    return {
+        "news_data": [],
+        "filtered_news": [],
+        "analysis": "",
+        "keyword": keywords,  # 회사별 확장 키워드 리스트 전달
+        "model": model,
+        "article_token_budget": ARTICLE_TOKEN_BUDGET,
+        "summary_batch_mode": SUMMARY_BATCH_MODE,
+        "summary_batch_token_budget": SUMMARY_BATCH_TOKEN_BUDGET,
+        "summary_batch_size": SUMMARY_BATCH_MAX_ARTICLES,
+        "excluded_news": [],
+        "borderline_news": [],
+        "retained_news": [],
+        "grouped_news": [],
+        "final_selection": [],
+        # 회사별 enhanced 기준들 적용
+        "exclusion_criteria": exclusion_criteria,
+        "duplicate_handling": duplicate_handling,
+        "selection_criteria": selection_criteria,
+        "system_prompt_1": system_prompt_1,
+        "user_prompt_1": "",
+        "llm_response_1": "",
+        "system_prompt_2": system_prompt_2,
+        "user_prompt_2": "",
+        "llm_response_2": "",
+        "system_prompt_3": system_prompt_3,
+        "user_prompt_3": "",
+        "llm_response_3": "",
+        "not_selected_news": [],
+        "original_news_data": [],
+        # 언론사 설정 (파싱된 딕셔너리)
+        "valid_press_dict": valid_press_dict,
+        # 날짜 필터 정보
+        "start_datetime": start_datetime,
+        "end_datetime": end_datetime,
+        # 증분 수집 (collection_state)
+        "incremental_collection": incremental_collection,
+        "carried_news": [],
+        "collection_watermarks": {},
+        # 지역별 RSS 상태 (collect_news에서 기록)
+        "region_health": {},
+        # 1단계 사전 필터 (relevance_filter)
+        "relevance_prefilter": relevance_prefilter,
+        "prefilter_stats": {},
+        # 1단계 로컬 모델 (verdict_model)
+        "stage1_local_model": stage1_local_model,
+        "stage1_model_stats": {},
+        # 단계별 모델 캐스케이드와 모델별 비용/지연 (model_cascade)
+        "model_cascade": model_cascade,
+        "model_usage": {},
+    }
+
+
+def run_news_pipeline(initial_state: dict, enable_article_summary: bool = False,
+                      on_stage: Optional[Callable[[str], None]] = None) -> dict:
+    """
+    키워드 1개의 분석 파이프라인을 실행합니다.
+
+    Args:
+        initial_state (dict): 키워드, 기준, 프롬프트, 날짜 범위 등이 담긴 초기 상태
+        enable_article_summary (bool): 최종 선정 기사 원문 요약 여부
+        on_stage (Callable[[str], None]): 각 단계 시작 시 단계 키로 호출되는 콜백 (진행 상황 표시용)
+
+    Returns:
+        dict: 최종 상태 (final_selection 등 포함)
+    """
+    # news_ai(LLM 클라이언트, 스크래퍼)는 실행 시점에 임포트 - 기준/상태 생성만 하는 호출자는 비용 없음
+    from news_ai import (
+        collect_news,
+        filter_excluded_news,
+        group_and_select_news,
+        evaluate_importance,
+        summarize_selected_articles,
+    )
+    from model_cascade import model_usage
+
+    def enter(stage):
+        if on_stage:
+            on_stage(stage)
+
+    # 작업 프로세스가 재사용되므로 키워드마다 모델별 비용/지연 집계를 새로 시작
+    model_usage.reset()
+
+    enter("collect")
+    state = collect_news(initial_state)
+
+    enter("exclusion")
+    state = filter_excluded_news(state)
+
+    enter("grouping")
+    state = group_and_select_news(state)
+
+    enter("evaluation")
+    state = evaluate_importance(state)
+
+    # 원문 요약 (옵션, 선정된 기사가 있을 때만)
+    if enable_article_summary and state.get("final_selection"):
+        enter("summary")
+        state = summarize_selected_articles(state)
+    state["model_usage"] = model_usage.summary()
+
+    # 증분 수집: 끝까지 실행된 경우에만 기사별 판단과 워터마크 기록
+    if state.get("incremental_collection"):
+        remember_collection(state)
+
+    return state
+
+
+def remember_collection(state: dict):
+    """이번 실행에서 분석한 기사의 최종 판단(보고서 분석 상태)과 키워드 × 지역별 워터마크 저장"""
+    from collection_state import CollectionStateStore, collection_scope
+    from news_report import build_news_status
+
+    # 1단계 분류가 실패했으면 판단이 없으므로 기록하지 않음 (다음 실행에서 다시 분석)
+    if state.get("news_data") and not any(state.get(key) for key in ("excluded_news", "borderline_news", "retained_news")):
+        print("1단계 분류 결과가 없어 수집 상태를 기록하지 않습니다.")
+        return
+
+    news_status = build_news_status(state)
+    verdicts = {position: (status['status'], status['final_reason'] or status['reason'])
+                for position, status in news_status.items()}
+    try:
+        CollectionStateStore().remember(collection_scope(state.get("keyword", [])), state.get("news_data", []),
+                                        verdicts, state.get("collection_watermarks", {}))
+    except Exception as e:
+        print(f"수집 상태 저장 실패 (다음 실행은 전체 수집): {e}")
@@ -0,0 +1,296 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+News Report
+-----------
+회사별 분석 파이프라인이 끝날 때마다 보고서 데이터를 누적하는 모듈입니다.
+분석 상태(제외/보류/유지/그룹/최종 선택) 행과 최종 선정 기사(파싱된 요약 포함)를 한 번만 만들어 두고,
+통합 Excel, Word, HTML 이메일을 모두 이 메모리 모델에서 생성합니다.
+"""
+
+import io
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from excel_report import StreamingExcelReport, column_widths, write_summary_sheet
+from article_summary import ArticleSummary
+from config import ADDITIONAL_PRESS_ALIASES, TRUSTED_PRESS_ALIASES
+from press_index import get_press_index
+
+# 통합 Excel 컬럼
+INTEGRATED_HEADERS = [
+    '키워드', '순번', '제목', '언론사', '날짜', 'URL', '분석 상태', '1차 분류 사유', '그룹핑 정보',
+    '최종 선택 사유', 'AI 번역 제목', 'AI 핵심 요약', 'AI 세부 내용', '원문 추출 성공'
+]
+
+# 증분 수집으로 이전 판단을 이어받은 기사의 분석 상태
+CARRIED_STATUS = '이전 실행 판단'
+
+# 요약 데이터가 없을 때 핵심 요약으로 보여줄 최대 길이
+FALLBACK_SUMMARY_LENGTH = 200
+
+
+def format_news_date(date_str: str, output_format: str = '%Y-%m-%d %H:%M') -> str:
+    """RSS 날짜(GMT) 또는 YYYY-MM-DD 문자열을 보고서용 형식으로 변환"""
+    try:
+        if 'GMT' in date_str:
+            date_obj = datetime.strptime(date_str, '%a, %d %b %Y %H:%M:%S %Z')
+            return date_obj.strftime(output_format)
+        datetime.strptime(date_str, '%Y-%m-%d')
+        return date_str
+    except:
+        return date_str if date_str else '날짜 정보 없음'
+
+
+def _first_index(news_list: List[dict], url_key: str, title_key: str) -> Tuple[Dict[str, int], Dict[str, int]]:
+    """URL/제목 → 첫 등장 위치 인덱스 (리스트를 매번 순회하지 않도록 한 번만 생성)"""
+    by_url, by_title = {}, {}
+    for position, news in enumerate(news_list):
+        by_url.setdefault(news.get(url_key), position)
+        by_title.setdefault(news.get(title_key), position)
+    return by_url, by_title
+
+
+def _lookup(by_url: Dict[str, int], by_title: Dict[str, int], url: Any, title: Any) -> Optional[int]:
+    """URL 또는 제목이 일치하는 첫 위치 (둘 다 일치하면 앞선 위치)"""
+    candidates = [position for position in (by_url.get(url), by_title.get(title)) if position is not None]
+    return min(candidates) if candidates else None
+
+
+def build_news_status(final_state: dict) -> Dict[int, dict]:
+    """
+    분석 상태에서 뉴스 순번별 상태/사유/그룹 정보를 계산합니다.
+
+    Returns:
+        Dict[int, dict]: 순번(1부터) → {'status', 'reason', 'group', 'final_reason'}
+    """
+    news_data = final_state.get("news_data", [])
+    news_status = {}
+
+    # 제외/보류/유지 뉴스 처리
+    for key, status in (("excluded_news", '제외'), ("borderline_news", '보류'), ("retained_news", '유지')):
+        for news in final_state.get(key, []):
+            news_status[news.get('index', -1)] = {
+                'status': status,
+                'reason': news.get('reason', ''),
+                'group': '',
+                'final_reason': ''
+            }
+
+    # 그룹핑 정보 처리
+    for group in final_state.get("grouped_news", []):
+        group_indices = group.get('indices', [])
+        selected_index = group.get('selected_index', -1)
+        group_info = f"그룹 {group_indices} (선택: {selected_index})"
+
+        for idx in group_indices:
+            if idx in news_status:
+                news_status[idx]['group'] = group_info
+                news_status[idx]['status'] = '그룹 대표 선택' if idx == selected_index else '그룹 내 미선택'
+
+    # 최종 선택된 뉴스 처리 (원본 뉴스에서 URL 또는 제목으로 순번 찾기)
+    by_url, by_title = _first_index(news_data, 'url', 'content')
+    for news in final_state.get("final_selection", []):
+        position = _lookup(by_url, by_title, news.get('url'), news.get('title'))
+        original_index = position + 1 if position is not None else -1
+        if original_index in news_status:
+            news_status[original_index]['status'] = '최종 선택'
+            news_status[original_index]['final_reason'] = news.get('reason', '')
+
+    # 최종 선택되지 않은 뉴스 처리
+    for news in final_state.get("not_selected_news", []):
+        news_index = news.get('index', -1)
+        if news_index in news_status:
+            news_status[news_index]['final_reason'] = f"미선택 사유: {news.get('reason', '')}"
+
+    return news_status
+
+
+def get_article_summary(news: dict) -> ArticleSummary:
+    """기사에 저장된 ArticleSummary 반환 (없으면 ai_summary 텍스트로 생성)"""
+    summary = news.get('article_summary')
+    if isinstance(summary, ArticleSummary):
+        return summary
+    return ArticleSummary.failed(news.get('ai_summary', ''))
+
+
+class NewsReport:
+    """
+    회사별 분석 결과를 완료 즉시 누적하는 보고서 모델.
+
+    사용 예:
+        report = NewsReport()
+        report.add_company("현대차", final_state)   # 회사별 파이프라인 종료 직후
+        excel_bio = report.to_excel("2025-06-01", "2025-06-02")
+        word_bio = report.to_word()
+        for news in report.final_news: ...          # HTML 이메일
+    """
+
+    def __init__(self):
+        self.rows: List[Tuple[list, str]] = []
+        self.final_news: List[dict] = []
+        self.company_stats: List[Tuple[str, int, int]] = []
+        # 언론사별 최종 선택 기사 수 (별칭/도메인을 설정된 언론사명으로 묶어 집계)
+        self.press_counts: Counter = Counter()
+
+    def add_company(self, company: str, final_state: dict):
+        """회사 1곳의 분석 상태를 보고서 행과 최종 선정 기사로 변환해 누적"""
+        if not final_state:
+            return
+
+        news_data = final_state.get("news_data", [])
+        final_selection = final_state.get("final_selection", [])
+        news_status = build_news_status(final_state)
+
+        valid_press_config = final_state.get("valid_press_dict")
+        press_index = get_press_index(valid_press_config if isinstance(valid_press_config, dict) and valid_press_config
+                                      else {**TRUSTED_PRESS_ALIASES, **ADDITIONAL_PRESS_ALIASES})
+
+        # 최종 선정 기사 (요약은 여기서 한 번만 변환)
+        selected_entries = []
+        for news in final_selection:
+            entry = dict(news)
+            entry['source_keyword'] = company
+            entry['article_summary'] = get_article_summary(news)
+            selected_entries.append(entry)
+            self.press_counts[press_index.canonical(news.get('press'), news.get('url'))] += 1
+        self.final_news.extend(selected_entries)
+
+        by_url, by_title = _first_index(final_selection, 'url', 'title')
+        for i, news in enumerate(news_data, 1):
+            status_info = news_status.get(i, {
+                'status': '상태 불명',
+                'reason': '',
+                'group': '',
+                'final_reason': ''
+            })
+
+            # AI 요약 정보 (최종 선택된 뉴스인 경우에만)
+            ai_title_korean, ai_summary_oneline, ai_details = "", "", ""
+            extraction_success = False
+            if status_info['status'] == '최종 선택':
+                position = _lookup(by_url, by_title, news.get('url'), news.get('content'))
+                if position is not None:
+                    selected = selected_entries[position]
+                    extraction_success = selected.get('extraction_success', False)
+                    if selected.get('ai_summary'):
+                        summary = selected['article_summary']
+                        ai_title_korean = summary.title
+                        ai_summary_oneline = summary.summary
+                        ai_details = summary.details_text()
+                        # 파싱된 요약이 없으면 원문 텍스트 앞부분만 표시
+                        if not summary.parsed and extraction_success and len(ai_summary_oneline) > FALLBACK_SUMMARY_LENGTH:
+                            ai_summary_oneline = ai_summary_oneline[:FALLBACK_SUMMARY_LENGTH] + "..."
+
+            self.rows.append(([
+                company,  # 맨 앞 컬럼에 키워드 추가
+                i,
+                news.get('content', '제목 없음'),
+                news.get('press', '알 수 없음'),
+                format_news_date(news.get('date', '')),
+                news.get('url', ''),
+                status_info['status'],
+                status_info['reason'],
+                status_info['group'],
+                status_info['final_reason'],
+                ai_title_korean,
+                ai_summary_oneline,
+                ai_details,
+                '성공' if extraction_success else '실패' if status_info['status'] == '최종 선택' else ''
+            ], status_info['status']))
+
+        # 증분 수집으로 이번에 다시 분석하지 않은 기사 (이전 실행의 판단 표시)
+        for i, news in enumerate(final_state.get("carried_news", []), len(news_data) + 1):
+            self.rows.append(([
+                company, i, news.get('content', '제목 없음'), news.get('press', '알 수 없음'),
+                format_news_date(news.get('date', '')), news.get('url', ''),
+                CARRIED_STATUS, f"{news.get('previous_verdict', '')}: {news.get('previous_reason', '')}".strip(': '),
+                '', '', '', '', '', ''
+            ], CARRIED_STATUS))
+
+        self.company_stats.append((company, len(news_data), len(final_selection)))
+
+    def to_excel(self, start_date: str, end_date: str) -> io.BytesIO:
+        """모든 키워드의 분석 결과를 하나의 시트에 통합한 Excel 파일 생성"""
+        report = StreamingExcelReport()
+        sheet = report.add_sheet('전체 뉴스 분석', INTEGRATED_HEADERS,
+                                 fixed_widths=column_widths(INTEGRATED_HEADERS, (values for values, _ in self.rows)))
+        for values, status in self.rows:
+            report.write_row(sheet, values, status=status)
+
+        # 요약 시트 추가
+        summary_data = [
+            ['분석 기간', f"{start_date} ~ {end_date}"],
+            ['분석 키워드 수', len(self.company_stats)],
+            ['전체 뉴스 수', len(self.rows)],
+            ['', '']  # 빈 행
+        ]
+        # 키워드별 통계
+        for company, news_count, selected_count in self.company_stats:
+            summary_data.append([f"{company} - 전체 뉴스", news_count])
+            summary_data.append([f"{company} - 최종 선택", selected_count])
+        # 언론사별 최종 선택 통계
+        if self.press_counts:
+            summary_data.append(['', ''])
+            for press, count in self.press_counts.most_common():
+                summary_data.append([f"{press} - 최종 선택", count])
+        write_summary_sheet(report, summary_data, widths=(25, 15))
+
+        return report.close()
+
+    def to_word(self, title: str = 'PwC 뉴스 분석 보고서') -> io.BytesIO:
+        """키워드별 최종 선정 기사와 AI 요약을 담은 Word 문서 생성"""
+        import docx
+        from docx.shared import RGBColor
+
+        doc = docx.Document()
+
+        # 제목 스타일 설정
+        heading = doc.add_heading(title, level=0)
+        for run in heading.runs:
+            run.font.color.rgb = RGBColor(208, 74, 2)  # PwC 오렌지 색상
+
+        current_company = None
+        number = 0
+        for news in self.final_news:
+            if news['source_keyword'] != current_company:
+                current_company = news['source_keyword']
+                number = 0
+                doc.add_heading(f"선별된 주요 뉴스: {current_company}", level=1)
+            number += 1
+
+            p = doc.add_paragraph()
+            p.add_run(f"{number}. {news.get('title', '제목 없음')}").bold = True
+            doc.add_paragraph().add_run(f"날짜: {news.get('date', '날짜 정보 없음')}").italic = True
+
+            if news.get('reason'):
+                doc.add_paragraph(f"선정 사유: {news['reason']}")
+            if news.get('keywords'):
+                doc.add_paragraph(f"키워드: {', '.join(news['keywords'])}")
+            if news.get('affiliates'):
+                doc.add_paragraph(f"관련 계열사: {', '.join(news['affiliates'])}")
+            doc.add_paragraph(f"언론사: {news.get('press', '알 수 없음')}")
+
+            # AI 요약
+            summary = news['article_summary']
+            if summary.title:
+                doc.add_paragraph().add_run(summary.title).bold = True
+            if summary.summary:
+                doc.add_paragraph(f"핵심 요약: {summary.summary}")
+            for detail in summary.details:
+                doc.add_paragraph(detail, style='List Bullet')
+
+            if news.get('url'):
+                doc.add_paragraph(f"출처: {news['url']}")
+
+        # 날짜 및 푸터 추가
+        current_date = datetime.now().strftime("%Y년 %m월 %d일")
+        doc.add_paragraph(f"\n보고서 생성일: {current_date}")
+        doc.add_paragraph("© 2024 PwC 뉴스 분석기 | 회계법인 관점의 뉴스 분석 도구")
+
+        bio = io.BytesIO()
+        doc.save(bio)
+        bio.seek(0)
+        return bio
@@ -2,11 +2,14 @@ import streamlit as st
 import requests
 from urllib.parse import urlparse
 from web_scraper import HybridNewsWebScraper
+from text_cleaner import clean_html
+from content_budget import budget_article, count_tokens
+from llm_governor import governed_call
+from prompt_layout import total_tokens
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage
 import os
 import time
-import re
 from datetime import datetime
 
 # 페이지 설정
@@ -22,34 +25,14 @@ dotenv.load_dotenv(override=True)
 
 def clean_html_tags(text: str) -> str:
     """HTML 태그를 제거하고 깔끔한 텍스트로 변환"""
-    if not text:
-        return ""
-    
-    # HTML 태그 제거
-    text = re.sub(r'<[^>]+>', '', text)
-    
-    # HTML 엔티티 변환
-    html_entities = {
-        '&amp;': '&',
-        '&lt;': '<',
-        '&gt;': '>',
-        '&quot;': '"',
-        '&#39;': "'",
-        '&nbsp;': ' '
-    }
-    
-    for entity, char in html_entities.items():
-        text = text.replace(entity, char)
-    
-    # 연속된 공백과 줄바꿈 정리
-    text = re.sub(r'\s+', ' ', text)
-    text = re.sub(r'\n\s*\n', '\n\n', text)
-    
-    return text.strip()
+    return clean_html(text)
 
 def generate_summary(content: str, title: str) -> str:
     """AI를 사용해 기사 요약 생성"""
     try:
+        # 본문 토큰 예산 적용 (리드/수치 문단 우선)
+        content = budget_article(content, title, model="gpt-4.1") or content
+        
         summary_prompt = f"""
 다음 뉴스 기사를 현대자동차 남양연구소 PT/전동화 개발 인력 관점에서 요약해주세요.
 
@@ -80,6 +63,7 @@ def generate_summary(content: str, title: str) -> str:
                 model="gpt-4.1",
                 temperature=0.3,
                 request_timeout=30,
+                max_retries=0,  # 재시도는 llm_governor에서 처리
                 openai_api_key=os.getenv("OPENAI_API_KEY"),
                 openai_api_base=os.getenv("OPENAI_BASE_URL")
             )
@@ -89,7 +73,13 @@ def generate_summary(content: str, title: str) -> str:
                 HumanMessage(content=summary_prompt)
             ]
             
-            response = llm.invoke(messages)
+            response = governed_call(
+                lambda: llm.invoke(messages),
+                model="gpt-4.1",
+                tokens=count_tokens(summary_prompt, "gpt-4.1") + 1000,
+                stage="summary",
+                usage_fn=total_tokens
+            )
             return clean_html_tags(response.content)
             
         except Exception as e:
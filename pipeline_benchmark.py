@@ -0,0 +1,534 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Pipeline Benchmark
+------------------
+실제 Google News/OpenAI 없이 전체 뉴스 파이프라인(수집 → 제외 판단 → 그룹핑 → 중요도 평가 → 원문 요약)의
+성능을 측정하는 벤치마크 하네스입니다.
+
+로컬 HTTP 서버 1개가 외부 서비스를 대신합니다.
+    /rss/search           기록된 RSS 피드(fixtures/feeds/*.xml) 또는 합성 Google News 피드
+    /articles/<번호>       기록된 기사 HTML(fixtures/articles/*.html) 또는 합성 기사
+    /v1/chat/completions  프롬프트 단계별로 결정적인 JSON을 돌려주는 가짜 OpenAI (응답 지연 설정 가능)
+
+회사 수 × 키워드 수 × 지역 수로 규모를 정하고 전체 시간, 단계별 시간, 최대 RSS, 외부 호출 수를 보고합니다.
+--baseline으로 이전 결과(JSON)를 주면 단계별 시간이 허용 비율 이상 늘었을 때 종료 코드 1로 끝나므로
+CI에서 단계별 성능 회귀를 잡을 수 있습니다.
+
+사용 예:
+    python pipeline_benchmark.py --companies 2 --keywords 3 --regions 2 --llm-latency 0.2 --json bench.json
+    python pipeline_benchmark.py --baseline bench.json --max-regression 0.25
+    python pipeline_benchmark.py --record fixtures --keywords-text "Hyundai e-axle" "현대차 전동화"
+"""
+
+import argparse
+import itertools
+import json
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+# 합성 피드에 쓰는 언론사 (이름, 홈페이지)
+SYNTHETIC_PRESS = [
+    ("Reuters", "https://www.reuters.com"),
+    ("Bloomberg", "https://www.bloomberg.com"),
+    ("연합뉴스", "https://www.yna.co.kr"),
+    ("한국경제", "https://www.hankyung.com"),
+    ("Nikkei Asia", "https://asia.nikkei.com"),
+]
+
+# 기본 규모 / 지연
+DEFAULT_ITEMS_PER_FEED = 40
+DEFAULT_LLM_LATENCY = 0.2
+DEFAULT_FEED_LATENCY = 0.05
+
+# 회귀 판정 시 무시할 최소 증가 시간 (초) - 아주 짧은 단계의 측정 잡음 방지
+DEFAULT_MIN_REGRESSION_SECONDS = 0.05
+
+_DATA_INDEX = re.compile(r'^(\d+)\. ', re.MULTILINE)
+_LIST_INDEX = re.compile(r'인덱스: (\d+)')
+_ARTICLE_ID = re.compile(r'\[기사 id=(\d+)\]')
+_FEED_LINK = re.compile(r'<link>[^<]*</link>')
+
+
+@lru_cache(maxsize=1)
+def _prompt_markers() -> Dict[str, str]:
+    """단계 판별용 고정 지시문 (news_ai의 프롬프트와 항상 일치하도록 직접 가져옴)"""
+    from news_ai import (
+        EVALUATION_INSTRUCTION,
+        EXCLUSION_INSTRUCTION,
+        GROUPING_INSTRUCTION,
+        SUMMARY_BATCH_INSTRUCTIONS,
+        SUMMARY_INSTRUCTIONS,
+    )
+
+    # 배치 요약 프롬프트에는 단건 요약 지시문도 들어 있으므로 배치를 먼저 확인
+    return {
+        "summary_batch": SUMMARY_BATCH_INSTRUCTIONS.splitlines()[0],
+        "summary": SUMMARY_INSTRUCTIONS.splitlines()[0],
+        "exclusion": EXCLUSION_INSTRUCTION.splitlines()[0],
+        "grouping": GROUPING_INSTRUCTION.splitlines()[0],
+        "evaluation": EVALUATION_INSTRUCTION.splitlines()[0],
+    }
+
+
+def _data_section(prompt: str, label: str = "[뉴스 목록]") -> str:
+    """프롬프트 맨 뒤 가변 데이터 섹션 (기준 문구의 번호 목록과 섞이지 않도록)"""
+    position = prompt.rfind(label)
+    return prompt[position + len(label):] if position != -1 else prompt
+
+
+def _summary_item(article_id: Optional[int] = None) -> dict:
+    item = {
+        "title": f"합성 기사 {article_id or 1} 요약",
+        "summary": "전동화 파워트레인 관련 발표 내용을 요약합니다.",
+        "details": ["모터 출력 160kW", "배터리 용량 77.4kWh", "양산 시점 2027년"],
+    }
+    return {"id": article_id, **item} if article_id is not None else item
+
+
+def fake_completion(prompt: str) -> tuple:
+    """
+    프롬프트 단계에 맞는 결정적인 응답 생성
+
+    Returns:
+        tuple: (단계명, 응답 본문)
+    """
+    markers = _prompt_markers()
+    stage = next((name for name, marker in markers.items() if marker in prompt), "other")
+
+    if stage == "summary_batch":
+        ids = [int(value) for value in _ARTICLE_ID.findall(prompt)]
+        return stage, json.dumps([_summary_item(article_id) for article_id in ids], ensure_ascii=False)
+    if stage == "summary":
+        return stage, json.dumps(_summary_item(), ensure_ascii=False)
+    if stage == "exclusion":
+        # 번호 % 5 == 0 제외, == 1 보류, 나머지 유지 (확신도 요청 시 번호 % 7 == 3은 낮은 확신도)
+        with_confidence = '"confidence"' in prompt
+        result = {"excluded": [], "borderline": [], "retained": []}
+        for value in _DATA_INDEX.findall(_data_section(prompt)):
+            index = int(value)
+            category = "excluded" if index % 5 == 0 else "borderline" if index % 5 == 1 else "retained"
+            item = {"index": index, "title": f"기사 {index}", "reason": "합성 판단"}
+            if with_confidence:
+                item["confidence"] = 0.5 if index % 7 == 3 else 0.95
+            result[category].append(item)
+        return stage, json.dumps(result, ensure_ascii=False)
+    if stage == "grouping":
+        # 인접한 두 기사씩 같은 그룹 (앞 기사 대표)
+        indices = [int(value) for value in _LIST_INDEX.findall(_data_section(prompt))]
+        groups = [{"indices": indices[i:i + 2], "selected_index": indices[i], "reason": "합성 그룹"}
+                  for i in range(0, len(indices), 2)]
+        return stage, json.dumps({"groups": groups}, ensure_ascii=False)
+    if stage == "evaluation":
+        # 3의 배수 번째는 미선정, 나머지는 상/중으로 선정
+        result = {"final_selection": [], "not_selected": []}
+        for position, value in enumerate(_LIST_INDEX.findall(_data_section(prompt)), 1):
+            index = int(value)
+            if position % 3 == 0:
+                result["not_selected"].append({"index": index, "title": f"기사 {index}", "importance": "하",
+                                               "reason": "합성 미선정"})
+            else:
+                result["final_selection"].append({
+                    "index": index, "title": f"기사 {index}", "importance": "상" if position % 2 else "중",
+                    "reason": "합성 선정", "keywords": ["전동화"], "affiliates": [], "press": "", "date": "",
+                })
+        return stage, json.dumps(result, ensure_ascii=False)
+    return stage, "합성 응답"
+
+
+class FixtureServer:
+    """
+    기록/합성 RSS 피드, 기사 HTML, 가짜 OpenAI를 제공하는 로컬 HTTP 서버.
+
+    사용 예:
+        with FixtureServer(llm_latency=0.2) as server:
+            os.environ["GOOGLE_NEWS_BASE_URL"] = server.rss_base_url
+            os.environ["OPENAI_BASE_URL"] = server.openai_base_url
+            ...
+            print(server.calls)
+    """
+
+    def __init__(self, fixtures_dir: Optional[str] = None, items_per_feed: int = DEFAULT_ITEMS_PER_FEED,
+                 llm_latency: float = DEFAULT_LLM_LATENCY, feed_latency: float = DEFAULT_FEED_LATENCY):
+        self.items_per_feed = items_per_feed
+        self.llm_latency = llm_latency
+        self.feed_latency = feed_latency
+        self.feeds: List[bytes] = []
+        self.articles: List[bytes] = []
+        if fixtures_dir:
+            root = Path(fixtures_dir)
+            self.feeds = [path.read_bytes() for path in sorted(root.glob("feeds/*.xml"))]
+            self.articles = [path.read_bytes() for path in sorted(root.glob("articles/*.html"))]
+        self.calls: Dict[str, int] = {}
+        self.prompt_chars = 0
+        self._lock = threading.Lock()
+        self._feed_counter = 0
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    @property
+    def rss_base_url(self) -> str:
+        return f"{self.base_url}/rss"
+
+    @property
+    def openai_base_url(self) -> str:
+        return f"{self.base_url}/v1"
+
+    def __enter__(self) -> "FixtureServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _count(self, key: str, prompt_chars: int = 0):
+        with self._lock:
+            self.calls[key] = self.calls.get(key, 0) + 1
+            self.prompt_chars += prompt_chars
+
+    def _next_feed_offset(self) -> int:
+        with self._lock:
+            self._feed_counter += 1
+            return self._feed_counter * self.items_per_feed
+
+    def feed_body(self, query: str, region: str) -> bytes:
+        """검색어/지역에 대한 RSS 응답 (기록된 피드는 기사 링크만 로컬 주소로 교체)"""
+        offset = self._next_feed_offset()
+        if self.feeds:
+            article_ids = itertools.count(offset)
+            feed = self.feeds[offset // self.items_per_feed % len(self.feeds)].decode('utf-8', 'replace')
+            return _FEED_LINK.sub(lambda _: f"<link>{self.base_url}/articles/{next(article_ids)}</link>",
+                                  feed).encode('utf-8')
+
+        # 합성 피드: 검색어의 각 키워드가 제목에 들어가도록 (OR 쿼리 수집량 집계 대상)
+        terms = [term.strip("() ") for term in re.split(r'\s+OR\s+', re.sub(r'\s+(when|after|before):\S+', '', query))]
+        terms = [term for term in terms if term] or ["news"]
+        now = datetime.now(timezone.utc)
+        items = []
+        for i in range(self.items_per_feed):
+            article_id = offset + i
+            press, homepage = SYNTHETIC_PRESS[article_id % len(SYNTHETIC_PRESS)]
+            published = format_datetime(now - timedelta(minutes=10 * i + 1), usegmt=True)
+            items.append(
+                f"<item><title>{terms[i % len(terms)]} unveils e-axle update {article_id} ({region}) - {press}</title>"
+                f"<link>{self.base_url}/articles/{article_id}</link>"
+                f"<guid isPermaLink=\"false\">{article_id}</guid><pubDate>{published}</pubDate>"
+                f"<source url=\"{homepage}\">{press}</source></item>"
+            )
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+            f'<title>Google News</title>{"".join(items)}</channel></rss>'
+        ).encode('utf-8')
+
+    def article_body(self, article_id: int) -> bytes:
+        """기사 HTML (기록된 기사를 순환 사용, 없으면 합성)"""
+        if self.articles:
+            return self.articles[article_id % len(self.articles)]
+        paragraphs = "".join(
+            f"<p>Hyundai Motor Group said on day {n} that article {article_id} describes a 160kW e-axle "
+            f"with an 800V silicon-carbide inverter and a 77.4kWh battery pack planned for 2027 production.</p>"
+            for n in range(8)
+        )
+        return (f"<html><head><title>Article {article_id}</title></head><body>"
+                f"<article><h1>Hyundai e-axle update {article_id}</h1>{paragraphs}</article></body></html>").encode('utf-8')
+
+    def _handler(self):
+        fixture = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _send(self, status: int, body: bytes, content_type: str):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                if parts.path.startswith("/rss"):
+                    params = parse_qs(parts.query)
+                    fixture._count("rss")
+                    time.sleep(fixture.feed_latency)
+                    body = fixture.feed_body(params.get("q", [""])[0], params.get("ceid", [""])[0])
+                    self._send(200, body, 'application/rss+xml; charset=utf-8')
+                elif parts.path.startswith("/articles/"):
+                    fixture._count("article")
+                    try:
+                        article_id = int(parts.path.rsplit("/", 1)[1])
+                    except ValueError:
+                        self._send(404, b"not found", 'text/plain')
+                        return
+                    self._send(200, fixture.article_body(article_id), 'text/html; charset=utf-8')
+                else:
+                    self._send(404, b"not found", 'text/plain')
+
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b"{}")
+                if not self.path.endswith("/chat/completions"):
+                    self._send(404, b'{"error": {"message": "not found"}}', 'application/json')
+                    return
+                prompt = "\n".join(str(message.get("content", "")) for message in payload.get("messages", []))
+                stage, content = fake_completion(prompt)
+                fixture._count(f"llm:{stage}", len(prompt))
+                time.sleep(fixture.llm_latency)
+                prompt_tokens = len(prompt) // 4
+                completion_tokens = len(content) // 4
+                body = json.dumps({
+                    "id": "chatcmpl-benchmark", "object": "chat.completion", "created": int(time.time()),
+                    "model": payload.get("model", "fake"),
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": content},
+                                 "finish_reason": "stop"}],
+                    "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                              "total_tokens": prompt_tokens + completion_tokens,
+                              "prompt_tokens_details": {"cached_tokens": 0}},
+                }, ensure_ascii=False).encode('utf-8')
+                self._send(200, body, 'application/json')
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def peak_rss_mb() -> Optional[float]:
+    """현재 프로세스의 최대 RSS (MB, resource 모듈이 없는 OS에서는 None)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_benchmark(companies: int = 1, keywords: int = 3, regions: int = 2,
+                  items_per_feed: int = DEFAULT_ITEMS_PER_FEED, llm_latency: float = DEFAULT_LLM_LATENCY,
+                  feed_latency: float = DEFAULT_FEED_LATENCY, article_summary: bool = True,
+                  fixtures_dir: Optional[str] = None, model: str = "gpt-4.1", cascade: bool = False) -> dict:
+    """
+    로컬 가짜 서버를 대상으로 회사 수만큼 파이프라인을 실행하고 성능 지표를 반환합니다.
+
+    Args:
+        companies (int): 분석할 회사(파이프라인 실행) 수
+        keywords (int): 회사별 검색 키워드 수
+        regions (int): 키워드별 검색 지역 수 (GoogleNews.regions 앞에서부터)
+        items_per_feed (int): 합성 피드 1개의 기사 수
+        llm_latency (float): 가짜 OpenAI 응답 지연 (초)
+        feed_latency (float): RSS 응답 지연 (초)
+        article_summary (bool): 원문 요약 단계 실행 여부
+        fixtures_dir (str): 기록된 fixture 디렉터리 (feeds/*.xml, articles/*.html)
+        model (str): 상태에 넣을 모델명
+        cascade (bool): 1단계 모델 캐스케이드 사용 여부 (config.STAGE_MODELS)
+
+    Returns:
+        dict: scale, wall_seconds, stages(단계별 누적 초), peak_rss_mb, calls, articles, model_usage
+    """
+    from googlenews import GoogleNews
+    from model_cascade import ModelUsageStats
+    from news_pipeline import PIPELINE_STAGES, build_initial_state, run_news_pipeline
+    from config import QUERY_REGIONS_BY_SCRIPT
+
+    region_names = list(GoogleNews().regions)[:max(1, regions)]
+    regions_by_script = {script: region_names for script in QUERY_REGIONS_BY_SCRIPT}
+    stages = {stage: 0.0 for stage, _ in PIPELINE_STAGES}
+    articles = {"collected": 0, "selected": 0}
+    model_stats = ModelUsageStats()
+    end_datetime = datetime.now(timezone.utc)
+    start_datetime = end_datetime - timedelta(days=1)
+
+    saved_env = {key: os.environ.get(key) for key in ("GOOGLE_NEWS_BASE_URL", "OPENAI_BASE_URL", "OPENAI_API_KEY")}
+    saved_cwd = os.getcwd()
+    with FixtureServer(fixtures_dir, items_per_feed, llm_latency, feed_latency) as server, \
+            tempfile.TemporaryDirectory() as workdir:
+        os.environ["GOOGLE_NEWS_BASE_URL"] = server.rss_base_url
+        os.environ["OPENAI_BASE_URL"] = server.openai_base_url
+        os.environ["OPENAI_API_KEY"] = "benchmark-key"
+        # 검색 수집량/수집 상태 SQLite는 임시 디렉터리에 생성 (실제 기록 오염 방지)
+        os.chdir(workdir)
+        started = time.perf_counter()
+        try:
+            for company in range(companies):
+                state = build_initial_state(
+                    [f"Company{company} topic{keyword}" for keyword in range(keywords)], model,
+                    "", "", "", ("", "", ""), {}, start_datetime, end_datetime, incremental_collection=False,
+                    model_cascade=cascade
+                )
+                state["query_regions_by_script"] = regions_by_script
+                marks = []
+                result = run_news_pipeline(state, enable_article_summary=article_summary,
+                                           on_stage=lambda stage: marks.append((stage, time.perf_counter())))
+                marks.append((None, time.perf_counter()))
+                for (stage, at), (_, next_at) in zip(marks, marks[1:]):
+                    stages[stage] += next_at - at
+                articles["collected"] += len(result.get("original_news_data", []))
+                articles["selected"] += len(result.get("final_selection", []))
+                model_stats.merge(result.get("model_usage") or {})
+        finally:
+            os.chdir(saved_cwd)
+            for key, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+        wall_seconds = time.perf_counter() - started
+        calls = dict(sorted(server.calls.items()))
+        calls["llm_prompt_chars"] = server.prompt_chars
+
+    return {
+        "scale": {"companies": companies, "keywords": keywords, "regions": len(region_names),
+                  "items_per_feed": items_per_feed, "llm_latency": llm_latency, "feed_latency": feed_latency,
+                  "article_summary": article_summary, "fixtures": bool(fixtures_dir), "cascade": cascade},
+        "wall_seconds": wall_seconds,
+        "stages": stages,
+        "peak_rss_mb": peak_rss_mb(),
+        "calls": calls,
+        "articles": articles,
+        "model_usage": model_stats.summary(),
+    }
+
+
+def find_regressions(result: dict, baseline: dict, max_regression: float = 0.25,
+                     min_seconds: float = DEFAULT_MIN_REGRESSION_SECONDS) -> List[str]:
+    """
+    기준 결과 대비 회귀 항목 (전체/단계별 시간이 비율과 최소 초를 모두 넘게 늘었거나 외부 호출이 늘어난 경우)
+
+    Returns:
+        List[str]: 회귀 설명 목록 (없으면 빈 리스트)
+    """
+    regressions = []
+    timings = [("전체", result["wall_seconds"], baseline.get("wall_seconds"))]
+    timings += [(stage, seconds, baseline.get("stages", {}).get(stage)) for stage, seconds in result["stages"].items()]
+    for name, current, previous in timings:
+        if previous is None:
+            continue
+        if current - previous > min_seconds and current > previous * (1 + max_regression):
+            regressions.append(f"{name}: {previous:.2f}s → {current:.2f}s (+{(current / max(previous, 1e-9) - 1):.0%})")
+    for name, count in result["calls"].items():
+        previous = baseline.get("calls", {}).get(name)
+        if name != "llm_prompt_chars" and previous is not None and count > previous:
+            regressions.append(f"호출 수 {name}: {previous} → {count}")
+    return regressions
+
+
+def format_report(result: dict) -> str:
+    """벤치마크 결과 요약 문자열"""
+    from news_pipeline import STAGE_NAMES
+
+    scale = result["scale"]
+    lines = [
+        f"규모: 회사 {scale['companies']} × 키워드 {scale['keywords']} × 지역 {scale['regions']} "
+        f"(피드당 {scale['items_per_feed']}건, LLM 지연 {scale['llm_latency']}s)",
+        f"전체 시간: {result['wall_seconds']:.2f}s",
+    ]
+    lines += [f"  {STAGE_NAMES.get(stage, stage)}: {seconds:.2f}s" for stage, seconds in result["stages"].items()]
+    if result["peak_rss_mb"] is not None:
+        lines.append(f"최대 RSS: {result['peak_rss_mb']:.1f}MB")
+    lines.append("호출: " + ", ".join(f"{name}={count}" for name, count in result["calls"].items()))
+    lines.append(f"기사: 수집 {result['articles']['collected']}건, 최종 선정 {result['articles']['selected']}건")
+    if result.get("model_usage"):
+        from model_cascade import ModelUsageStats
+
+        model_stats = ModelUsageStats()
+        model_stats.merge(result["model_usage"])
+        lines += [f"  {line}" for line in model_stats.report_lines()]
+    return "\n".join(lines)
+
+
+def record_fixtures(out_dir: str, keywords: List[str], regions: List[str], timeout: int = 10) -> int:
+    """
+    실제 Google News RSS 응답을 fixtures/feeds에 기록 (기사 HTML은 fixtures/articles/*.html로 직접 추가)
+
+    Returns:
+        int: 기록한 피드 수
+    """
+    import urllib.request
+    from urllib.parse import quote
+
+    from googlenews import GoogleNews
+    from rss_parser import USER_AGENT
+
+    news = GoogleNews()
+    feeds_dir = Path(out_dir) / "feeds"
+    feeds_dir.mkdir(parents=True, exist_ok=True)
+    recorded = 0
+    for keyword in keywords:
+        for region in regions:
+            config = news.regions[region]
+            url = (f"{news.base_url}/search?q={quote(keyword)}&hl={config['hl']}&gl={config['gl']}"
+                   f"&ceid={config['ceid']}")
+            request = urllib.request.Request(url, headers={'User-Agent': USER_AGENT})
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                body = response.read()
+            recorded += 1
+            (feeds_dir / f"{recorded:03d}.xml").write_bytes(body)
+            print(f"기록: {keyword} / {region} → {len(body)} bytes")
+    return recorded
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="기록된 fixture와 가짜 LLM으로 뉴스 파이프라인 성능을 측정합니다.")
+    parser.add_argument("--companies", type=int, default=1, help="회사(파이프라인 실행) 수")
+    parser.add_argument("--keywords", type=int, default=3, help="회사별 키워드 수")
+    parser.add_argument("--regions", type=int, default=2, help="키워드별 검색 지역 수")
+    parser.add_argument("--items-per-feed", type=int, default=DEFAULT_ITEMS_PER_FEED, help="합성 피드당 기사 수")
+    parser.add_argument("--llm-latency", type=float, default=DEFAULT_LLM_LATENCY, help="가짜 OpenAI 응답 지연 (초)")
+    parser.add_argument("--feed-latency", type=float, default=DEFAULT_FEED_LATENCY, help="RSS 응답 지연 (초)")
+    parser.add_argument("--no-summary", action="store_true", help="원문 요약 단계 생략")
+    parser.add_argument("--cascade", action="store_true", help="1단계 모델 캐스케이드 사용 (config.STAGE_MODELS)")
+    parser.add_argument("--fixtures", help="기록된 fixture 디렉터리 (feeds/*.xml, articles/*.html)")
+    parser.add_argument("--json", dest="json_path", help="결과를 JSON 파일로 저장")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    parser.add_argument("--max-regression", type=float, default=0.25, help="허용 증가 비율 (기본 25%%)")
+    parser.add_argument("--record", metavar="DIR", help="실제 Google News 피드를 DIR/feeds에 기록하고 종료")
+    parser.add_argument("--keywords-text", nargs="*", default=[], help="--record에 사용할 검색어")
+    parser.add_argument("--record-regions", nargs="*", default=["한국", "미국"], help="--record에 사용할 지역")
+    args = parser.parse_args(argv)
+
+    if args.record:
+        record_fixtures(args.record, args.keywords_text, args.record_regions)
+        return 0
+
+    result = run_benchmark(args.companies, args.keywords, args.regions, args.items_per_feed, args.llm_latency,
+                           args.feed_latency, not args.no_summary, args.fixtures, cascade=args.cascade)
+    print("\n=== 파이프라인 벤치마크 ===")
+    print(format_report(result))
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = find_regressions(result, baseline, args.max_regression)
+        if regressions:
+            print("\n성능 회귀:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("\n기준 결과 대비 회귀 없음")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
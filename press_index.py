@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Press Index
+-----------
+유효 언론사 설정("언론사: [별칭1, 별칭2, ...]")을 안전하게 파싱하고,
+정규화한 별칭 → 언론사 딕셔너리와 도메인 접미사 조회로 언론사명/URL을 O(1)에 매칭하는 모듈입니다.
+언론사 필터링, 중복 기사 대표 선정 시 언론사 우선순위, 보고서의 언론사별 집계에서 함께 사용합니다.
+
+설정 텍스트는 eval 대신 ast.literal_eval(실패 시 JSON)로 읽으므로 코드가 실행되지 않습니다.
+"""
+
+import ast
+import json
+import unicodedata
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+
+def normalize_alias(text: str) -> str:
+    """별칭 비교용 정규화 (NFKC, 대소문자 무시, 공백 정리, www. 제거)"""
+    normalized = " ".join(unicodedata.normalize("NFKC", text or "").casefold().split())
+    return normalized[4:] if normalized.startswith("www.") else normalized
+
+
+def _parse_literal(text: str):
+    """파이썬 리터럴 또는 JSON 값 파싱 (둘 다 실패하면 ValueError)"""
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError):
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"리스트 형식이 아닙니다: {text}") from e
+
+
+def _alias_list(value) -> List[str]:
+    """별칭 값 검증 (문자열 리스트만 허용)"""
+    if not isinstance(value, (list, tuple)) or not all(isinstance(alias, str) for alias in value):
+        raise ValueError(f"별칭은 문자열 리스트여야 합니다: {value!r}")
+    return list(value)
+
+
+def parse_press_config(text: str) -> Dict[str, List[str]]:
+    """
+    유효 언론사 설정 텍스트를 {언론사: [별칭, ...]} 딕셔너리로 변환합니다.
+
+    "언론사: [별칭, ...]" 형식의 줄 단위 설정과 JSON/파이썬 딕셔너리 전체 형식을 모두 지원하며,
+    형식이 잘못된 줄은 건너뜁니다.
+
+    Args:
+        text (str): 설정 텍스트
+
+    Returns:
+        Dict[str, List[str]]: 언론사 → 별칭 목록 (설정 순서 유지)
+    """
+    text = (text or "").strip()
+    if not text:
+        return {}
+
+    # 딕셔너리 전체 형식
+    if text.startswith("{"):
+        try:
+            config = _parse_literal(text)
+            if isinstance(config, dict):
+                return {str(name).strip(): _alias_list(aliases) for name, aliases in config.items()}
+        except ValueError as e:
+            print(f"[DEBUG] Valid press 전체 파싱 실패: {str(e)}")
+            return {}
+
+    press_config = {}
+    for line in text.split('\n'):
+        line = line.strip()
+        if not line or ': ' not in line:
+            continue
+        press_name, aliases_str = line.split(':', 1)
+        try:
+            press_config[press_name.strip()] = _alias_list(_parse_literal(aliases_str.strip()))
+        except ValueError as e:
+            print(f"[DEBUG] Valid press 파싱 실패: {line}, 오류: {str(e)}")
+    return press_config
+
+
+def _hostname(url: str) -> str:
+    """URL의 호스트명 (정규화, www. 제거)"""
+    if not url:
+        return ""
+    try:
+        return normalize_alias(urlparse(url if "//" in url else f"//{url}").hostname or "")
+    except ValueError:
+        return ""
+
+
+class PressIndex:
+    """
+    언론사 별칭 인덱스.
+
+    사용 예:
+        index = get_press_index(TRUSTED_PRESS_ALIASES)
+        index.match(press="Chosun")                          # "조선일보"
+        index.match(url="https://biz.chosun.com/it/...")     # "조선비즈" (가장 긴 도메인 접미사)
+        index.priority(press="한경")                          # 설정 순서 (없으면 len(index))
+    """
+
+    def __init__(self, press_config: Dict[str, List[str]]):
+        self.press_names: List[str] = list(press_config)
+        self._order = {name: position for position, name in enumerate(self.press_names)}
+        self._names: Dict[str, str] = {}
+        self._domains: Dict[str, str] = {}
+        for name, aliases in press_config.items():
+            for alias in [name, *aliases]:
+                key = normalize_alias(alias)
+                if not key:
+                    continue
+                # 같은 별칭이 여러 언론사에 있으면 먼저 나온 설정 우선
+                self._names.setdefault(key, name)
+                if "." in key and " " not in key:
+                    self._domains.setdefault(key, name)
+
+    def __len__(self) -> int:
+        return len(self.press_names)
+
+    def match_domain(self, url: str) -> Optional[str]:
+        """URL 호스트명의 가장 긴 등록 도메인 접미사로 언론사 찾기 (biz.chosun.com → chosun.com 순)"""
+        labels = _hostname(url).split(".")
+        for start in range(len(labels) - 1):
+            press = self._domains.get(".".join(labels[start:]))
+            if press:
+                return press
+        return None
+
+    def match(self, press: Optional[str] = None, url: Optional[str] = None) -> Optional[str]:
+        """
+        언론사명 또는 URL로 설정된 언론사 찾기
+
+        Args:
+            press (str): 기사에 표시된 언론사명 (별칭/도메인 모두 가능)
+            url (str): 기사 또는 언론사 URL
+
+        Returns:
+            Optional[str]: 설정된 언론사명 (매칭 실패 시 None)
+        """
+        if press:
+            name = self._names.get(normalize_alias(press))
+            if name:
+                return name
+        if url:
+            return self.match_domain(url)
+        return None
+
+    def match_news(self, news: dict) -> Optional[str]:
+        """뉴스 항목(press, source_url, url)으로 언론사 찾기"""
+        return (self.match(news.get('press'))
+                or self.match_domain(news.get('source_url', ''))
+                or self.match_domain(news.get('url', '')))
+
+    def canonical(self, press: Optional[str], url: Optional[str] = None) -> str:
+        """보고서 집계용 언론사명 (매칭 실패 시 원래 이름)"""
+        return self.match(press, url) or (press or '알 수 없음')
+
+    def priority(self, press: Optional[str] = None, url: Optional[str] = None) -> int:
+        """언론사 우선순위 (설정 순서, 작을수록 우선 / 미등록 언론사는 len(index))"""
+        name = self.match(press, url)
+        return self._order[name] if name else len(self.press_names)
+
+
+def _freeze(press_config: Dict[str, List[str]]) -> Tuple[Tuple[str, Tuple[str, ...]], ...]:
+    return tuple((name, tuple(aliases)) for name, aliases in press_config.items())
+
+
+@lru_cache(maxsize=32)
+def _build_index(frozen_config: Tuple[Tuple[str, Tuple[str, ...]], ...]) -> PressIndex:
+    return PressIndex(dict(frozen_config))
+
+
+def get_press_index(press_config: Dict[str, List[str]]) -> PressIndex:
+    """설정 내용별로 한 번만 생성되는 언론사 인덱스 반환"""
+    return _build_index(_freeze(press_config))
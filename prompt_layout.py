@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Prompt Layout
+-------------
+단계별 LLM 프롬프트를 "고정 지시문/기준/응답 형식 → 실행마다 바뀌는 데이터" 순서로 조립하는 모듈입니다.
+OpenAI의 자동 프롬프트 캐싱은 요청 앞부분(prefix)이 같을 때만 적용되므로,
+뉴스 목록이나 기사 본문 같은 가변 데이터는 항상 프롬프트 맨 뒤에 둡니다.
+API 응답의 usage 필드에서 캐시된 입력 토큰 수를 읽어 단계별로 집계합니다.
+"""
+
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# 단계 표시명 (call_llm의 stage 번호 및 요약 단계)
+STAGE_LABELS = {
+    1: "1단계 제외 판단",
+    2: "2단계 그룹핑",
+    3: "3단계 중요도 평가",
+    "summary": "원문 요약",
+}
+
+
+def _format_section(label: str, body: str) -> str:
+    """[라벨]\\n본문 형식의 섹션 문자열 생성"""
+    return f"[{label}]\n{body}" if label else body
+
+
+def build_prompt(instruction: str, static_sections: Sequence[Tuple[str, str]] = (),
+                 data_sections: Sequence[Tuple[str, str]] = ()) -> str:
+    """
+    캐시 친화적인 순서로 프롬프트를 조립합니다.
+
+    Args:
+        instruction (str): 작업 지시문 (고정)
+        static_sections (Sequence[Tuple[str, str]]): (라벨, 내용) 형식의 고정 섹션 - 기준, 응답 형식, 예시 등
+        data_sections (Sequence[Tuple[str, str]]): (라벨, 내용) 형식의 가변 섹션 - 뉴스 목록, 기사 본문 등
+
+    Returns:
+        str: 고정 섹션이 앞, 가변 섹션이 뒤에 오는 프롬프트
+    """
+    parts = [instruction.strip()] if instruction else []
+    parts += [_format_section(label, body.strip()) for label, body in static_sections if body and body.strip()]
+    parts += [_format_section(label, body.strip()) for label, body in data_sections]
+    return "\n\n".join(parts)
+
+
+def extract_usage(response: Any) -> Dict[str, int]:
+    """
+    LLM 응답 객체에서 입력/캐시/출력 토큰 수를 추출합니다.
+    langchain AIMessage(usage_metadata, response_metadata)와 OpenAI SDK 응답(usage)을 모두 지원합니다.
+    """
+    usage = {'prompt_tokens': 0, 'cached_tokens': 0, 'completion_tokens': 0}
+
+    # langchain-openai: usage_metadata
+    usage_metadata = getattr(response, 'usage_metadata', None)
+    if usage_metadata:
+        usage['prompt_tokens'] = usage_metadata.get('input_tokens', 0) or 0
+        usage['completion_tokens'] = usage_metadata.get('output_tokens', 0) or 0
+        details = usage_metadata.get('input_token_details') or {}
+        usage['cached_tokens'] = details.get('cache_read', 0) or 0
+        if usage['cached_tokens']:
+            return usage
+
+    # langchain-openai: response_metadata['token_usage'] (OpenAI 원본 usage)
+    response_metadata = getattr(response, 'response_metadata', None) or {}
+    token_usage = response_metadata.get('token_usage') or {}
+    if token_usage:
+        usage['prompt_tokens'] = token_usage.get('prompt_tokens', usage['prompt_tokens']) or 0
+        usage['completion_tokens'] = token_usage.get('completion_tokens', usage['completion_tokens']) or 0
+        details = token_usage.get('prompt_tokens_details') or {}
+        usage['cached_tokens'] = details.get('cached_tokens', 0) or 0
+        return usage
+
+    # OpenAI SDK: response.usage
+    sdk_usage = getattr(response, 'usage', None)
+    if sdk_usage is not None:
+        usage['prompt_tokens'] = getattr(sdk_usage, 'prompt_tokens', 0) or 0
+        usage['completion_tokens'] = getattr(sdk_usage, 'completion_tokens', 0) or 0
+        details = getattr(sdk_usage, 'prompt_tokens_details', None)
+        usage['cached_tokens'] = (getattr(details, 'cached_tokens', 0) or 0) if details is not None else 0
+
+    return usage
+
+
+def total_tokens(response: Any) -> int:
+    """응답의 입력 + 출력 토큰 합계 (llm_governor TPM 정산용)"""
+    usage = extract_usage(response)
+    return usage['prompt_tokens'] + usage['completion_tokens']
+
+
+class PromptCacheStats:
+    """단계별 입력 토큰/캐시 적중 토큰 누적 집계 (여러 회사 분석 전체에 걸쳐 누적)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[Any, Dict[str, int]] = {}
+
+    def record(self, stage: Any, response: Any) -> Dict[str, int]:
+        """응답의 usage를 단계별로 누적하고 해당 호출의 usage를 반환"""
+        usage = extract_usage(response)
+        with self._lock:
+            entry = self._stats.setdefault(stage, {'calls': 0, 'prompt_tokens': 0, 'cached_tokens': 0, 'completion_tokens': 0})
+            entry['calls'] += 1
+            for key, value in usage.items():
+                entry[key] += value
+        return usage
+
+    def merge(self, summary: Dict[Any, Dict[str, float]]):
+        """다른 프로세스에서 집계한 summary() 결과를 누적 (백그라운드 작업용)"""
+        with self._lock:
+            for stage, other in summary.items():
+                entry = self._stats.setdefault(stage, {'calls': 0, 'prompt_tokens': 0, 'cached_tokens': 0, 'completion_tokens': 0})
+                for key in entry:
+                    entry[key] += int(other.get(key, 0))
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def summary(self) -> Dict[Any, Dict[str, float]]:
+        """단계별 집계 결과 (캐시 적중률 포함)"""
+        with self._lock:
+            result = {}
+            for stage, entry in self._stats.items():
+                prompt_tokens = entry['prompt_tokens']
+                result[stage] = {**entry, 'cache_hit_ratio': entry['cached_tokens'] / prompt_tokens if prompt_tokens else 0.0}
+            return result
+
+    def report_lines(self) -> List[str]:
+        """출력용 단계별 요약 문자열"""
+        lines = []
+        for stage, entry in self.summary().items():
+            lines.append(
+                f"{STAGE_LABELS.get(stage, stage)}: 호출 {entry['calls']}회, "
+                f"입력 {entry['prompt_tokens']:,} 토큰 중 캐시 {entry['cached_tokens']:,} 토큰 "
+                f"({entry['cache_hit_ratio']:.1%}), 출력 {entry['completion_tokens']:,} 토큰"
+            )
+        return lines
+
+
+# 전역 집계 인스턴스 (news_ai의 LLM 호출이 기록, app에서 분석 종료 후 출력)
+cache_stats = PromptCacheStats()
+
+
+def format_usage(stage: Any, usage: Optional[Dict[str, int]]) -> str:
+    """단일 호출 usage 디버그 문자열"""
+    if not usage:
+        return f"{STAGE_LABELS.get(stage, stage)}: usage 정보 없음"
+    return (
+        f"{STAGE_LABELS.get(stage, stage)}: 입력 {usage['prompt_tokens']} 토큰 "
+        f"(캐시 {usage['cached_tokens']}), 출력 {usage['completion_tokens']} 토큰"
+    )
@@ -0,0 +1,258 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Query Planner
+-------------
+키워드 목록을 최소한의 Google News RSS 요청으로 바꾸는 검색 계획 모듈입니다.
+
+1. 키워드의 문자 체계(한글/가나/한자/라틴)로 검색 지역을 고릅니다 (config.QUERY_REGIONS_BY_SCRIPT).
+2. 보조 지역은 이전 실행에서 기록한 키워드 × 지역별 수집량이 계속 적으면 생략합니다.
+3. 같은 지역을 검색하는 키워드는 Google News의 OR 연산자로 묶어 한 번에 요청합니다.
+   OR 쿼리 결과가 한 페이지(k건)를 꽉 채우면 잘렸을 수 있으므로 키워드별 단독 요청으로 다시 검색하고,
+   단독으로도 페이지를 거의 채우는 키워드는 다음 실행부터 묶지 않습니다.
+
+수집량은 SQLite 테이블에 저장되므로 여러 작업 프로세스가 함께 기록하고 다음 실행에서 읽습니다.
+"""
+
+import re
+import sqlite3
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from config import (
+    QUERY_MAX_LENGTH,
+    QUERY_MAX_OR_TERMS,
+    QUERY_MIN_AVG_YIELD,
+    QUERY_MIN_OBSERVATIONS,
+    QUERY_REGIONS_BY_SCRIPT,
+    QUERY_STATS_DB_PATH,
+)
+
+# 최근 수집량 이동 평균 가중치 (최근 실행 비중)
+YIELD_EMA_ALPHA = 0.3
+
+# 평균 수집 건수가 페이지 크기의 이 비율 이상인 키워드는 OR 쿼리로 묶지 않고 단독 검색
+SOLO_YIELD_RATIO = 0.8
+
+# RSS 요청 1건의 최대 결과 수 (news_ai의 검색 결과 수)
+DEFAULT_PAGE_SIZE = 100
+
+_HANGUL = re.compile(r'[가-힣ᄀ-ᇿ㄰-㆏]')
+_KANA = re.compile(r'[぀-ヿ]')
+_HAN = re.compile(r'[一-鿿]')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS query_yield (
+    keyword TEXT NOT NULL,
+    region TEXT NOT NULL,
+    runs INTEGER NOT NULL,
+    avg_hits REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (keyword, region)
+);
+"""
+
+
+def detect_script(keyword: str) -> str:
+    """키워드 문자 체계 (hangul / kana / han / latin)"""
+    if _HANGUL.search(keyword):
+        return "hangul"
+    if _KANA.search(keyword):
+        return "kana"
+    if _HAN.search(keyword):
+        return "han"
+    return "latin"
+
+
+def build_or_query(keywords: Sequence[str]) -> str:
+    """키워드를 Google News OR 쿼리로 결합 (여러 단어 키워드는 괄호로 묶음)"""
+    if len(keywords) == 1:
+        return keywords[0]
+    return " OR ".join(f"({keyword})" if " " in keyword else keyword for keyword in keywords)
+
+
+class QueryYieldStore:
+    """키워드 × 지역별 검색 횟수와 최근 평균 수집 건수 (SQLite, 프로세스마다 연결을 새로 열어 사용)"""
+
+    def __init__(self, db_path: str = QUERY_STATS_DB_PATH):
+        self.db_path = db_path
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def load(self, keywords: Iterable[str]) -> Dict[Tuple[str, str], Tuple[int, float]]:
+        """(키워드, 지역) → (검색 횟수, 평균 수집 건수)"""
+        keywords = list(keywords)
+        if not keywords:
+            return {}
+        placeholders = ",".join("?" * len(keywords))
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT keyword, region, runs, avg_hits FROM query_yield WHERE keyword IN ({placeholders})",
+                keywords
+            ).fetchall()
+        return {(keyword, region): (runs, avg_hits) for keyword, region, runs, avg_hits in rows}
+
+    def record(self, region: str, hits: Dict[str, int]):
+        """지역 1곳의 키워드별 수집 건수 반영 (이동 평균 갱신)"""
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO query_yield (keyword, region, runs, avg_hits, updated_at) VALUES (?, ?, 1, ?, ?) "
+                "ON CONFLICT(keyword, region) DO UPDATE SET runs = runs + 1, "
+                "avg_hits = avg_hits * ? + excluded.avg_hits * ?, updated_at = excluded.updated_at",
+                [(keyword, region, float(count), now, 1 - YIELD_EMA_ALPHA, YIELD_EMA_ALPHA)
+                 for keyword, count in hits.items()]
+            )
+
+
+class RegionQuery:
+    """RSS 요청 1건 (쿼리 문자열, 지역, 포함된 키워드)"""
+
+    __slots__ = ('query', 'region', 'keywords')
+
+    def __init__(self, query: str, region: str, keywords: Tuple[str, ...]):
+        self.query = query
+        self.region = region
+        self.keywords = keywords
+
+    def __repr__(self) -> str:
+        return f"RegionQuery({self.query!r}, {self.region!r})"
+
+
+class QueryPlanner:
+    """
+    키워드 → 지역별 (OR) 쿼리 계획.
+
+    사용 예:
+        planner = QueryPlanner(page_size=100)
+        pending = planner.plan(["Hyundai e-axle", "현대차 전동화"])
+        while pending:
+            planned = pending.pop(0)
+            results = news.search_by_keyword(planned.query, k=100, region=planned.region)
+            retry = planner.split_truncated(planned, results)
+            if retry:
+                pending[:0] = retry     # 잘린 OR 쿼리는 키워드별로 다시 검색
+                continue
+            planner.record(planned, results)
+    """
+
+    def __init__(self, store: Optional[QueryYieldStore] = None,
+                 regions_by_script: Optional[Dict[str, List[str]]] = None,
+                 min_avg_yield: float = QUERY_MIN_AVG_YIELD, min_observations: int = QUERY_MIN_OBSERVATIONS,
+                 max_or_terms: int = QUERY_MAX_OR_TERMS, max_length: int = QUERY_MAX_LENGTH,
+                 page_size: int = DEFAULT_PAGE_SIZE):
+        if store is None:
+            try:
+                store = QueryYieldStore()
+            except sqlite3.Error as e:
+                # 수집량 기록을 쓸 수 없어도 문자 체계 기반 계획은 가능
+                print(f"검색 수집량 DB를 열 수 없어 과거 수집량 없이 계획합니다: {e}")
+        self.store = store
+        self.regions_by_script = regions_by_script or QUERY_REGIONS_BY_SCRIPT
+        self.min_avg_yield = min_avg_yield
+        self.min_observations = min_observations
+        self.max_or_terms = max(1, max_or_terms)
+        self.max_length = max_length
+        self.page_size = page_size
+
+    def regions_for(self, keyword: str, stats: Dict[Tuple[str, str], Tuple[int, float]]) -> List[str]:
+        """키워드의 검색 지역 (주 지역 + 수집량이 충분하거나 아직 판단할 수 없는 보조 지역)"""
+        primary, *secondary = self.regions_by_script.get(detect_script(keyword), self.regions_by_script["latin"])
+        regions = [primary]
+        for region in secondary:
+            runs, avg_hits = stats.get((keyword, region), (0, 0.0))
+            if runs < self.min_observations or avg_hits >= self.min_avg_yield:
+                regions.append(region)
+        return regions
+
+    def _is_busy(self, keyword: str, region: str, stats: Dict[Tuple[str, str], Tuple[int, float]]) -> bool:
+        """최근 평균 수집량이 페이지를 거의 채우는 키워드 (OR 쿼리로 묶으면 결과가 잘림)"""
+        runs, avg_hits = stats.get((keyword, region), (0, 0.0))
+        return runs > 0 and avg_hits >= self.page_size * SOLO_YIELD_RATIO
+
+    def _chunks(self, keywords: List[str], region: str = "",
+                stats: Optional[Dict[Tuple[str, str], Tuple[int, float]]] = None) -> List[List[str]]:
+        """OR 쿼리 단위로 분할 (키워드 수, 쿼리 길이 제한, 수집량이 많은 키워드는 단독)"""
+        stats = stats or {}
+        chunks, current = [], []
+        for keyword in keywords:
+            if self._is_busy(keyword, region, stats):
+                chunks.append([keyword])
+                continue
+            candidate = current + [keyword]
+            if current and (len(candidate) > self.max_or_terms or len(build_or_query(candidate)) > self.max_length):
+                chunks.append(current)
+                candidate = [keyword]
+            current = candidate
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def plan(self, keywords: Sequence[str]) -> List[RegionQuery]:
+        """
+        키워드 목록의 RSS 요청 계획을 만듭니다.
+
+        Args:
+            keywords (Sequence[str]): 검색 키워드 (중복은 대소문자 무시하고 제거)
+
+        Returns:
+            List[RegionQuery]: 지역별 (OR) 쿼리 목록 - 키워드 입력 순서 유지
+        """
+        unique, seen = [], set()
+        for keyword in keywords:
+            keyword = (keyword or "").strip()
+            if keyword and keyword.casefold() not in seen:
+                seen.add(keyword.casefold())
+                unique.append(keyword)
+
+        stats = {}
+        if self.store is not None:
+            try:
+                stats = self.store.load(unique)
+            except sqlite3.Error as e:
+                print(f"검색 수집량 조회 실패 (과거 수집량 없이 계획): {e}")
+
+        # 지역 → 해당 지역을 검색할 키워드 (입력 순서 유지)
+        by_region: Dict[str, List[str]] = {}
+        for keyword in unique:
+            for region in self.regions_for(keyword, stats):
+                by_region.setdefault(region, []).append(keyword)
+
+        return [
+            RegionQuery(build_or_query(chunk), region, tuple(chunk))
+            for region, region_keywords in by_region.items()
+            for chunk in self._chunks(region_keywords, region, stats)
+        ]
+
+    def split_truncated(self, planned: RegionQuery, results: List[dict]) -> List[RegionQuery]:
+        """
+        OR 쿼리 결과가 한 페이지를 꽉 채웠으면 키워드별 단독 쿼리 목록 반환 (잘린 결과 대신 다시 검색)
+
+        Returns:
+            List[RegionQuery]: 다시 검색할 단독 쿼리 (다시 검색할 필요가 없으면 빈 리스트)
+        """
+        if len(planned.keywords) == 1 or len(results) < self.page_size:
+            return []
+        return [RegionQuery(keyword, planned.region, (keyword,)) for keyword in planned.keywords]
+
+    def record(self, planned: RegionQuery, results: List[dict]):
+        """
+        요청 결과를 키워드별 수집량으로 기록
+
+        OR 쿼리는 결과를 키워드별로 정확히 나눌 수 없으므로(Google은 본문/스니펫으로도 매칭)
+        전체 결과 수를 각 키워드의 수집량 상한으로 기록합니다. 상한이 기준보다 적을 때만 보조 지역이 생략되므로
+        실제 수집량을 과소 집계해 지역을 잘못 생략하지 않습니다.
+        """
+        if self.store is None:
+            return
+        hits = {keyword: len(results) for keyword in planned.keywords}
+        try:
+            self.store.record(planned.region, hits)
+        except sqlite3.Error as e:
+            print(f"검색 수집량 기록 실패: {e}")
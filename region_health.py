@@ -0,0 +1,197 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Region Health
+-------------
+Google News 지역별 RSS 엔드포인트의 최근 지연 시간/오류율을 추적하고 차단기(circuit breaker)를 적용하는 모듈입니다.
+
+    closed     정상 - 모든 요청 허용
+    open       연속 실패(오류, 타임아웃, 느린 응답)가 기준 이상 - 대기 시간 동안 요청하지 않고 건너뜀
+    half-open  대기 시간이 지나 시험 요청 1건만 짧은 타임아웃으로 허용 - 성공하면 closed, 실패하면 다시 open
+
+상태는 프로세스 전역(region_health)에 있으므로 같은 작업 프로세스의 다음 키워드/회사 분석에도 이어집니다.
+한 번의 수집에서 지역별로 몇 번 요청/실패/건너뛰었는지는 RegionRunStats로 따로 집계해 실행 요약에 표시합니다.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+from config import (
+    REGION_BREAKER_COOLDOWN_SECONDS,
+    REGION_BREAKER_FAILURE_THRESHOLD,
+    REGION_HEALTH_WINDOW,
+    REGION_PROBE_TIMEOUT_SECONDS,
+    REGION_SLOW_SECONDS,
+)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class _RegionState:
+    """지역 1곳의 최근 요청 결과와 차단기 상태 (호출자가 잠금을 관리)"""
+
+    __slots__ = ('latencies', 'failures', 'consecutive_failures', 'open_until', 'probing')
+
+    def __init__(self, window: int):
+        self.latencies = deque(maxlen=window)
+        self.failures = deque(maxlen=window)
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.probing = False
+
+
+class RegionHealthTracker:
+    """
+    지역별 상태 추적 + 차단기.
+
+    사용 예:
+        timeout = region_health.acquire(region, timeout)   # None이면 차단 중 → 요청하지 않음
+        started = time.monotonic()
+        ... 요청 ...
+        region_health.record(region, time.monotonic() - started, ok=True)
+    """
+
+    def __init__(self, failure_threshold: int = REGION_BREAKER_FAILURE_THRESHOLD,
+                 cooldown: float = REGION_BREAKER_COOLDOWN_SECONDS, slow_seconds: float = REGION_SLOW_SECONDS,
+                 probe_timeout: float = REGION_PROBE_TIMEOUT_SECONDS, window: int = REGION_HEALTH_WINDOW):
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown = cooldown
+        self.slow_seconds = slow_seconds
+        self.probe_timeout = probe_timeout
+        self.window = window
+        self._regions: Dict[str, _RegionState] = {}
+        self._lock = threading.Lock()
+
+    def _state(self, region: str) -> _RegionState:
+        state = self._regions.get(region)
+        if state is None:
+            state = self._regions[region] = _RegionState(self.window)
+        return state
+
+    def _status(self, state: _RegionState, now: float) -> str:
+        if state.consecutive_failures < self.failure_threshold:
+            return CLOSED
+        return OPEN if now < state.open_until or state.probing else HALF_OPEN
+
+    def status(self, region: str) -> str:
+        """지역 차단기 상태 (closed / open / half-open)"""
+        with self._lock:
+            return self._status(self._state(region), time.monotonic())
+
+    def acquire(self, region: str, timeout: float) -> Optional[float]:
+        """
+        요청 허용 여부와 사용할 타임아웃
+
+        Returns:
+            Optional[float]: 요청에 사용할 타임아웃 (차단 중이면 None - 요청하지 않음)
+        """
+        with self._lock:
+            state = self._state(region)
+            status = self._status(state, time.monotonic())
+            if status == OPEN:
+                return None
+            if status == HALF_OPEN:
+                # 시험 요청은 1건만, 짧은 타임아웃으로
+                state.probing = True
+                return min(timeout, self.probe_timeout)
+            return timeout
+
+    def record(self, region: str, latency: float, ok: bool):
+        """요청 결과 기록 (느린 성공도 차단 판단에서는 실패로 집계)"""
+        failed = not ok or latency > self.slow_seconds
+        with self._lock:
+            state = self._state(region)
+            state.latencies.append(latency)
+            state.failures.append(failed)
+            state.probing = False
+            if failed:
+                state.consecutive_failures += 1
+                if state.consecutive_failures >= self.failure_threshold:
+                    state.open_until = time.monotonic() + self.cooldown
+            else:
+                state.consecutive_failures = 0
+                state.open_until = 0.0
+
+    def order(self, regions: List[str]) -> List[str]:
+        """정상 지역 먼저, 차단된 지역은 뒤로 (같은 상태에서는 입력 순서 유지)"""
+        rank = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+        return sorted(regions, key=lambda region: rank[self.status(region)])
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """지역별 상태, 최근 평균/최대 지연 시간, 오류율"""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                region: {
+                    'status': self._status(state, now),
+                    'avg_latency': sum(state.latencies) / len(state.latencies) if state.latencies else 0.0,
+                    'max_latency': max(state.latencies, default=0.0),
+                    'error_rate': sum(state.failures) / len(state.failures) if state.failures else 0.0,
+                    'samples': len(state.latencies),
+                }
+                for region, state in self._regions.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._regions.clear()
+
+
+class RegionRunStats:
+    """수집 1회의 지역별 요청/실패/건너뜀 횟수와 소요 시간 (실행 요약용, 작업 결과에 담아 전달)"""
+
+    def __init__(self):
+        self._stats: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, region: str, requests: int = 0, failures: int = 0, skipped: int = 0, seconds: float = 0.0):
+        with self._lock:
+            stats = self._stats.setdefault(region, {'requests': 0, 'failures': 0, 'skipped': 0, 'seconds': 0.0})
+            stats['requests'] += requests
+            stats['failures'] += failures
+            stats['skipped'] += skipped
+            stats['seconds'] += seconds
+
+    def merge(self, summary: Dict[str, Dict[str, float]]):
+        """다른 수집(작업 프로세스)의 summary() 결과 합산"""
+        for region, stats in (summary or {}).items():
+            self.add(region, stats.get('requests', 0), stats.get('failures', 0), stats.get('skipped', 0),
+                     stats.get('seconds', 0.0))
+
+    def summary(self, tracker: Optional[RegionHealthTracker] = None) -> Dict[str, Dict[str, float]]:
+        """지역별 집계 (tracker가 있으면 현재 차단기 상태/오류율 포함)"""
+        health = tracker.snapshot() if tracker else {}
+        with self._lock:
+            return {
+                region: {**stats, **{key: health[region][key] for key in ('status', 'error_rate')
+                                     if region in health}}
+                for region, stats in self._stats.items()
+            }
+
+    def report_lines(self) -> List[str]:
+        return format_region_health(self.summary())
+
+
+def format_region_health(summary: Dict[str, Dict[str, float]]) -> List[str]:
+    """지역 상태 요약 출력 줄"""
+    if not summary:
+        return []
+    lines = ["=== 지역별 RSS 상태 ==="]
+    for region, stats in summary.items():
+        requests = stats.get('requests', 0)
+        average = stats.get('seconds', 0.0) / requests if requests else 0.0
+        line = (f"{region}: 요청 {requests}회, 실패 {stats.get('failures', 0)}회, "
+                f"차단으로 건너뜀 {stats.get('skipped', 0)}회, 평균 {average:.2f}초")
+        if 'status' in stats:
+            line += f", 차단기 {stats['status']} (최근 오류율 {stats.get('error_rate', 0.0):.0%})"
+        lines.append(line)
+    return lines
+
+
+# 프로세스 전역 지역 상태 (GoogleNews 인스턴스 간 공유)
+region_health = RegionHealthTracker()
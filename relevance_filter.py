@@ -0,0 +1,317 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Relevance Filter
+----------------
+1단계(제외 판단) LLM 호출 전에 제목만으로 명백히 무관한 기사를 걸러내는 로컬 사전 필터입니다.
+
+검색 키워드와 회사 별칭(COMPANY_KEYWORD_MAP), 산업 용어(COMPANY_STRUCTURE_NEW), 핵심 이슈 용어,
+잡음 분류(주가 시세/스포츠/연예), 회사별 제외 기준 키워드를 하나의 정규식으로 컴파일해 제목을 한 번만 훑고,
+점수가 RELEVANCE_MIN_SCORE보다 낮은 제목은 사유와 함께 '제외'로 기록합니다. 나머지만 LLM에 보냅니다.
+
+    python relevance_filter.py --jobs-db news_jobs.db
+
+로 작업 테이블에 저장된 과거 1단계 판단과의 일치율과 실행당 절감 토큰을 확인합니다.
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from config import (
+    COMPANY_KEYWORD_MAP,
+    COMPANY_STRUCTURE_NEW,
+    RELEVANCE_KEEP_TERMS,
+    RELEVANCE_MIN_SCORE,
+    RELEVANCE_NOISE_TERMS,
+)
+
+# 분류별 가중치 (같은 용어가 여러 분류에 있으면 앞선 분류 우선)
+EXCLUSION_WEIGHT = -3
+NOISE_WEIGHT = -2
+KEYWORD_WEIGHT = 1
+KEEP_WEIGHT = 2
+DOMAIN_WEIGHT = 1
+COLLISION_WEIGHT = -1
+
+# 사전 필터로 제외된 기사 표시 (1단계 결과 항목의 'prefilter' 키, 보고서 사유 접두어)
+PREFILTER_REASON_PREFIX = "사전 필터"
+
+# 회사별 제외 기준의 "- 키워드: a, b" 줄 (범위별 기준의 "키워드: {keywords}"는 검색 키워드이므로 제외)
+_CRITERIA_KEYWORDS_RE = re.compile(r'^\s*-\s*키워드\s*:\s*(.+)$', re.MULTILINE)
+_LATIN_TOKEN_RE = re.compile(r'[A-Za-z0-9]+')
+_STOP_WORDS = frozenset({"and", "the", "for", "with", "from", "of", "in", "on"})
+
+
+def exclusion_terms(criteria: str) -> List[str]:
+    """제외 기준 문자열에서 제외 키워드 추출 (예: '- 키워드: 롯데카드, 롯데손보')"""
+    terms = []
+    for match in _CRITERIA_KEYWORDS_RE.finditer(criteria or ""):
+        terms.extend(term.strip() for term in match.group(1).split(',') if term.strip())
+    return terms
+
+
+def expand_keywords(keywords) -> List[str]:
+    """검색 키워드 + 같은 회사의 별칭 + 여러 단어 키워드의 단어 (중복 제거, 순서 유지)"""
+    if isinstance(keywords, str):
+        keywords = [keywords]
+    keywords = list(keywords)
+    wanted = set(keywords)
+    terms = list(keywords)
+    for company, aliases in COMPANY_KEYWORD_MAP.items():
+        if company in wanted or wanted.intersection(aliases):
+            terms.extend([company, *aliases])
+    # 영문 키워드 설정("Hyundai e-axle")은 제목에 구절 그대로 나오지 않으므로 단어별로도 일치
+    for keyword in keywords:
+        parts = keyword.split()
+        if len(parts) > 1:
+            terms.extend(part for part in parts if len(part) >= 3 and part.lower() not in _STOP_WORDS)
+    return list(dict.fromkeys(terms))
+
+
+def _leaf_terms(tree) -> Iterable[str]:
+    if isinstance(tree, dict):
+        for value in tree.values():
+            yield from _leaf_terms(value)
+    else:
+        yield from tree
+
+
+def _is_short_acronym(term: str) -> bool:
+    """SK, LG, GS 같은 짧은 영문 약어 (대소문자 구분, 다른 영단어 안에서는 일치하지 않음)"""
+    return len(term) <= 3 and term.isascii() and term.isalpha()
+
+
+def _term_pattern(term: str) -> str:
+    pattern = re.escape(term)
+    if _is_short_acronym(term):
+        pattern = f"(?-i:{pattern})"
+    # 영문/숫자로 시작·끝나는 용어는 다른 영단어의 일부와 일치하지 않도록 경계 지정 (한글 조사는 허용)
+    if term[0].isascii() and term[0].isalnum():
+        pattern = r"(?<![A-Za-z0-9])" + pattern
+    if term[-1].isascii() and term[-1].isalnum():
+        pattern += r"(?![A-Za-z0-9])"
+    return pattern
+
+
+class RelevanceFilter:
+    """
+    제목 관련성 점수 계산기 (분석 대상 1개 단위로 생성해 재사용).
+
+    사용 예:
+        relevance = RelevanceFilter.from_state(state)
+        score, reasons = relevance.score("[특징주] SK하이닉스, 3%↑")   # (-1, ["주가/시세 '특징주'"])
+        kept, excluded = relevance.split(state["news_data"])         # excluded는 1단계 '제외' 항목 형식
+    """
+
+    def __init__(self, keywords, exclusion: Sequence[str] = (),
+                 noise: Optional[Dict[str, List[str]]] = None, keep: Optional[Sequence[str]] = None,
+                 domain: Optional[Sequence[str]] = None, min_score: int = RELEVANCE_MIN_SCORE):
+        self.min_score = min_score
+        self.keywords = expand_keywords(keywords)
+        self.acronyms = [term for term in self.keywords if _is_short_acronym(term)]
+        noise = RELEVANCE_NOISE_TERMS if noise is None else noise
+        keep = RELEVANCE_KEEP_TERMS if keep is None else keep
+        domain = list(_leaf_terms(COMPANY_STRUCTURE_NEW)) if domain is None else domain
+
+        # 용어 → (분류, 가중치) - 앞선 분류가 우선
+        self._terms: Dict[str, Tuple[str, int]] = {}
+        groups = [("제외 기준", EXCLUSION_WEIGHT, exclusion)]
+        groups += [(category, NOISE_WEIGHT, terms) for category, terms in noise.items()]
+        groups += [("키워드", KEYWORD_WEIGHT, self.keywords), ("핵심 이슈", KEEP_WEIGHT, keep),
+                   ("산업 용어", DOMAIN_WEIGHT, domain)]
+        for category, weight, terms in groups:
+            for term in terms:
+                self._terms.setdefault(term.casefold(), (category, weight))
+
+        # 모든 용어를 긴 것부터 하나의 정규식으로 (같은 위치에서는 가장 긴 용어 일치 - '현대차證'이 '현대차'보다 먼저)
+        originals = {}
+        for _, _, terms in groups:
+            for term in terms:
+                originals.setdefault(term.casefold(), term)
+        ordered = sorted(originals.values(), key=len, reverse=True)
+        self._matcher = re.compile("|".join(_term_pattern(term) for term in ordered), re.IGNORECASE) if ordered else None
+
+    @classmethod
+    def from_state(cls, state: dict, min_score: int = RELEVANCE_MIN_SCORE) -> "RelevanceFilter":
+        """파이프라인 상태(검색 키워드, 제외 기준)로 생성"""
+        return cls(state.get("keyword", []), exclusion=exclusion_terms(state.get("exclusion_criteria", "")),
+                   min_score=min_score)
+
+    def _collision(self, title: str) -> Optional[str]:
+        """짧은 약어 키워드가 일반 영단어 안에만 있는 경우 그 단어 (예: LG → 'LGBTQ'는 제외, 'task' 안의 SK)"""
+        for token in _LATIN_TOKEN_RE.findall(title):
+            upper = token.upper()
+            for acronym in self.acronyms:
+                if acronym in upper and token != acronym and not token.isupper():
+                    return token
+        return None
+
+    def score(self, title: str) -> Tuple[int, List[str]]:
+        """
+        제목 점수와 근거
+
+        Returns:
+            Tuple[int, List[str]]: (점수, ["분류 '일치 용어'", ...])
+        """
+        matched: Dict[str, Tuple[str, int, str]] = {}
+        if self._matcher is not None:
+            for match in self._matcher.finditer(title):
+                key = match.group().casefold()
+                if key not in matched and key in self._terms:
+                    matched[key] = (*self._terms[key], match.group())
+        score = sum(weight for _, weight, _ in matched.values())
+        reasons = [f"{category} '{text}'" for category, _, text in matched.values()]
+        has_keyword = any(category == "키워드" for category, _, _ in matched.values())
+        if self.acronyms and not has_keyword:
+            token = self._collision(title)
+            if token:
+                score += COLLISION_WEIGHT
+                reasons.append(f"약어 충돌 '{token}'")
+        return score, reasons
+
+    def split(self, news_items: Sequence[dict]) -> Tuple[List[dict], List[dict]]:
+        """
+        LLM에 보낼 기사와 자동 제외 항목으로 분리
+
+        Returns:
+            Tuple[List[dict], List[dict]]: (남은 기사, 1단계 '제외' 결과 형식의 자동 제외 항목)
+        """
+        kept, excluded = [], []
+        for news in news_items:
+            title = news.get('content', '')
+            score, reasons = self.score(title)
+            if score >= self.min_score:
+                kept.append(news)
+                continue
+            index = news.get('original_index')
+            negative = [reason for reason in reasons if not reason.startswith(("키워드", "핵심 이슈", "산업 용어"))]
+            excluded.append({
+                'index': index,
+                'original_index': index,
+                'title': title,
+                'reason': f"{PREFILTER_REASON_PREFIX}(점수 {score}): {', '.join(negative or reasons)}",
+                'prefilter': True,
+            })
+        return kept, excluded
+
+
+def news_line(news: dict) -> str:
+    """1단계 프롬프트의 뉴스 목록 1줄 (filter_excluded_news와 같은 형식)"""
+    return f"{news.get('original_index')}. {news.get('content', '')} ({news.get('press', '알 수 없음')})\n"
+
+
+def prefilter_stats(excluded: List[dict], news_items: Sequence[dict], model: str) -> Dict[str, int]:
+    """
+    사전 필터 절감량 (자동 제외 건수, 줄어든 프롬프트 토큰, 응답에서 빠진 항목 토큰 추정)
+    """
+    from content_budget import count_tokens
+
+    by_index = {news.get('original_index'): news for news in news_items}
+    prompt_tokens = sum(count_tokens(news_line(by_index[item['index']]), model)
+                        for item in excluded if item['index'] in by_index)
+    # 응답 JSON 항목 1건 (index, 제목, 사유 - 사유는 제목 절반 길이로 추정)
+    response_tokens = sum(count_tokens(f'{{"index": {item["index"]}, "title": "{item["title"]}", "reason": ""}},', model)
+                          + count_tokens(item['title'], model) // 2 for item in excluded)
+    return {
+        'scored': len(news_items),
+        'auto_excluded': len(excluded),
+        'prompt_tokens_saved': prompt_tokens,
+        'response_tokens_saved': response_tokens,
+    }
+
+
+def past_verdicts(final_state: dict) -> List[Tuple[dict, str]]:
+    """과거 실행 결과에서 LLM이 판단한 (기사, 판단) 목록 (사전 필터/로컬 모델이 판단한 항목은 제외)"""
+    by_index = {news.get('original_index'): news for news in final_state.get("news_data", [])}
+    verdicts = []
+    for key, verdict in (("excluded_news", "제외"), ("borderline_news", "보류"), ("retained_news", "유지")):
+        for item in final_state.get(key, []):
+            news = by_index.get(item.get('index'))
+            if news is not None and not item.get('prefilter') and not item.get('local_model'):
+                verdicts.append((news, verdict))
+    return verdicts
+
+
+def evaluate(final_states: Iterable[dict], model: str = "gpt-4.1", min_score: int = RELEVANCE_MIN_SCORE) -> dict:
+    """
+    과거 1단계 판단과 사전 필터 판정 비교
+
+    Returns:
+        dict: runs, judged, dropped(필터가 제외했을 기사 수), dropped_by_verdict(그 기사들의 과거 LLM 판단별 수),
+              llm_excluded, prompt_tokens_saved, response_tokens_saved, harmful(과거 '유지'인데 필터가 제외한 제목 예시)
+    """
+    report = {'runs': 0, 'judged': 0, 'dropped': 0, 'dropped_by_verdict': {"제외": 0, "보류": 0, "유지": 0},
+              'llm_excluded': 0, 'prompt_tokens_saved': 0, 'response_tokens_saved': 0, 'harmful': []}
+    for final_state in final_states:
+        verdicts = past_verdicts(final_state)
+        if not verdicts:
+            continue
+        relevance = RelevanceFilter.from_state(final_state, min_score=min_score)
+        verdict_by_index = {news.get('original_index'): verdict for news, verdict in verdicts}
+        _, excluded = relevance.split([news for news, _ in verdicts])
+        stats = prefilter_stats(excluded, [news for news, _ in verdicts], model)
+
+        report['runs'] += 1
+        report['judged'] += len(verdicts)
+        report['llm_excluded'] += sum(1 for _, verdict in verdicts if verdict == "제외")
+        report['dropped'] += len(excluded)
+        report['prompt_tokens_saved'] += stats['prompt_tokens_saved']
+        report['response_tokens_saved'] += stats['response_tokens_saved']
+        for item in excluded:
+            verdict = verdict_by_index[item['index']]
+            report['dropped_by_verdict'][verdict] += 1
+            if verdict == "유지" and len(report['harmful']) < 10:
+                report['harmful'].append(f"{item['title']} ({item['reason']})")
+    return report
+
+
+def format_evaluation(report: dict) -> List[str]:
+    """evaluate() 결과 출력 줄"""
+    if not report['runs']:
+        return ["비교할 과거 1단계 판단이 없습니다."]
+    dropped = report['dropped']
+    by_verdict = report['dropped_by_verdict']
+    precision = by_verdict["제외"] / dropped if dropped else 0.0
+    recall = by_verdict["제외"] / report['llm_excluded'] if report['llm_excluded'] else 0.0
+    lines = [
+        "=== 사전 필터 평가 (과거 1단계 판단 기준) ===",
+        f"실행 {report['runs']}회, 판단된 기사 {report['judged']}건 (LLM 제외 {report['llm_excluded']}건)",
+        f"필터가 자동 제외: {dropped}건 ({dropped / report['judged']:.1%}) - 과거 판단 제외 {by_verdict['제외']}, "
+        f"보류 {by_verdict['보류']}, 유지 {by_verdict['유지']}",
+        f"일치율(자동 제외 중 과거 판단도 제외): {precision:.1%}, LLM 제외 중 필터가 잡은 비율: {recall:.1%}",
+        f"실행당 절감: 프롬프트 {report['prompt_tokens_saved'] / report['runs']:.0f}토큰, "
+        f"응답 약 {report['response_tokens_saved'] / report['runs']:.0f}토큰",
+    ]
+    if report['harmful']:
+        lines.append("과거 '유지'였지만 필터가 제외하는 제목:")
+        lines.extend(f"  - {title}" for title in report['harmful'])
+    return lines
+
+
+if __name__ == "__main__":
+    import argparse
+    import os
+
+    from config import JOB_DB_PATH
+
+    parser = argparse.ArgumentParser(description="사전 필터를 과거 1단계 판단(작업 테이블 결과)과 비교")
+    parser.add_argument("--jobs-db", default=JOB_DB_PATH, help=f"작업 테이블 SQLite 경로 (기본값: {JOB_DB_PATH})")
+    parser.add_argument("--min-score", type=int, default=RELEVANCE_MIN_SCORE, help="자동 제외 기준 점수")
+    parser.add_argument("--model", default="gpt-4.1", help="토큰 계산 모델")
+    args = parser.parse_args()
+
+    if os.path.exists(args.jobs_db):
+        from job_runner import JobStore
+        states = (result[0] for result in JobStore(args.jobs_db).results())
+        for line in format_evaluation(evaluate(states, model=args.model, min_score=args.min_score)):
+            print(line)
+    else:
+        print(f"작업 테이블이 없습니다: {args.jobs_db} - 예시 제목으로 점수만 표시합니다.")
+        relevance = RelevanceFilter(COMPANY_KEYWORD_MAP["SK"],
+                                    exclusion=exclusion_terms("- 키워드: SK증권"))
+        for title in ["SK하이닉스, 2분기 영업이익 5조 돌파 - 한국경제", "[특징주] SK하이닉스, 3%↑ - 이데일리",
+                      "SK 와이번스 홈런 4방으로 연승 - 스포츠조선", "SK증권, 신규 펀드 출시 - 머니투데이",
+                      "How to ask for a raise - Forbes", "SK이노베이션, 배터리 자회사 합병 결의 - 연합뉴스"]:
+            score, reasons = relevance.score(title)
+            print(f"{score:+d} {'제외' if score < relevance.min_score else 'LLM'}  {title}  {reasons}")
@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+RSS Parser
+----------
+Google News RSS 전용 경량 파서입니다.
+lxml iterparse로 응답 바이트 스트림에서 <item>을 하나씩 읽어 필요한 필드(link, title, source, pubDate)만
+작은 딕셔너리로 만들고, k개를 채우면 나머지 응답은 내려받지도 파싱하지도 않습니다.
+lxml이 없거나 예상과 다른 형식(Atom, 깨진 XML 등)이면 feedparser로 다시 파싱합니다.
+
+python rss_parser.py [기록된 피드.xml ...] 로 feedparser 대비 파싱 시간/메모리를 비교합니다.
+"""
+
+import io
+import threading
+import time
+import urllib.request
+from importlib.util import find_spec
+from typing import BinaryIO, Dict, List, Optional, Union
+
+from hedging import FetchCancelled
+
+# lxml 설치 여부 (없으면 feedparser만 사용)
+LXML_AVAILABLE = find_spec("lxml") is not None
+
+# RSS 요청 헤더 (feedparser 기본 요청과 같은 역할)
+USER_AGENT = "Mozilla/5.0 (compatible; PwC-News-Analyzer; +feed)"
+
+# 응답 스트림 읽기 단위
+READ_CHUNK_SIZE = 16 * 1024
+
+
+class _RecordingReader:
+    """
+    읽은 바이트를 보관하는 스트림 래퍼 (lxml 파싱 실패 시 feedparser에 전체 응답 전달용).
+    cancel이 설정되면 다음 읽기에서 FetchCancelled를 발생시켜 응답 읽기를 중단합니다 (헤징에서 진 요청).
+    """
+
+    def __init__(self, stream: BinaryIO, cancel: Optional[threading.Event] = None):
+        self._stream = stream
+        self._cancel = cancel
+        self._chunks: List[bytes] = []
+
+    def read(self, size: int = -1) -> bytes:
+        if self._cancel is not None and self._cancel.is_set():
+            raise FetchCancelled("먼저 도착한 응답이 있어 읽기를 중단합니다.")
+        data = self._stream.read(size if size and size > 0 else READ_CHUNK_SIZE)
+        self._chunks.append(data)
+        return data
+
+    def getvalue(self) -> bytes:
+        """지금까지 읽은 바이트 + 남은 응답 전체"""
+        if self._cancel is not None and self._cancel.is_set():
+            raise FetchCancelled("먼저 도착한 응답이 있어 읽기를 중단합니다.")
+        return b"".join(self._chunks) + self._stream.read()
+
+
+def _entry(link: str, title: str, press: str, source_url: str, published: str) -> Dict[str, str]:
+    return {
+        'link': link or '',
+        'title': title or '',
+        'press': press or '알 수 없음',
+        'source_url': source_url or '',
+        'published': published or '날짜 정보 없음',
+    }
+
+
+def parse_with_lxml(source: Union[bytes, BinaryIO], k: int = 100) -> Optional[List[Dict[str, str]]]:
+    """
+    lxml iterparse로 최대 k개 항목 파싱
+
+    Returns:
+        Optional[List[Dict[str, str]]]: 항목 목록 (RSS 형식이 아니면 None - feedparser로 재시도)
+    """
+    from lxml import etree
+
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+
+    entries = []
+    context = etree.iterparse(source, events=("end",), tag="item", resolve_entities=False, no_network=True)
+    for _, item in context:
+        source_element = item.find("source")
+        entries.append(_entry(
+            item.findtext("link"),
+            item.findtext("title"),
+            source_element.text if source_element is not None else None,
+            source_element.get("url") if source_element is not None else None,
+            item.findtext("pubDate"),
+        ))
+        # 처리한 항목은 바로 해제 (트리가 커지지 않도록)
+        item.clear()
+        while item.getprevious() is not None:
+            del item.getparent()[0]
+        if len(entries) >= k:
+            break
+
+    # 항목이 없을 때는 RSS 문서인지 확인 (Atom 등 다른 형식이면 None)
+    if not entries and (context.root is None or context.root.tag != "rss"):
+        return None
+    return entries
+
+
+def parse_with_feedparser(data: bytes, k: int = 100) -> List[Dict[str, str]]:
+    """feedparser로 파싱 (예상과 다른 피드 형식용 폴백)"""
+    import feedparser
+
+    parsed = feedparser.parse(data)
+    return [
+        _entry(entry.get('link'), entry.get('title'), entry.get('source', {}).get('title'),
+               entry.get('source', {}).get('href'), entry.get('published'))
+        for entry in parsed.entries[:k]
+    ]
+
+
+def parse_feed(source: Union[bytes, BinaryIO], k: int = 100,
+               cancel: Optional[threading.Event] = None) -> List[Dict[str, str]]:
+    """
+    Google News RSS 파싱 (lxml 우선, 실패 시 feedparser)
+
+    Args:
+        source (Union[bytes, BinaryIO]): 응답 바이트 또는 바이트 스트림
+        k (int): 최대 항목 수
+        cancel (threading.Event): 설정되면 스트림 읽기 중단 (FetchCancelled)
+
+    Returns:
+        List[Dict[str, str]]: link, title, press, source_url, published를 담은 항목 목록
+    """
+    if not LXML_AVAILABLE:
+        return parse_with_feedparser(source if isinstance(source, bytes) else source.read(), k)
+
+    reader = source if isinstance(source, bytes) else _RecordingReader(source, cancel)
+    try:
+        entries = parse_with_lxml(reader, k)
+    except FetchCancelled:
+        raise
+    except Exception as e:
+        print(f"RSS 스트림 파싱 실패, feedparser로 재시도: {e}")
+        entries = None
+    if entries is None:
+        return parse_with_feedparser(reader if isinstance(reader, bytes) else reader.getvalue(), k)
+    return entries
+
+
+def fetch_feed(url: str, k: int = 100, timeout: float = 10,
+               cancel: Optional[threading.Event] = None) -> List[Dict[str, str]]:
+    """RSS URL을 스트리밍으로 읽어 최대 k개 항목 반환 (k개를 채우거나 cancel이 설정되면 연결을 닫음)"""
+    request = urllib.request.Request(url, headers={'User-Agent': USER_AGENT})
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return parse_feed(response, k, cancel)
+
+
+def _sample_feed(items: int = 100) -> bytes:
+    """벤치마크용 Google News 형식 RSS (기록된 피드가 없을 때 사용)"""
+    body = "".join(
+        f"<item><title>Hyundai Motor unveils new e-axle with {160 + i}kW output - Reuters</title>"
+        f"<link>https://news.google.com/rss/articles/CBMi{i:06d}AbCdEfGhIjKlMnOpQrStUvWxYz?oc=5</link>"
+        f"<guid isPermaLink=\"false\">CBMi{i:06d}</guid>"
+        f"<pubDate>Mon, 19 Oct 2026 {i % 24:02d}:00:00 GMT</pubDate>"
+        f"<description>&lt;a href=\"https://news.google.com/rss/articles/CBMi{i:06d}\"&gt;Hyundai e-axle&lt;/a&gt;"
+        f"&amp;nbsp;&amp;nbsp;&lt;font color=\"#6f6f6f\"&gt;Reuters&lt;/font&gt;</description>"
+        f"<source url=\"https://www.reuters.com\">Reuters</source></item>"
+        for i in range(items)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<rss version="2.0" xmlns:media="http://search.yahoo.com/mrss/"><channel>'
+        '<title>"Hyundai" - Google News</title><link>https://news.google.com/search?q=Hyundai</link>'
+        f'<language>en-US</language>{body}</channel></rss>'
+    ).encode('utf-8')
+
+
+def benchmark_parsers(feeds: List[bytes], k: int = 100, repeat: int = 20) -> Dict[str, Dict[str, float]]:
+    """
+    피드별로 lxml 스트리밍 파서와 feedparser의 파싱 시간/메모리를 비교합니다.
+
+    Returns:
+        Dict[str, Dict[str, float]]: 파서명 → {'ms_per_feed': 평균 파싱 시간, 'peak_kb': 피드 1개 파싱 시 최대 Python 힙}
+    """
+    import tracemalloc
+
+    parsers = {'feedparser': parse_with_feedparser}
+    if LXML_AVAILABLE:
+        parsers['lxml iterparse'] = parse_with_lxml
+
+    results = {}
+    for name, parser in parsers.items():
+        started = time.perf_counter()
+        for _ in range(repeat):
+            for feed in feeds:
+                parser(feed, k)
+        elapsed = time.perf_counter() - started
+
+        peaks = []
+        for feed in feeds:
+            tracemalloc.start()
+            parser(feed, k)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+
+        results[name] = {
+            'ms_per_feed': elapsed * 1000 / (repeat * len(feeds)),
+            'peak_kb': sum(peaks) / len(peaks) / 1024,
+        }
+    return results
+
+
+if __name__ == "__main__":
+    import sys
+
+    paths = sys.argv[1:]
+    feeds = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            feeds.append(f.read())
+    if not feeds:
+        print("기록된 피드가 없어 100개 항목 샘플 피드로 측정합니다.")
+        feeds = [_sample_feed(100)]
+
+    for name, stats in benchmark_parsers(feeds).items():
+        print(f"{name}: 피드당 {stats['ms_per_feed']:.2f}ms, 최대 메모리 {stats['peak_kb']:.0f}KB (Python 힙 기준)")
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+원문 배치 요약 테스트 (배치 구성, 배치 응답 파싱, 누락 기사 단건 폴백, 호출 한도 초과 시 재요청 방지)
+"""
+
+import json
+
+import pytest
+
+import news_ai
+from article_summary import ArticleSummary
+from llm_governor import RateLimitExceeded
+from news_ai import _generate_batch_summaries, _invoke_summary_llm, _pack_summary_batches, _parse_batch_summary_response
+
+
+def _articles(count: int, content: str = "Hyundai unveiled a 160kW e-axle.") -> list:
+    return [{'id': i, 'title': f"기사 {i}", 'content': content} for i in range(1, count + 1)]
+
+
+@pytest.fixture
+def single_summaries(monkeypatch):
+    """단건 요약 폴백 호출 기록"""
+    calls = []
+
+    def fake_summarize(content, title, token_budget=0, model=""):
+        calls.append(title)
+        return ArticleSummary(title=title, summary="단건 요약")
+
+    monkeypatch.setattr(news_ai, "_summarize_article", fake_summarize)
+    return calls
+
+
+def test_pack_summary_batches_respects_size_and_budget():
+    articles = _articles(5)
+    assert [len(batch) for batch in _pack_summary_batches(articles, 100000, 2, "gpt-4.1")] == [2, 2, 1]
+    # 예산보다 큰 기사도 단독 배치로 포함
+    huge = _articles(2, content="본문 " * 2000)
+    assert [len(batch) for batch in _pack_summary_batches(huge, 500, 10, "gpt-4.1")] == [1, 1]
+    assert _pack_summary_batches([], 1000, 4, "gpt-4.1") == []
+
+
+def test_parse_batch_summary_response():
+    response = "```json\n" + json.dumps([
+        {"id": 1, "title": "t1", "summary": "s1"},
+        {"id": "2", "summary": "s2"},
+        {"id": "x", "summary": "잘못된 id"},
+        "문자열 항목",
+    ], ensure_ascii=False) + "\n```"
+    parsed = _parse_batch_summary_response(response)
+    assert sorted(parsed) == [1, 2]
+    assert parsed[2]["summary"] == "s2"
+    with pytest.raises(ValueError):
+        _parse_batch_summary_response("요약할 수 없습니다")
+
+
+def test_missing_ids_fall_back_to_single_summary(monkeypatch, single_summaries, capsys):
+    response = json.dumps([{"id": 1, "title": "t1", "summary": "s1", "details": ["d"]},
+                           {"id": 3, "summary": ""}])
+    monkeypatch.setattr(news_ai, "_invoke_summary_llm", lambda prompt, model, **kwargs: response)
+
+    summaries = _generate_batch_summaries(_articles(3), max_batch_size=5)
+    assert summaries[1].summary == "s1"
+    assert list(summaries[1].details) == ["d"]
+    assert single_summaries == ["기사 2", "기사 3"]
+    assert "LLM 호출 3회 (단건 폴백 2개)" in capsys.readouterr().out
+
+
+def test_failed_batch_is_counted_and_falls_back(monkeypatch, single_summaries, capsys):
+    def broken(prompt, model, **kwargs):
+        raise ValueError("잘못된 응답")
+
+    monkeypatch.setattr(news_ai, "_invoke_summary_llm", broken)
+    summaries = _generate_batch_summaries(_articles(2), max_batch_size=5)
+    assert [summary.summary for summary in summaries.values()] == ["단건 요약", "단건 요약"]
+    assert "LLM 호출 3회 (단건 폴백 2개)" in capsys.readouterr().out
+
+
+def test_rate_limited_batch_is_not_resent(monkeypatch, single_summaries, capsys):
+    def limited(prompt, model, **kwargs):
+        raise RateLimitExceeded("gpt-4.1: 재시도 5회 초과")
+
+    monkeypatch.setattr(news_ai, "_invoke_summary_llm", limited)
+    summaries = _generate_batch_summaries(_articles(2), max_batch_size=5)
+    assert single_summaries == []
+    assert all(not summary.parsed for summary in summaries.values())
+    assert "LLM 호출 1회 (단건 폴백 0개)" in capsys.readouterr().out
+
+
+def test_invoke_summary_llm_does_not_retry_rate_limit_with_second_client(monkeypatch):
+    calls = []
+
+    def governed(fn, model, tokens=0, stage=None, usage_fn=None):
+        calls.append(stage)
+        raise RateLimitExceeded("재시도 초과")
+
+    monkeypatch.setattr(news_ai, "_get_chat_model", lambda *args, **kwargs: object())
+    monkeypatch.setattr(news_ai, "governed_call", governed)
+    with pytest.raises(RateLimitExceeded):
+        _invoke_summary_llm("프롬프트", "gpt-4.1")
+    assert calls == ["summary"]
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+collection_state 테스트 (발행 시각, 기사 지문, 워터마크, 이전 판단)
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from collection_state import CollectionStateStore, article_fingerprints, collection_scope, published_timestamp
+
+NEWS = [
+    {'url': 'https://www.reuters.com/a?utm=1', 'content': 'Hyundai unveils e-axle', 'press': 'Reuters'},
+    {'url': 'https://www.reuters.com/b', 'content': 'Kia expands EV lineup', 'press': 'Reuters'},
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return CollectionStateStore(str(tmp_path / "collection_state.db"), retention_days=30)
+
+
+def test_published_timestamp():
+    expected = datetime(2026, 10, 19, 1, tzinfo=timezone.utc).timestamp()
+    assert published_timestamp("Mon, 19 Oct 2026 01:00:00 GMT") == expected
+    assert published_timestamp("Mon, 19 Oct 2026 10:00:00 +0900") == expected
+    assert published_timestamp("날짜 정보 없음") is None
+    assert published_timestamp(None) is None
+
+
+def test_article_fingerprints():
+    first = article_fingerprints(NEWS[0])
+    assert [fingerprint[:2] for fingerprint in first] == ["u:", "t:"]
+    # 쿼리 문자열과 제목의 대소문자/구두점은 무시
+    same = article_fingerprints({'url': 'https://WWW.reuters.com/a', 'content': 'hyundai unveils e-axle!',
+                                 'press': 'reuters'})
+    assert same == first
+    assert article_fingerprints({'content': 'Hyundai unveils e-axle', 'press': 'AP'})[0] != first[1]
+    assert article_fingerprints({}) == ()
+
+
+def test_collection_scope():
+    assert collection_scope(["Hyundai", "Kia"]) == "Hyundai | Kia"
+    assert collection_scope("Hyundai") == "Hyundai"
+
+
+def test_query_start_uses_earliest_watermark(store):
+    start = datetime(2026, 10, 1, tzinfo=timezone.utc)
+    marks = {("a", "미국"): datetime(2026, 10, 18, tzinfo=timezone.utc).timestamp(),
+             ("b", "미국"): datetime(2026, 10, 17, tzinfo=timezone.utc).timestamp()}
+    overlap = timedelta(hours=6)
+    assert store.query_start(["a", "b"], "미국", start, marks, overlap) == datetime(2026, 10, 16, 18, tzinfo=timezone.utc)
+    # 워터마크가 없는 키워드가 있으면 원래 시작 시각
+    assert store.query_start(["a", "c"], "미국", start, marks, overlap) == start
+    assert store.query_start(["a"], "일본", start, marks, overlap) == start
+    assert store.query_start(["a"], "미국", None, marks, overlap) is None
+    # 원래 시작 시각보다 앞당기지 않음
+    late_start = datetime(2026, 10, 18, 12, tzinfo=timezone.utc)
+    assert store.query_start(["a"], "미국", late_start, marks, overlap) == late_start
+
+
+def test_remember_and_previous_verdicts(store):
+    scope = collection_scope(["Hyundai"])
+    store.remember(scope, NEWS, {1: ("제외", "무관")}, {("Hyundai", "미국"): 200.0})
+    moved = {'url': 'https://m.reuters.com/other', 'content': 'Hyundai unveils e-axle', 'press': 'Reuters'}
+    new = {'url': 'https://www.reuters.com/c', 'content': 'Brand new', 'press': 'Reuters'}
+    assert store.previous_verdicts(scope, [NEWS[0], NEWS[1], moved, new]) == [
+        ("제외", "무관"), ("상태 불명", ""), ("제외", "무관"), None
+    ]
+    assert store.previous_verdicts("다른 대상", NEWS) == [None, None]
+
+
+def test_watermarks_only_move_forward(store):
+    store.remember("s", [], {}, {("Hyundai", "미국"): 200.0})
+    store.remember("s", [], {}, {("Hyundai", "미국"): 100.0, ("Kia", "한국"): 50.0})
+    assert store.watermarks(["Hyundai", "Kia", "Genesis"]) == {("Hyundai", "미국"): 200.0, ("Kia", "한국"): 50.0}
+    assert store.watermarks([]) == {}
+
+
+def test_expired_fingerprints_are_removed(tmp_path):
+    store = CollectionStateStore(str(tmp_path / "expired.db"), retention_days=-1)
+    store.remember("s", NEWS[:1], {1: ("유지", "")}, {})
+    assert store.previous_verdicts("s", NEWS[:1]) == [None]
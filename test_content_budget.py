@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+content_budget 테스트 (리드/수치 문단 우선 보존, 보일러플레이트 제거, 예산 준수)
+"""
+
+from content_budget import budget_article, count_tokens, has_numeric_facts, is_boilerplate, split_paragraphs
+
+MODEL = "gpt-4.1"
+LEAD = [
+    "Hyundai Motor Group unveiled its next-generation electric drive unit for the upcoming BEV platform today.",
+    "The company said the new system will debut in the Ioniq lineup and be shared across Kia and Genesis models.",
+]
+NUMERIC = "The e-axle delivers 160kW of output and 350Nm of torque, extending range to 560km on a single charge."
+FILLER = [f"Industry analysts commented on the broader market context in paragraph number {i} of the article."
+          for i in range(12)]
+
+
+def _article() -> str:
+    return "\n".join(LEAD + FILLER[:6] + ["구독하기", NUMERIC] + FILLER[6:])
+
+
+def test_fits_budget_keeps_everything_but_boilerplate():
+    result = budget_article(_article(), max_tokens=100000, model=MODEL)
+    assert "구독하기" not in result
+    assert result.split("\n\n") == LEAD + FILLER[:6] + [NUMERIC] + FILLER[6:]
+
+
+def test_keeps_lead_and_numeric_paragraphs_first():
+    budget = sum(count_tokens(p, MODEL) for p in LEAD + [NUMERIC]) + count_tokens(FILLER[0], MODEL)
+    paragraphs = budget_article(_article(), max_tokens=budget, model=MODEL).split("\n\n")
+    assert paragraphs[:2] == LEAD
+    assert NUMERIC in paragraphs
+    assert len(paragraphs) == 4
+    # 원래 순서 유지 (수치 문단은 앞쪽 잡문 뒤에 있었음)
+    assert paragraphs[-1] == NUMERIC
+    assert sum(count_tokens(p, MODEL) for p in paragraphs) <= budget
+
+
+def test_title_is_charged_and_deduplicated():
+    title = LEAD[0]
+    paragraphs = budget_article(_article(), title=title, max_tokens=100000, model=MODEL).split("\n\n")
+    assert paragraphs[0] == LEAD[1]
+
+
+def test_truncates_single_oversized_lead():
+    result = budget_article("Hyundai " * 400, max_tokens=20, model=MODEL)
+    assert result.endswith("...")
+    assert count_tokens(result, MODEL) <= 25
+    assert budget_article("", max_tokens=20) == ""
+
+
+def test_paragraph_helpers():
+    assert split_paragraphs("a\n\n\nb") == ["a", "b"]
+    long_text = "첫 문장입니다. " * 100
+    assert len(split_paragraphs(long_text)) == 100
+    assert is_boilerplate("짧음")
+    assert is_boilerplate("관련 기사 더보기 구독")
+    assert not is_boilerplate("광고 시장 전망과 구독 모델 확대에 대한 분석 기사입니다. " * 4)
+    assert has_numeric_facts("가격은 5,000만 원부터")
+    assert has_numeric_facts("$45,000 starting price")
+    assert not has_numeric_facts("Model 3 update")
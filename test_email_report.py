@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+email_report 테스트 (기사 데이터 준비, URL 병렬 디코딩, 이메일 HTML 렌더링)
+"""
+
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("jinja2")
+
+from article_summary import ArticleSummary  # noqa: E402
+from email_report import prepare_email_articles, render_email_html, resolve_article_urls  # noqa: E402
+
+GOOGLE_URL = "https://news.google.com/rss/articles/CBMi000001"
+
+
+def _news(**overrides) -> dict:
+    news = {
+        'title': "Hyundai unveils e-axle", 'press': "Reuters", 'date': "Mon, 19 Oct 2026 01:00:00 GMT",
+        'source_keyword': "Hyundai e-axle", 'reason': "신규 구동계 공개", 'url': GOOGLE_URL,
+    }
+    news.update(overrides)
+    return news
+
+
+def test_resolve_article_urls_dedups_and_keeps_failures():
+    calls = []
+
+    def resolver(url):
+        calls.append(url)
+        if url.endswith("broken"):
+            raise RuntimeError("디코딩 실패")
+        return None if url.endswith("none") else url.replace("news.google.com/rss/articles", "example.com")
+
+    urls = [GOOGLE_URL, GOOGLE_URL, f"{GOOGLE_URL}broken", f"{GOOGLE_URL}none", "https://www.reuters.com/a", ""]
+    resolved = resolve_article_urls(urls, resolver, max_workers=4)
+    assert resolved[GOOGLE_URL] == "https://example.com/CBMi000001"
+    assert resolved[f"{GOOGLE_URL}broken"] == f"{GOOGLE_URL}broken"
+    assert resolved[f"{GOOGLE_URL}none"] == f"{GOOGLE_URL}none"
+    assert resolved["https://www.reuters.com/a"] == "https://www.reuters.com/a"
+    assert sorted(calls) == sorted([GOOGLE_URL, f"{GOOGLE_URL}broken", f"{GOOGLE_URL}none"])
+    assert resolve_article_urls([GOOGLE_URL], None) == {GOOGLE_URL: GOOGLE_URL}
+
+
+def test_prepare_email_articles():
+    summary = ArticleSummary(title="현대차, e-액슬 공개", summary="160kW 출력", details=["350Nm 토크"])
+    articles = prepare_email_articles(
+        [_news(ai_summary="<div>요약</div>", article_summary=summary), _news(url="", date="")],
+        resolver=lambda url: "https://www.reuters.com/a",
+    )
+    assert articles[0]['url'] == "https://www.reuters.com/a"
+    assert articles[0]['date'] == "2026-10-19"
+    assert articles[0]['keyword'] == "Hyundai e-axle"
+    assert articles[0]['summary'] is summary
+    assert articles[1]['summary'] is None
+    assert articles[1]['date'] == "날짜 정보 없음"
+
+
+def _render(articles, **kwargs) -> str:
+    return render_email_html(articles, generated_at=datetime(2026, 10, 19, 9, 30), **kwargs)
+
+
+def test_render_parsed_summary():
+    summary = ArticleSummary(title="현대차, e-액슬 공개", summary="160kW 출력", details=["350Nm 토크", "2027년 양산"])
+    html = _render(prepare_email_articles([_news(ai_summary="x", article_summary=summary)]), report_title="주간 보고서")
+    assert "<h1>주간 보고서</h1>" in html
+    assert "생성일: 2026년 10월 19일 09:30" in html
+    assert "1. Hyundai unveils e-axle" in html
+    assert '<div class="korean-title">현대차, e-액슬 공개</div>' in html
+    assert "<strong>핵심 요약:</strong> 160kW 출력" in html
+    assert "<ul class='details'><li>350Nm 토크</li><li>2027년 양산</li></ul>" in html
+    assert f'<a href="{GOOGLE_URL}" target="_blank">' in html
+
+
+def test_render_summary_fallbacks():
+    articles = prepare_email_articles([
+        _news(title="요약 실패", ai_summary="<p>원문 추출 실패</p>"),
+        _news(title="요약 없음"),
+    ])
+    html = _render(articles)
+    assert "1. 요약 실패" in html and "2. 요약 없음" in html
+    # 파싱되지 않은 요약은 저장된 HTML 그대로
+    assert "<p>원문 추출 실패</p>" in html
+    assert "원문 요약을 생성하지 못했습니다." in html
+    assert "원문 요약이 비활성화되었습니다." not in html
+
+    disabled = _render(articles, enable_article_summary=False)
+    assert disabled.count("원문 요약이 비활성화되었습니다.") == 2
+    assert "<p>원문 추출 실패</p>" not in disabled
+
+
+def test_render_empty():
+    html = _render([])
+    assert 'class="article"' not in html
+    assert html.rstrip().endswith("</html>")
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+기사 HTML 헤징 요청 테스트 (스트리밍 읽기, 취소 시 남은 본문을 내려받지 않음)
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+import web_scraper
+from hedging import FetchCancelled
+from web_scraper import HybridNewsWebScraper
+
+CHUNK = b"<p>" + b"x" * (16 * 1024 - 7) + b"</p>\n"
+CHUNKS = 200
+
+
+@pytest.fixture(scope="module")
+def server():
+    sent = {'bytes': 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/missing":
+                self.send_response(404)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(CHUNK) * CHUNKS))
+            self.end_headers()
+            try:
+                for _ in range(CHUNKS):
+                    self.wfile.write(CHUNK)
+                    sent['bytes'] += len(CHUNK)
+                    if self.path == "/slow":
+                        time.sleep(0.01)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}", sent
+    httpd.shutdown()
+
+
+class _CancelAfter:
+    """hedging.call 대체 - delay초 뒤 취소 신호 (다른 요청이 먼저 끝난 상황)"""
+
+    def __init__(self, delay):
+        self.delay = delay
+
+    def call(self, key, fn):
+        cancel = threading.Event()
+        if self.delay is not None:
+            threading.Timer(self.delay, cancel.set).start()
+        return fn(cancel)
+
+
+@pytest.fixture
+def scraper():
+    return HybridNewsWebScraper(enable_ai_fallback=False)
+
+
+def test_get_html_reads_whole_body(server, scraper, monkeypatch):
+    base_url, _ = server
+    monkeypatch.setattr(web_scraper, "hedging", _CancelAfter(None))
+    assert scraper._get_html(f"{base_url}/fast", timeout=5) == CHUNK * CHUNKS
+
+
+def test_get_html_raises_for_http_errors(server, scraper, monkeypatch):
+    base_url, _ = server
+    monkeypatch.setattr(web_scraper, "hedging", _CancelAfter(None))
+    with pytest.raises(requests.HTTPError):
+        scraper._get_html(f"{base_url}/missing", timeout=5)
+
+
+def test_cancelled_fetch_stops_downloading(server, scraper, monkeypatch):
+    base_url, sent = server
+    monkeypatch.setattr(web_scraper, "hedging", _CancelAfter(0.1))
+    sent['bytes'] = 0
+    started = time.monotonic()
+    with pytest.raises(FetchCancelled):
+        scraper._get_html(f"{base_url}/slow", timeout=5)
+    # 전체 본문(200청크 × 10ms = 2초)을 기다리지 않고 중단
+    assert time.monotonic() - started < 1.0
+    time.sleep(0.2)
+    assert sent['bytes'] < len(CHUNK) * CHUNKS // 2
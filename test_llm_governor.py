@@ -0,0 +1,140 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+llm_governor 테스트 (토큰 버킷, 오류 분류, Retry-After/백오프 재시도)
+"""
+
+import pytest
+
+import llm_governor
+from llm_governor import (
+    LLMGovernor,
+    RateLimitExceeded,
+    TokenBucket,
+    _retry_after,
+    _status_code,
+    backoff_delay,
+    init_worker,
+    is_retryable,
+    worker_rate_limits,
+)
+
+LIMITS = {"default": {"rpm": 6000, "tpm": 10_000_000}, "gpt-4.1": {"rpm": 6000, "tpm": 10_000_000},
+          "gpt-4.1-nano": {"rpm": 6000, "tpm": 10_000_000}}
+
+
+class _Response:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class APIStatusError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.response = _Response(status_code, headers)
+
+
+class APITimeoutError(Exception):
+    pass
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays = []
+    monkeypatch.setattr(llm_governor.time, "sleep", delays.append)
+    return delays
+
+
+def test_token_bucket():
+    bucket = TokenBucket(60)
+    now = bucket.updated
+    assert bucket.wait_time(60, now) == 0.0
+    bucket.consume(60)
+    assert bucket.wait_time(1, now) == pytest.approx(1.0)
+    assert bucket.wait_time(1, now + 1.0) == pytest.approx(0.0)
+    # 한도보다 큰 요청은 버킷이 가득 찼을 때 통과
+    assert bucket.wait_time(1000, now + 120.0) == 0.0
+
+
+def test_status_code_and_retry_after():
+    assert _status_code(APIStatusError(429)) == 429
+    assert _status_code(ValueError("x")) is None
+    assert _retry_after(APIStatusError(429, {'retry-after-ms': '1500'})) == 1.5
+    assert _retry_after(APIStatusError(429, {'Retry-After': '2'})) == 2.0
+    assert _retry_after(APIStatusError(429, {'Retry-After': 'Mon, 19 Oct 2026 01:00:00 GMT'})) is None
+    assert _retry_after(APIStatusError(429)) is None
+
+
+def test_is_retryable():
+    assert is_retryable(APIStatusError(429))
+    assert is_retryable(APIStatusError(503))
+    assert not is_retryable(APIStatusError(400))
+    assert is_retryable(APITimeoutError())
+    assert not is_retryable(ValueError("bad prompt"))
+
+
+def test_backoff_delay_bounds():
+    for attempt in range(8):
+        assert 0 <= backoff_delay(attempt, base=1.0, cap=10.0) <= min(10.0, 2 ** attempt)
+
+
+def test_model_key_longest_prefix():
+    governor = LLMGovernor(LIMITS)
+    assert governor._model_key("gpt-4.1-nano-2025-04-14") == "gpt-4.1-nano"
+    assert governor._model_key("openai.gpt-4.1") == "gpt-4.1"
+    assert governor._model_key("gpt-5") == "default"
+
+
+def test_call_retries_with_retry_after(sleeps):
+    errors = [APIStatusError(429, {'retry-after-ms': '20'}), APITimeoutError()]
+
+    def fn():
+        if errors:
+            raise errors.pop(0)
+        return {'usage': 10}
+
+    governor = LLMGovernor(LIMITS, max_retries=3)
+    assert governor.call(fn, "gpt-4.1", tokens=5, usage_fn=lambda response: response['usage']) == {'usage': 10}
+    assert sleeps[0] == 0.02
+    assert len(sleeps) == 2
+    assert governor.stats()["gpt-4.1"]['calls'] == 1
+    assert governor.stats()["gpt-4.1"]['retries'] == 2
+    assert governor.stats()["gpt-4.1"]['rate_limited'] == 1
+
+
+def test_call_raises_after_max_retries(sleeps):
+    def fn():
+        raise APIStatusError(500)
+
+    with pytest.raises(RateLimitExceeded):
+        LLMGovernor(LIMITS, max_retries=2).call(fn, "gpt-4.1")
+    assert len(sleeps) == 2
+
+
+def test_call_does_not_retry_client_errors(sleeps):
+    calls = []
+
+    def fn():
+        calls.append(1)
+        raise APIStatusError(400)
+
+    with pytest.raises(APIStatusError):
+        LLMGovernor(LIMITS, max_retries=3).call(fn, "gpt-4.1")
+    assert calls == [1]
+    assert sleeps == []
+
+
+def test_worker_rate_limits_split_total():
+    assert worker_rate_limits(2, LIMITS)["gpt-4.1"] == {"rpm": 3000, "tpm": 5_000_000}
+    assert worker_rate_limits(0, {"default": {"rpm": 3, "tpm": 10}})["default"] == {"rpm": 3, "tpm": 10}
+    assert worker_rate_limits(8, {"default": {"rpm": 3, "tpm": 10}})["default"] == {"rpm": 1, "tpm": 1}
+
+
+def test_init_worker_configures_global_governor(monkeypatch):
+    monkeypatch.setattr(llm_governor, "governor", LLMGovernor(LIMITS))
+    monkeypatch.setattr(llm_governor, "LLM_RATE_LIMITS", {"default": {"rpm": 500, "tpm": 200000}})
+    init_worker(4)
+    assert llm_governor.governor.rate_limits == {"default": {"rpm": 125, "tpm": 50000}}
+    assert llm_governor.governor._state("default").requests.capacity == 125
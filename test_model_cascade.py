@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+model_cascade 테스트 (단계 모델 선택, 재판단 기준, 비용 집계, 1단계 캐스케이드 결과 병합)
+"""
+
+import pytest
+
+import news_ai
+from config import STAGE_MODELS
+from model_cascade import ModelUsageStats, estimate_cost, model_price, needs_escalation, stage_model
+
+SELECTED = "gpt-4.1"
+TRIAGE = STAGE_MODELS[1]
+
+
+def test_stage_model():
+    assert stage_model({"model": SELECTED}, 1) == SELECTED
+    assert stage_model({"model": SELECTED, "model_cascade": True}, 1) == TRIAGE
+    # 단계 모델이 없으면 선택한 모델
+    assert stage_model({"model": SELECTED, "model_cascade": True}, 3) == SELECTED
+
+
+@pytest.mark.parametrize("verdict, item, expected", [
+    ("excluded", {"confidence": 0.95}, False),
+    ("retained", {"confidence": 0.8}, False),
+    ("excluded", {"confidence": 0.79}, True),
+    ("borderline", {"confidence": 0.99}, True),
+    ("retained", {}, True),
+    ("retained", {"confidence": "높음"}, True),
+    ("retained", {"confidence": 1.5}, True),
+    ("excluded", {"confidence": "0.9"}, False),
+])
+def test_needs_escalation(verdict, item, expected):
+    assert needs_escalation(verdict, item, threshold=0.8, escalate_borderline=True) is expected
+
+
+def test_borderline_can_skip_escalation():
+    assert not needs_escalation("borderline", {"confidence": 0.9}, threshold=0.8, escalate_borderline=False)
+
+
+def test_model_price_and_cost():
+    assert model_price("openai.gpt-4.1-nano-2025-04-14") == model_price("gpt-4.1-nano")
+    assert model_price("unknown-model") is None
+    assert estimate_cost("unknown-model", {'prompt_tokens': 1000}) == 0.0
+    input_price, cached_price, output_price = model_price(SELECTED)
+    usage = {'prompt_tokens': 1000, 'cached_tokens': 400, 'completion_tokens': 100}
+    assert estimate_cost(SELECTED, usage) == pytest.approx(
+        (600 * input_price + 400 * cached_price + 100 * output_price) / 1_000_000)
+
+
+def test_usage_stats_merge_and_report():
+    stats = ModelUsageStats()
+    stats.merge({'models': [{'stage': 1, 'model': TRIAGE, 'calls': 2, 'prompt_tokens': 100, 'cached_tokens': 0,
+                             'completion_tokens': 10, 'cost': 0.01, 'seconds': 1.5}],
+                 'cascade': {'triaged': 10, 'escalated': 3}})
+    stats.record_escalation(10, 1)
+    summary = stats.summary()
+    assert summary['total_cost'] == pytest.approx(0.01)
+    assert summary['cascade'] == {'triaged': 20, 'escalated': 4}
+    assert stats.report_lines()[-1].endswith("20건 중 4건 재판단 (20.0%)")
+    stats.reset()
+    assert stats.report_lines() == []
+
+
+@pytest.fixture
+def cascade(monkeypatch):
+    """_classify_news를 모델별 고정 응답으로 대체하고 호출/기록 내역 반환"""
+    calls, logged = [], []
+    responses = {}
+
+    def fake_classify(state, system_prompt, news_data, model, with_confidence=False):
+        calls.append((model, [news['original_index'] for news in news_data], with_confidence))
+        response = responses[model]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    monkeypatch.setattr(news_ai, "_classify_news", fake_classify)
+    monkeypatch.setattr(news_ai, "_log_verdicts",
+                        lambda state, news_data, classification: logged.append(classification))
+    monkeypatch.setattr(news_ai, "model_usage", ModelUsageStats())
+    return responses, calls, logged
+
+
+NEWS = [{'original_index': i, 'content': f"기사 {i}", 'press': "연합뉴스"} for i in (1, 2, 3, 4)]
+
+
+def _indices(classification):
+    return {category: [item['index'] for item in items] for category, items in classification.items()}
+
+
+def test_cascade_merges_reviewed_items(cascade):
+    responses, calls, logged = cascade
+    responses[TRIAGE] = {
+        "excluded": [{'index': 1, 'confidence': 0.95}, {'index': 2, 'confidence': 0.4}],
+        "borderline": [{'index': 3, 'confidence': 0.9}],
+        "retained": [],
+    }
+    responses[SELECTED] = {"excluded": [], "borderline": [{'index': 3}], "retained": [{'index': 2}, {'index': 4}]}
+    state = {"model": SELECTED, "model_cascade": True}
+
+    result = news_ai._classify_news_cascade(state, "system", NEWS)
+    # 확신도가 낮은 2, 보류 3, 빠뜨린 4만 선택한 모델로 재판단
+    assert calls == [(TRIAGE, [1, 2, 3, 4], True), (SELECTED, [2, 3, 4], False)]
+    assert _indices(result) == {"excluded": [1], "borderline": [3], "retained": [2, 4]}
+    # 작은 모델 판단은 기록하지 않음
+    assert logged == [responses[SELECTED]]
+    assert news_ai.model_usage.summary()['cascade'] == {'triaged': 4, 'escalated': 3}
+
+
+def test_cascade_keeps_confident_triage(cascade):
+    responses, calls, logged = cascade
+    responses[TRIAGE] = {"excluded": [{'index': i, 'confidence': 0.99} for i in (1, 2, 3, 4)],
+                         "borderline": [], "retained": []}
+    result = news_ai._classify_news_cascade({"model": SELECTED, "model_cascade": True}, "system", NEWS)
+    assert _indices(result)["excluded"] == [1, 2, 3, 4]
+    assert len(calls) == 1
+    assert logged == []
+
+
+def test_cascade_falls_back_to_triage_on_parse_error(cascade):
+    responses, calls, logged = cascade
+    responses[TRIAGE] = {"excluded": [{'index': 1, 'confidence': 0.3}], "borderline": [],
+                         "retained": [{'index': i, 'confidence': 0.9} for i in (2, 3, 4)]}
+    responses[SELECTED] = ValueError("필수 필드가 누락되었습니다.")
+    result = news_ai._classify_news_cascade({"model": SELECTED, "model_cascade": True}, "system", NEWS)
+    assert result is responses[TRIAGE]
+    assert logged == []
+
+
+def test_without_cascade_uses_selected_model_once(cascade):
+    responses, calls, logged = cascade
+    responses[SELECTED] = {"excluded": [{'index': 1}], "borderline": [], "retained": [{'index': 2}]}
+    result = news_ai._classify_news_cascade({"model": SELECTED}, "system", NEWS)
+    assert result is responses[SELECTED]
+    assert calls == [(SELECTED, [1, 2, 3, 4], False)]
+    assert logged == [responses[SELECTED]]
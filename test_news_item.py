@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+news_item 테스트 (핵심 필드 불변, 딕셔너리 호환, pickle)
+"""
+
+import pickle
+
+import pytest
+
+from news_item import NewsItem, as_news_item
+
+
+def _item() -> NewsItem:
+    return NewsItem("https://news.google.com/rss/articles/CBMi1", "Hyundai unveils e-axle", "Reuters",
+                    source_url="https://www.reuters.com", date="Mon, 19 Oct 2026 01:00:00 GMT", region="미국")
+
+
+def test_core_fields_are_immutable():
+    item = _item()
+    with pytest.raises(AttributeError):
+        item.press = "AP"
+    with pytest.raises(TypeError):
+        item['content'] = "다른 제목"
+    with pytest.raises(TypeError):
+        item['unknown'] = 1
+    assert item.press == "Reuters"
+
+
+def test_annotations_and_mapping_interface():
+    item = _item()
+    assert 'original_index' not in item
+    assert item.get('original_index', -1) == -1
+    with pytest.raises(KeyError):
+        item['original_index']
+
+    item['original_index'] = 3
+    item.group_info = {'size': 2}
+    assert item['original_index'] == 3
+    assert 'original_index' in item
+    assert item.get('press') == "Reuters"
+    assert item.get('missing', 'x') == 'x'
+    assert list(item.keys()) == ['url', 'content', 'press', 'source_url', 'date', 'region',
+                                 'original_index', 'group_info']
+
+
+def test_dict_round_trip():
+    item = _item()
+    item['current_index'] = 2
+    data = item.to_dict()
+    assert data['current_index'] == 2
+    assert 'list_index' not in data
+    assert NewsItem.from_dict(data) == item
+    assert NewsItem.from_dict(item) is item
+    assert as_news_item(None) is None
+    assert as_news_item({'content': '제목'}).press == '알 수 없음'
+
+
+def test_with_press_keeps_annotations():
+    item = _item()
+    item['original_index'] = 5
+    renamed = item.with_press("로이터")
+    assert renamed.press == "로이터"
+    assert renamed['original_index'] == 5
+    assert item.press == "Reuters"
+
+
+def test_pickle_round_trip():
+    item = _item()
+    item['list_index'] = 7
+    restored = pickle.loads(pickle.dumps(item))
+    assert restored == item
+    assert restored.content == item.content
+    with pytest.raises(AttributeError):
+        restored.url = ""
@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+pipeline_benchmark 테스트 (작은 규모 실행, --baseline 회귀 비교)
+"""
+
+import json
+
+import pytest
+
+from pipeline_benchmark import find_regressions, main
+
+# 키워드 1개 × 지역 1곳, 지연 없는 가짜 서버 (수 초 안에 끝나는 규모)
+QUICK_ARGS = ["--keywords", "1", "--regions", "1", "--items-per-feed", "5", "--llm-latency", "0",
+              "--feed-latency", "0", "--no-summary"]
+
+
+@pytest.fixture(scope="module")
+def baseline_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp("benchmark") / "baseline.json"
+    assert main(QUICK_ARGS + ["--json", str(path)]) == 0
+    return path
+
+
+def test_quick_run_result(baseline_path):
+    result = json.loads(baseline_path.read_text(encoding="utf-8"))
+    assert result["articles"]["collected"] == 5
+    assert result["calls"]["rss"] == 1
+    assert result["calls"]["llm:exclusion"] == 1
+    assert result["wall_seconds"] > 0
+    assert result["model_usage"]["models"]
+
+
+def test_baseline_without_regression(baseline_path):
+    # 시간 편차는 허용하고 호출 수만 비교
+    assert main(QUICK_ARGS + ["--baseline", str(baseline_path), "--max-regression", "100"]) == 0
+
+
+def test_baseline_with_more_calls_fails(baseline_path, tmp_path):
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    baseline["calls"]["rss"] = 0
+    path = tmp_path / "strict.json"
+    path.write_text(json.dumps(baseline), encoding="utf-8")
+    assert main(QUICK_ARGS + ["--baseline", str(path), "--max-regression", "100"]) == 1
+
+
+def test_find_regressions():
+    baseline = {"wall_seconds": 1.0, "stages": {"수집": 0.5}, "calls": {"rss": 2, "llm_prompt_chars": 100}}
+    result = {"wall_seconds": 2.0, "stages": {"수집": 0.51, "요약": 3.0}, "calls": {"rss": 3, "llm_prompt_chars": 500}}
+    assert find_regressions(result, baseline, max_regression=0.25, min_seconds=0.05) == [
+        "전체: 1.00s → 2.00s (+100%)", "호출 수 rss: 2 → 3"
+    ]
+    assert find_regressions(baseline | {"stages": {}}, baseline) == []
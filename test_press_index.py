@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+press_index 테스트 (설정 파싱, 별칭/도메인 매칭, 우선순위)
+"""
+
+from press_index import PressIndex, get_press_index, normalize_alias, parse_press_config
+
+PRESS_CONFIG = {
+    "조선일보": ["조선일보", "chosun", "chosun.com"],
+    "조선비즈": ["조선비즈", "biz.chosun.com"],
+    "한국경제": ["한국경제", "한경", "hankyung.com"],
+}
+
+
+def test_normalize_alias():
+    assert normalize_alias("  Www.Chosun.COM ") == "chosun.com"
+    assert normalize_alias("Ｃｈｏｓｕｎ  Ilbo") == "chosun ilbo"
+    assert normalize_alias(None) == ""
+
+
+def test_parse_press_config_lines():
+    text = "조선일보: ['조선일보', 'chosun']\n한국경제: [\"한경\"]\n잘못된 줄: 문자열\n설명 없는 줄"
+    assert parse_press_config(text) == {"조선일보": ["조선일보", "chosun"], "한국경제": ["한경"]}
+
+
+def test_parse_press_config_dict():
+    assert parse_press_config('{"조선일보": ["chosun"], "한국경제": ["한경"]}') == {
+        "조선일보": ["chosun"], "한국경제": ["한경"]
+    }
+    assert parse_press_config('{"조선일보": "chosun"}') == {}
+    assert parse_press_config("") == {}
+
+
+def test_parse_press_config_does_not_execute_code():
+    assert parse_press_config("조선일보: __import__('os').getcwd()") == {}
+
+
+def test_match_by_alias_and_domain():
+    index = PressIndex(PRESS_CONFIG)
+    assert index.match(press="CHOSUN") == "조선일보"
+    assert index.match(press="없는 언론사") is None
+    assert index.match(url="https://www.hankyung.com/article/1") == "한국경제"
+    # 가장 긴 도메인 접미사 우선
+    assert index.match(url="https://biz.chosun.com/it/1") == "조선비즈"
+    assert index.match(url="https://news.chosun.com/1") == "조선일보"
+    assert index.match(url="https://example.com") is None
+
+
+def test_match_news_falls_back_to_urls():
+    index = PressIndex(PRESS_CONFIG)
+    assert index.match_news({'press': '한경'}) == "한국경제"
+    assert index.match_news({'press': 'Unknown', 'source_url': 'https://biz.chosun.com'}) == "조선비즈"
+    assert index.match_news({'press': 'Unknown', 'url': 'https://chosun.com/a'}) == "조선일보"
+    assert index.match_news({'press': 'Unknown'}) is None
+
+
+def test_canonical_and_priority():
+    index = PressIndex(PRESS_CONFIG)
+    assert len(index) == 3
+    assert index.canonical("한경") == "한국경제"
+    assert index.canonical("Reuters") == "Reuters"
+    assert index.canonical(None) == "알 수 없음"
+    assert index.priority(press="chosun") == 0
+    assert index.priority(url="https://biz.chosun.com") == 1
+    assert index.priority(press="Reuters") == len(index)
+
+
+def test_duplicate_alias_prefers_first_press():
+    index = PressIndex({"A일보": ["공통"], "B일보": ["공통"]})
+    assert index.match(press="공통") == "A일보"
+
+
+def test_get_press_index_is_cached():
+    assert get_press_index(PRESS_CONFIG) is get_press_index(dict(PRESS_CONFIG))
@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+query_planner 테스트 (문자 체계별 지역, OR 쿼리 분할, 잘린 결과 재검색, 수집량 기록)
+"""
+
+import pytest
+
+from config import QUERY_STATS_DB_PATH
+from query_planner import QueryPlanner, QueryYieldStore, build_or_query, detect_script
+
+REGIONS = {"hangul": ["한국"], "kana": ["일본"], "han": ["중국"], "latin": ["미국", "일본"]}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return QueryYieldStore(str(tmp_path / "query_stats.db"))
+
+
+def _planner(store, **kwargs) -> QueryPlanner:
+    return QueryPlanner(store, regions_by_script=REGIONS, **kwargs)
+
+
+def _plan(planner, keywords):
+    return [(planned.query, planned.region) for planned in planner.plan(keywords)]
+
+
+def test_detect_script():
+    assert detect_script("현대차 전동화") == "hangul"
+    assert detect_script("トヨタ") == "kana"
+    assert detect_script("丰田") == "han"
+    assert detect_script("Hyundai e-axle") == "latin"
+
+
+def test_build_or_query():
+    assert build_or_query(["Hyundai e-axle"]) == "Hyundai e-axle"
+    assert build_or_query(["Hyundai e-axle", "Kia"]) == "(Hyundai e-axle) OR Kia"
+
+
+def test_plan_merges_keywords_per_region(store):
+    planner = _planner(store)
+    assert _plan(planner, ["a", "b", "A", "현대차", " "]) == [("a OR b", "미국"), ("a OR b", "일본"), ("현대차", "한국")]
+
+
+def test_plan_respects_term_and_length_limits(store):
+    assert _plan(_planner(store, max_or_terms=2), ["a", "b", "c"])[:2] == [("a OR b", "미국"), ("c", "미국")]
+    planner = _planner(store, max_length=len("alpha OR bravo"))
+    assert [query for query, region in _plan(planner, ["alpha", "bravo", "charlie"]) if region == "미국"] == [
+        "alpha OR bravo", "charlie"
+    ]
+
+
+def test_split_truncated_only_for_full_or_pages(store):
+    planner = _planner(store, page_size=3)
+    merged = planner.plan(["a", "b"])[0]
+    assert planner.split_truncated(merged, [{}] * 2) == []
+    retry = planner.split_truncated(merged, [{}] * 3)
+    assert [(planned.query, planned.region, planned.keywords) for planned in retry] == [
+        ("a", "미국", ("a",)), ("b", "미국", ("b",))
+    ]
+    solo = retry[0]
+    assert planner.split_truncated(solo, [{}] * 3) == []
+
+
+def test_busy_keywords_are_planned_alone(store):
+    planner = _planner(store, page_size=10)
+    for keyword, hits in (("a", 10), ("b", 3), ("c", 3)):
+        planner.record(planner.plan([keyword])[0], [{}] * hits)
+    assert [query for query, region in _plan(planner, ["a", "b", "c"]) if region == "미국"] == ["a", "b OR c"]
+
+
+def test_record_credits_every_or_keyword(store):
+    planner = _planner(store)
+    planner.record(planner.plan(["a", "b"])[0], [{}] * 4)
+    assert store.load(["a", "b"]) == {("a", "미국"): (1, 4.0), ("b", "미국"): (1, 4.0)}
+
+
+def test_low_yield_secondary_region_is_pruned(store):
+    planner = _planner(store, min_avg_yield=1.0, min_observations=2)
+    for _ in range(2):
+        store.record("일본", {"a": 0, "b": 5})
+    assert _plan(planner, ["a", "b"]) == [("a OR b", "미국"), ("b", "일본")]
+
+
+def test_plan_when_stats_db_cannot_open(tmp_path, monkeypatch):
+    # 기본 DB 경로가 디렉터리라 열 수 없으면 과거 수집량 없이 계획
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / QUERY_STATS_DB_PATH).mkdir()
+    planner = QueryPlanner(regions_by_script=REGIONS)
+    assert planner.store is None
+    assert _plan(planner, ["a"]) == [("a", "미국"), ("a", "일본")]
+    planner.record(planner.plan(["a"])[0], [{}])
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+region_health 테스트 (차단기 상태 전이, 지역 정렬, 실행 요약)
+"""
+
+import time
+
+from region_health import CLOSED, HALF_OPEN, OPEN, RegionHealthTracker, RegionRunStats, format_region_health
+
+
+def _tracker(**kwargs) -> RegionHealthTracker:
+    options = dict(failure_threshold=2, cooldown=60.0, slow_seconds=1.0, probe_timeout=2.0, window=10)
+    options.update(kwargs)
+    return RegionHealthTracker(**options)
+
+
+def test_opens_after_consecutive_failures():
+    tracker = _tracker()
+    assert tracker.acquire("미국", 10) == 10
+    tracker.record("미국", 0.1, ok=False)
+    assert tracker.status("미국") == CLOSED
+    # 느린 성공도 실패로 집계
+    tracker.record("미국", 5.0, ok=True)
+    assert tracker.status("미국") == OPEN
+    assert tracker.acquire("미국", 10) is None
+
+
+def test_success_resets_failure_count():
+    tracker = _tracker()
+    tracker.record("미국", 0.1, ok=False)
+    tracker.record("미국", 0.1, ok=True)
+    tracker.record("미국", 0.1, ok=False)
+    assert tracker.status("미국") == CLOSED
+
+
+def test_half_open_allows_single_probe():
+    tracker = _tracker(cooldown=0.0)
+    tracker.record("일본", 0.1, ok=False)
+    tracker.record("일본", 0.1, ok=False)
+    time.sleep(0.001)
+    assert tracker.status("일본") == HALF_OPEN
+    assert tracker.acquire("일본", 10) == 2.0
+    # 시험 요청 진행 중에는 다른 요청을 막음
+    assert tracker.acquire("일본", 10) is None
+    tracker.record("일본", 0.1, ok=True)
+    assert tracker.status("일본") == CLOSED
+    assert tracker.acquire("일본", 10) == 10
+
+
+def test_failed_probe_reopens():
+    tracker = _tracker(cooldown=0.0)
+    for _ in range(2):
+        tracker.record("일본", 0.1, ok=False)
+    tracker.acquire("일본", 10)
+    tracker.cooldown = 60.0
+    tracker.record("일본", 0.1, ok=False)
+    assert tracker.status("일본") == OPEN
+
+
+def test_order_and_snapshot():
+    tracker = _tracker()
+    for _ in range(2):
+        tracker.record("미국", 0.5, ok=False)
+    tracker.record("한국", 0.2, ok=True)
+    assert tracker.order(["미국", "한국", "일본"]) == ["한국", "일본", "미국"]
+    snapshot = tracker.snapshot()
+    assert snapshot["미국"]["status"] == OPEN
+    assert snapshot["미국"]["error_rate"] == 1.0
+    assert snapshot["한국"] == {'status': CLOSED, 'avg_latency': 0.2, 'max_latency': 0.2, 'error_rate': 0.0,
+                               'samples': 1}
+    tracker.reset()
+    assert tracker.snapshot() == {}
+
+
+def test_run_stats_merge_and_report():
+    stats = RegionRunStats()
+    stats.add("미국", requests=2, failures=1, seconds=1.0)
+    other = RegionRunStats()
+    other.add("미국", requests=2, skipped=1, seconds=1.0)
+    other.add("한국", requests=1, seconds=0.5)
+    stats.merge(other.summary())
+    summary = stats.summary()
+    assert summary["미국"] == {'requests': 4, 'failures': 1, 'skipped': 1, 'seconds': 2.0}
+
+    tracker = _tracker()
+    tracker.record("미국", 0.1, ok=True)
+    assert stats.summary(tracker)["미국"]["status"] == CLOSED
+    assert "status" not in stats.summary(tracker)["한국"]
+
+    lines = stats.report_lines()
+    assert lines[0] == "=== 지역별 RSS 상태 ==="
+    assert lines[1] == "미국: 요청 4회, 실패 1회, 차단으로 건너뜀 1회, 평균 0.50초"
+    assert format_region_health({}) == []
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+relevance_filter 테스트 (제외 기준 키워드, 제목 점수, 자동 제외 항목 형식)
+"""
+
+from relevance_filter import (
+    COLLISION_WEIGHT,
+    DOMAIN_WEIGHT,
+    EXCLUSION_WEIGHT,
+    KEEP_WEIGHT,
+    KEYWORD_WEIGHT,
+    NOISE_WEIGHT,
+    RelevanceFilter,
+    exclusion_terms,
+    expand_keywords,
+    past_verdicts,
+)
+
+NOISE = {"주가/시세": ["특징주", "목표가"], "스포츠": ["홈런"]}
+
+
+def _filter(keywords=("SK하이닉스",), exclusion=("SK증권",), **kwargs) -> RelevanceFilter:
+    options = dict(noise=NOISE, keep=["영업이익", "합병"], domain=["반도체", "배터리"])
+    options.update(kwargs)
+    return RelevanceFilter(list(keywords), exclusion=exclusion, **options)
+
+
+def test_exclusion_terms_reads_only_criteria_lines():
+    criteria = "키워드: {keywords}\n- 키워드: 롯데카드, 롯데손보 ,\n  - 키워드 : 롯데렌탈\n- 기타: 무시"
+    assert exclusion_terms(criteria) == ["롯데카드", "롯데손보", "롯데렌탈"]
+    assert exclusion_terms(None) == []
+
+
+def test_expand_keywords_splits_phrases():
+    assert expand_keywords("Hyundai e-axle for EV") == ["Hyundai e-axle for EV", "Hyundai", "e-axle"]
+    assert expand_keywords(["a", "a"]) == ["a"]
+
+
+def test_score_weights():
+    relevance = _filter()
+    assert relevance.score("SK하이닉스, 반도체 영업이익 5조") == (
+        KEYWORD_WEIGHT + DOMAIN_WEIGHT + KEEP_WEIGHT,
+        ["키워드 'SK하이닉스'", "산업 용어 '반도체'", "핵심 이슈 '영업이익'"],
+    )
+    assert relevance.score("[특징주] SK하이닉스 목표가 상향")[0] == NOISE_WEIGHT * 2 + KEYWORD_WEIGHT
+    assert relevance.score("SK증권, 신규 펀드 출시") == (EXCLUSION_WEIGHT, ["제외 기준 'SK증권'"])
+    # 같은 용어는 한 번만
+    assert relevance.score("홈런 홈런 홈런")[0] == NOISE_WEIGHT
+
+
+def test_short_acronym_collision():
+    relevance = _filter(keywords=["LG"], exclusion=())
+    assert relevance.score("LG에너지솔루션 배터리 증설")[0] == KEYWORD_WEIGHT + DOMAIN_WEIGHT
+    # 약어는 대소문자 구분, 영단어 안의 LG는 충돌
+    assert relevance.score("Algorithm updates for lg users") == (COLLISION_WEIGHT, ["약어 충돌 'Algorithm'"])
+
+
+def test_split_marks_prefilter_items():
+    relevance = _filter()
+    news = [
+        {'original_index': 1, 'content': 'SK하이닉스, 합병 결의', 'press': '연합뉴스'},
+        {'original_index': 2, 'content': 'SK증권 특징주', 'press': '이데일리'},
+        {'original_index': 3, 'content': '오늘의 날씨', 'press': '연합뉴스'},
+    ]
+    kept, excluded = relevance.split(news)
+    assert [item['original_index'] for item in kept] == [1, 3]
+    assert excluded == [{
+        'index': 2,
+        'original_index': 2,
+        'title': 'SK증권 특징주',
+        'reason': f"사전 필터(점수 {EXCLUSION_WEIGHT + NOISE_WEIGHT}): 제외 기준 'SK증권', 주가/시세 '특징주'",
+        'prefilter': True,
+    }]
+
+
+def test_min_score():
+    assert _filter(min_score=1).split([{'original_index': 1, 'content': '오늘의 날씨'}])[0] == []
+
+
+def test_from_state():
+    relevance = RelevanceFilter.from_state({"keyword": ["SK하이닉스"], "exclusion_criteria": "- 키워드: SK증권"})
+    assert relevance.score("SK증권 리포트")[0] < 0
+
+
+def test_past_verdicts_skips_automatic_verdicts():
+    state = {
+        "news_data": [{'original_index': i, 'content': f"기사 {i}"} for i in (1, 2, 3, 4)],
+        "excluded_news": [{'index': 1}, {'index': 2, 'prefilter': True}],
+        "borderline_news": [{'index': 3, 'local_model': True}],
+        "retained_news": [{'index': 4}],
+    }
+    assert [(news['original_index'], verdict) for news, verdict in past_verdicts(state)] == [(1, "제외"), (4, "유지")]
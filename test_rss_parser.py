@@ -0,0 +1,78 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+rss_parser 테스트 (lxml 스트림 파싱, feedparser 폴백, 취소)
+"""
+
+import io
+import threading
+
+import pytest
+
+import rss_parser
+from hedging import FetchCancelled
+from rss_parser import _RecordingReader, _sample_feed, parse_feed, parse_with_feedparser, parse_with_lxml
+
+ATOM_FEED = (
+    b'<?xml version="1.0" encoding="utf-8"?><feed xmlns="http://www.w3.org/2005/Atom"><title>t</title>'
+    b'<entry><title>Atom title</title><link href="https://example.com/a"/>'
+    b'<published>2026-10-19T01:00:00Z</published></entry></feed>'
+)
+
+
+def test_parse_with_lxml_fields():
+    entries = parse_with_lxml(_sample_feed(3))
+    assert len(entries) == 3
+    assert entries[0] == {
+        'link': 'https://news.google.com/rss/articles/CBMi000000AbCdEfGhIjKlMnOpQrStUvWxYz?oc=5',
+        'title': 'Hyundai Motor unveils new e-axle with 160kW output - Reuters',
+        'press': 'Reuters',
+        'source_url': 'https://www.reuters.com',
+        'published': 'Mon, 19 Oct 2026 00:00:00 GMT',
+    }
+
+
+def test_parse_with_lxml_stops_at_k():
+    assert len(parse_with_lxml(_sample_feed(50), k=5)) == 5
+
+
+def test_parse_with_lxml_missing_fields_and_other_formats():
+    feed = b'<rss version="2.0"><channel><item><title>only title</title></item></channel></rss>'
+    assert parse_with_lxml(feed) == [{'link': '', 'title': 'only title', 'press': '알 수 없음', 'source_url': '',
+                                      'published': '날짜 정보 없음'}]
+    assert parse_with_lxml(b'<rss version="2.0"><channel></channel></rss>') == []
+    assert parse_with_lxml(ATOM_FEED) is None
+
+
+def test_parse_with_feedparser_matches_lxml():
+    pytest.importorskip("feedparser")
+    feed = _sample_feed(5)
+    assert parse_with_feedparser(feed, k=5) == parse_with_lxml(feed, k=5)
+
+
+def test_parse_feed_falls_back_for_atom_and_broken_xml():
+    pytest.importorskip("feedparser")
+    assert [entry['title'] for entry in parse_feed(io.BytesIO(ATOM_FEED))] == ["Atom title"]
+    # 닫는 태그가 잘린 응답도 feedparser로 읽을 수 있는 항목은 반환
+    broken = _sample_feed(2)[:-len("</channel></rss>")]
+    assert [entry['press'] for entry in parse_feed(broken)] == ["Reuters", "Reuters"]
+
+
+def test_parse_feed_without_lxml(monkeypatch):
+    pytest.importorskip("feedparser")
+    monkeypatch.setattr(rss_parser, "LXML_AVAILABLE", False)
+    assert len(parse_feed(io.BytesIO(_sample_feed(4)), k=2)) == 2
+
+
+def test_recording_reader_keeps_read_bytes():
+    reader = _RecordingReader(io.BytesIO(b"0123456789"))
+    assert reader.read(4) == b"0123"
+    assert reader.getvalue() == b"0123456789"
+
+
+def test_cancelled_stream_stops_reading():
+    cancel = threading.Event()
+    cancel.set()
+    with pytest.raises(FetchCancelled):
+        parse_feed(io.BytesIO(_sample_feed(3)), cancel=cancel)
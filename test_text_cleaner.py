@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+text_cleaner 테스트 (컴파일된 정규식이 기존 패턴별 re.sub/re.search 루프와 같은 결과를 내는지)
+"""
+
+import re
+
+import pytest
+
+from text_cleaner import AD_PATTERNS, JUNK_LINE_PATTERNS, _sample_article, clean_content, clean_html, is_junk_line
+
+SAMPLES = [
+    "[홍길동 기자] hong@example.com 본문입니다",
+    "현대차가 새 e-axle을 공개했다. 저작권자 © 예시경제 무단전재 및 재배포 금지",
+    "▶ 관련 뉴스 바로가기 본문 [김철수 기자] ▲ 신차 사진 이 기사는 예시에서 제공",
+    "Sponsored Content 광고 AD 공유하기 페이스북 트위터 카카오 라인 SNS 공유",
+    "기자 kim@news.com [특파원 기자] 기자회견 결과",
+    "Copyright 2026 Example. All rights reserved. 좋아요 싫어요 네이버 다음",
+    "관련기사 더보기 구독 알림 댓글 남기기 프린트 스크랩",
+    "[단독] 괄호만 열리고 닫히지 않는 [제목 기자",
+    "",
+]
+
+
+def _legacy_clean(content: str) -> str:
+    """기존 web_scraper._clean_content의 패턴별 루프"""
+    content = re.sub(r'\s+', ' ', content)
+    for pattern in AD_PATTERNS:
+        content = re.sub(pattern, '', content, flags=re.IGNORECASE)
+    return re.sub(r'\s+', ' ', content).strip()
+
+
+def _legacy_junk(line: str) -> bool:
+    """기존 _is_junk_line의 패턴별 루프"""
+    return any(re.search(pattern, line, re.IGNORECASE) for pattern in JUNK_LINE_PATTERNS)
+
+
+@pytest.mark.parametrize("text", SAMPLES + [_sample_article(16)])
+def test_clean_content_matches_legacy_loop(text):
+    assert clean_content(text, max_length=0) == _legacy_clean(text)
+
+
+def test_byline_email_removed_before_bracket_pattern():
+    assert clean_content("[홍길동 기자] hong@example.com 본문입니다") == "[홍길동 본문입니다"
+
+
+def test_keep_paragraphs_cleans_each_line():
+    text = "첫 문단   입니다 공유하기\n\n\n[홍길동 기자] hong@example.com\n둘째 문단"
+    assert clean_content(text, max_length=0, keep_paragraphs=True) == "첫 문단 입니다\n\n[홍길동\n\n둘째 문단"
+
+
+def test_clean_content_max_length():
+    assert clean_content("가" * 10, max_length=4) == "가가가가..."
+    assert clean_content("가" * 10, max_length=0) == "가" * 10
+
+
+@pytest.mark.parametrize("line", [
+    "12", " ★★ ", "관련 기사", "더보기", "AD", "광고 문의", "구독하기", "로그인 | 회원가입",
+    "현대차가 새 e-axle을 공개했다.", "Hyundai adds 160kW e-axle", "이전기사 다음 기사", "",
+])
+def test_is_junk_line_matches_legacy_loop(line):
+    assert is_junk_line(line) == _legacy_junk(line)
+
+
+def test_clean_html():
+    assert clean_html("<b>현대차</b> &amp; 기아&nbsp;  발표") == "현대차 & 기아 발표"
+    assert clean_html("<div>첫 줄<br>\n\n\n\n둘째 <span", keep_newlines=True) == "첫 줄\n\n둘째"
@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+verdict_model 테스트 (특징 추출, 학습/판단/보정, 판단 기록에서 사전 필터·로컬 모델 항목 제외)
+"""
+
+import math
+
+import pytest
+
+from config import STAGE_MODELS
+from verdict_model import (
+    VERDICTS,
+    HashedNgramClassifier,
+    VerdictLog,
+    features,
+    log_stage1_verdicts,
+    train,
+    training_samples,
+)
+
+pytest.importorskip("numpy")
+
+KEYWORD = "Hyundai e-axle"
+EXCLUDED = [f"[특징주] 현대차 주가 {i}% 급등 마감" for i in range(20)]
+RETAINED = [f"Hyundai unveils e-axle with {150 + i}kW motor output" for i in range(20)]
+
+
+def _samples():
+    rows = []
+    for excluded, retained in zip(EXCLUDED, RETAINED):
+        rows.append((excluded, "이데일리", KEYWORD, "excluded"))
+        rows.append((retained, "Reuters", KEYWORD, "retained"))
+    return rows
+
+
+@pytest.fixture(scope="module")
+def model():
+    return HashedNgramClassifier(hash_bits=12).fit(_samples())
+
+
+def test_features_split_press_suffix():
+    result = features("Hyundai e-axle - Reuters", "Reuters", KEYWORD)
+    assert "w:hyundai" in result and "b:hyundai e" in result
+    assert "w:reuters" not in result
+    assert result[-2:] == ["p:reuters", f"k:{KEYWORD}"]
+
+
+def test_fit_separates_verdicts(model):
+    assert model.meta['trained_samples'] == 40
+    probabilities = model.predict_proba("[특징주] 현대차 주가 상한가", "이데일리", KEYWORD)
+    assert VERDICTS[int(probabilities.argmax())] == "excluded"
+    assert math.isclose(float(probabilities.sum()), 1.0, rel_tol=1e-5)
+    probabilities = model.predict_proba("Hyundai e-axle reaches 200kW output", "Reuters", KEYWORD)
+    assert VERDICTS[int(probabilities.argmax())] == "retained"
+
+
+def test_decide_only_confident_items(model):
+    news = [
+        {'original_index': 1, 'content': "[특징주] 현대차 주가 9% 급등 마감", 'press': "이데일리"},
+        {'original_index': 2, 'content': "Hyundai unveils e-axle with 165kW motor output", 'press': "Reuters"},
+    ]
+    uncertain, decided = model.decide(news, KEYWORD, threshold=0.5)
+    assert uncertain == []
+    assert [item['index'] for item in decided["excluded"]] == [1]
+    assert [item['index'] for item in decided["retained"]] == [2]
+    assert decided["excluded"][0]['local_model'] is True
+    assert decided["excluded"][0]['reason'].startswith("로컬 모델 판단 (확신도 ")
+
+    uncertain, decided = model.decide(news, KEYWORD, threshold=1.01)
+    assert uncertain == news
+    assert all(not items for items in decided.values())
+
+
+def test_calibrate_minimizes_validation_loss(model):
+    def loss(temperature):
+        return -sum(math.log(float(model.predict_proba(headline, press, keyword, temperature)[VERDICTS.index(verdict)]))
+                    for headline, press, keyword, verdict in validation)
+
+    validation = _samples()[:10] + [("[특징주] Hyundai e-axle 공개", "Reuters", KEYWORD, "retained")]
+    original = model.temperature
+    try:
+        temperature = model.calibrate(validation)
+        assert 0.5 <= temperature <= 3.0
+        assert loss(temperature) <= loss(1.0) + 1e-9
+        assert model.calibrate([]) == temperature
+    finally:
+        model.temperature = original
+
+
+def test_save_and_load(model, tmp_path):
+    path = str(tmp_path / "stage1_model.npz")
+    model.save(path)
+    loaded = HashedNgramClassifier.load(path)
+    assert loaded.hash_bits == 12
+    assert loaded.meta['trained_samples'] == 40
+    title = RETAINED[0]
+    assert loaded.predict_proba(title, "Reuters", KEYWORD).tolist() == pytest.approx(
+        model.predict_proba(title, "Reuters", KEYWORD).tolist())
+
+
+def test_log_stage1_verdicts_skips_automatic_items(tmp_path):
+    db_path = str(tmp_path / "verdicts.db")
+    news = [{'original_index': i, 'content': f"기사 {i}", 'press': "연합뉴스"} for i in (1, 2, 3, 4)]
+    classification = {
+        "excluded": [{'index': 1, 'reason': "무관"}, {'index': 2, 'prefilter': True}],
+        "borderline": [{'index': 3, 'local_model': True}],
+        "retained": [{'index': 4, 'reason': "핵심"}, {'index': 99}],
+    }
+    log_stage1_verdicts(KEYWORD, news, classification, model="gpt-4.1", db_path=db_path)
+    assert VerdictLog(db_path).samples() == [("기사 1", "연합뉴스", KEYWORD, "excluded"),
+                                             ("기사 4", "연합뉴스", KEYWORD, "retained")]
+
+
+def test_training_samples_exclude_cascade_model(tmp_path):
+    log = VerdictLog(str(tmp_path / "verdicts.db"))
+    log.record(KEYWORD, [("큰 모델 판단", "AP", "retained", "")], model="gpt-4.1", logged_at=1.0)
+    log.record(KEYWORD, [("작은 모델 판단", "AP", "excluded", "")], model=STAGE_MODELS[1], logged_at=2.0)
+    assert [row[0] for row in training_samples(log)] == ["큰 모델 판단"]
+    assert [row[0] for row in training_samples(log, models=[STAGE_MODELS[1]])] == ["작은 모델 판단"]
+
+
+def test_train_requires_min_samples(tmp_path):
+    log = VerdictLog(str(tmp_path / "verdicts.db"))
+    model, lines = train(log, path=str(tmp_path / "model.npz"), min_samples=10)
+    assert model is None
+    assert lines == ["학습 데이터가 부족합니다: 0건 (최소 10건)"]
@@ -0,0 +1,239 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Text Cleaner
+------------
+기사 본문/요약 텍스트 정리 모듈입니다.
+광고·불필요 문구 패턴을 모듈 로드 시 컴파일해 두고,
+web_scraper, improved_extractor, news_ai, news_summarizer, app에서 공통으로 사용합니다.
+광고 문구는 기존과 같은 결과가 나오도록 패턴 순서대로 하나씩 제거하고(앞 패턴이 지운 뒤의 텍스트에 다음 패턴 적용),
+쓸모없는 라인 판별은 일치 여부만 보므로 하나의 정규식(alternation)으로 검사합니다.
+"""
+
+import re
+import time
+from typing import Dict, List
+
+# 광고성 문구 패턴 (본문 정리용)
+AD_PATTERNS = [
+    r'저작권자.*?무단.*?금지',
+    r'Copyright.*?All rights reserved',
+    r'무단전재.*?재배포.*?금지',
+    r'기자.*?@.*?\.com',
+    r'▶.*?바로가기',
+    r'▲.*?사진',
+    r'\[.*?기자\]',
+    r'이 기사는.*?제공',
+    r'관련기사.*?더보기',
+    r'구독.*?알림',
+    r'댓글.*?남기기',
+    r'공유하기',
+    r'프린트.*?스크랩',
+    r'좋아요.*?싫어요',
+    r'SNS.*?공유',
+    r'네이버.*?다음',
+    r'페이스북.*?트위터',
+    r'카카오.*?라인',
+    r'광고.*?AD',
+    r'Sponsored.*?Content'
+]
+
+# 쓸모없는 라인 패턴 (라인 단위 필터링용)
+JUNK_LINE_PATTERNS = [
+    r'^\s*\d+\s*$',  # 숫자만
+    r'^\s*[^\w\s]*\s*$',  # 특수문자만
+    r'관련\s*기사',
+    r'더\s*보기',
+    r'이전\s*기사',
+    r'다음\s*기사',
+    r'^\s*AD\s*$',
+    r'광고',
+    r'구독',
+    r'로그인',
+    r'회원가입'
+]
+
+# HTML 엔티티 변환표
+HTML_ENTITIES = {
+    '&amp;': '&',
+    '&lt;': '<',
+    '&gt;': '>',
+    '&quot;': '"',
+    '&#39;': "'",
+    '&nbsp;': ' ',
+    '&apos;': "'"
+}
+
+# 기본 본문 길이 제한
+MAX_CONTENT_LENGTH = 3000
+
+# 컴파일된 정규식 (모듈 로드 시 1회)
+# 광고 패턴은 하나로 합치면 결과가 달라짐 - 예: '[홍길동 기자] hong@example.com'에서 '\[.*?기자\]'가 먼저 일치해
+# '기자.*?@.*?\.com'이 이메일을 지우지 못함 (순서대로 적용하면 '[홍길동 '만 남음)
+_AD_RES = [re.compile(p, re.IGNORECASE) for p in AD_PATTERNS]
+_JUNK_LINE_RE = re.compile('|'.join(f'(?:{p})' for p in JUNK_LINE_PATTERNS), re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r'\s+')
+_INLINE_WHITESPACE_RE = re.compile(r'[ \t]+')
+_BLANK_LINES_RE = re.compile(r'\n\s*\n\s*\n+')
+
+_ENTITY_ALTERNATION = '|'.join(re.escape(entity) for entity in HTML_ENTITIES)
+# 태그 + 엔티티를 한 번에 처리 (태그는 제거, 엔티티는 변환)
+_MARKUP_RE = re.compile(rf'<[^>]+>|{_ENTITY_ALTERNATION}')
+# 표시용: 닫히지 않은 태그, 여는 태그 없는 닫는 태그까지 제거
+_DISPLAY_MARKUP_RE = re.compile(rf'<[^<>]*>|<[^<>]*|[^<>]*>|{_ENTITY_ALTERNATION}')
+
+
+def _remove_ads(text: str) -> str:
+    """광고성 문구 패턴을 순서대로 제거"""
+    for pattern in _AD_RES:
+        text = pattern.sub('', text)
+    return text
+
+
+def _replace_markup(match: re.Match) -> str:
+    """태그는 빈 문자열로, 엔티티는 대응 문자로 치환"""
+    return HTML_ENTITIES.get(match.group(0), '')
+
+
+def clean_content(content: str, max_length: int = MAX_CONTENT_LENGTH, keep_paragraphs: bool = False) -> str:
+    """
+    기사 본문을 정리합니다 (공백 정리 + 광고성 문구 제거 + 길이 제한).
+
+    Args:
+        content (str): 원본 본문
+        max_length (int): 최대 길이, 0 이하이면 자르지 않음 (기본값: 3000)
+        keep_paragraphs (bool): True이면 줄 단위 문단 구분을 유지 (content_budget용)
+
+    Returns:
+        str: 정리된 본문
+    """
+    if not content:
+        return ""
+
+    if keep_paragraphs:
+        paragraphs = (
+            _WHITESPACE_RE.sub(' ', _remove_ads(line)).strip()
+            for line in content.split('\n')
+        )
+        content = '\n\n'.join(p for p in paragraphs if p)
+    else:
+        content = _WHITESPACE_RE.sub(' ', content)
+        content = _remove_ads(content)
+        content = _WHITESPACE_RE.sub(' ', content).strip()
+
+    # 길이 제한 (너무 긴 기사는 앞부분만)
+    if max_length > 0 and len(content) > max_length:
+        content = content[:max_length] + "..."
+
+    return content
+
+
+def is_junk_line(line: str) -> bool:
+    """쓸모없는 라인 판별 (숫자/특수문자만, 관련기사, 광고, 구독 등)"""
+    return _JUNK_LINE_RE.search(line) is not None
+
+
+def filter_meaningful_lines(text: str, min_length: int = 20) -> List[str]:
+    """줄 단위로 나눠 의미있는 라인만 반환"""
+    return [
+        line for line in (raw.strip() for raw in text.split('\n'))
+        if len(line) > min_length and not _JUNK_LINE_RE.search(line)
+    ]
+
+
+def clean_html(text: str, keep_newlines: bool = False) -> str:
+    """
+    HTML 태그를 제거하고 엔티티를 변환합니다.
+
+    Args:
+        text (str): HTML이 포함된 텍스트
+        keep_newlines (bool): True이면 줄바꿈을 유지하고 닫히지 않은 태그 조각까지 제거 (Streamlit 표시용)
+
+    Returns:
+        str: 정리된 텍스트
+    """
+    if not text:
+        return ""
+
+    if keep_newlines:
+        text = _DISPLAY_MARKUP_RE.sub(_replace_markup, text)
+        text = _INLINE_WHITESPACE_RE.sub(' ', text)
+        text = _BLANK_LINES_RE.sub('\n\n', text)
+    else:
+        text = _MARKUP_RE.sub(_replace_markup, text)
+        text = _WHITESPACE_RE.sub(' ', text)
+
+    return text.strip()
+
+
+def _sample_article(paragraphs: int = 40) -> str:
+    """벤치마크용 샘플 기사 (광고/잡음 라인 포함)"""
+    body = [
+        "현대자동차가 차세대 하이브리드 시스템을 공개했다. 새 시스템은 2.5L 엔진과 100kW 모터를 결합했다.",
+        "Hyundai Motor unveiled a new e-axle with 160kW output and 350Nm torque for its next BEV platform.",
+        "▶ 관련 뉴스 바로가기",
+        "[홍길동 기자] hong@example.com",
+        "저작권자 © 예시경제 무단전재 및 재배포 금지",
+        "<div class='ad'>Sponsored Content &amp; 광고 AD</div>",
+        "공유하기 페이스북 트위터 카카오 라인",
+        "12",
+    ]
+    return '\n'.join(body[i % len(body)] for i in range(paragraphs))
+
+
+def benchmark_throughput(size_mb: float = 0.25, repeat: int = 3) -> Dict[str, float]:
+    """
+    정리 함수별 처리량(MB/s)을 측정합니다.
+    패턴별 re.sub/re.search를 반복하던 기존 방식과 미리 컴파일한 정규식 방식을 비교합니다.
+
+    Args:
+        size_mb (float): 측정용 텍스트 크기 (기본값: 0.25MB)
+        repeat (int): 반복 횟수, 최고 기록 사용 (기본값: 3)
+
+    Returns:
+        Dict[str, float]: 항목별 MB/s
+    """
+    sample = _sample_article()
+    copies = max(1, int(size_mb * 1024 * 1024 / len(sample.encode('utf-8'))))
+    text = '\n'.join([sample] * copies)
+    lines = text.split('\n')
+    mb = len(text.encode('utf-8')) / (1024 * 1024)
+
+    def legacy_clean(content):
+        content = re.sub(r'\s+', ' ', content)
+        for pattern in AD_PATTERNS:
+            content = re.sub(pattern, '', content, flags=re.IGNORECASE)
+        return re.sub(r'\s+', ' ', content).strip()
+
+    def legacy_junk(line):
+        for pattern in JUNK_LINE_PATTERNS:
+            if re.search(pattern, line, re.IGNORECASE):
+                return True
+        return False
+
+    cases = {
+        'clean_content (legacy)': lambda: legacy_clean(text),
+        'clean_content (compiled)': lambda: clean_content(text, max_length=0),
+        'is_junk_line (legacy)': lambda: [legacy_junk(line) for line in lines],
+        'is_junk_line (compiled)': lambda: [is_junk_line(line) for line in lines],
+        'clean_html': lambda: clean_html(text),
+        'clean_html (display)': lambda: clean_html(text, keep_newlines=True),
+    }
+
+    results = {}
+    for name, fn in cases.items():
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+        results[name] = mb / best if best > 0 else float('inf')
+    return results
+
+
+# 처리량 벤치마크
+if __name__ == "__main__":
+    print("=== 텍스트 정리 처리량 벤치마크 ===")
+    for name, mbps in benchmark_throughput().items():
+        print(f"{name:<28} {mbps:8.2f} MB/s")
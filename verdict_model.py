@@ -0,0 +1,443 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Verdict Model
+-------------
+1단계(제외 판단) LLM 판단을 기록하고, 그 기록으로 학습한 로컬 분류기가 확신하는 기사만 직접 판단하는 모듈입니다.
+
+1. filter_excluded_news가 LLM으로 판단한 기사를 (제목, 언론사, 키워드, 판단, 사유)로 SQLite에 기록합니다.
+2. 해시 n-gram(글자 2~3-gram, 단어 1~2-gram, 언론사, 키워드) 다항 로지스틱 회귀를 CPU로 학습하고,
+   검증 구간에서 온도(temperature)를 맞춰 확률을 보정합니다.
+3. 실행 시 보정된 확률이 STAGE1_MODEL_CONFIDENCE 이상인 기사만 로컬 모델이 판단하고 나머지는 LLM에 보냅니다.
+
+    python verdict_model.py train --import-jobs news_jobs.db   # 과거 작업 결과 가져오기 + 학습 + 보정 보고서
+    python verdict_model.py report                             # 저장된 모델의 보정 보고서
+
+numpy는 학습/판단 시점에만 임포트합니다.
+"""
+
+import json
+import math
+import os
+import re
+import sqlite3
+import time
+import zlib
+from functools import lru_cache
+from importlib.util import find_spec
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from config import (
+    STAGE1_MODEL_CONFIDENCE,
+    STAGE1_MODEL_HASH_BITS,
+    STAGE1_MODEL_MIN_SAMPLES,
+    STAGE1_MODEL_PATH,
+    STAGE1_VERDICT_DB_PATH,
+    STAGE_MODELS,
+)
+
+# 1단계 판단 (LLM 응답 JSON 키 순서)
+VERDICTS = ("excluded", "borderline", "retained")
+VERDICT_LABELS = {"excluded": "제외", "borderline": "보류", "retained": "유지"}
+
+# numpy 설치 여부 (선택적, 임포트는 학습/판단 시)
+NUMPY_AVAILABLE = find_spec("numpy") is not None
+
+# 학습 하이퍼파라미터
+EPOCHS = 8
+LEARNING_RATE = 0.5
+L2 = 1e-6
+CHAR_NGRAMS = (2, 3)
+
+# 보정 보고서 신뢰도 구간 수, 확신도 기준 후보
+CALIBRATION_BINS = 10
+REPORT_THRESHOLDS = (0.7, 0.8, 0.9, 0.95)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS stage1_verdicts (
+    keyword TEXT NOT NULL,
+    headline TEXT NOT NULL,
+    press TEXT NOT NULL,
+    verdict TEXT NOT NULL,
+    reason TEXT,
+    model TEXT,
+    logged_at REAL NOT NULL,
+    PRIMARY KEY (keyword, headline, press)
+);
+"""
+
+_NON_WORD = re.compile(r'\W+')
+
+
+class VerdictLog:
+    """1단계 LLM 판단 기록 (SQLite, 프로세스마다 연결을 새로 열어 사용)"""
+
+    def __init__(self, db_path: str = STAGE1_VERDICT_DB_PATH):
+        self.db_path = db_path
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def record(self, keyword: str, rows: Iterable[Tuple[str, str, str, str]], model: str = "",
+               logged_at: Optional[float] = None) -> int:
+        """
+        판단 기록 (같은 키워드의 같은 제목+언론사는 최신 판단으로 갱신)
+
+        Args:
+            keyword (str): 분석 대상 키 (collection_scope)
+            rows (Iterable[Tuple[str, str, str, str]]): (제목, 언론사, 판단, 사유)
+            model (str): 판단한 LLM 모델명
+            logged_at (float): 기록 시각 (과거 결과를 가져올 때 지정)
+
+        Returns:
+            int: 기록한 행 수
+        """
+        logged_at = logged_at or time.time()
+        values = [(keyword, headline, press or "", verdict, reason, model, logged_at)
+                  for headline, press, verdict, reason in rows if headline and verdict in VERDICTS]
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO stage1_verdicts (keyword, headline, press, verdict, reason, model, logged_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT(keyword, headline, press) DO UPDATE SET "
+                "verdict = excluded.verdict, reason = excluded.reason, model = excluded.model, "
+                "logged_at = excluded.logged_at",
+                values
+            )
+        return len(values)
+
+    def samples(self, since: float = 0.0, models: Optional[Sequence[str]] = None,
+                exclude_models: Sequence[str] = ()) -> List[Tuple[str, str, str, str]]:
+        """
+        학습 데이터 (제목, 언론사, 키워드, 판단) - 기록 시각 순
+
+        Args:
+            since (float): 이 시각 이후 기록만
+            models (Sequence[str]): 주면 이 모델들이 판단한 기록만
+            exclude_models (Sequence[str]): 제외할 모델 (캐스케이드 작은 모델 등)
+        """
+        query = "SELECT headline, press, keyword, verdict FROM stage1_verdicts WHERE logged_at > ?"
+        args: list = [since]
+        if models:
+            query += f" AND model IN ({', '.join('?' * len(models))})"
+            args += list(models)
+        exclude_models = [model for model in exclude_models if model]
+        if exclude_models:
+            query += f" AND model NOT IN ({', '.join('?' * len(exclude_models))})"
+            args += exclude_models
+        with self._connect() as conn:
+            return conn.execute(query + " ORDER BY logged_at, rowid", args).fetchall()
+
+
+def features(headline: str, press: str, keyword: str) -> List[str]:
+    """기사 1건의 특징 문자열 (글자 n-gram, 단어 1~2-gram, 언론사, 키워드)"""
+    # Google News 제목 끝의 " - 언론사"는 언론사 특징으로 따로 사용
+    if press and headline.endswith(f" - {press}"):
+        headline = headline[:-len(press) - 3]
+    text = _NON_WORD.sub(" ", headline.casefold()).strip()
+    words = text.split()
+    result = [f"w:{word}" for word in words]
+    result += [f"b:{first} {second}" for first, second in zip(words, words[1:])]
+    for word in words:
+        padded = f" {word} "
+        for n in CHAR_NGRAMS:
+            result += [f"c:{padded[i:i + n]}" for i in range(len(padded) - n + 1)]
+    result.append(f"p:{(press or '').casefold()}")
+    result.append(f"k:{keyword}")
+    return result
+
+
+class HashedNgramClassifier:
+    """
+    해시 n-gram 다항 로지스틱 회귀 (1단계 제외/보류/유지).
+
+    사용 예:
+        model = HashedNgramClassifier().fit(train_samples)
+        model.calibrate(validation_samples)
+        probabilities = model.predict_proba(headline, press, keyword)   # VERDICTS 순서
+        model.save(STAGE1_MODEL_PATH)
+    """
+
+    def __init__(self, hash_bits: int = STAGE1_MODEL_HASH_BITS):
+        import numpy as np
+
+        self.hash_bits = hash_bits
+        self.weights = np.zeros((1 << hash_bits, len(VERDICTS)), dtype=np.float32)
+        self.bias = np.zeros(len(VERDICTS), dtype=np.float32)
+        self.temperature = 1.0
+        self.meta: Dict[str, object] = {}
+
+    def _vector(self, headline: str, press: str, keyword: str):
+        """특징 해시 인덱스와 값 (L2 정규화된 이진 특징)"""
+        import numpy as np
+
+        mask = (1 << self.hash_bits) - 1
+        indices = np.unique(np.fromiter(
+            (zlib.crc32(feature.encode('utf-8')) & mask for feature in features(headline, press, keyword)),
+            dtype=np.int64
+        ))
+        return indices, 1.0 / math.sqrt(max(1, len(indices)))
+
+    def _logits(self, indices, value):
+        return self.weights[indices].sum(axis=0) * value + self.bias
+
+    def fit(self, samples: Sequence[Tuple[str, str, str, str]], epochs: int = EPOCHS,
+            learning_rate: float = LEARNING_RATE, l2: float = L2, seed: int = 0) -> "HashedNgramClassifier":
+        """확률적 경사 하강법으로 학습 (samples: (제목, 언론사, 키워드, 판단))"""
+        import numpy as np
+
+        vectors = [self._vector(headline, press, keyword) for headline, press, keyword, _ in samples]
+        labels = [VERDICTS.index(verdict) for _, _, _, verdict in samples]
+        rng = np.random.default_rng(seed)
+        for epoch in range(epochs):
+            rate = learning_rate / (1 + epoch)
+            for position in rng.permutation(len(samples)):
+                indices, value = vectors[position]
+                logits = self._logits(indices, value)
+                probabilities = np.exp(logits - logits.max())
+                probabilities /= probabilities.sum()
+                probabilities[labels[position]] -= 1.0
+                self.weights[indices] -= rate * (value * probabilities + l2 * self.weights[indices])
+                self.bias -= rate * probabilities
+        self.meta['trained_samples'] = len(samples)
+        return self
+
+    def predict_proba(self, headline: str, press: str, keyword: str, temperature: Optional[float] = None):
+        """보정된 판단별 확률 (VERDICTS 순서)"""
+        import numpy as np
+
+        logits = self._logits(*self._vector(headline, press, keyword)) / (temperature or self.temperature)
+        probabilities = np.exp(logits - logits.max())
+        return probabilities / probabilities.sum()
+
+    def calibrate(self, samples: Sequence[Tuple[str, str, str, str]]) -> float:
+        """검증 데이터의 음의 로그우도가 최소인 온도 선택 (확률 보정)"""
+        if not samples:
+            return self.temperature
+        best = None
+        for temperature in [0.5 + 0.1 * step for step in range(26)]:
+            loss = -sum(math.log(max(1e-12, float(self.predict_proba(headline, press, keyword, temperature)[
+                VERDICTS.index(verdict)]))) for headline, press, keyword, verdict in samples)
+            if best is None or loss < best[0]:
+                best = (loss, temperature)
+        self.temperature = best[1]
+        return self.temperature
+
+    def decide(self, news_items: Sequence[dict], keyword: str,
+               threshold: float = STAGE1_MODEL_CONFIDENCE) -> Tuple[List[dict], Dict[str, List[dict]]]:
+        """
+        확신도가 기준 이상인 기사만 판단
+
+        Returns:
+            Tuple[List[dict], Dict[str, List[dict]]]: (LLM에 보낼 기사, 판단별 1단계 결과 형식 항목)
+        """
+        uncertain, decided = [], {verdict: [] for verdict in VERDICTS}
+        for news in news_items:
+            title = news.get('content', '')
+            probabilities = self.predict_proba(title, news.get('press', ''), keyword)
+            best = int(probabilities.argmax())
+            if probabilities[best] < threshold:
+                uncertain.append(news)
+                continue
+            index = news.get('original_index')
+            decided[VERDICTS[best]].append({
+                'index': index,
+                'original_index': index,
+                'title': title,
+                'reason': f"로컬 모델 판단 (확신도 {probabilities[best]:.2f})",
+                'local_model': True,
+            })
+        return uncertain, decided
+
+    def save(self, path: str = STAGE1_MODEL_PATH):
+        import numpy as np
+
+        np.savez_compressed(path, weights=self.weights, bias=self.bias,
+                            temperature=np.float32(self.temperature), hash_bits=np.int32(self.hash_bits),
+                            meta=np.array(json.dumps(self.meta, ensure_ascii=False)))
+
+    @classmethod
+    def load(cls, path: str = STAGE1_MODEL_PATH) -> "HashedNgramClassifier":
+        import numpy as np
+
+        with np.load(path) as data:
+            model = cls.__new__(cls)
+            model.hash_bits = int(data['hash_bits'])
+            model.weights = data['weights']
+            model.bias = data['bias']
+            model.temperature = float(data['temperature'])
+            model.meta = json.loads(str(data['meta']))
+        return model
+
+
+@lru_cache(maxsize=4)
+def _load_cached(path: str, mtime: float) -> HashedNgramClassifier:
+    return HashedNgramClassifier.load(path)
+
+
+def load_stage1_model(path: str = STAGE1_MODEL_PATH) -> Optional[HashedNgramClassifier]:
+    """저장된 로컬 모델 (파일이 바뀌면 다시 읽음, 없거나 numpy가 없으면 None)"""
+    if not NUMPY_AVAILABLE:
+        print("numpy가 설치되지 않아 1단계 로컬 모델을 사용하지 않습니다. pip install numpy로 설치하세요.")
+        return None
+    if not os.path.exists(path):
+        print(f"1단계 로컬 모델이 없습니다: {path} (python verdict_model.py train 으로 학습)")
+        return None
+    try:
+        return _load_cached(path, os.path.getmtime(path))
+    except Exception as e:
+        print(f"1단계 로컬 모델 로드 실패: {e}")
+        return None
+
+
+def log_stage1_verdicts(keyword: str, news_items: Sequence[dict], classification: Dict[str, List[dict]],
+                        model: str = "", db_path: str = STAGE1_VERDICT_DB_PATH):
+    """LLM이 판단한 기사만 기록 (사전 필터/로컬 모델 판단은 학습 데이터에 넣지 않음)"""
+    by_index = {news.get('original_index'): news for news in news_items}
+    rows = []
+    for verdict in VERDICTS:
+        for item in classification.get(verdict, []):
+            news = by_index.get(item.get('index'))
+            if news is not None and not item.get('prefilter') and not item.get('local_model'):
+                rows.append((news.get('content', ''), news.get('press', ''), verdict, item.get('reason', '')))
+    try:
+        VerdictLog(db_path).record(keyword, rows, model=model)
+    except Exception as e:
+        print(f"1단계 판단 기록 실패: {e}")
+
+
+def import_job_results(log: VerdictLog, jobs_db: str) -> int:
+    """작업 테이블(job_runner)에 저장된 과거 결과의 1단계 판단을 기록으로 가져오기"""
+    from collection_state import collection_scope
+    from job_runner import JobStore
+    from relevance_filter import past_verdicts
+
+    labels = {label: verdict for verdict, label in VERDICT_LABELS.items()}
+    count = 0
+    for result in JobStore(jobs_db).results():
+        final_state = result[0]
+        rows = [(news.get('content', ''), news.get('press', ''), labels[label], "")
+                for news, label in past_verdicts(final_state)]
+        count += log.record(collection_scope(final_state.get("keyword", [])), rows, model=final_state.get("model", ""))
+    return count
+
+
+def calibration_report(model: HashedNgramClassifier, samples: Sequence[Tuple[str, str, str, str]],
+                       threshold: float = STAGE1_MODEL_CONFIDENCE) -> List[str]:
+    """
+    보정 보고서 (정확도, ECE, 신뢰도 구간별 정확도, 확신도 기준별 처리 비율/정확도, 과거 '유지'를 제외한 수)
+    """
+    if not samples:
+        return ["보고서를 만들 검증 데이터가 없습니다."]
+    predictions = []
+    for headline, press, keyword, verdict in samples:
+        probabilities = model.predict_proba(headline, press, keyword)
+        best = int(probabilities.argmax())
+        predictions.append((float(probabilities[best]), VERDICTS[best], verdict))
+
+    total = len(predictions)
+    accuracy = sum(predicted == verdict for _, predicted, verdict in predictions) / total
+    bins = [[] for _ in range(CALIBRATION_BINS)]
+    for confidence, predicted, verdict in predictions:
+        bins[min(CALIBRATION_BINS - 1, int(confidence * CALIBRATION_BINS))].append((confidence, predicted == verdict))
+    ece = sum(abs(sum(c for c, _ in bucket) / len(bucket) - sum(ok for _, ok in bucket) / len(bucket))
+              * len(bucket) / total for bucket in bins if bucket)
+
+    lines = [
+        "=== 1단계 로컬 모델 보정 보고서 ===",
+        f"검증 {total}건, 정확도 {accuracy:.1%}, ECE {ece:.3f}, 온도 {model.temperature:.1f}",
+        "신뢰도 구간   건수   평균 확신도   정확도",
+    ]
+    for position, bucket in enumerate(bins):
+        if bucket:
+            lines.append(f"{position / CALIBRATION_BINS:.1f}-{(position + 1) / CALIBRATION_BINS:.1f}   "
+                         f"{len(bucket):5d}   {sum(c for c, _ in bucket) / len(bucket):10.2f}   "
+                         f"{sum(ok for _, ok in bucket) / len(bucket):6.1%}")
+    lines.append("확신도 기준   로컬 판단 비율   정확도   유지→제외 오판")
+    for cutoff in sorted(set(REPORT_THRESHOLDS + (threshold,))):
+        decided = [(predicted, verdict) for confidence, predicted, verdict in predictions if confidence >= cutoff]
+        correct = sum(predicted == verdict for predicted, verdict in decided)
+        harmful = sum(predicted == "excluded" and verdict == "retained" for predicted, verdict in decided)
+        marker = "   ← 현재 설정" if cutoff == threshold else ""
+        lines.append(f"{cutoff:.2f}          {len(decided) / total:13.1%}   "
+                     f"{correct / len(decided) if decided else 0.0:6.1%}   {harmful:12d}{marker}")
+    return lines
+
+
+def training_samples(log: VerdictLog, since: float = 0.0,
+                     models: Optional[Sequence[str]] = None) -> List[Tuple[str, str, str, str]]:
+    """학습/평가용 기록 (models를 주지 않으면 캐스케이드 작은 모델의 판단은 제외)"""
+    return log.samples(since=since, models=models, exclude_models=() if models else (STAGE_MODELS.get(1),))
+
+
+def train(log: VerdictLog, path: str = STAGE1_MODEL_PATH, min_samples: int = STAGE1_MODEL_MIN_SAMPLES,
+          hash_bits: int = STAGE1_MODEL_HASH_BITS,
+          models: Optional[Sequence[str]] = None) -> Tuple[Optional[HashedNgramClassifier], List[str]]:
+    """
+    기록 순서대로 학습 70% / 보정 15% / 검증 15%로 나눠 학습, 온도 보정 후 저장
+
+    Args:
+        models (Sequence[str]): 이 모델들이 판단한 기록만 사용 (없으면 캐스케이드 작은 모델을 뺀 전체)
+
+    Returns:
+        Tuple[Optional[HashedNgramClassifier], List[str]]: (모델 - 데이터가 부족하면 None, 보고서 줄)
+    """
+    samples = training_samples(log, models=models)
+    if len(samples) < min_samples:
+        return None, [f"학습 데이터가 부족합니다: {len(samples)}건 (최소 {min_samples}건)"]
+    train_end, calibration_end = int(len(samples) * 0.7), int(len(samples) * 0.85)
+    started = time.perf_counter()
+    model = HashedNgramClassifier(hash_bits).fit(samples[:train_end])
+    model.calibrate(samples[train_end:calibration_end])
+    model.meta.update({'trained_at': time.time(), 'train_seconds': round(time.perf_counter() - started, 2),
+                       'classes': {verdict: sum(1 for sample in samples if sample[3] == verdict) for verdict in VERDICTS}})
+    model.save(path)
+    counts = ", ".join(f"{VERDICT_LABELS[verdict]} {count}" for verdict, count in model.meta['classes'].items())
+    lines = [f"학습 {train_end}건 / 보정 {calibration_end - train_end}건 / 검증 {len(samples) - calibration_end}건 "
+             f"({counts}), {model.meta['train_seconds']}초 → {path}"]
+    return model, lines + calibration_report(model, samples[calibration_end:])
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="1단계 판단 기록으로 로컬 분류기 학습/보정 보고서")
+    parser.add_argument("command", choices=["train", "report"], help="train: 학습 후 저장, report: 저장된 모델 평가")
+    parser.add_argument("--db", default=STAGE1_VERDICT_DB_PATH, help=f"판단 기록 경로 (기본값: {STAGE1_VERDICT_DB_PATH})")
+    parser.add_argument("--model-path", default=STAGE1_MODEL_PATH, help=f"모델 파일 (기본값: {STAGE1_MODEL_PATH})")
+    parser.add_argument("--import-jobs", help="작업 테이블(news_jobs.db)의 과거 1단계 판단을 먼저 가져오기")
+    parser.add_argument("--min-samples", type=int, default=STAGE1_MODEL_MIN_SAMPLES, help="학습 최소 기록 수")
+    parser.add_argument("--models", nargs="*",
+                        help="이 모델들이 판단한 기록만 사용 (기본값: 캐스케이드 작은 모델 STAGE_MODELS[1] 제외)")
+    parser.add_argument("--threshold", type=float, default=STAGE1_MODEL_CONFIDENCE, help="보고서의 현재 확신도 기준")
+    args = parser.parse_args(argv)
+
+    if not NUMPY_AVAILABLE:
+        print("numpy가 필요합니다. pip install numpy로 설치하세요.")
+        return 1
+
+    log = VerdictLog(args.db)
+    if args.import_jobs:
+        print(f"작업 테이블에서 {import_job_results(log, args.import_jobs)}건의 판단을 가져왔습니다.")
+
+    if args.command == "train":
+        model, lines = train(log, args.model_path, min_samples=args.min_samples, models=args.models)
+    else:
+        model = load_stage1_model(args.model_path)
+        if model is None:
+            return 1
+        # 학습 이후 새로 쌓인 판단으로 평가 (없으면 전체 기록)
+        samples = (training_samples(log, since=model.meta.get('trained_at', 0.0), models=args.models)
+                   or training_samples(log, models=args.models))
+        lines = calibration_report(model, samples, threshold=args.threshold)
+    for line in lines:
+        print(line)
+    return 0 if model is not None else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -11,45 +11,45 @@ import requests
 from bs4 import BeautifulSoup
 import time
 from typing import Optional, Dict, List, Tuple
-import re
 from urllib.parse import urlparse
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import json
 from enum import Enum
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, WebDriverException
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.service import Service
+from importlib.util import find_spec
+from config import ARTICLE_MAX_CHARS
+from text_cleaner import clean_content, is_junk_line, filter_meaningful_lines
+from content_budget import budget_article, count_tokens
+from llm_governor import governed_call
+from prompt_layout import total_tokens
+from hedging import FetchCancelled, hedging
+
+# 선택적 의존성은 설치 여부만 확인하고 실제 임포트는 처음 사용할 때 수행
+# (selenium은 JavaScript 렌더링 사이트, newspaper3k/openai는 원문 요약 단계에서만 필요)
 
 # Google News URL 디코더 (선택적)
-try:
-    from googlenewsdecoder import gnewsdecoder
-    GOOGLE_NEWS_DECODER_AVAILABLE = True
-except ImportError:
-    GOOGLE_NEWS_DECODER_AVAILABLE = False
+GOOGLE_NEWS_DECODER_AVAILABLE = find_spec("googlenewsdecoder") is not None
+if not GOOGLE_NEWS_DECODER_AVAILABLE:
     print("googlenewsdecoder가 설치되지 않았습니다. pip install googlenewsdecoder로 설치하세요.")
 
-# newspaper3k 임포트 (선택적)
-try:
-    from newspaper import Article
-    NEWSPAPER3K_AVAILABLE = True
-except ImportError:
-    NEWSPAPER3K_AVAILABLE = False
+# newspaper3k (선택적)
+NEWSPAPER3K_AVAILABLE = find_spec("newspaper") is not None
+if not NEWSPAPER3K_AVAILABLE:
     print("newspaper3k가 설치되지 않았습니다. pip install newspaper3k로 설치하세요.")
 
-# OpenAI API 임포트 (선택적)
-try:
-    import openai
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
+# OpenAI API (선택적)
+OPENAI_AVAILABLE = find_spec("openai") is not None
+if not OPENAI_AVAILABLE:
     print("OpenAI API가 설치되지 않았습니다. pip install openai로 설치하세요.")
 
 
+# AI 폴백 설정
+AI_FALLBACK_MODEL = "gpt-4o-mini"
+AI_FALLBACK_TOKEN_BUDGET = 2500
+
+# 기사 HTML 스트림 읽기 단위 (헤징에서 진 요청은 청크 사이에서 읽기 중단)
+ARTICLE_READ_CHUNK_SIZE = 16 * 1024
+
+
 class ExtractionMethod(Enum):
     """추출 방법 열거형"""
     NEWSPAPER3K = "newspaper3k"
@@ -103,37 +103,21 @@ class HybridNewsWebScraper:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         })
         
-        # AI 설정
+        # AI 설정 (OpenAI 클라이언트는 AI 폴백을 처음 사용할 때 생성)
         self.enable_ai_fallback = enable_ai_fallback and OPENAI_AVAILABLE
         self.openai_client = None
+        self._openai_api_key = None
         
         # Selenium 설정 (필요시 동적으로 생성)
         print("🔧 Selenium은 필요시 동적으로 초기화됩니다.")
         
-        if OPENAI_AVAILABLE:
-            try:
-                # 환경변수에서 API 키 가져오기 (우선순위)
-                import os
-                api_key = openai_api_key or os.getenv('OPENAI_API_KEY')
-                
-                if api_key:
-                    # 최신 OpenAI 라이브러리 방식
-                    try:
-                        from openai import OpenAI
-                        self.openai_client = OpenAI(
-                            api_key=api_key,
-                            base_url=os.getenv('OPENAI_BASE_URL')  # PwC 설정 지원
-                        )
-                        print("✅ OpenAI API 클라이언트 초기화 성공")
-                    except Exception as init_error:
-                        print(f"⚠️ OpenAI 클라이언트 초기화 실패: {init_error}")
-                        self.enable_ai_fallback = False
-                else:
-                    self.enable_ai_fallback = False
-                    print("⚠️ OpenAI API 키가 설정되지 않아 AI 폴백을 비활성화합니다.")
-            except Exception as e:
+        if self.enable_ai_fallback:
+            # 환경변수에서 API 키 가져오기 (우선순위)
+            import os
+            self._openai_api_key = openai_api_key or os.getenv('OPENAI_API_KEY')
+            if not self._openai_api_key:
                 self.enable_ai_fallback = False
-                print(f"⚠️ OpenAI API 초기화 실패: {e}")
+                print("⚠️ OpenAI API 키가 설정되지 않아 AI 폴백을 비활성화합니다.")
         
         # 통계 추적
         self.stats = {
@@ -226,6 +210,42 @@ class HybridNewsWebScraper:
             }
         }
     
+    def _get_openai_client(self):
+        """OpenAI 클라이언트 반환 (처음 호출 시 생성, 실패하면 AI 폴백 비활성화)"""
+        if self.openai_client is None and self.enable_ai_fallback:
+            try:
+                import os
+                from openai import OpenAI
+                self.openai_client = OpenAI(
+                    api_key=self._openai_api_key,
+                    base_url=os.getenv('OPENAI_BASE_URL'),  # PwC 설정 지원
+                    max_retries=0  # 재시도는 llm_governor에서 처리
+                )
+                print("✅ OpenAI API 클라이언트 초기화 성공")
+            except Exception as init_error:
+                print(f"⚠️ OpenAI 클라이언트 초기화 실패: {init_error}")
+                self.enable_ai_fallback = False
+        return self.openai_client
+
+    def _get_html(self, url: str, timeout: int) -> bytes:
+        """
+        기사 HTML 요청 (헤징을 켜면 호스트별 p90 지연을 넘긴 요청은 한 번 더 보내고 먼저 온 응답 사용).
+        본문은 스트리밍으로 읽으므로, 다른 요청이 먼저 끝나면 나머지 본문을 내려받지 않고 연결을 닫습니다.
+        """
+        def fetch(cancel):
+            with self.session.get(url, timeout=timeout, stream=True) as response:
+                response.raise_for_status()
+                chunks = []
+                for chunk in response.iter_content(ARTICLE_READ_CHUNK_SIZE):
+                    if cancel.is_set():
+                        raise FetchCancelled("먼저 도착한 응답이 있어 읽기를 중단합니다.")
+                    chunks.append(chunk)
+            if cancel.is_set():
+                raise FetchCancelled("먼저 도착한 응답이 있어 버립니다.")
+            return b"".join(chunks)
+
+        return hedging.call(f"article:{urlparse(url).netloc.lower()}", fetch)
+
     def extract_content(self, url: str, timeout: int = 15) -> ExtractionResult:
         """
         하이브리드 방식으로 URL에서 기사 본문을 추출합니다.
@@ -336,6 +356,7 @@ class HybridNewsWebScraper:
     def _extract_with_newspaper3k(self, url: str, domain: str, timeout: int) -> ExtractionResult:
         """1차: newspaper3k 라이브러리를 사용한 추출"""
         try:
+            from newspaper import Article
             article = Article(url)
             article.download()
             article.parse()
@@ -366,6 +387,11 @@ class HybridNewsWebScraper:
     
     def _extract_with_selenium(self, url: str, domain: str, timeout: int) -> ExtractionResult:
         """3차: Selenium으로 동적 콘텐츠 추출"""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.common.exceptions import TimeoutException, WebDriverException
+
         if not self.driver:
             return ExtractionResult(
                 url=url, domain=domain, method=ExtractionMethod.SELENIUM,
@@ -437,6 +463,11 @@ class HybridNewsWebScraper:
     def _extract_with_improved_selenium(self, url: str, domain: str, timeout: int) -> ExtractionResult:
         """3차: ImprovedNewsExtractor의 고급 Selenium 추출"""
         print("   🌐 고급 Selenium 모드로 시도...")
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+        from selenium.webdriver.support.ui import WebDriverWait
+        from webdriver_manager.chrome import ChromeDriverManager
         
         # 고급 Chrome 옵션 설정 (ImprovedNewsExtractor 방식)
         options = Options()
@@ -553,8 +584,7 @@ class HybridNewsWebScraper:
                         text = element.get_text(separator='\n', strip=True)
                         
                         # 의미있는 문장만 필터링
-                        lines = [line.strip() for line in text.split('\n') if line.strip()]
-                        meaningful_lines = [line for line in lines if len(line) > 20 and not self._is_junk_line(line)]
+                        meaningful_lines = filter_meaningful_lines(text)
                         
                         if len(meaningful_lines) >= 3:
                             content = '\n\n'.join(meaningful_lines)
@@ -596,15 +626,10 @@ class HybridNewsWebScraper:
         """2차: 커스텀 파서를 사용한 추출"""
         try:
             # HTTP 요청
-            response = self.session.get(url, timeout=timeout)
-            response.raise_for_status()
-            
-            # 인코딩 설정
-            if response.encoding == 'ISO-8859-1':
-                response.encoding = response.apparent_encoding
+            html = self._get_html(url, timeout)
             
-            # BeautifulSoup으로 파싱
-            soup = BeautifulSoup(response.content, 'html.parser')
+            # BeautifulSoup으로 파싱 (인코딩은 BeautifulSoup이 바이트에서 판별)
+            soup = BeautifulSoup(html, 'html.parser')
             
             # 제목 추출
             title = self._extract_title_custom(soup, domain)
@@ -645,21 +670,21 @@ class HybridNewsWebScraper:
         """3차: AI API를 사용한 추출"""
         try:
             # 먼저 HTML 가져오기
-            response = self.session.get(url, timeout=timeout)
-            response.raise_for_status()
-            
-            if response.encoding == 'ISO-8859-1':
-                response.encoding = response.apparent_encoding
+            html = self._get_html(url, timeout)
             
             # HTML에서 텍스트 추출 (간단한 전처리)
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(html, 'html.parser')
             
             # 불필요한 태그 제거
             for tag in soup(['script', 'style', 'nav', 'header', 'footer', 'aside', 'advertisement']):
                 tag.decompose()
             
-            # 전체 텍스트 추출 (더 관대한 길이 제한)
-            raw_text = soup.get_text()[:8000]  # AI API 토큰 제한 고려하되 더 많이
+            # 보일러플레이트 제거 후 토큰 예산 안에서 리드/수치 문단 우선 보존
+            raw_text = budget_article(
+                soup.get_text(separator='\n'),
+                max_tokens=AI_FALLBACK_TOKEN_BUDGET,
+                model=AI_FALLBACK_MODEL
+            )
             
             # 텍스트 길이 체크를 더 관대하게 (50자 이상이면 시도)
             if len(raw_text.strip()) < 50:
@@ -687,20 +712,27 @@ class HybridNewsWebScraper:
             """
             
             # OpenAI 클라이언트 확인
-            if not self.openai_client:
+            client = self._get_openai_client()
+            if not client:
                 return ExtractionResult(
                     url=url, domain=domain, method=ExtractionMethod.AI_FALLBACK,
                     error_message="OpenAI 클라이언트가 초기화되지 않음"
                 )
             
-            response = self.openai_client.chat.completions.create(
-                model="gpt-4o-mini",  # 빠르고 저렴한 모델
-                messages=[
-                    {"role": "system", "content": "당신은 웹페이지에서 뉴스 기사를 추출하는 전문가입니다. JSON 형식으로만 응답하세요."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=1000,
-                temperature=0.1
+            response = governed_call(
+                lambda: client.chat.completions.create(
+                    model=AI_FALLBACK_MODEL,  # 빠르고 저렴한 모델
+                    messages=[
+                        {"role": "system", "content": "당신은 웹페이지에서 뉴스 기사를 추출하는 전문가입니다. JSON 형식으로만 응답하세요."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    max_tokens=1000,
+                    temperature=0.1
+                ),
+                model=AI_FALLBACK_MODEL,
+                tokens=count_tokens(prompt, AI_FALLBACK_MODEL) + 1000,
+                stage="extraction",
+                usage_fn=total_tokens
             )
             
             # AI 응답 파싱
@@ -777,70 +809,12 @@ class HybridNewsWebScraper:
         return None
     
     def _clean_content(self, content: str) -> str:
-        """본문 정리 (개선된 버전)"""
-        if not content:
-            return ""
-        
-        # 불필요한 공백 제거
-        content = re.sub(r'\s+', ' ', content)
-        
-        # 광고성 문구 제거 (확장된 패턴)
-        ad_patterns = [
-            r'저작권자.*?무단.*?금지',
-            r'Copyright.*?All rights reserved',
-            r'무단전재.*?재배포.*?금지',
-            r'기자.*?@.*?\.com',
-            r'▶.*?바로가기',
-            r'▲.*?사진',
-            r'\[.*?기자\]',
-            r'이 기사는.*?제공',
-            r'관련기사.*?더보기',
-            r'구독.*?알림',
-            r'댓글.*?남기기',
-            r'공유하기',
-            r'프린트.*?스크랩',
-            r'좋아요.*?싫어요',
-            r'SNS.*?공유',
-            r'네이버.*?다음',
-            r'페이스북.*?트위터',
-            r'카카오.*?라인',
-            r'광고.*?AD',
-            r'Sponsored.*?Content'
-        ]
-        
-        for pattern in ad_patterns:
-            content = re.sub(pattern, '', content, flags=re.IGNORECASE)
-        
-        # 연속된 공백과 줄바꿈 정리
-        content = re.sub(r'\s+', ' ', content).strip()
-        content = re.sub(r'\n+', '\n', content)
-        
-        # 길이 제한 (너무 긴 기사는 앞부분만)
-        if len(content) > 3000:
-            content = content[:3000] + "..."
-        
-        return content
+        """본문 정리 (문단 구분 유지, 저장 크기는 ARTICLE_MAX_CHARS로 제한 - 프롬프트 분량은 요약 단계의 토큰 예산으로 처리)"""
+        return clean_content(content, max_length=ARTICLE_MAX_CHARS, keep_paragraphs=True)
     
     def _is_junk_line(self, line):
-        """쓸모없는 라인 판별 (ImprovedNewsExtractor에서 가져옴)"""
-        junk_patterns = [
-            r'^\s*\d+\s*$',  # 숫자만
-            r'^\s*[^\w\s]*\s*$',  # 특수문자만
-            r'관련\s*기사',
-            r'더\s*보기',
-            r'이전\s*기사',
-            r'다음\s*기사',
-            r'^\s*AD\s*$',
-            r'광고',
-            r'구독',
-            r'로그인',
-            r'회원가입'
-        ]
-        
-        for pattern in junk_patterns:
-            if re.search(pattern, line, re.IGNORECASE):
-                return True
-        return False
+        """쓸모없는 라인 판별 (text_cleaner의 컴파일된 단일 정규식 사용)"""
+        return is_junk_line(line)
     
     def _fallback_content_extraction(self, soup):
         """폴백 본문 추출 (ImprovedNewsExtractor에서 가져옴)"""
@@ -865,6 +839,7 @@ class HybridNewsWebScraper:
             if GOOGLE_NEWS_DECODER_AVAILABLE:
                 print(f"   📦 googlenewsdecoder 라이브러리 사용 중...")
                 try:
+                    from googlenewsdecoder import gnewsdecoder
                     result = gnewsdecoder(google_news_url, interval=1)
                     if result.get("status") and result.get("decoded_url"):
                         decoded_url = result["decoded_url"]
@@ -974,20 +949,20 @@ class HybridNewsWebScraper:
             # 순차 처리
             print(f"순차 처리로 {len(urls)}개 기사 추출 시작")
             start_time = time.time()
-        
-        for i, url in enumerate(urls, 1):
-            print(f"기사 {i}/{len(urls)} 추출 중: {url}")
-            
-            result = self.extract_content(url)
-            results[url] = result
             
-            status = "✅" if result.success else "❌"
-            method = result.method.value if result.success else "실패"
-            print(f"{status} 완료 - {method}")
-            
-            # 요청 간 지연 (서버 부하 방지)
-            if i < len(urls):
-                time.sleep(delay)
+            for i, url in enumerate(urls, 1):
+                print(f"기사 {i}/{len(urls)} 추출 중: {url}")
+                
+                result = self.extract_content(url)
+                results[url] = result
+                
+                status = "✅" if result.success else "❌"
+                method = result.method.value if result.success else "실패"
+                print(f"{status} 완료 - {method}")
+                
+                # 요청 간 지연 (서버 부하 방지)
+                if i < len(urls):
+                    time.sleep(delay)
             
             elapsed_time = time.time() - start_time
             success_count = sum(1 for result in results.values() if result.success)